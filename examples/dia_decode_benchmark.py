@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""Benchmark: Dia decode throughput.
+
+Times the Dia decoding loop (encoder, cross-attention precompute and the
+autoregressive decode steps, without the DAC decode) with the compiled decode
+step and with the same step run eagerly, at several batch sizes. Each prompt
+in a batch gets its own CFG pair, so a batch of B runs 2B decoder rows.
+Reports decode steps per second and tokens per second summed over the batch.
+
+Usage:
+    python examples/dia_decode_benchmark.py
+    python examples/dia_decode_benchmark.py --batch-sizes 1 2 4 --steps 300
+"""
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Dia decode throughput")
+    parser.add_argument(
+        "--model",
+        "-m",
+        default="mlx-community/Dia-1.6B",
+        help="Dia model to use (default: mlx-community/Dia-1.6B)",
+    )
+    parser.add_argument(
+        "--text",
+        default="[S1] The quick brown fox jumps over the lazy dog. [S2] Does it?",
+        help="Prompt to decode",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="Batch sizes to benchmark (default: 1 2 4)",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=200,
+        help="Decode steps per run (default: 200)",
+    )
+    args = parser.parse_args()
+
+    import mlx.core as mx
+
+    from mlx_audio.tts.utils import load_model
+
+    print(f"Loading model: {args.model}")
+    model = load_model(args.model)
+
+    print("-" * 60)
+    print(f"{'step':>10} {'batch':>6} {'steps / s':>12} {'tokens / s':>12}")
+    print("-" * 60)
+    for compiled in (False, True):
+        for batch_size in args.batch_sizes:
+            texts = [args.text] * batch_size
+
+            def run():
+                codes = model._generate_codes(
+                    texts, max_tokens=args.steps, compiled=compiled, verbose=False
+                )
+                mx.eval(codes)
+                return codes
+
+            # The first run compiles the decode steps of every cache block
+            run()
+            tic = time.perf_counter()
+            codes = run()
+            elapsed = time.perf_counter() - tic
+
+            steps = max(len(c) for c in codes) + 1
+            label = "compiled" if compiled else "eager"
+            print(
+                f"{label:>10} {batch_size:>6} {steps / elapsed:>12.1f} "
+                f"{batch_size * steps / elapsed:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
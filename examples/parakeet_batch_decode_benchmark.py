@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""Benchmark: batched greedy TDT/RNNT decoding for Parakeet.
+
+Splits an audio file into fixed-length windows, runs the Conformer encoder
+once, and then times the greedy transducer decoder alone at several batch
+sizes. Reports decode time per hour of audio for each batch size.
+
+Usage:
+    python examples/parakeet_batch_decode_benchmark.py --audio path/to/audio.wav
+    python examples/parakeet_batch_decode_benchmark.py --audio path/to/audio.wav --batch-sizes 1 8 32 --window 10
+"""
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure Parakeet transducer decode time per audio-hour"
+    )
+    parser.add_argument(
+        "--audio", "-a", required=True, help="Path to audio file to transcribe"
+    )
+    parser.add_argument(
+        "--model",
+        "-m",
+        default="mlx-community/parakeet-tdt-0.6b-v2",
+        help="Parakeet TDT or RNNT model to use (default: mlx-community/parakeet-tdt-0.6b-v2)",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 8, 32],
+        help="Batch sizes to benchmark (default: 1 8 32)",
+    )
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=10.0,
+        help="Window length in seconds (default: 10)",
+    )
+    parser.add_argument(
+        "--sync-interval",
+        type=int,
+        default=16,
+        help="Decoder steps between host syncs (default: 16)",
+    )
+    args = parser.parse_args()
+
+    import mlx.core as mx
+
+    from mlx_audio.stt.models.parakeet.audio import log_mel_spectrogram
+    from mlx_audio.stt.models.parakeet.rnnt import greedy_batch_decode
+    from mlx_audio.stt.utils import load_audio, load_model
+
+    print(f"Loading model: {args.model}")
+    model = load_model(args.model)
+    if not hasattr(model, "joint"):
+        raise SystemExit("This benchmark needs a TDT or RNNT Parakeet model")
+    sample_rate = model.preprocessor_config.sample_rate
+
+    audio = load_audio(args.audio, sample_rate)
+    window = int(args.window * sample_rate)
+    windows = [audio[i : i + window] for i in range(0, len(audio) - window + 1, window)]
+    if not windows:
+        raise SystemExit(f"Audio is shorter than one {args.window:.0f}s window")
+
+    mel = mx.concatenate(
+        [log_mel_spectrogram(w, model.preprocessor_config) for w in windows]
+    )
+    features, lengths = [], []
+    for start in range(0, len(windows), 8):
+        f, l = model.encoder(mel[start : start + 8])
+        mx.eval(f, l)
+        features.append(f)
+        lengths.append(l)
+    features = mx.concatenate(features)
+    lengths = mx.concatenate(lengths)
+    audio_hours = len(windows) * args.window / 3600
+
+    decode_kwargs = {
+        "blank": len(model.vocabulary),
+        "durations": getattr(model, "durations", None),
+        "max_symbols": model.max_symbols,
+        "sync_interval": args.sync_interval,
+    }
+
+    print(f"{len(windows)} windows of {args.window:.0f}s ({audio_hours * 60:.1f} min)")
+    print("-" * 60)
+    print(f"{'batch':>6} {'time (s)':>10} {'s / audio-hour':>16} {'tokens':>8}")
+    print("-" * 60)
+    baseline = None
+    for batch_size in args.batch_sizes:
+        # Warm up on one batch, then time a full pass over every window
+        greedy_batch_decode(
+            model.decoder,
+            model.joint,
+            features[:batch_size],
+            lengths[:batch_size],
+            **decode_kwargs,
+        )
+        n_tokens = 0
+        tic = time.perf_counter()
+        for start in range(0, len(windows), batch_size):
+            hypotheses = greedy_batch_decode(
+                model.decoder,
+                model.joint,
+                features[start : start + batch_size],
+                lengths[start : start + batch_size],
+                **decode_kwargs,
+            )
+            n_tokens += sum(len(h) for h in hypotheses)
+        elapsed = time.perf_counter() - tic
+
+        per_hour = elapsed / audio_hours
+        baseline = baseline or per_hour
+        print(
+            f"{batch_size:>6} {elapsed:>10.3f} {per_hour:>16.1f} {n_tokens:>8}"
+            f"  ({baseline / per_hour:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
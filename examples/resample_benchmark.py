@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""Benchmark: polyphase resampling against scipy.
+
+Times ``mlx_audio.dsp.resample`` (NumPy and MLX backends) and the streaming
+``StreamingResampler`` against ``scipy.signal.resample_poly`` and the
+FFT-based ``scipy.signal.resample`` on synthetic 1-minute and 1-hour clips.
+The FFT resampler allocates several full-length complex buffers, so it is
+only run on clips up to ``--fft-max-seconds``.
+
+Usage:
+    python examples/resample_benchmark.py
+    python examples/resample_benchmark.py --rates 44100:16000 24000:16000 --durations 60
+"""
+
+import argparse
+import time
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - tic)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare mlx_audio resampling with scipy"
+    )
+    parser.add_argument(
+        "--rates",
+        nargs="+",
+        default=["44100:16000", "48000:24000", "24000:16000", "16000:24000"],
+        help="Conversions as orig:target (default: common TTS/STT rates)",
+    )
+    parser.add_argument(
+        "--durations",
+        type=float,
+        nargs="+",
+        default=[60.0, 3600.0],
+        help="Clip durations in seconds (default: 60 3600)",
+    )
+    parser.add_argument(
+        "--fft-max-seconds",
+        type=float,
+        default=600.0,
+        help="Longest clip to run scipy.signal.resample on (default: 600)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per measurement (default: 3)"
+    )
+    args = parser.parse_args()
+
+    import mlx.core as mx
+    import numpy as np
+    from scipy import signal
+
+    from mlx_audio.dsp import StreamingResampler, resample
+
+    rng = np.random.default_rng(0)
+    print(f"{'rate':>13} {'clip':>7} {'method':>18} {'time (s)':>9} {'x realtime':>11}")
+    print("-" * 62)
+    for rate in args.rates:
+        orig_sr, target_sr = (int(r) for r in rate.split(":"))
+        g = np.gcd(orig_sr, target_sr)
+        up, down = target_sr // g, orig_sr // g
+
+        for duration in args.durations:
+            x = rng.standard_normal(int(duration * orig_sr)).astype(np.float32)
+            x_mx = mx.array(x)
+            mx.eval(x_mx)
+
+            def mlx_resample():
+                mx.eval(resample(x_mx, orig_sr, target_sr))
+
+            def streaming():
+                resampler = StreamingResampler(orig_sr, target_sr)
+                block = 30 * orig_sr
+                for start in range(0, len(x), block):
+                    resampler.process(x[start : start + block])
+                resampler.flush()
+
+            methods = {
+                "scipy resample_poly": lambda: signal.resample_poly(x, up, down),
+                "dsp numpy": lambda: resample(x, orig_sr, target_sr),
+                "dsp mlx": mlx_resample,
+                "dsp streaming": streaming,
+            }
+            if duration <= args.fft_max_seconds:
+                n_out = int(len(x) * target_sr / orig_sr)
+                methods["scipy resample"] = lambda: signal.resample(x, n_out)
+
+            mlx_resample()  # build the cached filter banks and kernels
+            label = f"{orig_sr / 1000:g}k->{target_sr / 1000:g}k"
+            for name, fn in methods.items():
+                elapsed = timed(fn, args.repeat)
+                print(
+                    f"{label:>13} {duration:>6g}s {name:>18} "
+                    f"{elapsed:>9.3f} {duration / elapsed:>11.0f}"
+                )
+        print("-" * 62)
+
+
+if __name__ == "__main__":
+    main()
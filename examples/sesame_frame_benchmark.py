@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""Benchmark: Sesame CSM per-frame latency.
+
+Prefills the default speaker prompt and a line of text, then times
+``generate_frame`` (backbone step plus the depth decoder over every codebook)
+at several batch sizes. Reports milliseconds per frame and the real-time
+factor, where one frame is 80 ms of audio per utterance in the batch.
+
+Usage:
+    python examples/sesame_frame_benchmark.py
+    python examples/sesame_frame_benchmark.py --batch-sizes 1 2 4 --frames 100
+"""
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure Sesame CSM frame latency and real-time factor"
+    )
+    parser.add_argument(
+        "--model",
+        "-m",
+        default="mlx-community/csm-1b",
+        help="Sesame model to use (default: mlx-community/csm-1b)",
+    )
+    parser.add_argument(
+        "--text",
+        default="The quick brown fox jumps over the lazy dog.",
+        help="Text to prefill before generating frames",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="Batch sizes to benchmark (default: 1 2 4)",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=50,
+        help="Timed frames per batch size (default: 50)",
+    )
+    args = parser.parse_args()
+
+    import mlx.core as mx
+    from mlx_lm.sample_utils import make_sampler
+
+    from mlx_audio.tts.utils import load_model
+
+    print(f"Loading model: {args.model}")
+    model = load_model(args.model)
+    sampler = make_sampler(temp=0.9, top_k=50)
+
+    context = model.default_speaker_prompt("conversational_a")
+    tokens, masks = model._tokenize_segment(context[0])
+    text_tokens, text_masks = model._tokenize_text_segment(args.text, 0)
+    prompt = mx.concat([tokens, text_tokens]).astype(mx.int32)
+    prompt_mask = mx.concat([masks, text_masks]).astype(mx.bool_)
+    frame_ms = 80.0
+
+    print(f"Prompt length: {prompt.shape[0]} frames")
+    print("-" * 60)
+    print(f"{'batch':>6} {'ms / frame':>12} {'frames / s':>12} {'RTF':>8}")
+    print("-" * 60)
+    for batch_size in args.batch_sizes:
+        model.model.reset_caches()
+        curr = mx.broadcast_to(prompt[None], (batch_size, *prompt.shape))
+        curr_mask = mx.broadcast_to(prompt_mask[None], curr.shape)
+
+        # The prefill frame and the first steps compile the depth decoder
+        for _ in range(2):
+            sample = model.model.generate_frame(curr, curr_mask, None, sampler)
+            curr = mx.concat(
+                [sample, mx.zeros((batch_size, 1), dtype=mx.int32)], axis=1
+            )[:, None]
+            curr_mask = mx.concat(
+                [mx.ones_like(sample), mx.zeros((batch_size, 1), dtype=mx.int32)],
+                axis=1,
+            )[:, None].astype(mx.bool_)
+            mx.eval(curr)
+
+        tic = time.perf_counter()
+        for _ in range(args.frames):
+            sample = model.model.generate_frame(curr, curr_mask, None, sampler)
+            curr = mx.concat(
+                [sample, mx.zeros((batch_size, 1), dtype=mx.int32)], axis=1
+            )[:, None]
+            mx.eval(curr)
+        elapsed = time.perf_counter() - tic
+
+        ms_per_frame = 1000 * elapsed / args.frames
+        rtf = ms_per_frame / (frame_ms * batch_size)
+        print(
+            f"{batch_size:>6} {ms_per_frame:>12.2f} "
+            f"{batch_size * args.frames / elapsed:>12.1f} {rtf:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,21 @@
 This module provides functions for reading and writing audio files.
 - Reading: Uses miniaudio to support WAV, MP3, FLAC, and Vorbis formats.
            Uses ffmpeg for M4A/AAC format support.
-- Writing: Uses miniaudio for WAV/FLAC and ffmpeg for MP3 encoding.
+- Writing: Encodes WAV and raw PCM natively and uses ffmpeg for MP3/FLAC/AAC.
+
+FFmpegEncoder and FFmpegDecoder keep one ffmpeg process per stream and move
+audio through it block by block. read_blocks decodes long files in bounded
+memory, memory-mapping WAV data and resampling on the fly.
 """
 
 import io
+import os
 import shutil
+import struct
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 
@@ -32,6 +39,23 @@ _SAMPLE_FORMAT_MAP = {
     "float32": "FLOAT32",
 }
 
+# WAV sample formats that can be memory-mapped:
+# (format tag, bits per sample) -> (dtype, zero point, full scale)
+_WAV_MEMMAP_DTYPES = {
+    (1, 8): ("u1", 128.0, 128.0),
+    (1, 16): ("<i2", 0.0, 32768.0),
+    (1, 32): ("<i4", 0.0, 2147483648.0),
+    (3, 32): ("<f4", 0.0, 1.0),
+    (3, 64): ("<f8", 0.0, 1.0),
+}
+
+# ffmpeg muxer used for each encoded output format
+_FFMPEG_MUXERS = {
+    "mp3": "mp3",
+    "flac": "flac",
+    "aac": "adts",
+}
+
 
 def _detect_format_from_bytes(data: bytes) -> str:
     """Detect audio format from bytes data using magic bytes."""
@@ -50,131 +74,180 @@ def _detect_format_from_bytes(data: bytes) -> str:
         raise ValueError("Unable to detect audio format from bytes")
 
 
-def _decode_ffmpeg(
-    input_data: Union[str, Path, bytes],
-) -> Tuple[np.ndarray, int, int]:
-    """Decode audio using ffmpeg (for formats not supported by miniaudio like M4A).
+def _drain(stream: BinaryIO, sink: list) -> threading.Thread:
+    """Read ``stream`` into ``sink`` on a daemon thread until EOF."""
 
-    Args:
-        input_data: Path to the audio file or raw bytes data.
+    def run():
+        for block in iter(lambda: stream.read1(1 << 16), b""):
+            sink.append(block)
 
-    Returns:
-        Tuple of (samples as int16 numpy array, sample_rate, nchannels).
-
-    Raises:
-        RuntimeError: If ffmpeg is not found or decoding fails.
-    """
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path is None:
-        raise RuntimeError(
-            "\n"
-            "========================================\n"
-            "  ffmpeg not found!\n"
-            "========================================\n"
-            "\n"
-            "ffmpeg is required for M4A/AAC audio decoding.\n"
-            "\n"
-            "Install ffmpeg:\n"
-            "  macOS:  brew install ffmpeg\n"
-            "  Ubuntu: sudo apt install ffmpeg\n"
-        )
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
 
-    # First, get audio info using ffprobe
-    ffprobe_path = shutil.which("ffprobe")
-    if ffprobe_path is None:
-        raise RuntimeError("ffprobe not found (usually installed with ffmpeg)")
-
-    if isinstance(input_data, bytes):
-        # Use stdin for bytes input
-        probe_cmd = [
-            ffprobe_path,
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_streams",
-            "-select_streams",
-            "a:0",
-            "-i",
-            "pipe:0",
-        ]
-        probe_result = subprocess.run(
-            probe_cmd,
-            input=input_data,
-            capture_output=True,
-        )
-    else:
-        probe_cmd = [
-            ffprobe_path,
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_streams",
-            "-select_streams",
-            "a:0",
-            str(input_data),
-        ]
-        probe_result = subprocess.run(probe_cmd, capture_output=True)
 
-    if probe_result.returncode != 0:
-        raise RuntimeError(f"ffprobe failed: {probe_result.stderr.decode()}")
+class FFmpegDecoder:
+    """Streaming ffmpeg decoder to 16-bit PCM.
 
-    import json
+    ffmpeg writes WAV to its stdout, so the sample rate and channel count are
+    read from that header instead of running ffprobe first. Iterating yields
+    int16 blocks of shape (frames, channels) as they are decoded. In-memory
+    inputs are fed to ffmpeg from a background thread, file paths are read by
+    ffmpeg itself.
 
-    probe_info = json.loads(probe_result.stdout.decode())
-    if not probe_info.get("streams"):
-        raise RuntimeError("No audio streams found in file")
+    Args:
+        source: Path to an audio file, encoded bytes, or a binary file-like object.
+        block_frames: Frames per yielded block.
 
-    stream = probe_info["streams"][0]
-    sample_rate = int(stream.get("sample_rate", 44100))
-    nchannels = int(stream.get("channels", 2))
+    Example:
+        >>> with FFmpegDecoder("speech.m4a") as decoder:
+        ...     for block in decoder:
+        ...         process(block, decoder.sample_rate)
+    """
 
-    # Decode to raw PCM using ffmpeg
-    if isinstance(input_data, bytes):
-        decode_cmd = [
-            ffmpeg_path,
+    def __init__(
+        self,
+        source: Union[str, Path, bytes, BinaryIO],
+        block_frames: int = 1 << 16,
+    ):
+        self.block_frames = block_frames
+        from_pipe = not isinstance(source, (str, Path))
+        cmd = [
+            _get_ffmpeg_path(),
+            "-hide_banner",
+            "-loglevel",
+            "error",
             "-i",
-            "pipe:0",
-            "-f",
-            "s16le",  # Output: signed 16-bit little-endian PCM
+            "pipe:0" if from_pipe else str(source),
+            "-map",
+            "0:a:0",
+            "-map_metadata",
+            "-1",
             "-acodec",
             "pcm_s16le",
-            "-ar",
-            str(sample_rate),
-            "-ac",
-            str(nchannels),
-            "pipe:1",
-        ]
-        decode_result = subprocess.run(
-            decode_cmd,
-            input=input_data,
-            capture_output=True,
-        )
-    else:
-        decode_cmd = [
-            ffmpeg_path,
-            "-i",
-            str(input_data),
             "-f",
-            "s16le",
-            "-acodec",
-            "pcm_s16le",
-            "-ar",
-            str(sample_rate),
-            "-ac",
-            str(nchannels),
+            "wav",
             "pipe:1",
         ]
-        decode_result = subprocess.run(decode_cmd, capture_output=True)
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if from_pipe else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._stderr: list = []
+        self._threads = [_drain(self._proc.stderr, self._stderr)]
+        if from_pipe:
+            feeder = threading.Thread(target=self._feed, args=(source,), daemon=True)
+            feeder.start()
+            self._threads.append(feeder)
+
+        self.sample_rate, self.nchannels = self._read_header()
+
+    def _feed(self, source):
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                self._proc.stdin.write(source)
+            else:
+                for block in iter(lambda: source.read(1 << 20), b""):
+                    self._proc.stdin.write(block)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg exited early, the error is reported by the reader
+        finally:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
 
-    if decode_result.returncode != 0:
-        raise RuntimeError(f"ffmpeg decoding failed: {decode_result.stderr.decode()}")
+    def _read_exact(self, n: int) -> bytes:
+        data = self._proc.stdout.read(n)
+        return data if data is not None else b""
 
-    # Convert raw PCM bytes to numpy array
-    samples = np.frombuffer(decode_result.stdout, dtype=np.int16)
+    def _fail(self):
+        self.close()
+        raise RuntimeError(
+            f"ffmpeg decoding failed: {b''.join(self._stderr).decode(errors='replace')}"
+        )
 
-    return samples, sample_rate, nchannels
+    def _read_header(self) -> Tuple[int, int]:
+        riff = self._read_exact(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            self._fail()
+        sample_rate = nchannels = None
+        while True:
+            chunk = self._read_exact(8)
+            if len(chunk) < 8:
+                self._fail()
+            chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"data":
+                break
+            body = self._read_exact(size + (size & 1))
+            if chunk_id == b"fmt ":
+                nchannels, sample_rate = struct.unpack("<HI", body[2:8])
+        if sample_rate is None:
+            self._fail()
+        return sample_rate, nchannels
+
+    def __iter__(self):
+        block_bytes = self.block_frames * self.nchannels * 2
+        pending = b""
+        while True:
+            data = self._read_exact(block_bytes)
+            if not data:
+                break
+            data = pending + data
+            usable = len(data) - len(data) % (self.nchannels * 2)
+            pending = data[usable:]
+            yield np.frombuffer(data[:usable], dtype="<i2").reshape(-1, self.nchannels)
+
+        if self._proc.wait() != 0:
+            for thread in self._threads:
+                thread.join()
+            self._fail()
+
+    def read_all(self) -> np.ndarray:
+        """Decode the remaining audio into one (frames, channels) array."""
+        blocks = list(self)
+        if not blocks:
+            return np.zeros((0, self.nchannels), dtype=np.int16)
+        return np.concatenate(blocks)
+
+    def close(self):
+        """Stop ffmpeg if it is still running."""
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        for stream in (self._proc.stdin, self._proc.stdout):
+            if stream is not None:
+                try:
+                    stream.close()
+                except BrokenPipeError:
+                    pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _decode_ffmpeg(
+    input_data: Union[str, Path, bytes, BinaryIO],
+) -> Tuple[np.ndarray, int, int]:
+    """Decode audio using ffmpeg (for formats not supported by miniaudio like M4A).
+
+    Args:
+        input_data: Path to the audio file, raw bytes data or a binary file-like object.
+
+    Returns:
+        Tuple of (samples as int16 numpy array, sample_rate, nchannels).
+
+    Raises:
+        RuntimeError: If ffmpeg is not found or decoding fails.
+    """
+    with FFmpegDecoder(input_data) as decoder:
+        samples = decoder.read_all().reshape(-1)
+    return samples, decoder.sample_rate, decoder.nchannels
 
 
 def read(
@@ -193,27 +266,11 @@ def read(
         Tuple of (audio_data, sample_rate).
         audio_data is a numpy array with shape (samples,) for mono or (samples, channels) for multi-channel.
     """
-    # Check if this is an M4A file that needs ffmpeg
-    use_ffmpeg = False
-    if isinstance(file, (str, Path)):
-        ext = Path(file).suffix.lstrip(".").lower()
-        if ext in ("m4a", "aac"):
-            use_ffmpeg = True
-    elif isinstance(file, io.BytesIO):
-        file.seek(0)
-        header = file.read(12)
-        file.seek(0)
-        if header[4:8] == b"ftyp":
-            use_ffmpeg = True
-
-    if use_ffmpeg:
+    if _needs_ffmpeg(file):
         # Use ffmpeg for M4A/AAC decoding
         if isinstance(file, io.BytesIO):
             file.seek(0)
-            input_data = file.read()
-        else:
-            input_data = file
-        samples, sample_rate, nchannels = _decode_ffmpeg(input_data)
+        samples, sample_rate, nchannels = _decode_ffmpeg(file)
     else:
         # Use miniaudio for other formats
         import miniaudio
@@ -229,18 +286,7 @@ def read(
         elif isinstance(file, io.BytesIO):
             file.seek(0)
             data = file.read()
-            # Detect format and get info to preserve original sample rate and channels
-            fmt = _detect_format_from_bytes(data)
-            if fmt == "wav":
-                info = miniaudio.wav_get_info(data)
-            elif fmt == "mp3":
-                info = miniaudio.mp3_get_info(data)
-            elif fmt == "flac":
-                info = miniaudio.flac_get_info(data)
-            elif fmt == "vorbis":
-                info = miniaudio.vorbis_get_info(data)
-            else:
-                raise ValueError(f"Unsupported format: {fmt}")
+            info = _memory_info(data)
             decoded = miniaudio.decode(
                 data,
                 nchannels=info.nchannels,
@@ -275,6 +321,270 @@ def read(
     return samples, sample_rate
 
 
+def _needs_ffmpeg(file: Union[str, Path, io.BytesIO]) -> bool:
+    """Whether ``file`` is M4A/AAC, which miniaudio cannot decode."""
+    if isinstance(file, (str, Path)):
+        return Path(file).suffix.lstrip(".").lower() in ("m4a", "aac")
+    if isinstance(file, io.BytesIO):
+        file.seek(0)
+        header = file.read(12)
+        file.seek(0)
+        return header[4:8] == b"ftyp"
+    return False
+
+
+def _memory_info(data: bytes):
+    """miniaudio stream info of encoded audio held in memory."""
+    import miniaudio
+
+    # Detect format and get info to preserve original sample rate and channels
+    fmt = _detect_format_from_bytes(data)
+    if fmt == "wav":
+        return miniaudio.wav_get_info(data)
+    elif fmt == "mp3":
+        return miniaudio.mp3_get_info(data)
+    elif fmt == "flac":
+        return miniaudio.flac_get_info(data)
+    elif fmt == "vorbis":
+        return miniaudio.vorbis_get_info(data)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+class AudioInfo(NamedTuple):
+    """Stream parameters of an audio file (see :func:`info`)."""
+
+    samplerate: int
+    channels: int
+    frames: int
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.samplerate
+
+
+def _wav_layout(path: Union[str, Path]):
+    """Locate the sample data of a WAV file from its header.
+
+    Returns:
+        Tuple of (format tag, bits per sample, sample_rate, nchannels, data
+        offset, frames), or None if ``path`` is not a RIFF/WAVE file.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"data":
+                break
+            body = f.read(size + (size & 1))
+            if chunk_id == b"fmt ":
+                fmt = body
+        offset = f.tell()
+
+    if fmt is None or len(fmt) < 16:
+        return None
+    tag, nchannels, sample_rate, _, block_align, bits = struct.unpack(
+        "<HHIIHH", fmt[:16]
+    )
+    if tag == 0xFFFE and len(fmt) >= 26:
+        # WAVE_FORMAT_EXTENSIBLE: the real format leads the subformat GUID
+        tag = struct.unpack("<H", fmt[24:26])[0]
+    # Streamed WAVs leave the data size at 0xFFFFFFFF, trust the file size
+    size = min(size, file_size - offset)
+    return tag, bits, sample_rate, nchannels, offset, size // max(block_align, 1)
+
+
+def info(file: Union[str, Path, io.BytesIO]) -> AudioInfo:
+    """Return the sample rate, channel count and length of an audio file.
+
+    WAV, MP3, FLAC and Vorbis are answered from their headers; M4A/AAC is
+    decoded by ffmpeg in blocks to count its frames.
+    """
+    if _needs_ffmpeg(file):
+        with FFmpegDecoder(file) as decoder:
+            frames = sum(len(block) for block in decoder)
+        return AudioInfo(decoder.sample_rate, decoder.nchannels, frames)
+
+    if isinstance(file, (str, Path)):
+        layout = _wav_layout(file)
+        if layout is not None:
+            _, _, sample_rate, nchannels, _, frames = layout
+            return AudioInfo(sample_rate, nchannels, frames)
+
+        import miniaudio
+
+        file_info = miniaudio.get_file_info(str(file))
+    elif isinstance(file, io.BytesIO):
+        file_info = _memory_info(file.getvalue())
+    else:
+        raise TypeError(f"Unsupported file type: {type(file)}")
+    return AudioInfo(file_info.sample_rate, file_info.nchannels, file_info.num_frames)
+
+
+def _open_stream(
+    file: Union[str, Path, io.BytesIO], block_frames: int, dtype: np.dtype
+) -> Tuple[int, int, Iterator[np.ndarray]]:
+    """Open ``file`` for block-wise decoding at its own sample rate.
+
+    Returns:
+        Tuple of (sample_rate, nchannels, iterator of (frames, channels) blocks
+        scaled to [-1, 1] in ``dtype``).
+    """
+    if _needs_ffmpeg(file):
+        decoder = FFmpegDecoder(file, block_frames=block_frames)
+
+        def ffmpeg_blocks():
+            with decoder:
+                for block in decoder:
+                    yield block.astype(dtype) / 32768.0
+
+        return decoder.sample_rate, decoder.nchannels, ffmpeg_blocks()
+
+    if isinstance(file, (str, Path)):
+        layout = _wav_layout(file)
+        spec = None
+        if layout is not None:
+            tag, bits, sample_rate, nchannels, offset, frames = layout
+            spec = _WAV_MEMMAP_DTYPES.get((tag, bits))
+        if spec is not None:
+            sample_dtype, zero, scale = spec
+
+            def wav_blocks():
+                if frames == 0:
+                    return
+                data = np.memmap(
+                    file,
+                    dtype=sample_dtype,
+                    mode="r",
+                    offset=offset,
+                    shape=(frames, nchannels),
+                )
+                for start in range(0, frames, block_frames):
+                    block = data[start : start + block_frames].astype(dtype)
+                    yield (block - zero) / scale if zero else block / scale
+
+            return sample_rate, nchannels, wav_blocks()
+
+    import miniaudio
+
+    if isinstance(file, (str, Path)):
+        stream_info = miniaudio.get_file_info(str(file))
+        stream = miniaudio.stream_file(
+            str(file),
+            nchannels=stream_info.nchannels,
+            sample_rate=stream_info.sample_rate,
+            frames_to_read=block_frames,
+        )
+    elif isinstance(file, io.BytesIO):
+        data = file.getvalue()
+        stream_info = _memory_info(data)
+        stream = miniaudio.stream_memory(
+            data,
+            nchannels=stream_info.nchannels,
+            sample_rate=stream_info.sample_rate,
+            frames_to_read=block_frames,
+        )
+    else:
+        raise TypeError(f"Unsupported file type: {type(file)}")
+
+    nchannels = stream_info.nchannels
+
+    def miniaudio_blocks():
+        for chunk in stream:
+            samples = np.frombuffer(chunk, dtype=np.int16).reshape(-1, nchannels)
+            yield samples.astype(dtype) / 32768.0
+
+    return stream_info.sample_rate, nchannels, miniaudio_blocks()
+
+
+def read_blocks(
+    file: Union[str, Path, io.BytesIO],
+    block_seconds: float = 30.0,
+    target_sr: Optional[int] = None,
+    dtype: str = "float32",
+    overlap_seconds: float = 0.0,
+    mono: bool = False,
+    always_2d: bool = False,
+) -> Iterator[np.ndarray]:
+    """Read an audio file block by block with bounded memory.
+
+    WAV data is memory-mapped, other formats are streamed by miniaudio (or
+    ffmpeg for M4A/AAC), and resampling runs as a streaming polyphase filter,
+    so only about one block is held in memory however long the file is.
+
+    Args:
+        file: Path to the audio file or a BytesIO object.
+        block_seconds: Duration of each yielded block in seconds.
+        target_sr: Sample rate of the yielded blocks. Defaults to the file's own rate.
+        dtype: Data type of the blocks. Supports 'float32', 'float64', 'int16'.
+        overlap_seconds: Audio shared by consecutive blocks, in seconds.
+        mono: If True, average the channels.
+        always_2d: If True, always yield 2D blocks (frames, channels).
+
+    Yields:
+        Blocks of ``block_seconds`` at ``target_sr``, shaped like :func:`read`
+        output. The last block holds the remainder and may be shorter.
+
+    Example:
+        >>> for block in read_blocks("podcast.mp3", 30.0, target_sr=16000, mono=True):
+        ...     transcribe(block)
+    """
+    from mlx_audio.dsp import StreamingResampler
+
+    work_dtype = np.dtype("float64" if dtype == "float64" else "float32")
+    sample_rate, nchannels, blocks = _open_stream(file, 1 << 16, work_dtype)
+    out_sr = target_sr or sample_rate
+    block = max(int(round(block_seconds * out_sr)), 1)
+    overlap = int(round(overlap_seconds * out_sr))
+    if overlap >= block:
+        raise ValueError("overlap_seconds must be shorter than block_seconds")
+
+    resampler = None
+    if out_sr != sample_rate:
+        resampler = StreamingResampler(sample_rate, out_sr, dtype=work_dtype)
+
+    def pieces():
+        for x in blocks:
+            if mono and nchannels > 1:
+                x = x.mean(axis=1, keepdims=True)
+            yield x if resampler is None else resampler.process(x)
+        if resampler is not None:
+            yield resampler.flush()
+
+    def convert(x: np.ndarray) -> np.ndarray:
+        if not always_2d and x.shape[1] == 1:
+            x = x[:, 0]
+        if dtype == "int16":
+            return np.clip(np.round(x * 32768.0), -32768, 32767).astype(np.int16)
+        return np.array(x, dtype=dtype)
+
+    pending, pending_frames, emitted = [], 0, False
+    for piece in pieces():
+        if len(piece) == 0:
+            continue
+        pending.append(piece)
+        pending_frames += len(piece)
+        if pending_frames < block:
+            continue
+        buffer = np.concatenate(pending) if len(pending) > 1 else pending[0]
+        start = 0
+        while len(buffer) - start >= block:
+            yield convert(buffer[start : start + block])
+            emitted = True
+            start += block - overlap
+        pending, pending_frames = [buffer[start:]], len(buffer) - start
+
+    # Only emit the remainder if it holds audio not yielded yet
+    if pending_frames > (overlap if emitted else 0):
+        yield convert(np.concatenate(pending))
+
+
 def _check_ffmpeg_available() -> bool:
     """Check if ffmpeg is available on the system."""
     return shutil.which("ffmpeg") is not None
@@ -308,35 +618,15 @@ def _get_ffmpeg_path() -> str:
     return ffmpeg_path
 
 
-def _encode_ffmpeg(
-    data: np.ndarray,
-    samplerate: int,
-    nchannels: int,
-    output: Union[str, Path, io.BytesIO],
-    format: str = "mp3",
-    bitrate: str = "128k",
-) -> None:
-    """Encode audio using ffmpeg.
-
-    Args:
-        data: Audio data as int16 numpy array (samples,) or (samples, channels)
-        samplerate: Sample rate in Hz
-        nchannels: Number of channels
-        output: Output file path or BytesIO object
-        format: Output format (mp3, flac, etc.)
-        bitrate: Audio bitrate for lossy formats (default: 128k)
-    """
-    ffmpeg_path = _get_ffmpeg_path()
-
-    # Prepare raw PCM bytes (interleaved for stereo)
-    if data.ndim == 1:
-        pcm_bytes = data.tobytes()
-    else:
-        pcm_bytes = data.flatten().tobytes()
-
-    # Build ffmpeg command
+def _encode_command(samplerate: int, nchannels: int, format: str, bitrate: str) -> list:
+    """ffmpeg arguments encoding s16le PCM from stdin to ``format``."""
+    if format not in _FFMPEG_MUXERS:
+        raise ValueError(f"Unsupported output format: {format}")
     cmd = [
-        ffmpeg_path,
+        _get_ffmpeg_path(),
+        "-hide_banner",
+        "-loglevel",
+        "error",
         "-y",  # Overwrite output
         "-f",
         "s16le",  # Input: signed 16-bit little-endian PCM
@@ -344,40 +634,308 @@ def _encode_ffmpeg(
         str(samplerate),  # Sample rate
         "-ac",
         str(nchannels),  # Channels
+        # Raw PCM needs no probing; without these ffmpeg buffers several
+        # seconds of input before it writes any output. (-fflags nobuffer
+        # is left out: it makes ffmpeg drop the first packets of a pipe.)
+        "-probesize",
+        "32",
+        "-analyzeduration",
+        "0",
         "-i",
         "pipe:0",  # Read from stdin
     ]
 
     # Add format-specific options
-    if format == "mp3":
+    if format in ("mp3", "aac"):
         cmd.extend(["-b:a", bitrate])
 
-    cmd.extend(["-f", format])
+    cmd.extend(["-f", _FFMPEG_MUXERS[format]])
+    return cmd
 
-    if isinstance(output, io.BytesIO):
-        cmd.append("pipe:1")
-        result = subprocess.run(
+
+class FFmpegEncoder:
+    """Long-lived ffmpeg process encoding a stream of PCM blocks.
+
+    Blocks are piped to one ffmpeg process for the whole stream and the
+    encoded bytes are collected by a reader thread as ffmpeg produces them,
+    so a streamed MP3/FLAC/AAC response is a single continuous file.
+    ``encode`` never waits for ffmpeg: it returns the bytes available so far
+    and the rest of a block comes with the next call or ``close``.
+
+    Args:
+        samplerate: Sample rate in Hz.
+        nchannels: Number of channels.
+        format: Output format ('mp3', 'flac' or 'aac').
+        bitrate: Audio bitrate for lossy formats (default: 128k).
+
+    Example:
+        >>> with FFmpegEncoder(24000, format="mp3") as encoder:
+        ...     for result in model.generate(text):
+        ...         yield encoder.encode(result.audio)
+        ...     yield encoder.close()
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        nchannels: int = 1,
+        format: str = "mp3",
+        bitrate: str = "128k",
+    ):
+        self.nchannels = nchannels
+        cmd = _encode_command(samplerate, nchannels, format, bitrate)
+        cmd.extend(["-flush_packets", "1", "pipe:1"])
+        self._proc = subprocess.Popen(
             cmd,
-            input=pcm_bytes,
-            capture_output=True,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
-        if result.returncode != 0:
-            raise RuntimeError(f"ffmpeg failed: {result.stderr.decode()}")
-        output.write(result.stdout)
-        output.seek(0)
-    else:
+        self._output: list = []
+        self._stderr: list = []
+        self._threads = [
+            _drain(self._proc.stdout, self._output),
+            _drain(self._proc.stderr, self._stderr),
+        ]
+
+    def _take_output(self) -> bytes:
+        n = len(self._output)
+        data = b"".join(self._output[:n])
+        del self._output[:n]
+        return data
+
+    def _fail(self):
+        self.abort()
+        raise RuntimeError(
+            f"ffmpeg failed: {b''.join(self._stderr).decode(errors='replace')}"
+        )
+
+    def encode(self, data) -> bytes:
+        """Feed a block of audio and return the bytes encoded so far."""
+        samples = _to_int16(data)
+        nchannels = 1 if samples.ndim == 1 else samples.shape[1]
+        if nchannels != self.nchannels:
+            raise ValueError(
+                f"Expected {self.nchannels} channel(s), got a block with {nchannels}"
+            )
+        try:
+            self._proc.stdin.write(_pcm_view(samples))
+            self._proc.stdin.flush()
+        except BrokenPipeError:
+            self._fail()
+        return self._take_output()
+
+    def close(self) -> bytes:
+        """Finish the stream and return the remaining encoded bytes."""
+        if self._proc.stdin.closed:
+            return self._take_output()
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = self._proc.wait()
+        for thread in self._threads:
+            thread.join()
+        if returncode != 0:
+            self._fail()
+        return self._take_output()
+
+    def abort(self):
+        """Stop ffmpeg without waiting for the rest of the stream."""
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.abort()
+
+
+def _encode_ffmpeg(
+    data: np.ndarray,
+    samplerate: int,
+    nchannels: int,
+    output: Union[str, Path, BinaryIO],
+    format: str = "mp3",
+    bitrate: str = "128k",
+) -> None:
+    """Encode audio using ffmpeg.
+
+    Args:
+        data: Audio data as int16 numpy array (samples,) or (samples, channels)
+        samplerate: Sample rate in Hz
+        nchannels: Number of channels
+        output: Output file path or binary file-like object
+        format: Output format (mp3, flac, aac)
+        bitrate: Audio bitrate for lossy formats (default: 128k)
+    """
+    if isinstance(output, (str, Path)):
+        cmd = _encode_command(samplerate, nchannels, format, bitrate)
         cmd.append(str(output))
         result = subprocess.run(
             cmd,
-            input=pcm_bytes,
+            input=_pcm_view(_to_int16(data)),
             capture_output=True,
         )
         if result.returncode != 0:
             raise RuntimeError(f"ffmpeg failed: {result.stderr.decode()}")
+        return
+
+    encoder = FFmpegEncoder(samplerate, nchannels, format=format, bitrate=bitrate)
+    with encoder:
+        output.write(encoder.encode(data))
+        output.write(encoder.close())
+    if isinstance(output, io.BytesIO):
+        output.seek(0)
+
+
+def _to_int16(data) -> np.ndarray:
+    """Convert NumPy, MLX or array-like audio to little-endian int16 samples.
+
+    Floats are clipped to [-1, 1] and scaled. Arrays are converted through the
+    buffer protocol, never through Python lists.
+    """
+    if not isinstance(data, np.ndarray):
+        if type(data).__module__.startswith("mlx") and "bfloat16" in str(data.dtype):
+            import mlx.core as mx
+
+            data = data.astype(mx.float32)
+        data = np.asarray(data)
+
+    if data.dtype.kind == "f":
+        data = np.clip(data, -1.0, 1.0) * 32767
+    return np.ascontiguousarray(data, dtype="<i2")
+
+
+def _pcm_view(samples: np.ndarray) -> memoryview:
+    """Interleaved PCM bytes of int16 ``samples`` without copying."""
+    return memoryview(samples).cast("B")
+
+
+def wav_header(
+    samplerate: int, nchannels: int = 1, num_frames: Optional[int] = None
+) -> bytes:
+    """Return the 44-byte header of a 16-bit PCM WAV file.
+
+    Args:
+        samplerate: Sample rate in Hz.
+        nchannels: Number of channels.
+        num_frames: Number of frames (samples per channel), or None for a
+            stream of unknown length, which uses the maximum chunk sizes.
+    """
+    block_align = nchannels * 2
+    if num_frames is None:
+        data_size = riff_size = 0xFFFFFFFF
+    else:
+        data_size = min(num_frames * block_align, 0xFFFFFFFF - 36)
+        riff_size = 36 + data_size
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        riff_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        nchannels,
+        samplerate,
+        samplerate * block_align,
+        block_align,
+        16,  # bits per sample
+        b"data",
+        data_size,
+    )
+
+
+class WavStreamWriter:
+    """Incremental 16-bit PCM WAV encoder.
+
+    The header is emitted first with the sizes of a stream of unknown length
+    and every block is then appended as raw PCM, so audio can be sent while it
+    is generated as one continuous WAV stream. When writing to a seekable
+    file, :meth:`close` patches the header with the final sizes.
+
+    Args:
+        samplerate: Sample rate in Hz.
+        nchannels: Number of channels, or None to take it from the first block.
+        file: Optional binary file-like object written by :meth:`write`.
+
+    Example:
+        >>> writer = WavStreamWriter(24000)
+        >>> for result in model.generate(text):
+        ...     yield writer.encode(result.audio)
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        nchannels: Optional[int] = None,
+        file: Optional[BinaryIO] = None,
+    ):
+        self.samplerate = samplerate
+        self.nchannels = nchannels
+        self.file = file
+        self.num_frames = 0
+        self._header_sent = False
+        self._header_pos = None
+
+    def _samples(self, data) -> np.ndarray:
+        samples = _to_int16(data)
+        nchannels = 1 if samples.ndim == 1 else samples.shape[1]
+        if self.nchannels is None:
+            self.nchannels = nchannels
+        elif nchannels != self.nchannels:
+            raise ValueError(
+                f"Expected {self.nchannels} channel(s), got a block with {nchannels}"
+            )
+        self.num_frames += samples.shape[0]
+        return samples
+
+    def _header(self) -> bytes:
+        self._header_sent = True
+        return wav_header(self.samplerate, self.nchannels)
+
+    def encode(self, data) -> bytes:
+        """Return the bytes of the next block, preceded by the header on the
+        first call."""
+        samples = self._samples(data)
+        pcm = samples.tobytes()
+        return pcm if self._header_sent else self._header() + pcm
+
+    def write(self, data) -> None:
+        """Append a block to ``file``."""
+        samples = self._samples(data)
+        if not self._header_sent:
+            if self.file.seekable():
+                self._header_pos = self.file.tell()
+            self.file.write(self._header())
+        self.file.write(_pcm_view(samples))
+
+    def close(self) -> None:
+        """Write the final sizes into the header of a seekable ``file``."""
+        if self._header_pos is None:
+            return
+        end = self.file.tell()
+        self.file.seek(self._header_pos)
+        self.file.write(wav_header(self.samplerate, self.nchannels, self.num_frames))
+        self.file.seek(end)
+        self._header_pos = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 def write(
-    file: Union[str, Path, io.BytesIO],
+    file: Union[str, Path, BinaryIO],
     data: np.ndarray,
     samplerate: int,
     format: Optional[str] = None,
@@ -385,44 +943,27 @@ def write(
     """Write audio data to a file.
 
     Args:
-        file: Path to the output file or a BytesIO object.
-        data: Audio data as numpy array. Shape can be (samples,) for mono
-              or (samples, channels) for multi-channel.
+        file: Path to the output file or a binary file-like object (e.g. BytesIO).
+        data: Audio data as a NumPy or MLX array. Shape can be (samples,) for
+              mono or (samples, channels) for multi-channel.
         samplerate: Sample rate in Hz.
-        format: Output format. Supports 'wav', 'flac', 'mp3'. If None, inferred from file extension.
+        format: Output format. Supports 'wav', 'pcm' (raw 16-bit little-endian),
+            'flac', 'mp3', 'aac'. If None, inferred from file extension.
 
     Note:
-        WAV and FLAC use miniaudio for encoding.
-        MP3 uses ffmpeg (must be installed: brew install ffmpeg).
+        WAV and PCM are encoded directly from the array buffer.
+        MP3, FLAC and AAC use ffmpeg (must be installed: brew install ffmpeg).
     """
-    import miniaudio
-
     # Determine format
     if format is None:
         if isinstance(file, (str, Path)):
             format = Path(file).suffix.lstrip(".").lower()
         else:
-            format = "wav"  # Default to WAV for BytesIO
+            format = "wav"  # Default to WAV for file-like objects
 
     format = format.lower()
 
-    # Ensure data is numpy array (handle MLX arrays and other array-like types)
-    if not isinstance(data, np.ndarray):
-        # Check for MLX array (has tolist but not __array__)
-        if hasattr(data, "tolist") and not hasattr(data, "__array__"):
-            data = np.array(data.tolist())
-        elif hasattr(data, "__array__"):
-            data = np.asarray(data)
-        else:
-            data = np.array(data)
-
-    # Convert to int16 for encoding
-    if data.dtype in (np.float32, np.float64):
-        # Clip to [-1, 1] range and convert to int16
-        data = np.clip(data, -1.0, 1.0)
-        data = (data * 32767).astype(np.int16)
-    elif data.dtype != np.int16:
-        data = data.astype(np.int16)
+    data = _to_int16(data)
 
     # Get number of channels
     if data.ndim == 1:
@@ -430,46 +971,22 @@ def write(
     else:
         nchannels = data.shape[1]
 
-    if format == "wav":
-        import array
+    if format in ("wav", "pcm"):
+        chunks = [_pcm_view(data)]
+        if format == "wav":
+            chunks.insert(0, wav_header(samplerate, nchannels, data.shape[0]))
 
-        # Flatten for miniaudio (interleaved)
-        if data.ndim == 1:
-            samples_flat = data
+        if isinstance(file, (str, Path)):
+            with open(file, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
         else:
-            samples_flat = data.flatten()
-
-        # Convert to array.array for miniaudio
-        samples_array = array.array("h", samples_flat.tolist())
-
-        # Create DecodedSoundFile
-        sound = miniaudio.DecodedSoundFile(
-            name="output",
-            nchannels=nchannels,
-            sample_rate=samplerate,
-            sample_format=miniaudio.SampleFormat.SIGNED16,
-            samples=samples_array,
-        )
-
-        if isinstance(file, io.BytesIO):
-            # Write to temp file, read back to BytesIO
-            import tempfile
-
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-            try:
-                miniaudio.wav_write_file(tmp_path, sound)
-                with open(tmp_path, "rb") as f:
-                    file.write(f.read())
+            for chunk in chunks:
+                file.write(chunk)
+            if isinstance(file, io.BytesIO):
                 file.seek(0)
-            finally:
-                import os
-
-                os.unlink(tmp_path)
-        else:
-            miniaudio.wav_write_file(str(file), sound)
 
-    elif format in ("flac", "mp3"):
+    elif format in _FFMPEG_MUXERS:
         # Check for ffmpeg early to provide a clear error message
         if not _check_ffmpeg_available():
             import warnings
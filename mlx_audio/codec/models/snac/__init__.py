@@ -1 +1,2 @@
 from .snac import SNAC
+from .streaming import SNACFrameBuffer, SNACStreamingDecoder
@@ -0,0 +1,325 @@
+from typing import List, Optional
+
+import mlx.core as mx
+import mlx.nn as nn
+
+from .attention import LocalMHA
+from .layers import (
+    DecoderBlock,
+    ResidualUnit,
+    WNConv1d,
+    WNConvTranspose1d,
+    normalize_weight,
+)
+
+
+def _cat(a: Optional[mx.array], b: Optional[mx.array]) -> Optional[mx.array]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return mx.concatenate([a, b], axis=1)
+
+
+class _Pointwise:
+    """Layer without temporal context (activations, 1x1 convs, noise)."""
+
+    def __init__(self, layer):
+        self.layer = layer
+
+    def reset(self):
+        pass
+
+    def step(self, x):
+        return self.layer(x)
+
+    def flush(self):
+        return None
+
+
+class _Conv:
+    """Stride-1 convolution padded by ``padding`` frames on both sides.
+
+    Keeps the last ``(kernel_size - 1) * dilation`` input frames between
+    calls, so its output lags the input by ``padding`` frames until ``flush``
+    supplies the right padding.
+    """
+
+    def __init__(self, conv: WNConv1d):
+        if conv.stride != 1:
+            raise ValueError("Streaming decode only supports stride-1 convolutions")
+        self.conv = conv
+        self.weight = conv.weight_g * conv.weight_v / normalize_weight(conv.weight_v)
+        self.bias = conv.bias if "bias" in conv else None
+        self.history = (conv.kernel_size - 1) * conv.dilation
+
+    def reset(self):
+        self.buffer = None
+
+    def _conv(self, x):
+        c = self.conv
+        y = mx.conv1d(x, self.weight, 1, 0, c.dilation, c.groups)
+        return y if self.bias is None else y + self.bias
+
+    def step(self, x):
+        if self.buffer is None:
+            pad = mx.zeros((x.shape[0], self.conv.padding, x.shape[2]), x.dtype)
+            x = mx.concatenate([pad, x], axis=1)
+        else:
+            x = mx.concatenate([self.buffer, x], axis=1)
+        if x.shape[1] <= self.history:
+            self.buffer = x
+            return None
+        self.buffer = x[:, x.shape[1] - self.history :]
+        return self._conv(x)
+
+    def flush(self):
+        if self.buffer is None:
+            return None
+        pad = mx.zeros(
+            (self.buffer.shape[0], self.conv.padding, self.buffer.shape[2]),
+            self.buffer.dtype,
+        )
+        return self.step(pad)
+
+
+class _ConvTranspose:
+    """Transposed convolution evaluated by overlap-add.
+
+    Each input frame writes ``kernel_size`` samples starting at
+    ``frame * stride``; the ``kernel_size - stride`` samples still waiting for
+    the next frame are carried between calls.
+    """
+
+    def __init__(self, conv: WNConvTranspose1d):
+        self.conv = conv
+        weight = (
+            conv.weight_g
+            * conv.weight_v
+            / normalize_weight(conv.weight_v, except_dim=0)
+        )
+        self.weight = weight.swapaxes(0, 2)
+        self.bias = conv.bias
+        self.overlap = conv.kernel_size - conv.stride
+        # WNConvTranspose1d passes `groups` positionally, where
+        # mx.conv_transpose1d expects `output_padding`; mirror the extra samples
+        self.output_padding = conv.groups
+
+    def reset(self):
+        self.tail = None
+        self.skip = self.conv.padding
+
+    def _emit(self, y):
+        if self.skip > 0:
+            drop = min(self.skip, y.shape[1])
+            y = y[:, drop:]
+            self.skip -= drop
+        if y.shape[1] == 0:
+            return None
+        return y if self.bias is None else y + self.bias
+
+    def step(self, x):
+        c = self.conv
+        y = mx.conv_transpose1d(
+            x, self.weight, c.stride, 0, c.dilation, groups=c.groups
+        )
+        if self.tail is not None:
+            y = mx.concatenate(
+                [y[:, : self.overlap] + self.tail, y[:, self.overlap :]], axis=1
+            )
+        ready = y.shape[1] - self.overlap
+        self.tail = y[:, ready:]
+        return self._emit(y[:, :ready])
+
+    def flush(self):
+        if self.tail is None:
+            return None
+        # Matches the full transposed conv cropped by `padding` on both sides
+        end = self.overlap - self.conv.padding + self.output_padding
+        return self._emit(self.tail[:, :end])
+
+
+class _Sequential:
+    def __init__(self, layers):
+        self.stages = [_stage(layer) for layer in layers]
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    def step(self, x):
+        for stage in self.stages:
+            if x is None:
+                return None
+            x = stage.step(x)
+        return x
+
+    def flush(self):
+        x = None
+        for stage in self.stages:
+            y = stage.step(x) if x is not None else None
+            x = _cat(y, stage.flush())
+        return x
+
+
+class _Residual:
+    """Residual unit whose skip path is delayed to match the block's lag."""
+
+    def __init__(self, unit: ResidualUnit):
+        self.block = _Sequential(unit.block.layers)
+
+    def reset(self):
+        self.block.reset()
+        self.skip = None
+
+    def _add(self, y):
+        if y is None:
+            return None
+        n = y.shape[1]
+        out = self.skip[:, :n] + y
+        self.skip = self.skip[:, n:]
+        return out
+
+    def step(self, x):
+        self.skip = _cat(self.skip, x)
+        return self._add(self.block.step(x))
+
+    def flush(self):
+        return self._add(self.block.flush())
+
+
+def _stage(layer):
+    if isinstance(layer, WNConv1d):
+        if layer.kernel_size == 1 and layer.padding == 0:
+            return _Pointwise(layer)
+        return _Conv(layer)
+    if isinstance(layer, WNConvTranspose1d):
+        return _ConvTranspose(layer)
+    if isinstance(layer, ResidualUnit):
+        return _Residual(layer)
+    if isinstance(layer, DecoderBlock):
+        return _Sequential(layer.block.layers)
+    if isinstance(layer, nn.Sequential):
+        return _Sequential(layer.layers)
+    if isinstance(layer, LocalMHA):
+        raise ValueError("Streaming decode does not support local attention layers")
+    return _Pointwise(layer)
+
+
+class SNACStreamingDecoder:
+    """Incremental decoder for the SNAC codec.
+
+    SNAC pads its decoder convolutions symmetrically, so each layer needs a
+    few frames of lookahead. Instead of re-decoding overlapping context on
+    every call (as ``SNAC.decode_stream`` does), every convolution keeps the
+    input frames its kernel still needs and transposed convolutions carry
+    their overlap-add tail. New frames are therefore decoded exactly once;
+    the audio for the last few frames is held back until more codes arrive or
+    ``flush`` is called. Decoding all codes followed by ``flush`` produces the
+    same samples as ``SNAC.decode`` (up to the decoder's noise injection).
+
+    Example:
+        >>> decoder = SNACStreamingDecoder(snac)
+        >>> for codes in code_chunks:
+        ...     play(decoder.decode_frames(codes))
+        >>> play(decoder.flush())
+    """
+
+    def __init__(self, snac):
+        self._snac = snac
+        self._decoder = _Sequential(snac.decoder.model.layers)
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all carried state to start a new utterance."""
+        self._decoder.reset()
+        self._batch_size = None
+
+    def _audio(self, audio: Optional[mx.array]) -> mx.array:
+        if audio is None:
+            return mx.zeros((self._batch_size or 1, 0, 1))
+        return audio
+
+    def decode_frames(self, codes: List[mx.array]) -> mx.array:
+        """Decode new code frames.
+
+        Args:
+            codes: New codes per codebook, shaped ``(B, T_i)`` with ``T_i``
+                consistent with the quantizer strides (e.g. 1, 2 and 4 codes
+                per frame for the 24 kHz model).
+
+        Returns:
+            The audio that is final after these frames, shaped ``(B, T, 1)``
+            like ``SNAC.decode``. It may be empty for the first few frames.
+        """
+        self._batch_size = codes[0].shape[0]
+        z_q = self._snac.quantizer.from_codes(codes)
+        return self._audio(self._decoder.step(z_q.moveaxis(1, 2)))
+
+    def flush(self) -> mx.array:
+        """Return the held-back audio at the end of the stream and reset."""
+        audio = self._audio(self._decoder.flush())
+        self.reset()
+        return audio
+
+
+class SNACFrameBuffer:
+    """Collects the interleaved SNAC codes emitted by a TTS language model.
+
+    Orpheus-style models write each frame of the 24 kHz codec as seven tokens,
+    one from the first codebook followed by codebooks 2, 3, 3, 2, 3, 3, where
+    code ``c`` at position ``i`` of the frame is token
+    ``token_offset + i * codebook_size + c``. Tokens are appended one at a
+    time and each completed frame is split into its codebooks right away, so
+    the generated sequence never has to be re-parsed.
+
+    Args:
+        token_offset: Token id of code 0 at the first position of a frame.
+        codebook_size: Number of codes per codebook.
+    """
+
+    LAYERS = (0, 1, 2, 2, 1, 2, 2)
+
+    def __init__(self, token_offset: int, codebook_size: int = 4096):
+        self.token_offset = token_offset
+        self.codebook_size = codebook_size
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all frames, e.g. when the model restarts its speech."""
+        self._layers = [[] for _ in range(max(self.LAYERS) + 1)]
+        self._group = []
+        self._returned = 0
+
+    def __len__(self) -> int:
+        return len(self._layers[0])
+
+    def append(self, token: int) -> bool:
+        """Add one generated token; return True if it completed a frame."""
+        position = len(self._group)
+        self._group.append(token - self.token_offset - position * self.codebook_size)
+        if len(self._group) < len(self.LAYERS):
+            return False
+        for layer, code in zip(self.LAYERS, self._group):
+            self._layers[layer].append(code)
+        self._group = []
+        return True
+
+    def _codes(self, start: int) -> List[mx.array]:
+        codes = []
+        for index, layer in enumerate(self._layers):
+            per_frame = self.LAYERS.count(index)
+            codes.append(mx.array(layer[start * per_frame :])[None])
+        return codes
+
+    def codes(self) -> List[mx.array]:
+        """Codes of every complete frame, one ``(1, T_i)`` array per codebook."""
+        return self._codes(0)
+
+    def new_codes(self) -> Optional[List[mx.array]]:
+        """Codes of the frames completed since the last call, or None."""
+        if len(self) == self._returned:
+            return None
+        codes = self._codes(self._returned)
+        self._returned = len(self)
+        return codes
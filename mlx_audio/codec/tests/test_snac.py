@@ -1,8 +1,9 @@
 import unittest
 
 import mlx.core as mx
+import numpy as np
 
-from ..models.snac import SNAC
+from ..models.snac import SNAC, SNACFrameBuffer, SNACStreamingDecoder
 
 config = {
     "sampling_rate": 24000,
@@ -35,6 +36,72 @@ class TestSNAC(unittest.TestCase):
         reconstructed = model.decode(codes).squeeze(-1)
         self.assertEqual(reconstructed.shape, (1, 120_907))
 
+    def test_streaming_decode_matches_decode(self):
+        """Chunked streaming decode reproduces a single full decode."""
+        mx.random.seed(0)
+        model = SNAC(**{**config, "decoder_dim": 64, "noise": False})
+        frames = 11
+        codes = [
+            mx.random.randint(0, 4096, (1, frames * n)) for n in model.vq_strides[::-1]
+        ]
+        expected = model.decode(codes)
+
+        decoder = SNACStreamingDecoder(model)
+        for chunks in ([1, 1, 3, 6], [frames]):
+            audio, start = [], 0
+            for n in chunks:
+                audio.append(
+                    decoder.decode_frames(
+                        [
+                            c[:, start * s : (start + n) * s]
+                            for c, s in zip(codes, model.vq_strides[::-1])
+                        ]
+                    )
+                )
+                start += n
+            # Audio of the last frames waits for lookahead until flushed
+            self.assertLess(sum(a.shape[1] for a in audio), expected.shape[1])
+            audio.append(decoder.flush())
+
+            audio = mx.concatenate(audio, axis=1)
+            self.assertEqual(audio.shape, expected.shape)
+            np.testing.assert_allclose(audio, expected, atol=1e-5)
+
+    def test_frame_buffer(self):
+        """Interleaved 7-token frames are split into the three codebooks."""
+        offset = 1000
+        layer_1, layer_2, layer_3 = [5, 6], [7, 8, 9, 10], list(range(11, 19))
+        tokens = []
+        for i in range(2):
+            frame = [
+                layer_1[i],
+                layer_2[2 * i],
+                layer_3[4 * i],
+                layer_3[4 * i + 1],
+                layer_2[2 * i + 1],
+                layer_3[4 * i + 2],
+                layer_3[4 * i + 3],
+            ]
+            tokens += [offset + p * 4096 + c for p, c in enumerate(frame)]
+
+        frames = SNACFrameBuffer(token_offset=offset)
+        self.assertIsNone(frames.new_codes())
+        completed = [frames.append(t) for t in tokens[:10]]
+        self.assertEqual(completed, [False] * 6 + [True] + [False] * 3)
+        self.assertEqual(
+            [c.tolist() for c in frames.new_codes()],
+            [[[5]], [[7, 8]], [[11, 12, 13, 14]]],
+        )
+        self.assertIsNone(frames.new_codes())
+
+        for t in tokens[10:]:
+            frames.append(t)
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(frames.new_codes()[2].tolist(), [[15, 16, 17, 18]])
+        self.assertEqual(
+            [c.tolist() for c in frames.codes()], [[layer_1], [layer_2], [layer_3]]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -15,18 +15,27 @@ __all__ = [
     "stft",
     "istft",
     "ISTFTCache",
+    "get_istft_cache",
     "mel_filters",
+    "resample",
+    "resample_filter",
+    "StreamingResampler",
     # Kaldi-compatible features
     "compute_deltas_kaldi",
     "mel_scale_kaldi",
     "inverse_mel_scale_kaldi",
     "get_mel_banks_kaldi",
     "compute_fbank_kaldi",
+    "compute_fbank_kaldi_batch",
 ]
+import hashlib
+import threading
+from collections import OrderedDict
 from functools import lru_cache
-from typing import Optional
+from typing import Hashable, Optional
 
 import mlx.core as mx
+import numpy as np
 
 
 # Common window functions
@@ -117,27 +126,28 @@ def stft(
 
     def _pad(x, padding, pad_mode="reflect"):
         if pad_mode == "constant":
-            return mx.pad(x, [(padding, padding)])
+            return mx.pad(x, [(0, 0)] * (x.ndim - 1) + [(padding, padding)])
         elif pad_mode == "reflect":
-            prefix = x[1 : padding + 1][::-1]
-            suffix = x[-(padding + 1) : -1][::-1]
-            return mx.concatenate([prefix, x, suffix])
+            prefix = x[..., 1 : padding + 1][..., ::-1]
+            suffix = x[..., -(padding + 1) : -1][..., ::-1]
+            return mx.concatenate([prefix, x, suffix], axis=-1)
         else:
             raise ValueError(f"Invalid pad_mode {pad_mode}")
 
     if center:
         x = _pad(x, n_fft // 2, pad_mode)
 
-    num_frames = 1 + (x.shape[0] - n_fft) // hop_length
+    num_frames = 1 + (x.shape[-1] - n_fft) // hop_length
     if num_frames <= 0:
         raise ValueError(
-            f"Input is too short (length={x.shape[0]}) for n_fft={n_fft} with "
+            f"Input is too short (length={x.shape[-1]}) for n_fft={n_fft} with "
             f"hop_length={hop_length} and center={center}."
         )
 
-    shape = (num_frames, n_fft)
-    strides = (hop_length, 1)
-    frames = mx.as_strided(x, shape=shape, strides=strides)
+    # A (batch, samples) input gives (batch, frames, freq)
+    shape = (*x.shape[:-1], num_frames, n_fft)
+    strides = (x.shape[-1], hop_length, 1)[-len(shape) :]
+    frames = mx.as_strided(mx.contiguous(x), shape=shape, strides=strides)
     return mx.fft.rfft(frames * w)
 
 
@@ -169,39 +179,27 @@ def istft(
     if hop_length is None:
         hop_length = win_length // 4
 
+    # positions in the time-domain signal and the overlap-added window,
+    # both shared across calls through the process-wide cache
+    cache = get_istft_cache()
     if isinstance(window, str):
-        window_fn = STR_TO_WINDOW_FN.get(window.lower())
-        if window_fn is None:
-            raise ValueError(f"Unknown window function: {window}")
-        w = window_fn(win_length + 1)[:-1]
+        w = _periodic_window(window.lower(), win_length)
     else:
-        w = window
-
-    if w.shape[0] < win_length:
-        w = mx.concatenate([w, mx.zeros((win_length - w.shape[0],))], axis=0)
+        w = cache.padded_window(window, win_length)
 
     num_frames = x.shape[1]
     t = (num_frames - 1) * hop_length + win_length
 
-    reconstructed = mx.zeros(t)
-    window_sum = mx.zeros(t)
-
     # inverse FFT of each frame
     frames_time = mx.fft.irfft(x, axis=0).transpose(1, 0)
 
-    # get the position in the time-domain signal to add the frame
-    frame_offsets = mx.arange(num_frames) * hop_length
-    indices = frame_offsets[:, None] + mx.arange(win_length)
-    indices_flat = indices.flatten()
-
-    updates_reconstructed = (frames_time * w).flatten()
+    indices_flat = cache.get_positions(num_frames, win_length, hop_length)
     # Use window squared for COLA normalization (matches PyTorch's istft) or just window
-    window_norm = (w * w) if normalized else w
-    updates_window = mx.tile(window_norm, (num_frames,)).flatten()
+    window_sum = cache.get_window_sum(w, hop_length, num_frames, squared=normalized)
 
     # overlap-add the inverse transformed frame, scaled by the window
-    reconstructed = reconstructed.at[indices_flat].add(updates_reconstructed)
-    window_sum = window_sum.at[indices_flat].add(updates_window)
+    updates_reconstructed = (frames_time * w).flatten()
+    reconstructed = mx.zeros(t).at[indices_flat].add(updates_reconstructed)
 
     # normalize by the sum of (squared) window values
     reconstructed = mx.where(
@@ -217,6 +215,20 @@ def istft(
     return reconstructed
 
 
+@lru_cache(maxsize=None)
+def _periodic_window(name: str, length: int) -> mx.array:
+    window_fn = STR_TO_WINDOW_FN.get(name)
+    if window_fn is None:
+        raise ValueError(f"Unknown window function: {name}")
+    return window_fn(length + 1)[:-1]
+
+
+def _zero_pad_window(window: mx.array, length: int) -> mx.array:
+    return mx.concatenate(
+        [window, mx.zeros((length - window.shape[0],), dtype=window.dtype)]
+    )
+
+
 # Mel filterbank
 
 
@@ -301,51 +313,143 @@ class ISTFTCache:
     Advanced caching for iSTFT operations. Fully vectorized Overlap-Add for MLX.
     Handles multiple configurations efficiently.
     Automatically caches normalization buffers and position indices for maximum performance.
+
+    Entries live in one LRU bounded by ``max_entries`` and ``max_bytes``, so
+    variable-length inputs cannot grow it without limit. Windows are keyed by
+    a content fingerprint computed once per window array; windows shorter
+    than the frame are zero-padded once, so the padded copy keeps its
+    fingerprint across calls too.
     """
 
-    def __init__(self):
-        self.norm_buffer_cache = {}
-        self.position_cache = {}
+    _MAX_WINDOW_KEYS = 32
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # id(window) -> (window, fingerprint); holding the window keeps the id valid
+        self._window_keys = OrderedDict()
+        # (id(window), length) -> (window, padded window)
+        self._padded_windows = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def window_key(self, window: mx.array) -> Hashable:
+        """Content fingerprint of a window, computed once per window array."""
+        with self._lock:
+            entry = self._window_keys.get(id(window))
+            if entry is not None and entry[0] is window:
+                self._window_keys.move_to_end(id(window))
+                return entry[1]
+
+        data = np.array(window.astype(mx.float32))
+        key = (data.shape[0], hashlib.blake2b(data.tobytes(), digest_size=16).digest())
+        with self._lock:
+            self._window_keys[id(window)] = (window, key)
+            if len(self._window_keys) > self._MAX_WINDOW_KEYS:
+                self._window_keys.popitem(last=False)
+        return key
+
+    def padded_window(self, window: mx.array, length: int) -> mx.array:
+        """``window`` zero-padded to ``length``, built once per window array."""
+        if window.shape[0] >= length:
+            return window
+        key = (id(window), length)
+        with self._lock:
+            entry = self._padded_windows.get(key)
+            if entry is not None and entry[0] is window:
+                self._padded_windows.move_to_end(key)
+                return entry[1]
+
+        padded = _zero_pad_window(window, length)
+        with self._lock:
+            self._padded_windows[key] = (window, padded)
+            if len(self._padded_windows) > self._MAX_WINDOW_KEYS:
+                self._padded_windows.popitem(last=False)
+        return padded
+
+    def _get(self, key: Hashable, build) -> mx.array:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self._bytes += value.nbytes
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return value
 
     def get_positions(self, num_frames: int, frame_length: int, hop_length: int):
         """Get cached position indices or create new ones"""
-        key = (num_frames, frame_length, hop_length)
 
-        if key not in self.position_cache:
+        def build():
             positions = (
                 mx.arange(num_frames)[:, None] * hop_length
                 + mx.arange(frame_length)[None, :]
             )
-            self.position_cache[key] = positions.reshape(-1)
+            return positions.reshape(-1)
 
-        return self.position_cache[key]
+        return self._get(("positions", num_frames, frame_length, hop_length), build)
 
-    def get_norm_buffer(
+    def get_window_sum(
         self,
-        n_fft: int,
-        hop_length: int,
-        win_length: int,
         window: mx.array,
+        hop_length: int,
         num_frames: int,
+        squared: bool = True,
     ):
-        """Get cached normalization buffer or create new one"""
-        window_hash = hash(tuple(window.tolist()))
-        key = (n_fft, hop_length, win_length, window_hash, num_frames)
+        """Get the cached overlap-added (squared) window over ``num_frames`` frames"""
 
-        if key not in self.norm_buffer_cache:
+        def build():
             frame_length = window.shape[0]
             ola_len = (num_frames - 1) * hop_length + frame_length
             positions_flat = self.get_positions(num_frames, frame_length, hop_length)
+            window_norm = window**2 if squared else window
+            window_sum = mx.zeros(ola_len, dtype=mx.float32)
+            return window_sum.at[positions_flat].add(mx.tile(window_norm, num_frames))
 
-            window_squared = window**2
-            norm_buffer = mx.zeros(ola_len, dtype=mx.float32)
-            window_sq_tiled = mx.tile(window_squared, num_frames)
-            norm_buffer = norm_buffer.at[positions_flat].add(window_sq_tiled)
-            norm_buffer = mx.maximum(norm_buffer, 1e-10)
+        key = ("window_sum", self.window_key(window), hop_length, num_frames, squared)
+        return self._get(key, build)
 
-            self.norm_buffer_cache[key] = norm_buffer
+    def get_norm_buffer(
+        self,
+        n_fft: int,
+        hop_length: int,
+        win_length: int,
+        window: mx.array,
+        num_frames: int,
+        eps: float = 1e-10,
+    ):
+        """Get cached normalization buffer or create new one"""
 
-        return self.norm_buffer_cache[key]
+        def build():
+            window_sum = self.get_window_sum(window, hop_length, num_frames)
+            return mx.maximum(window_sum, eps)
+
+        key = (
+            "norm",
+            self.window_key(window),
+            n_fft,
+            hop_length,
+            win_length,
+            num_frames,
+            eps,
+        )
+        return self._get(key, build)
 
     def istft(
         self,
@@ -357,6 +461,7 @@ class ISTFTCache:
         window: mx.array,
         center: bool = True,
         audio_length: int = None,
+        eps: float = 1e-10,
     ) -> mx.array:
         """
         iSTFT with automatic caching and vectorized overlap-add.
@@ -370,14 +475,13 @@ class ISTFTCache:
             window: Window function
             center: If True, remove center padding
             audio_length: Target audio length
+            eps: Floor of the window normalization
 
         Returns:
             Reconstructed audio (batch, samples)
         """
         # Window padding safety check
-        if window.shape[0] < n_fft:
-            pad = n_fft - window.shape[0]
-            window = mx.concatenate([window, mx.zeros((pad,), dtype=window.dtype)])
+        window = self.padded_window(window, n_fft)
 
         # Inverse FFT
         stft_complex = real_part + 1j * imag_part
@@ -391,7 +495,7 @@ class ISTFTCache:
 
         # Get cached items
         norm_buffer = self.get_norm_buffer(
-            n_fft, hop_length, win_length, window, num_frames
+            n_fft, hop_length, win_length, window, num_frames, eps
         )
         positions_flat = self.get_positions(num_frames, frame_length, hop_length)
 
@@ -418,17 +522,284 @@ class ISTFTCache:
 
     def clear_cache(self):
         """Clear all cached data to free memory"""
-        self.norm_buffer_cache.clear()
-        self.position_cache.clear()
+        with self._lock:
+            self._entries.clear()
+            self._window_keys.clear()
+            self._padded_windows.clear()
+            self._bytes = 0
 
     def cache_info(self):
         """Get information about cached items"""
-        return {
-            "norm_buffers": len(self.norm_buffer_cache),
-            "position_indices": len(self.position_cache),
-            "total_cached_items": len(self.norm_buffer_cache)
-            + len(self.position_cache),
-        }
+        with self._lock:
+            kinds = [key[0] for key in self._entries]
+            return {
+                "norm_buffers": kinds.count("norm"),
+                "window_sums": kinds.count("window_sum"),
+                "position_indices": kinds.count("positions"),
+                "total_cached_items": len(kinds),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_ISTFT_CACHE = ISTFTCache()
+
+
+def get_istft_cache() -> ISTFTCache:
+    """Process-wide iSTFT cache shared by :func:`istft` and model vocoders."""
+    return _ISTFT_CACHE
+
+
+# =============================================================================
+# Polyphase resampling
+# =============================================================================
+
+
+def _rate_ratio(orig_sr: int, target_sr: int):
+    g = math.gcd(int(orig_sr), int(target_sr))
+    return int(target_sr) // g, int(orig_sr) // g
+
+
+@lru_cache(maxsize=32)
+def resample_filter(up: int, down: int) -> np.ndarray:
+    """
+    Anti-aliasing lowpass for resampling by ``up / down``.
+
+    Kaiser-windowed sinc (beta 5.0) with ``20 * max(up, down) + 1`` taps and a
+    cutoff at the lower Nyquist rate, scaled by ``up``. This is the filter
+    ``scipy.signal.resample_poly`` designs by default.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    n = np.arange(2 * half_len + 1) - half_len
+    h = np.sinc(n / max_rate) * np.kaiser(2 * half_len + 1, 5.0)
+    h = h / h.sum() * up
+    h.setflags(write=False)
+    return h
+
+
+@lru_cache(maxsize=32)
+def _polyphase_bank(up: int, down: int) -> np.ndarray:
+    # bank[p, i] = h[p + i * up], reversed along taps for use on input windows
+    h = resample_filter(up, down)
+    taps = -(-len(h) // up)
+    padded = np.zeros(taps * up)
+    padded[: len(h)] = h
+    bank = np.ascontiguousarray(padded.reshape(taps, up).T[:, ::-1])
+    bank.setflags(write=False)
+    return bank
+
+
+@lru_cache(maxsize=32)
+def _strided_banks(up: int, down: int, dtype: mx.Dtype):
+    """
+    The polyphase bank laid out as strided convolutions.
+
+    Output ``q * up + r`` is row ``r`` of a kernel applied to the input window
+    starting at ``q * down + start``, so one conv1d with stride ``down``
+    computes a whole group of phases. Phases are grouped so that the spread
+    of their window offsets stays within about one filter length, which
+    keeps the zero padding in each kernel small.
+
+    Returns:
+        List of (kernel of shape (phases, width, 1), start) per group, in
+        phase order.
+    """
+    bank = _polyphase_bank(up, down)
+    taps = bank.shape[1]
+    half_len = (len(resample_filter(up, down)) - 1) // 2
+    offsets = [(r * down + half_len) // up for r in range(up)]
+    groups = max(1, min(up, round((offsets[-1] - offsets[0]) / taps)))
+    size = -(-up // groups)
+
+    banks = []
+    for first in range(0, up, size):
+        phases = range(first, min(first + size, up))
+        base = offsets[phases[0]]
+        kernel = np.zeros(
+            (len(phases), taps + offsets[phases[-1]] - base, 1), dtype=np.float32
+        )
+        for i, r in enumerate(phases):
+            shift = offsets[r] - base
+            kernel[i, shift : shift + taps, 0] = bank[(r * down + half_len) % up]
+        banks.append((mx.array(kernel, dtype=dtype), base - taps + 1))
+    return banks
+
+
+class StreamingResampler:
+    """
+    Polyphase resampler that keeps its filter state across blocks.
+
+    Feeding a signal block by block through :meth:`process` and then calling
+    :meth:`flush` gives the same samples as resampling it in one go with
+    :func:`resample` (or ``scipy.signal.resample_poly``), while holding only
+    one block and the filter history in memory.
+
+    Args:
+        orig_sr: Sample rate of the input.
+        target_sr: Sample rate of the output.
+        dtype: Floating point dtype of the output blocks.
+        padtype: Signal assumed beyond the edges: "constant" (zeros) or
+            "edge" (the first and last samples repeated).
+
+    Example:
+        >>> resampler = StreamingResampler(44100, 16000)
+        >>> for block in blocks:
+        ...     consume(resampler.process(block))
+        >>> consume(resampler.flush())
+    """
+
+    def __init__(
+        self, orig_sr: int, target_sr: int, dtype=np.float32, padtype="constant"
+    ):
+        if padtype not in ("constant", "edge"):
+            raise ValueError(f"Unsupported padtype: {padtype}")
+        self.orig_sr = orig_sr
+        self.target_sr = target_sr
+        self.dtype = np.dtype(dtype)
+        self.padtype = padtype
+        self.up, self.down = _rate_ratio(orig_sr, target_sr)
+        self.half_len = (len(resample_filter(self.up, self.down)) - 1) // 2
+        self._bank = _polyphase_bank(self.up, self.down).astype(self.dtype)
+        self.taps = self._bank.shape[1]
+        self._buffer = None
+        # Absolute input index of self._buffer[0]; the history starts zeroed
+        self._base = -(self.taps - 1)
+        self._num_in = 0
+        self._num_out = 0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Resample the next block of shape (frames,) or (frames, channels)."""
+        x = np.asarray(x, dtype=self.dtype)
+        if self.up == self.down:
+            self._num_in += len(x)
+            self._num_out += len(x)
+            return x
+        if self._buffer is None:
+            if len(x) == 0:
+                return x
+            history = x[:1] if self.padtype == "edge" else np.zeros_like(x[:1])
+            self._buffer = np.repeat(history, self.taps - 1, axis=0)
+        self._buffer = np.concatenate([self._buffer, x])
+        self._num_in += len(x)
+        # Output n needs input up to (n * down + half_len) // up
+        stop = (self._num_in * self.up - 1 - self.half_len) // self.down + 1
+        return self._emit(stop)
+
+    def flush(self) -> np.ndarray:
+        """Return the samples still held by the filter at the end of the signal."""
+        if self.up == self.down or self._buffer is None:
+            return np.zeros((0,), dtype=self.dtype)
+        stop = -(-self._num_in * self.up // self.down)
+        last = ((stop - 1) * self.down + self.half_len) // self.up
+        pad = max(last - (self._base + len(self._buffer)) + 1, 0)
+        tail = self._buffer[-1:]
+        if self.padtype == "constant":
+            tail = np.zeros_like(tail)
+        self._buffer = np.concatenate([self._buffer, np.repeat(tail, pad, axis=0)])
+        return self._emit(stop)
+
+    def _emit(self, stop: int) -> np.ndarray:
+        start = self._num_out
+        count = max(stop - start, 0)
+        out = np.empty((count,) + self._buffer.shape[1:], dtype=self.dtype)
+        if count:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                self._buffer, self.taps, axis=0
+            )
+            # Outputs n, n + up, n + 2 * up, ... share a filter phase and read
+            # windows that are `down` input samples apart
+            for r in range(min(self.up, count)):
+                m = (start + r) * self.down + self.half_len
+                first = m // self.up - self._base - self.taps + 1
+                n = len(range(r, count, self.up))
+                out[r :: self.up] = (
+                    windows[first : first + (n - 1) * self.down + 1 : self.down]
+                    @ self._bank[m % self.up]
+                )
+            self._num_out = stop
+
+        # Drop the input no later output can reach
+        m = self._num_out * self.down + self.half_len
+        keep = m // self.up - self._base - self.taps + 1
+        if keep > 0:
+            self._buffer = self._buffer[keep:]
+            self._base += keep
+        return out
+
+
+def _resample_mlx(x: mx.array, up: int, down: int, padtype: str) -> mx.array:
+    # x: (batch, frames)
+    n_in = x.shape[1]
+    n_out = -(-n_in * up // down)
+    windows = -(-n_out // up)
+    dtype = x.dtype if mx.issubdtype(x.dtype, mx.floating) else mx.float32
+    banks = _strided_banks(up, down, dtype)
+
+    left = -min(start for _, start in banks)
+    right = max(
+        (windows - 1) * down + start + kernel.shape[1] - n_in for kernel, start in banks
+    )
+    mode = "edge" if padtype == "edge" else "constant"
+    x = mx.pad(x.astype(dtype), [(0, 0), (left, max(right, 0))], mode=mode)
+    x = x[..., None]
+    phases = [
+        mx.conv1d(x[:, left + start :], kernel, stride=down)[:, :windows]
+        for kernel, start in banks
+    ]
+    y = mx.concatenate(phases, axis=-1) if len(phases) > 1 else phases[0]
+    return y.reshape(x.shape[0], -1)[:, :n_out]
+
+
+def resample(
+    x,
+    orig_sr: int,
+    target_sr: int,
+    axis: int = 0,
+    padtype: str = "constant",
+):
+    """
+    Resample audio with a windowed-sinc polyphase filter.
+
+    NumPy arrays are filtered with :class:`StreamingResampler` and MLX arrays
+    with a single strided ``conv1d`` over the same filter bank, so both
+    backends give ``scipy.signal.resample_poly`` results. Every other axis is
+    treated as independent channels or batch entries. Filter banks are
+    cached per rate ratio.
+
+    Args:
+        x: Audio as a NumPy or MLX array.
+        orig_sr: Sample rate of ``x``.
+        target_sr: Sample rate to resample to.
+        axis: Time axis (default 0, as in ``resample_poly``).
+        padtype: "constant" (zeros) or "edge" beyond the signal edges.
+
+    Returns:
+        Resampled array of the same kind, with ``ceil(n * target_sr / orig_sr)``
+        samples along ``axis``.
+    """
+    up, down = _rate_ratio(orig_sr, target_sr)
+    if padtype not in ("constant", "edge"):
+        raise ValueError(f"Unsupported padtype: {padtype}")
+
+    if isinstance(x, mx.array):
+        if up == down:
+            return x
+        moved = mx.moveaxis(x, axis, -1)
+        flat = moved.reshape(-1, moved.shape[-1])
+        y = _resample_mlx(flat, up, down, padtype)
+        return mx.moveaxis(y.reshape(*moved.shape[:-1], -1), -1, axis)
+
+    x = np.asarray(x)
+    if up == down:
+        return x.copy()
+    dtype = x.dtype if x.dtype in (np.float32, np.float64) else np.float64
+    resampler = StreamingResampler(orig_sr, target_sr, dtype=dtype, padtype=padtype)
+    moved = np.moveaxis(x, axis, 0)
+    y = np.concatenate([resampler.process(moved), resampler.flush()])
+    return np.moveaxis(y, 0, axis)
 
 
 # =============================================================================
@@ -458,7 +829,6 @@ def compute_deltas_kaldi(
 
     original_shape = specgram.shape
     specgram = specgram.reshape(-1, original_shape[-1])
-    num_features = specgram.shape[0]
 
     n = (win_length - 1) // 2
     denom = float(n * (n + 1) * (2 * n + 1)) / 3.0
@@ -471,16 +841,13 @@ def compute_deltas_kaldi(
     else:
         padded = mx.pad(specgram, [(0, 0), (n, n)])
 
-    kernel_weights = mx.arange(-n, n + 1, dtype=padded.dtype)
+    # Weighted sum of shifted copies: sum_k k * c_{t+k} for k in [-n, n]
     time_steps = padded.shape[1] - 2 * n
-    output = mx.zeros((num_features, time_steps), dtype=padded.dtype)
-
-    for i in range(time_steps):
-        window = padded[:, i : i + win_length]
-        weighted = window * kernel_weights
-        output[:, i] = mx.sum(weighted, axis=1) / denom
+    output = sum(
+        k * padded[:, n + k : n + k + time_steps] for k in range(-n, n + 1) if k != 0
+    )
 
-    return output.reshape(original_shape)
+    return (output / denom).reshape(original_shape)
 
 
 def mel_scale_kaldi(freq: mx.array) -> mx.array:
@@ -501,26 +868,34 @@ def _next_power_of_2(x: int) -> int:
 def _get_strided_kaldi(
     waveform: mx.array, window_size: int, window_shift: int, snip_edges: bool
 ) -> mx.array:
-    """Extract frames from waveform using strided windowing (Kaldi-style)."""
-    num_samples = waveform.shape[0]
+    """Extract frames from waveform using strided windowing (Kaldi-style).
+
+    A (batch, samples) waveform gives (batch, frames, window_size) frames.
+    """
+    batch_shape = waveform.shape[:-1]
+    num_samples = waveform.shape[-1]
 
     if snip_edges:
         if num_samples < window_size:
-            return mx.zeros((0, 0))
+            return mx.zeros((*batch_shape, 0, 0))
         m = 1 + (num_samples - window_size) // window_shift
     else:
         m = (num_samples + (window_shift // 2)) // window_shift
         pad = window_size // 2 - window_shift // 2
 
         if pad > 0:
-            pad_left = waveform[1 : pad + 1][::-1]
-            pad_right = waveform[-1 : -pad - 1 : -1] if pad > 1 else waveform[-1:0:-1]
-            waveform = mx.concatenate([pad_left, waveform, pad_right])
+            pad_left = waveform[..., 1 : pad + 1][..., ::-1]
+            pad_right = (
+                waveform[..., -1 : -pad - 1 : -1] if pad > 1 else waveform[..., -1:0:-1]
+            )
+            waveform = mx.concatenate([pad_left, waveform, pad_right], axis=-1)
         else:
-            pad_right = waveform[::-1]
-            waveform = mx.concatenate([waveform[-pad:], pad_right])
+            pad_right = waveform[..., ::-1]
+            waveform = mx.concatenate([waveform[..., -pad:], pad_right], axis=-1)
 
-    return mx.as_strided(waveform, shape=(m, window_size), strides=(window_shift, 1))
+    shape = (*batch_shape, m, window_size)
+    strides = (waveform.shape[-1], window_shift, 1)[-len(shape) :]
+    return mx.as_strided(mx.contiguous(waveform), shape=shape, strides=strides)
 
 
 def get_mel_banks_kaldi(
@@ -609,6 +984,72 @@ def compute_fbank_kaldi(
     if waveform.ndim == 2:
         waveform = waveform[0]
 
+    return _fbank_kaldi(
+        waveform,
+        sample_rate=sample_rate,
+        win_len=win_len,
+        win_inc=win_inc,
+        num_mels=num_mels,
+        win_type=win_type,
+        preemphasis=preemphasis,
+        dither=dither,
+        snip_edges=snip_edges,
+        low_freq=low_freq,
+        high_freq=high_freq,
+    )
+
+
+def compute_fbank_kaldi_batch(
+    waveforms: mx.array,
+    sample_rate: int = 48000,
+    win_len: int = 1920,
+    win_inc: int = 384,
+    num_mels: int = 60,
+    win_type: str = "hamming",
+    preemphasis: float = 0.97,
+    dither: float = 1.0,
+    snip_edges: bool = True,
+    low_freq: float = 20.0,
+    high_freq: float = 0.0,
+) -> mx.array:
+    """
+    Compute Kaldi-compatible log mel-filterbank features for equal-length waveforms.
+
+    Takes the same arguments as :func:`compute_fbank_kaldi`, with ``waveforms``
+    of shape (batch, samples).
+
+    Returns:
+        Log mel-filterbank features (batch, time, num_mels)
+    """
+    return _fbank_kaldi(
+        waveforms,
+        sample_rate=sample_rate,
+        win_len=win_len,
+        win_inc=win_inc,
+        num_mels=num_mels,
+        win_type=win_type,
+        preemphasis=preemphasis,
+        dither=dither,
+        snip_edges=snip_edges,
+        low_freq=low_freq,
+        high_freq=high_freq,
+    )
+
+
+def _fbank_kaldi(
+    waveform: mx.array,
+    sample_rate: int,
+    win_len: int,
+    win_inc: int,
+    num_mels: int,
+    win_type: str,
+    preemphasis: float,
+    dither: float,
+    snip_edges: bool,
+    low_freq: float,
+    high_freq: float,
+) -> mx.array:
+    """Log mel-filterbank features of a (..., samples) waveform."""
     frame_length_ms = win_len / sample_rate * 1000
     frame_shift_ms = win_inc / sample_rate * 1000
     window_shift_samples = int(sample_rate * frame_shift_ms * 0.001)
@@ -620,8 +1061,8 @@ def compute_fbank_kaldi(
         waveform, window_size, window_shift_samples, snip_edges
     )
 
-    if strided_input.shape[0] == 0:
-        return mx.zeros((0, num_mels))
+    if strided_input.shape[-2] == 0:
+        return mx.zeros((*waveform.shape[:-1], 0, num_mels))
 
     # Apply dither
     if dither != 0.0:
@@ -629,14 +1070,14 @@ def compute_fbank_kaldi(
         strided_input = strided_input + rand_gauss
 
     # Remove DC offset
-    row_means = mx.mean(strided_input, axis=1, keepdims=True)
+    row_means = mx.mean(strided_input, axis=-1, keepdims=True)
     strided_input = strided_input - row_means
 
     # Apply preemphasis
     if preemphasis != 0.0:
-        first_col = strided_input[:, 0:1]
-        other_cols = strided_input[:, 1:] - preemphasis * strided_input[:, :-1]
-        strided_input = mx.concatenate([first_col, other_cols], axis=1)
+        first_col = strided_input[..., 0:1]
+        other_cols = strided_input[..., 1:] - preemphasis * strided_input[..., :-1]
+        strided_input = mx.concatenate([first_col, other_cols], axis=-1)
 
     # Apply window function
     if win_type == "hamming":
@@ -657,10 +1098,12 @@ def compute_fbank_kaldi(
     # Pad to power of 2
     if padded_window_size != window_size:
         padding = padded_window_size - window_size
-        strided_input = mx.pad(strided_input, [(0, 0), (0, padding)])
+        strided_input = mx.pad(
+            strided_input, [(0, 0)] * (strided_input.ndim - 1) + [(0, padding)]
+        )
 
     # FFT and power spectrum
-    fft_result = mx.fft.rfft(strided_input, n=padded_window_size, axis=1)
+    fft_result = mx.fft.rfft(strided_input, n=padded_window_size, axis=-1)
     spectrum = mx.abs(fft_result) ** 2.0
 
     # Get mel filterbank
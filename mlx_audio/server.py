@@ -7,16 +7,31 @@ It offers an OpenAI-compatible API for Audio completions and model management.
 
 import argparse
 import asyncio
+import concurrent.futures
 import inspect
 import io
 import json
 import os
+import queue
 import subprocess
+import tempfile
+import threading
 import time
 import webbrowser
-from dataclasses import asdict, is_dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, is_dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib.parse import unquote
 
 import mlx.core as mx
@@ -35,10 +50,18 @@ from fastapi import (
 )
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
+from mlx.utils import tree_reduce
 from pydantic import BaseModel
 
+from mlx_audio.audio_io import FFmpegEncoder, WavStreamWriter
 from mlx_audio.audio_io import read as audio_read
 from mlx_audio.audio_io import write as audio_write
+from mlx_audio.tts.batching import (
+    BatchRequest,
+    ContinuousBatchingEngine,
+    SamplingParams,
+    get_batch_engine,
+)
 from mlx_audio.utils import load_model
 
 
@@ -70,22 +93,184 @@ def sanitize_for_json(obj: Any) -> Any:
 
 MLX_AUDIO_NUM_WORKERS = os.getenv("MLX_AUDIO_NUM_WORKERS", "2")
 
+# Default STT input sample rate when a model does not declare its own
+STT_SAMPLE_RATE = 16000
+
+# Size of the blocks used to stream uploaded files into memory
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# STT model modules whose ``generate`` only accepts a file path
+PATH_ONLY_STT_MODELS = {"voxtral"}
+
+
+def model_nbytes(model) -> int:
+    """Return the number of bytes held by a model's parameters."""
+    return tree_reduce(
+        lambda acc, x: acc + x.nbytes if isinstance(x, mx.array) else acc, model, 0
+    )
+
+
+def parse_memory_budget(value: Optional[str]) -> Optional[int]:
+    """Convert a memory budget in GB (e.g. ``"12"`` or ``"7.5"``) to bytes."""
+    if not value:
+        return None
+    try:
+        budget_gb = float(value)
+    except ValueError:
+        raise ValueError(f"Invalid model memory budget: {value!r} (expected GB)")
+    return int(budget_gb * 2**30) if budget_gb > 0 else None
+
 
 class ModelProvider:
-    def __init__(self):
-        self.models: Dict[str, Dict[str, Any]] = {}
+    """Registry of loaded models shared by all request handlers.
+
+    Concurrent requests for a model that is not loaded yet share a single
+    load. Loaded models are tracked by parameter size and, once the memory
+    budget is exceeded, the least recently used ones are evicted. Pinned
+    models are never evicted automatically.
+
+    Args:
+        memory_budget: Maximum bytes of model parameters to keep loaded, or
+            None for no limit.
+        pinned_models: Names of models that must stay loaded once loaded.
+        preload_voices: Voices loaded into the voice cache of models that have
+            one (Kokoro) right after they are loaded.
+        warmup: Call ``warmup()`` on models that define it right after they
+            are loaded, e.g. to compile Kokoro's decoder ahead of requests.
+    """
+
+    def __init__(
+        self,
+        memory_budget: Optional[int] = None,
+        pinned_models: Optional[List[str]] = None,
+        preload_voices: Optional[List[str]] = None,
+        warmup: bool = False,
+    ):
+        self.models: "OrderedDict[str, Any]" = OrderedDict()
+        self.model_bytes: Dict[str, int] = {}
+        self.load_times: Dict[str, float] = {}
+        self.last_used: Dict[str, float] = {}
+        self.memory_budget = memory_budget
+        self.pinned_models = set(pinned_models or [])
+        self.preload_voices = list(preload_voices or [])
+        self.warmup = warmup
         self.lock = asyncio.Lock()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "loads": 0,
+            "load_failures": 0,
+            "evictions": 0,
+            "load_time": 0.0,
+        }
+
+    async def load_model(self, model_name: str):
+        async with self.lock:
+            if model_name in self.models:
+                self.stats["hits"] += 1
+                self._touch(model_name)
+                return self.models[model_name]
+
+            task = self._loading.get(model_name)
+            if task is None:
+                self.stats["misses"] += 1
+                task = asyncio.ensure_future(self._load(model_name))
+                self._loading[model_name] = task
+            else:
+                # Another request is already loading this model
+                self.stats["coalesced"] += 1
+
+        # Shield the shared load so one cancelled request doesn't abort it
+        return await asyncio.shield(task)
+
+    async def _load(self, model_name: str):
+        start = time.perf_counter()
+        try:
+            model = await inference_executor.run(self._load_and_prepare, model_name)
+        except Exception:
+            async with self.lock:
+                self._loading.pop(model_name, None)
+                self.stats["load_failures"] += 1
+            raise
+        elapsed = time.perf_counter() - start
+
+        async with self.lock:
+            self._loading.pop(model_name, None)
+            self.models[model_name] = model
+            self.model_bytes[model_name] = model_nbytes(model)
+            self.load_times[model_name] = elapsed
+            self.stats["loads"] += 1
+            self.stats["load_time"] += elapsed
+            self._touch(model_name)
+            self._evict_if_needed(keep=model_name)
+        return model
+
+    def _load_and_prepare(self, model_name: str):
+        model = load_model(model_name)
+        if self.preload_voices and hasattr(model, "preload_voices"):
+            try:
+                model.preload_voices(self.preload_voices)
+            except Exception as e:
+                # A missing voice must not make the model unavailable
+                print(f"Failed to preload voices for {model_name}: {e}")
+        if self.warmup and callable(getattr(model, "warmup", None)):
+            try:
+                model.warmup()
+            except Exception as e:
+                print(f"Failed to warm up {model_name}: {e}")
+        return model
+
+    def _touch(self, model_name: str):
+        self.models.move_to_end(model_name)
+        self.last_used[model_name] = time.time()
+
+    def _forget(self, model_name: str):
+        del self.models[model_name]
+        self.model_bytes.pop(model_name, None)
+        self.load_times.pop(model_name, None)
+        self.last_used.pop(model_name, None)
+
+    def _evict_if_needed(self, keep: Optional[str] = None):
+        """Evict least recently used models until within the memory budget."""
+        if self.memory_budget is None:
+            return
+
+        evicted = False
+        for model_name in list(self.models):
+            if self.memory_used <= self.memory_budget:
+                break
+            if model_name == keep or model_name in self.pinned_models:
+                continue
+            self._forget(model_name)
+            self.stats["evictions"] += 1
+            evicted = True
 
-    def load_model(self, model_name: str):
-        if model_name not in self.models:
-            self.models[model_name] = load_model(model_name)
+        if evicted:
+            mx.clear_cache()
 
-        return self.models[model_name]
+    @property
+    def memory_used(self) -> int:
+        return sum(self.model_bytes.values())
+
+    async def pin_model(self, model_name: str, pinned: bool = True):
+        async with self.lock:
+            if pinned:
+                self.pinned_models.add(model_name)
+            else:
+                self.pinned_models.discard(model_name)
+                self._evict_if_needed()
+
+    async def set_memory_budget(self, memory_budget: Optional[int]):
+        async with self.lock:
+            self.memory_budget = memory_budget
+            self._evict_if_needed()
 
     async def remove_model(self, model_name: str) -> bool:
         async with self.lock:
             if model_name in self.models:
-                del self.models[model_name]
+                self._forget(model_name)
                 return True
             return False
 
@@ -93,6 +278,334 @@ class ModelProvider:
         async with self.lock:
             return list(self.models.keys())
 
+    async def get_batching_stats(self) -> Dict[str, Any]:
+        """Continuous-batching engine metrics of the loaded models."""
+        async with self.lock:
+            models = list(self.models.items())
+        stats = {}
+        for model_name, model in models:
+            engine = getattr(model, "_batch_engine", None)
+            if isinstance(engine, ContinuousBatchingEngine):
+                stats[model_name] = engine.get_stats()
+        return stats
+
+    async def get_stats(self) -> Dict[str, Any]:
+        async with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "avg_load_time": (
+                    self.stats["load_time"] / self.stats["loads"]
+                    if self.stats["loads"]
+                    else 0.0
+                ),
+                "loading": list(self._loading),
+                "memory_used": self.memory_used,
+                "memory_budget": self.memory_budget,
+                # Least recently used first, i.e. in eviction order
+                "models": [
+                    {
+                        "id": model_name,
+                        "bytes": self.model_bytes.get(model_name, 0),
+                        "load_time": self.load_times.get(model_name),
+                        "last_used": self.last_used.get(model_name),
+                        "pinned": model_name in self.pinned_models,
+                    }
+                    for model_name in self.models
+                ],
+            }
+
+
+class InferenceQueueFull(RuntimeError):
+    """Raised when the inference queue cannot accept more work."""
+
+
+@dataclass
+class InferenceJob:
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    loop: asyncio.AbstractEventLoop
+    future: Optional[asyncio.Future] = None
+    chunks: Optional[asyncio.Queue] = None
+    cleanup: Optional[Callable[[], None]] = None
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class InferenceExecutor:
+    """Runs model work on dedicated threads so the event loop stays responsive.
+
+    Each worker thread owns its own MLX stream on the default device and pulls
+    jobs from a bounded queue. Async handlers either await a single result with
+    :meth:`run` or consume a generator chunk by chunk with :meth:`iterate`.
+    Jobs whose caller has gone away (e.g. the client disconnected) are skipped
+    if still queued, and streamed jobs stop at the next chunk boundary. A
+    streamed job waits once ``max_buffered_chunks`` chunks are waiting to be
+    sent, so a slow client slows the job down instead of buffering its output.
+    That holds up the worker, so work shared between requests (the batched
+    TTS decode) is run as short :meth:`submit` jobs instead of streamed ones.
+
+    A job's ``cleanup`` callback runs on the worker once the job is over,
+    whether it finished, failed, was skipped or was rejected, so resources
+    the job reads (e.g. temporary files) are never released under it.
+
+    Args:
+        num_workers: Number of worker threads (one MLX stream each).
+        max_queue_size: Maximum number of queued jobs before new work is
+            rejected with :class:`InferenceQueueFull`.
+        max_buffered_chunks: Maximum number of chunks of a streamed job
+            waiting to be consumed.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 1,
+        max_queue_size: int = 64,
+        max_buffered_chunks: int = 8,
+    ):
+        self.num_workers = max(1, num_workers)
+        self.max_queue_size = max_queue_size
+        self.max_buffered_chunks = max_buffered_chunks
+        self._queue: "queue.Queue[Optional[InferenceJob]]" = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "active": 0,
+            "wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
+    def configure(
+        self, num_workers: Optional[int] = None, max_queue_size: Optional[int] = None
+    ):
+        """Change the pool settings. Only valid before any job was submitted."""
+        with self._start_lock:
+            if self._threads:
+                raise RuntimeError("Cannot reconfigure a running InferenceExecutor")
+            if num_workers is not None:
+                self.num_workers = max(1, num_workers)
+            if max_queue_size is not None:
+                self.max_queue_size = max_queue_size
+                self._queue = queue.Queue(maxsize=max_queue_size)
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.num_workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"mlx-audio-inference-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _submit(self, job: InferenceJob):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._stats_lock:
+                self.stats["rejected"] += 1
+            self._cleanup(job)
+            raise InferenceQueueFull(
+                f"Inference queue is full ({self.max_queue_size} pending requests)"
+            )
+        with self._stats_lock:
+            self.stats["submitted"] += 1
+
+    def submit(
+        self, fn: Callable, *args, cleanup: Optional[Callable] = None, **kwargs
+    ) -> asyncio.Future:
+        """Queue ``fn(*args, **kwargs)`` and return a future for its result.
+
+        The job is queued immediately, so a full queue is reported by this
+        call. Cancelling the future skips the job if it has not started yet.
+        ``cleanup`` is called on the worker once the job is over.
+        """
+        loop = asyncio.get_running_loop()
+        job = InferenceJob(
+            fn, args, kwargs, loop, future=loop.create_future(), cleanup=cleanup
+        )
+        job.future.add_done_callback(lambda _: job.cancelled.set())
+        self._submit(job)
+        return job.future
+
+    async def run(
+        self, fn: Callable, *args, cleanup: Optional[Callable] = None, **kwargs
+    ):
+        """Run ``fn(*args, **kwargs)`` on a worker thread and await its result.
+
+        ``cleanup`` is called on the worker once the job is over.
+        """
+        return await self.submit(fn, *args, cleanup=cleanup, **kwargs)
+
+    def iterate(
+        self, fn: Callable, *args, cleanup: Optional[Callable] = None, **kwargs
+    ) -> AsyncIterator:
+        """Run the generator ``fn(*args, **kwargs)`` on a worker thread.
+
+        The job is queued immediately (so a full queue is reported before any
+        response is started) and its items are yielded by the returned async
+        iterator. Closing the iterator cancels the job. ``cleanup`` is called
+        on the worker once the job is over.
+        """
+        loop = asyncio.get_running_loop()
+        job = InferenceJob(
+            fn,
+            args,
+            kwargs,
+            loop,
+            chunks=asyncio.Queue(maxsize=self.max_buffered_chunks),
+            cleanup=cleanup,
+        )
+        self._submit(job)
+        return self._drain(job)
+
+    async def _drain(self, job: InferenceJob):
+        try:
+            while True:
+                kind, item = await job.chunks.get()
+                if kind == "item":
+                    yield item
+                elif kind == "error":
+                    raise item
+                else:
+                    return
+        finally:
+            job.cancelled.set()
+
+    def _post(self, job: InferenceJob, kind: str, item: Any = None):
+        if job.chunks is not None:
+            self._put_chunk(job, kind, item)
+            return
+
+        def deliver():
+            if not job.future.done():
+                if kind == "error":
+                    job.future.set_exception(item)
+                else:
+                    job.future.set_result(item)
+
+        try:
+            job.loop.call_soon_threadsafe(deliver)
+        except RuntimeError:
+            # The caller's event loop is closed; nobody is waiting anymore
+            pass
+
+    def _put_chunk(self, job: InferenceJob, kind: str, item: Any):
+        """Queue a chunk of a streamed job, waiting while the buffer is full."""
+        try:
+            put = asyncio.run_coroutine_threadsafe(
+                job.chunks.put((kind, item)), job.loop
+            )
+        except RuntimeError:
+            # The caller's event loop is closed; nobody is waiting anymore
+            return
+        while True:
+            try:
+                put.result(timeout=0.1)
+                return
+            except concurrent.futures.TimeoutError:
+                # Slow consumer: keep waiting unless it went away
+                if job.cancelled.is_set() or job.loop.is_closed():
+                    put.cancel()
+                    return
+            except concurrent.futures.CancelledError:
+                return
+
+    @staticmethod
+    def _cleanup(job: InferenceJob):
+        if job.cleanup is None:
+            return
+        try:
+            job.cleanup()
+        except Exception as e:
+            print(f"Inference job cleanup failed: {e}")
+
+    def _worker(self):
+        stream = mx.new_stream(mx.default_device())
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            wait_time = time.perf_counter() - job.enqueued_at
+            with self._stats_lock:
+                self.stats["wait_time"] += wait_time
+                self.stats["max_wait_time"] = max(
+                    self.stats["max_wait_time"], wait_time
+                )
+                skipped = job.cancelled.is_set()
+                if skipped:
+                    self.stats["cancelled"] += 1
+                else:
+                    self.stats["active"] += 1
+            if skipped:
+                self._cleanup(job)
+                continue
+
+            status = "completed"
+            final = ("done", None)
+            try:
+                with mx.stream(stream):
+                    if job.chunks is None:
+                        final = ("result", job.fn(*job.args, **job.kwargs))
+                    else:
+                        generator = job.fn(*job.args, **job.kwargs)
+                        try:
+                            for item in generator:
+                                if job.cancelled.is_set():
+                                    status = "cancelled"
+                                    break
+                                self._post(job, "item", item)
+                        finally:
+                            close = getattr(generator, "close", None)
+                            if close is not None:
+                                close()
+            except Exception as e:
+                status = "failed"
+                final = ("error", e)
+            finally:
+                self._cleanup(job)
+                with self._stats_lock:
+                    self.stats["active"] -= 1
+                    self.stats[status] += 1
+            # Only report back once the job is fully over
+            self._post(job, *final)
+
+    def shutdown(self):
+        """Stop the worker threads once the queued jobs are done."""
+        with self._start_lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            started = (
+                self.stats["completed"] + self.stats["failed"] + self.stats["active"]
+            )
+            started += self.stats["cancelled"]
+            return {
+                **self.stats,
+                "workers": self.num_workers,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_size": self.max_queue_size,
+                "avg_wait_time": self.stats["wait_time"] / started if started else 0.0,
+            }
+
 
 app = FastAPI()
 
@@ -183,8 +696,38 @@ class TranscriptionRequest(BaseModel):
     text: str | None = None
 
 
-# Initialize the ModelProvider
-model_provider = ModelProvider()
+# Initialize the ModelProvider. ``MLX_AUDIO_MODEL_MEMORY_BUDGET`` (in GB) caps
+# the parameter memory of loaded models and ``MLX_AUDIO_PINNED_MODELS`` is a
+# comma-separated list of models that are never evicted.
+# ``MLX_AUDIO_PRELOAD_VOICES`` is a space-separated list of voices (blends use
+# commas, e.g. ``af_heart af_bella,af_jessica``) cached when a model loads.
+# ``MLX_AUDIO_WARMUP=1`` warms up (e.g. compiles) models as they are loaded.
+# ``MLX_AUDIO_CONDS_CACHE_DIR`` keeps Chatterbox speaker conditionals on disk so
+# they survive restarts.
+pinned_models_env = os.getenv("MLX_AUDIO_PINNED_MODELS")
+model_provider = ModelProvider(
+    memory_budget=parse_memory_budget(os.getenv("MLX_AUDIO_MODEL_MEMORY_BUDGET")),
+    pinned_models=(
+        [name.strip() for name in pinned_models_env.split(",") if name.strip()]
+        if pinned_models_env
+        else None
+    ),
+    preload_voices=os.getenv("MLX_AUDIO_PRELOAD_VOICES", "").split(),
+    warmup=os.getenv("MLX_AUDIO_WARMUP", "0") == "1",
+)
+
+# Initialize the InferenceExecutor that runs all model work off the event loop.
+# ``MLX_AUDIO_INFERENCE_WORKERS`` sets the number of worker threads (one MLX
+# stream each) and ``MLX_AUDIO_INFERENCE_QUEUE_SIZE`` bounds pending requests.
+inference_executor = InferenceExecutor(
+    num_workers=int(os.getenv("MLX_AUDIO_INFERENCE_WORKERS", "1")),
+    max_queue_size=int(os.getenv("MLX_AUDIO_INFERENCE_QUEUE_SIZE", "64")),
+)
+
+# Concurrent TTS requests on models with a continuous-batching engine (Qwen3-TTS,
+# Llama/Orpheus) share one decode step. ``MLX_AUDIO_TTS_MAX_BATCH_SIZE`` caps the
+# number of sequences per step; 0 runs every request through ``generate``.
+tts_max_batch_size = int(os.getenv("MLX_AUDIO_TTS_MAX_BATCH_SIZE", "8"))
 
 
 @app.get("/")
@@ -213,18 +756,53 @@ async def list_models():
     return {"object": "list", "data": models_data}
 
 
+@app.get("/v1/models/stats")
+async def model_stats():
+    """
+    Get model registry metrics: cache hits and misses, load times,
+    evictions and the memory held by each loaded model.
+    """
+    return sanitize_for_json(await model_provider.get_stats())
+
+
+@app.get("/v1/inference/stats")
+async def inference_stats():
+    """
+    Get inference executor metrics: queue depth, active jobs and the time
+    requests spent waiting for a worker.
+    """
+    return sanitize_for_json(inference_executor.get_stats())
+
+
+@app.get("/v1/audio/speech/stats")
+async def speech_batching_stats():
+    """
+    Get continuous-batching metrics of the loaded TTS models: queued and
+    active sequences, average batch size and aggregate tokens/sec.
+    """
+    return sanitize_for_json(
+        {
+            "max_batch_size": tts_max_batch_size,
+            "models": await model_provider.get_batching_stats(),
+        }
+    )
+
+
 @app.post("/v1/models")
-async def add_model(model_name: str):
+async def add_model(model_name: str, pin: bool = False):
     """
     Add a new model to the API.
 
     Args:
         model_name (str): The name of the model to add.
+        pin (bool): Keep the model loaded regardless of the memory budget.
 
     Returns:
         dict (dict): A dictionary containing the status of the operation.
     """
-    model_provider.load_model(model_name)
+    if pin:
+        await model_provider.pin_model(model_name)
+    await model_provider.load_model(model_name)
     return {"status": "success", "message": f"Model {model_name} added successfully"}
 
 
@@ -250,14 +828,54 @@ async def remove_model(model_name: str):
         raise HTTPException(status_code=404, detail=f"Model '{model_name}' not found")
 
 
-async def generate_audio(model, payload: SpeechRequest):
-    # Load reference audio if provided
+def encode_audio(audio, sample_rate: int, response_format: str) -> bytes:
+    buffer = io.BytesIO()
+    audio_write(buffer, audio, sample_rate, format=response_format)
+    return buffer.getvalue()
+
+
+class AudioStreamEncoder:
+    """Encode the successive results of one response as a single stream.
+
+    WAV responses are one header with an unknown length followed by the PCM
+    of every result. MP3, FLAC and AAC responses pipe every result through
+    one ffmpeg process, started with the first result. Other formats encode
+    each result as a complete file.
+    """
+
+    def __init__(self, response_format: str):
+        self.response_format = response_format
+        self._writer = None
+
+    def encode(self, audio, sample_rate: int) -> bytes:
+        if self._writer is None:
+            if self.response_format == "wav":
+                self._writer = WavStreamWriter(sample_rate)
+            elif self.response_format in ("mp3", "flac", "aac"):
+                self._writer = FFmpegEncoder(sample_rate, format=self.response_format)
+            else:
+                return encode_audio(audio, sample_rate, self.response_format)
+        return self._writer.encode(audio)
+
+    def close(self) -> bytes:
+        """Finish the stream and return any bytes still held by the encoder."""
+        if isinstance(self._writer, FFmpegEncoder):
+            return self._writer.close()
+        return b""
+
+    def abort(self):
+        """Release the encoder of a response that ended early."""
+        if isinstance(self._writer, FFmpegEncoder):
+            self._writer.abort()
+
+
+def synthesize_audio(model, payload: SpeechRequest):
+    """Generator that runs TTS generation and yields encoded audio chunks.
+
+    Runs on an inference worker thread; see :func:`generate_audio`.
+    """
     ref_audio = payload.ref_audio
     if ref_audio and isinstance(ref_audio, str):
-        if not os.path.exists(ref_audio):
-            raise HTTPException(
-                status_code=400, detail=f"Reference audio file not found: {ref_audio}"
-            )
         # Import load_audio from generate module
         from mlx_audio.tts.generate import load_audio
 
@@ -268,7 +886,8 @@ async def generate_audio(model, payload: SpeechRequest):
             ref_audio, sample_rate=model.sample_rate, volume_normalize=normalize
         )
 
-    for result in model.generate(
+    encoder = AudioStreamEncoder(payload.response_format)
+    results = model.generate(
         payload.input,
         voice=payload.voice,
         speed=payload.speed,
@@ -283,19 +902,156 @@ async def generate_audio(model, payload: SpeechRequest):
         top_k=payload.top_k,
         repetition_penalty=payload.repetition_penalty,
         verbose=payload.verbose,
-    ):
+    )
+    try:
+        for result in results:
+            chunk = encoder.encode(result.audio, result.sample_rate)
+            if chunk:
+                yield chunk
+        tail = encoder.close()
+        if tail:
+            yield tail
+    finally:
+        encoder.abort()
 
-        sample_rate = result.sample_rate
-        buffer = io.BytesIO()
-        audio_write(buffer, result.audio, sample_rate, format=payload.response_format)
-        buffer.seek(0)
-        yield buffer.getvalue()
+
+def batch_engine_for(model, payload: SpeechRequest):
+    """Return the continuous-batching engine for ``model`` if ``payload`` can use it.
+
+    Voice cloning requests keep the per-request ``generate`` path.
+    """
+    if payload.ref_audio or tts_max_batch_size < 1:
+        return None
+    return get_batch_engine(model, max_batch_size=tts_max_batch_size)
+
+
+async def wait_for_segment(
+    engine: ContinuousBatchingEngine,
+    request: BatchRequest,
+    driver: Optional[asyncio.Future] = None,
+):
+    """Return the result of ``request``, driving the shared batch meanwhile.
+
+    ``driver`` is an executor job stepping the batch until ``request`` is
+    done; one is queued if not given. Jobs queued for other requests step
+    the same batch, so the result is taken from the request's own future
+    as soon as any of them finishes it.
+    """
+    if request.done():
+        if driver is not None:
+            driver.cancel()
+        return request.result()
+    if driver is None:
+        driver = inference_executor.submit(engine.drive, request)
+    segment = asyncio.wrap_future(request.future)
+    try:
+        await asyncio.wait([segment, driver], return_when=asyncio.FIRST_COMPLETED)
+        if not segment.done():
+            # Re-raise a failed job; otherwise it only returns once done
+            driver.result()
+    finally:
+        driver.cancel()
+    return request.result()
+
+
+async def stream_batched_audio(
+    engine: ContinuousBatchingEngine,
+    requests: List[BatchRequest],
+    driver: Optional[asyncio.Future],
+    response_format: str,
+):
+    """Stream the encoded audio of ``requests`` in segment order.
+
+    Segments are decoded by executor jobs that each step the shared batch
+    (``driver`` is the one already queued for the first segment), and their
+    audio is encoded off the event loop. A client that reads slowly only
+    holds back its own response: no executor job waits on it.
+    """
+    encoder = AudioStreamEncoder(response_format)
+    try:
+        for request in requests:
+            result = await wait_for_segment(engine, request, driver)
+            driver = None
+            if result is None:
+                continue
+            chunk = await asyncio.to_thread(
+                encoder.encode, result.audio, result.sample_rate
+            )
+            if chunk:
+                yield chunk
+        tail = await asyncio.to_thread(encoder.close)
+        if tail:
+            yield tail
+    finally:
+        if driver is not None:
+            driver.cancel()
+        # Client went away or a segment failed: free the remaining batch slots
+        engine.cancel(requests)
+        encoder.abort()
+
+
+def generate_audio(model, payload: SpeechRequest) -> AsyncIterator[bytes]:
+    """Queue TTS generation and stream its encoded chunks.
+
+    Models with a continuous-batching engine join the shared batched decode,
+    which is driven by inference executor jobs; everything else runs
+    ``model.generate`` on the inference executor. Either way a full executor
+    queue rejects the request with 503.
+
+    Batched segments are handed to each request as soon as any job finishes
+    them, so concurrent requests get their audio while sharing one worker.
+    """
+    ref_audio = payload.ref_audio
+    if ref_audio and isinstance(ref_audio, str) and not os.path.exists(ref_audio):
+        raise HTTPException(
+            status_code=400, detail=f"Reference audio file not found: {ref_audio}"
+        )
+
+    engine = batch_engine_for(model, payload)
+    if engine is not None:
+        if payload.speed is not None and payload.speed != 1.0:
+            raise HTTPException(
+                status_code=400,
+                detail="speed is not supported with continuous batching",
+            )
+        params = SamplingParams(
+            temperature=payload.temperature or 0.0,
+            top_k=payload.top_k or 0,
+            top_p=payload.top_p or 1.0,
+            repetition_penalty=payload.repetition_penalty or 1.0,
+        )
+        try:
+            requests = engine.submit_text(
+                payload.input,
+                params,
+                voice=payload.voice,
+                instruct=payload.instruct,
+                lang_code=payload.lang_code,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            # Queue the first job now so a full queue is a 503, not a broken stream
+            driver = (
+                inference_executor.submit(engine.drive, requests[0])
+                if requests
+                else None
+            )
+        except InferenceQueueFull as e:
+            engine.cancel(requests)
+            raise HTTPException(status_code=503, detail=str(e))
+        return stream_batched_audio(engine, requests, driver, payload.response_format)
+
+    try:
+        return inference_executor.iterate(synthesize_audio, model, payload)
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @app.post("/v1/audio/speech")
 async def tts_speech(payload: SpeechRequest):
     """Generate speech audio following the OpenAI text-to-speech API."""
-    model = model_provider.load_model(payload.model)
+    model = await model_provider.load_model(payload.model)
     return StreamingResponse(
         generate_audio(model, payload),
         media_type=f"audio/{payload.response_format}",
@@ -305,36 +1061,121 @@ async def tts_speech(payload: SpeechRequest):
     )
 
 
-def generate_transcription_stream(stt_model, tmp_path: str, gen_kwargs: dict):
-    """Generator that yields transcription chunks and cleans up temp file."""
-    try:
-        # Call generate with stream=True (models handle streaming internally)
-        result = stt_model.generate(tmp_path, **gen_kwargs)
-
-        # Check if result is a generator (streaming mode)
-        if hasattr(result, "__iter__") and hasattr(result, "__next__"):
-            accumulated_text = ""
-            for chunk in result:
-                # Handle different chunk types (string tokens vs structured chunks)
-                if isinstance(chunk, str):
-                    accumulated_text += chunk
-                    chunk_data = {"text": chunk, "accumulated": accumulated_text}
-                else:
-                    # Structured chunk (e.g., Whisper streaming)
-                    chunk_data = {
-                        "text": chunk.text,
-                        "start": getattr(chunk, "start_time", None),
-                        "end": getattr(chunk, "end_time", None),
-                        "is_final": getattr(chunk, "is_final", None),
-                        "language": getattr(chunk, "language", None),
-                    }
-                yield json.dumps(sanitize_for_json(chunk_data)) + "\n"
-        else:
-            # Not a generator, yield the full result
-            yield json.dumps(sanitize_for_json(result)) + "\n"
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+def stt_sample_rate(stt_model) -> int:
+    """Return the input sample rate expected by an STT model."""
+    for owner in (
+        stt_model,
+        getattr(stt_model, "preprocessor_config", None),
+        getattr(stt_model, "config", None),
+    ):
+        sample_rate = getattr(owner, "sample_rate", None)
+        if isinstance(sample_rate, int):
+            return sample_rate
+    return STT_SAMPLE_RATE
+
+
+def accepts_array_input(stt_model) -> bool:
+    """Check whether an STT model's ``generate`` can take a waveform array."""
+    module_parts = type(stt_model).__module__.split(".")
+    return not any(part in PATH_ONLY_STT_MODELS for part in module_parts)
+
+
+async def read_upload(
+    file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> bytearray:
+    """Stream an uploaded file into a single preallocated buffer.
+
+    The buffer is sized from the upload's reported size and only grows
+    (geometrically) when the client did not report one or under-reported it.
+    """
+    buffer = bytearray(file.size or 0)
+    offset = 0
+    while chunk := await file.read(chunk_size):
+        end = offset + len(chunk)
+        if end > len(buffer):
+            buffer.extend(bytes(max(end - len(buffer), len(buffer))))
+        buffer[offset:end] = chunk
+        offset = end
+    del buffer[offset:]
+    return buffer
+
+
+def prepare_stt_input(
+    stt_model, audio: np.ndarray, sample_rate: int
+) -> Tuple[Union[mx.array, str], Optional[str]]:
+    """Turn a decoded waveform into the input for ``stt_model.generate``.
+
+    Models that accept arrays get a mono float32 ``mx.array`` resampled to
+    their input rate, without touching the filesystem. Other models get the
+    path of a temporary WAV file, which is returned as the second element so
+    the caller can remove it once transcription is done.
+
+    Args:
+        stt_model: The loaded STT model.
+        audio: Waveform with shape (samples,) or (samples, channels).
+        sample_rate: Sample rate of ``audio`` in Hz.
+
+    Returns:
+        Tuple of (model input, temporary file path or None).
+    """
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+
+    if not accepts_array_input(stt_model):
+        fd, tmp_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        audio_write(tmp_path, audio, sample_rate, format="wav")
+        return tmp_path, tmp_path
+
+    target_sr = stt_sample_rate(stt_model)
+    if sample_rate != target_sr:
+        from mlx_audio.stt.utils import resample_audio
+
+        audio = resample_audio(audio, sample_rate, target_sr)
+    return mx.array(audio, dtype=mx.float32), None
+
+
+def decode_stt_upload(
+    stt_model, data: bytearray
+) -> Tuple[Union[mx.array, str], Optional[str]]:
+    """Decode uploaded audio bytes into the input for ``stt_model.generate``."""
+    audio, sr = audio_read(io.BytesIO(data), always_2d=False, dtype="float32")
+    return prepare_stt_input(stt_model, audio, sr)
+
+
+def remove_temp_file(tmp_path: Optional[str]):
+    if tmp_path is not None and os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+
+def generate_transcription_stream(
+    stt_model, audio: Union[mx.array, str], gen_kwargs: dict
+):
+    """Generator that yields transcription chunks as NDJSON lines."""
+    # Call generate with stream=True (models handle streaming internally)
+    result = stt_model.generate(audio, **gen_kwargs)
+
+    # Check if result is a generator (streaming mode)
+    if hasattr(result, "__iter__") and hasattr(result, "__next__"):
+        accumulated_text = ""
+        for chunk in result:
+            # Handle different chunk types (string tokens vs structured chunks)
+            if isinstance(chunk, str):
+                accumulated_text += chunk
+                chunk_data = {"text": chunk, "accumulated": accumulated_text}
+            else:
+                # Structured chunk (e.g., Whisper streaming)
+                chunk_data = {
+                    "text": chunk.text,
+                    "start": getattr(chunk, "start_time", None),
+                    "end": getattr(chunk, "end_time", None),
+                    "is_final": getattr(chunk, "is_final", None),
+                    "language": getattr(chunk, "language", None),
+                }
+            yield json.dumps(sanitize_for_json(chunk_data)) + "\n"
+    else:
+        # Not a generator, yield the full result
+        yield json.dumps(sanitize_for_json(result)) + "\n"
 
 
 @app.post("/v1/audio/transcriptions")
@@ -366,14 +1207,12 @@ async def stt_transcriptions(
         text=text,
     )
 
-    data = await file.read()
-    tmp = io.BytesIO(data)
-    audio, sr = audio_read(tmp, always_2d=False)
-    tmp.close()
-    tmp_path = f"/tmp/{time.time()}.mp3"
-    audio_write(tmp_path, audio, sr)
+    data = await read_upload(file)
+    stt_model = await model_provider.load_model(payload.model)
 
-    stt_model = model_provider.load_model(payload.model)
+    # Decoding and resampling are CPU-bound, keep them off the event loop
+    stt_input, tmp_path = await asyncio.to_thread(decode_stt_upload, stt_model, data)
+    del data
 
     # Build kwargs for generate, filtering None values
     gen_kwargs = payload.model_dump(exclude={"model"}, exclude_none=True)
@@ -382,10 +1221,19 @@ async def stt_transcriptions(
     signature = inspect.signature(stt_model.generate)
     gen_kwargs = {k: v for k, v in gen_kwargs.items() if k in signature.parameters}
 
-    return StreamingResponse(
-        generate_transcription_stream(stt_model, tmp_path, gen_kwargs),
-        media_type="application/x-ndjson",
-    )
+    # The temp file is removed by the worker once inference is over
+    try:
+        chunks = inference_executor.iterate(
+            generate_transcription_stream,
+            stt_model,
+            stt_input,
+            gen_kwargs,
+            cleanup=partial(remove_temp_file, tmp_path),
+        )
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
 
 
 @app.websocket("/v1/audio/transcriptions/realtime")
@@ -408,7 +1256,7 @@ async def stt_realtime_transcriptions(websocket: WebSocket):
 
         # Load the STT model
         print("Loading STT model...")
-        stt_model = model_provider.load_model(model_name)
+        stt_model = await model_provider.load_model(model_name)
         print("STT model loaded successfully")
 
         # Initialize WebRTC VAD for speech detection
@@ -545,18 +1393,20 @@ async def stt_realtime_transcriptions(websocket: WebSocket):
                     processed_samples = process_size
                     initial_chunk_processed = True
 
-                    # Save to temporary file for processing
-                    tmp_path = f"/tmp/realtime_initial_{time.time()}.mp3"
-                    audio_write(tmp_path, audio_array, sample_rate)
+                    stt_input, tmp_path = await asyncio.to_thread(
+                        prepare_stt_input, stt_model, audio_array, sample_rate
+                    )
 
                     try:
                         # Generate transcription for initial chunk
-                        result = stt_model.generate(
-                            tmp_path,
+                        result = await inference_executor.run(
+                            stt_model.generate,
+                            stt_input,
                             language=(
                                 language if language and language != "Detect" else None
                             ),
                             verbose=False,
+                            cleanup=partial(remove_temp_file, tmp_path),
                         )
 
                         print(f"Initial transcription: {result.text[:100]}...")
@@ -589,10 +1439,6 @@ async def stt_realtime_transcriptions(websocket: WebSocket):
                         await websocket.send_json(
                             {"error": error_msg, "status": "error"}
                         )
-                    finally:
-                        # Clean up temp file
-                        if os.path.exists(tmp_path):
-                            os.remove(tmp_path)
 
                 # Process final chunk (entire accumulated buffer)
                 if should_process_final and len(audio_buffer) > 0:
@@ -600,19 +1446,21 @@ async def stt_realtime_transcriptions(websocket: WebSocket):
                     process_size = len(audio_buffer)
                     audio_array = np.array(audio_buffer)
 
-                    # Save to temporary file for processing
-                    tmp_path = f"/tmp/realtime_{time.time()}.mp3"
-                    audio_write(tmp_path, audio_array, sample_rate)
+                    stt_input, tmp_path = await asyncio.to_thread(
+                        prepare_stt_input, stt_model, audio_array, sample_rate
+                    )
 
                     try:
                         # Generate transcription
 
-                        result = stt_model.generate(
-                            tmp_path,
+                        result = await inference_executor.run(
+                            stt_model.generate,
+                            stt_input,
                             language=(
                                 language if language and language != "Detect" else None
                             ),
                             verbose=False,
+                            cleanup=partial(remove_temp_file, tmp_path),
                         )
 
                         print(f"Transcription result: {result.text[:100]}...")
@@ -654,10 +1502,6 @@ async def stt_realtime_transcriptions(websocket: WebSocket):
                         await websocket.send_json(
                             {"error": error_msg, "status": "error"}
                         )
-                    finally:
-                        # Clean up temp file
-                        if os.path.exists(tmp_path):
-                            os.remove(tmp_path)
 
             elif "text" in message:
                 # JSON message received (e.g., stop command)
@@ -804,6 +1648,56 @@ def main():
         default="logs",
         help="Directory to save server logs",
     )
+    parser.add_argument(
+        "--model-memory-budget",
+        type=float,
+        default=None,
+        help="""Maximum memory (in GB) of model parameters to keep loaded.
+        Least recently used models are evicted once it is exceeded.
+        Overrides the `MLX_AUDIO_MODEL_MEMORY_BUDGET` env variable.""",
+    )
+    parser.add_argument(
+        "--pin-models",
+        nargs="+",
+        default=None,
+        help="Models that are never evicted once loaded",
+    )
+    parser.add_argument(
+        "--preload-voices",
+        nargs="+",
+        default=None,
+        help="""Voices (or comma-separated blends) to cache as soon as a model with
+        a voice cache, such as Kokoro, is loaded. Overrides the
+        `MLX_AUDIO_PRELOAD_VOICES` env variable.""",
+    )
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="""Warm up models as they are loaded, e.g. compile Kokoro's decoder for
+        its common input lengths. Same as setting `MLX_AUDIO_WARMUP=1`.""",
+    )
+    parser.add_argument(
+        "--inference-workers",
+        type=int,
+        default=None,
+        help="""Number of inference threads per server worker, each with its own
+        MLX stream. Overrides the `MLX_AUDIO_INFERENCE_WORKERS` env variable.""",
+    )
+    parser.add_argument(
+        "--inference-queue-size",
+        type=int,
+        default=None,
+        help="""Maximum number of pending inference requests before new ones are
+        rejected with 503. Overrides the `MLX_AUDIO_INFERENCE_QUEUE_SIZE` env variable.""",
+    )
+    parser.add_argument(
+        "--tts-max-batch-size",
+        type=int,
+        default=None,
+        help="""Maximum number of concurrent TTS requests decoded together on models
+        that support continuous batching; 0 disables batching. Overrides the
+        `MLX_AUDIO_TTS_MAX_BATCH_SIZE` env variable.""",
+    )
 
     args = parser.parse_args()
     if isinstance(args.workers, float):
@@ -811,6 +1705,33 @@ def main():
 
     setup_cors(app, args.allowed_origins)
 
+    # Worker processes re-import this module, so pass registry settings via env
+    if args.model_memory_budget is not None:
+        os.environ["MLX_AUDIO_MODEL_MEMORY_BUDGET"] = str(args.model_memory_budget)
+        model_provider.memory_budget = parse_memory_budget(
+            str(args.model_memory_budget)
+        )
+    if args.pin_models:
+        os.environ["MLX_AUDIO_PINNED_MODELS"] = ",".join(args.pin_models)
+        model_provider.pinned_models.update(args.pin_models)
+    if args.preload_voices:
+        os.environ["MLX_AUDIO_PRELOAD_VOICES"] = " ".join(args.preload_voices)
+        model_provider.preload_voices = list(args.preload_voices)
+    if args.warmup:
+        os.environ["MLX_AUDIO_WARMUP"] = "1"
+        model_provider.warmup = True
+    if args.inference_workers is not None:
+        os.environ["MLX_AUDIO_INFERENCE_WORKERS"] = str(args.inference_workers)
+    if args.inference_queue_size is not None:
+        os.environ["MLX_AUDIO_INFERENCE_QUEUE_SIZE"] = str(args.inference_queue_size)
+    inference_executor.configure(
+        num_workers=args.inference_workers, max_queue_size=args.inference_queue_size
+    )
+    if args.tts_max_batch_size is not None:
+        global tts_max_batch_size
+        os.environ["MLX_AUDIO_TTS_MAX_BATCH_SIZE"] = str(args.tts_max_batch_size)
+        tts_max_batch_size = args.tts_max_batch_size
+
     client = MLXAudioStudioServer(start_ui=args.start_ui, log_dir=args.log_dir)
     client.start_server(
         host=args.host,
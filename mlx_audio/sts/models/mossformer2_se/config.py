@@ -22,6 +22,7 @@ class MossFormer2SEConfig:
         chunk_seconds: Chunk duration for chunked mode
         chunk_overlap: Overlap ratio for chunked mode
         auto_chunk_threshold: Auto-enable chunked mode above this duration (seconds)
+        batch_size: Max equal-length windows run through the model at once
     """
 
     # Audio parameters
@@ -45,6 +46,7 @@ class MossFormer2SEConfig:
     chunk_seconds: float = 4.0
     chunk_overlap: float = 0.25
     auto_chunk_threshold: float = 60.0  # Auto-enable chunked mode above 60s
+    batch_size: int = 4  # Caps peak memory of batched window inference
 
     # Model architecture
     in_channels: int = 180  # 3 * num_mels (fbank + delta + delta-delta)
@@ -74,6 +76,7 @@ class MossFormer2SEConfig:
             "chunk_seconds": self.chunk_seconds,
             "chunk_overlap": self.chunk_overlap,
             "auto_chunk_threshold": self.auto_chunk_threshold,
+            "batch_size": self.batch_size,
             "in_channels": self.in_channels,
             "out_channels": self.out_channels,
             "out_channels_final": self.out_channels_final,
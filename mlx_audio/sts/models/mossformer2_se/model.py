@@ -6,7 +6,7 @@ Handles loading, processing, and saving audio for speech enhancement.
 
 import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import mlx.core as mx
 import mlx.nn as nn
@@ -15,9 +15,9 @@ from huggingface_hub import hf_hub_download
 from mlx.utils import tree_unflatten
 
 from mlx_audio.dsp import (
-    ISTFTCache,
     compute_deltas_kaldi,
-    compute_fbank_kaldi,
+    compute_fbank_kaldi_batch,
+    get_istft_cache,
     hamming,
     stft,
 )
@@ -56,7 +56,7 @@ class MossFormer2SEModel:
         """
         self.model = model
         self.config = config
-        self._istft_cache = ISTFTCache()
+        self._istft_cache = get_istft_cache()
         self._window = None
         self._warmed_up = False
 
@@ -161,6 +161,7 @@ class MossFormer2SEModel:
         self,
         audio_input: Union[str, np.ndarray, mx.array],
         chunked: Optional[bool] = None,
+        batch_size: Optional[int] = None,
     ) -> np.ndarray:
         """Enhance audio.
 
@@ -169,211 +170,206 @@ class MossFormer2SEModel:
             chunked: Force chunked processing. If None, auto-selects:
                      - < 60s: Full mode (faster, best quality)
                      - >= 60s: Chunked mode (lower RAM)
+            batch_size: Windows run through the model at once
+                        (default: config.batch_size)
 
         Returns:
             Enhanced audio as numpy array
         """
+        return self.enhance_many([audio_input], chunked, batch_size)[0]
+
+    def enhance_many(
+        self,
+        audio_inputs: List[Union[str, np.ndarray, mx.array]],
+        chunked: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+    ) -> List[np.ndarray]:
+        """Enhance several files or arrays together.
+
+        Equal-length windows from all inputs are stacked and run through the
+        model in shared batches, so bulk jobs keep the GPU busy.
+
+        Args:
+            audio_inputs: Audio file paths or audio arrays
+            chunked: Force chunked processing, see :meth:`enhance`
+            batch_size: Windows run through the model at once
+                        (default: config.batch_size)
+
+        Returns:
+            Enhanced audio as numpy arrays, in input order
+        """
+        audios = [self._load_input(audio_input) for audio_input in audio_inputs]
+        modes = [
+            (
+                chunked
+                if chunked is not None
+                else (
+                    len(audio) / self.config.sample_rate
+                    >= self.config.auto_chunk_threshold
+                )
+            )
+            for audio in audios
+        ]
+        return self._enhance_batch(audios, modes, batch_size)
+
+    def _load_input(self, audio_input: Union[str, np.ndarray, mx.array]) -> np.ndarray:
+        """Load a path or array as mono audio of shape (samples,)."""
         # Load audio if path
         if isinstance(audio_input, str):
             audio_np, sr = load_audio(audio_input, self.config.sample_rate)
         elif isinstance(audio_input, mx.array):
             audio_np = np.array(audio_input)
-            sr = self.config.sample_rate
         else:
             audio_np = audio_input
-            sr = self.config.sample_rate
 
         # Ensure correct shape
-        if audio_np.ndim == 1:
-            audio_np = audio_np.reshape(1, -1)
-        elif audio_np.ndim == 2 and audio_np.shape[0] > audio_np.shape[1]:
+        if audio_np.ndim == 2 and audio_np.shape[0] > audio_np.shape[1]:
             audio_np = audio_np.T
-            audio_np = audio_np[0:1]
-
-        duration = audio_np.shape[1] / self.config.sample_rate
-
-        # Auto-select mode
-        use_chunked = (
-            chunked
-            if chunked is not None
-            else (duration >= self.config.auto_chunk_threshold)
-        )
-
-        # Process
-        if use_chunked:
-            enhanced = self._decode_chunked(audio_np)
-        else:
-            enhanced = self._decode_one_audio(audio_np)
+        if audio_np.ndim == 2:
+            audio_np = audio_np[0]
 
-        return enhanced
+        return audio_np
 
     def _decode_one_audio(self, inputs: np.ndarray) -> np.ndarray:
         """Full audio processing."""
-        if hasattr(inputs, "numpy"):
-            inputs_np = inputs.numpy()
-        else:
-            inputs_np = inputs
-
-        if inputs_np.ndim == 2:
-            inputs_np = inputs_np[0, :]
-
-        input_len = inputs_np.shape[0]
-        original_len = input_len
-        inputs_np = inputs_np * MAX_WAV_VALUE
-
-        window = hamming(self.config.win_len, periodic=False)
-
-        # Check if segmented processing is needed
-        if input_len > self.config.sample_rate * self.config.one_time_decode_length:
-            print(
-                f"  Using segmented processing for {input_len / self.config.sample_rate:.1f}s audio"
-            )
-
-            window_size = int(self.config.sample_rate * self.config.decode_window)
-            stride = int(window_size * 0.75)
-            t = inputs_np.shape[0]
-
-            # Pad input
-            if t < window_size:
-                inputs_np = np.concatenate([inputs_np, np.zeros(window_size - t)], 0)
-            elif t < window_size + stride:
-                padding = window_size + stride - t
-                inputs_np = np.concatenate([inputs_np, np.zeros(padding)], 0)
-            else:
-                if (t - window_size) % stride != 0:
-                    padding = t - (t - window_size) // stride * stride
-                    inputs_np = np.concatenate([inputs_np, np.zeros(padding)], 0)
-
-            audio = mx.array(inputs_np)
-            t = audio.shape[0]
-            output_segments = []
-            output_ranges = []
-            give_up_length = (window_size - stride) // 2
-            current_idx = 0
-
-            while current_idx + window_size <= t:
-                audio_segment = audio[current_idx : current_idx + window_size]
-                output_segment = self._process_chunk(audio_segment, window, window_size)
-                mx.eval(output_segment)
-
-                if current_idx == 0:
-                    output_segments.append(output_segment[:-give_up_length])
-                    output_ranges.append(
-                        (current_idx, current_idx + window_size - give_up_length)
-                    )
-                else:
-                    output_segments.append(
-                        output_segment[give_up_length:-give_up_length]
-                    )
-                    output_ranges.append(
-                        (
-                            current_idx + give_up_length,
-                            current_idx + window_size - give_up_length,
-                        )
-                    )
-
-                current_idx += stride
-
-            outputs_np = np.zeros(t)
-            for segment, (start, end) in zip(output_segments, output_ranges):
-                segment_np = np.array(segment)
-                outputs_np[start:end] = segment_np
-
-            outputs_np = outputs_np[:original_len]
-
-        else:
-            # Process entire audio
-            audio = mx.array(inputs_np)
-            output = self._process_chunk(audio, window, len(audio))
-            mx.eval(output)
-            outputs_np = np.array(output)
-
-        return outputs_np / MAX_WAV_VALUE
+        return self._enhance_batch([self._load_input(inputs)], [False])[0]
 
     def _decode_chunked(self, inputs: np.ndarray) -> np.ndarray:
         """Chunked audio processing with discard-edges reassembly."""
-        if hasattr(inputs, "numpy"):
-            inputs_np = inputs.numpy()
-        else:
-            inputs_np = inputs
-
-        if inputs_np.ndim == 2:
-            inputs_np = inputs_np[0, :]
+        return self._enhance_batch([self._load_input(inputs)], [True])[0]
 
-        original_len = inputs_np.shape[0]
-        inputs_np = inputs_np * MAX_WAV_VALUE
+    def _plan_windows(
+        self, num_samples: int, chunked: bool
+    ) -> Tuple[int, List[Tuple[int, int, int, int]]]:
+        """Split an input into model windows.
 
-        window = hamming(self.config.win_len, periodic=False)
-
-        chunk_samples = int(self.config.sample_rate * self.config.chunk_seconds)
-        overlap_samples = int(chunk_samples * self.config.chunk_overlap)
-        stride = chunk_samples - overlap_samples
-        give_up = overlap_samples // 2
+        Returns:
+            Padded input length and (start, length, keep_start, keep_end)
+            windows, with the kept range relative to the window start.
+        """
+        if chunked:
+            chunk_samples = int(self.config.sample_rate * self.config.chunk_seconds)
+            overlap_samples = int(chunk_samples * self.config.chunk_overlap)
+            stride = chunk_samples - overlap_samples
+            give_up = overlap_samples // 2
+
+            if num_samples <= chunk_samples:
+                return num_samples, [(0, num_samples, 0, num_samples)]
+
+            starts = list(range(0, num_samples - chunk_samples + 1, stride))
+            windows = [
+                (
+                    start,
+                    chunk_samples,
+                    0 if i == 0 else give_up,
+                    chunk_samples - give_up,
+                )
+                for i, start in enumerate(starts)
+            ]
+            current_idx = starts[-1] + stride
+            if current_idx < num_samples:
+                remaining = num_samples - current_idx
+                windows.append((current_idx, remaining, give_up, remaining))
 
-        if original_len <= chunk_samples:
-            audio = mx.array(inputs_np)
-            result = self._process_chunk(audio, window, original_len)
-            return np.array(result) / MAX_WAV_VALUE
+            print(
+                f"  Chunked: {len(starts)} x {self.config.chunk_seconds}s"
+                + (" + partial" if current_idx < num_samples else "")
+            )
+            return num_samples, windows
 
-        num_full_chunks = (original_len - chunk_samples) // stride + 1
-        remaining = original_len - (num_full_chunks - 1) * stride - chunk_samples
-        has_partial = remaining > 0
+        if num_samples <= self.config.sample_rate * self.config.one_time_decode_length:
+            return num_samples, [(0, num_samples, 0, num_samples)]
 
         print(
-            f"  Chunked: {num_full_chunks} x {self.config.chunk_seconds}s"
-            + (f" + partial" if has_partial else "")
+            f"  Using segmented processing for {num_samples / self.config.sample_rate:.1f}s audio"
         )
 
-        chunks = []
-        chunk_starts = []
-        current_idx = 0
-
-        while current_idx + chunk_samples <= original_len:
-            audio_segment = mx.array(
-                inputs_np[current_idx : current_idx + chunk_samples]
+        window_size = int(self.config.sample_rate * self.config.decode_window)
+        stride = int(window_size * 0.75)
+        give_up_length = (window_size - stride) // 2
+
+        # Pad input
+        t = num_samples
+        if t < window_size:
+            t = window_size
+        elif t < window_size + stride:
+            t = window_size + stride
+        elif (t - window_size) % stride != 0:
+            t += t - (t - window_size) // stride * stride
+
+        windows = [
+            (
+                start,
+                window_size,
+                0 if start == 0 else give_up_length,
+                window_size - give_up_length,
             )
-            chunk_result = self._process_chunk(audio_segment, window, chunk_samples)
-            chunks.append(np.array(chunk_result))
-            chunk_starts.append(current_idx)
-            current_idx += stride
-
-        if current_idx < original_len:
-            remaining = original_len - current_idx
-            audio_segment = mx.array(inputs_np[current_idx:])
-            chunk_result = self._process_chunk(audio_segment, window, remaining)
-            chunks.append(np.array(chunk_result))
-            chunk_starts.append(current_idx)
-
-        # Reassemble
-        output = np.zeros(original_len)
-        num_chunks = len(chunks)
-
-        for idx, (chunk, start_idx) in enumerate(zip(chunks, chunk_starts)):
-            chunk_len = len(chunk)
-            is_first = idx == 0
-            is_last = idx == num_chunks - 1
-
-            if is_last and chunk_len < chunk_samples:
-                keep_start = give_up if not is_first else 0
-                keep_end = chunk_len
-            else:
-                keep_start = 0 if is_first else give_up
-                keep_end = chunk_len - give_up
+            for start in range(0, t - window_size + 1, stride)
+        ]
+        return t, windows
 
-            output_start = start_idx + keep_start
-            output_end = min(start_idx + keep_end, original_len)
-            chunk_slice = chunk[keep_start : keep_start + (output_end - output_start)]
-            output[output_start:output_end] = chunk_slice
+    def _enhance_batch(
+        self,
+        audios: List[np.ndarray],
+        chunked: List[bool],
+        batch_size: Optional[int] = None,
+    ) -> List[np.ndarray]:
+        """Enhance inputs by running their equal-length windows in batches.
+
+        Each window keeps only its (keep_start, keep_end) range, which is
+        written into the output on device; the host sees each result once.
+        """
+        batch_size = batch_size or self.config.batch_size
+        window = hamming(self.config.win_len, periodic=False)
 
-        return output / MAX_WAV_VALUE
+        inputs = []
+        outputs = []
+        groups = {}
+        for index, (audio, use_chunked) in enumerate(zip(audios, chunked)):
+            padded_len, windows = self._plan_windows(len(audio), use_chunked)
+            audio = mx.array(audio, dtype=mx.float32) * MAX_WAV_VALUE
+            inputs.append(mx.pad(audio, [(0, padded_len - len(audio))]))
+            outputs.append(mx.zeros((padded_len,), dtype=mx.float32))
+            for start, length, keep_start, keep_end in windows:
+                groups.setdefault(length, []).append(
+                    (index, start, keep_start, keep_end)
+                )
+
+        for length, group in groups.items():
+            for i in range(0, len(group), batch_size):
+                batch = group[i : i + batch_size]
+                segments = mx.stack(
+                    [
+                        inputs[index][start : start + length]
+                        for index, start, _, _ in batch
+                    ]
+                )
+                enhanced = self._process_batch(segments, window)
+                mx.eval(enhanced)
+
+                for row, (index, start, keep_start, keep_end) in enumerate(batch):
+                    outputs[index][start + keep_start : start + keep_end] = enhanced[
+                        row, keep_start:keep_end
+                    ]
+
+        return [
+            np.array(output[: len(audio)] / MAX_WAV_VALUE)
+            for output, audio in zip(outputs, audios)
+        ]
 
     def _process_chunk(
         self, audio_segment: mx.array, window: mx.array, chunk_length: int
     ) -> mx.array:
         """Process a single audio chunk."""
-        # Feature extraction using dsp.py Kaldi functions
-        fbanks = compute_fbank_kaldi(
-            audio_segment,
+        output_segment = self._process_batch(audio_segment[None], window)
+        mx.eval(output_segment)
+
+        return output_segment[0, :chunk_length]
+
+    def _compute_features(self, audio_segments: mx.array) -> mx.array:
+        """Kaldi fbanks with deltas and delta-deltas, (batch, time, 3 * num_mels)."""
+        fbanks = compute_fbank_kaldi_batch(
+            audio_segments,
             sample_rate=self.config.sample_rate,
             win_len=self.config.win_len,
             win_inc=self.config.win_inc,
@@ -381,47 +377,43 @@ class MossFormer2SEModel:
             win_type=self.config.win_type,
             preemphasis=self.config.preemphasis,
         )
-        fbank_transposed = mx.transpose(fbanks, [1, 0])
+        fbank_transposed = mx.transpose(fbanks, [0, 2, 1])
         fbank_delta = compute_deltas_kaldi(fbank_transposed, win_length=5)
         fbank_delta_delta = compute_deltas_kaldi(fbank_delta, win_length=5)
-        fbank_delta = mx.transpose(fbank_delta, [1, 0])
-        fbank_delta_delta = mx.transpose(fbank_delta_delta, [1, 0])
-        fbanks = mx.concatenate([fbanks, fbank_delta, fbank_delta_delta], axis=1)
-        fbanks = mx.expand_dims(fbanks, axis=0)
+        fbank_delta = mx.transpose(fbank_delta, [0, 2, 1])
+        fbank_delta_delta = mx.transpose(fbank_delta_delta, [0, 2, 1])
+        return mx.concatenate([fbanks, fbank_delta, fbank_delta_delta], axis=-1)
 
+    def _process_batch(self, audio_segments: mx.array, window: mx.array) -> mx.array:
+        """Enhance equal-length audio segments (batch, samples)."""
         # Model inference
-        Out_List = self.model(fbanks)
-        pred_mask = Out_List[-1][0]
+        Out_List = self.model(self._compute_features(audio_segments))
+        pred_mask = Out_List[-1]  # (batch, time, freq)
 
-        # STFT - use dsp.stft (returns time, freq complex) and transpose to (freq, time)
+        # STFT - dsp.stft returns (batch, time, freq) complex
         stft_complex = stft(
-            audio_segment,
+            audio_segments,
             self.config.fft_len,
             self.config.win_inc,
             self.config.win_len,
             window,
             center=False,
         )
-        real_part = mx.real(stft_complex).T  # (freq, time)
-        imag_part = mx.imag(stft_complex).T
-
-        # Apply mask
-        pred_mask = mx.transpose(pred_mask, [1, 0])
-        pred_mask = mx.expand_dims(pred_mask, axis=-1)
-        spectrum_real = real_part * pred_mask[:, :, 0]
-        spectrum_imag = imag_part * pred_mask[:, :, 0]
-
-        # iSTFT
-        output_segment = self._istft_cache.istft(
-            spectrum_real.reshape(1, *spectrum_real.shape),
-            spectrum_imag.reshape(1, *spectrum_imag.shape),
+
+        # Apply mask and transpose to (batch, freq, time)
+        spectrum_real = mx.transpose(mx.real(stft_complex) * pred_mask, [0, 2, 1])
+        spectrum_imag = mx.transpose(mx.imag(stft_complex) * pred_mask, [0, 2, 1])
+
+        # iSTFT, zero-filling samples past the last full frame
+        length = audio_segments.shape[-1]
+        output = self._istft_cache.istft(
+            spectrum_real,
+            spectrum_imag,
             self.config.fft_len,
             self.config.win_inc,
             self.config.win_len,
             window,
             center=False,
-            audio_length=chunk_length,
+            audio_length=length,
         )
-        mx.eval(output_segment)
-
-        return output_segment[0]
+        return mx.pad(output, [(0, 0), (0, length - output.shape[-1])])
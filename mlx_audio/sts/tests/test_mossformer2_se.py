@@ -116,6 +116,54 @@ class TestSTFT(unittest.TestCase):
         info = cache.cache_info()
         self.assertEqual(info["total_cached_items"], 0)
 
+    def test_istft_cache_lru_eviction(self):
+        """Test ISTFTCache stays bounded and counts hits, misses and evictions."""
+        from mlx_audio.dsp import ISTFTCache
+
+        cache = ISTFTCache(max_entries=4)
+        for num_frames in range(1, 11):
+            cache.get_positions(num_frames, 64, 16)
+
+        info = cache.cache_info()
+        self.assertEqual(info["position_indices"], 4)
+        self.assertEqual(info["misses"], 10)
+        self.assertEqual(info["evictions"], 6)
+
+        # Most recent entries survive and are served from the cache
+        cache.get_positions(10, 64, 16)
+        self.assertEqual(cache.cache_info()["hits"], 1)
+        cache.get_positions(1, 64, 16)
+        self.assertEqual(cache.cache_info()["misses"], 11)
+
+    def test_istft_cache_reuses_window(self):
+        """Test norm buffers are shared by windows with equal contents."""
+        from mlx_audio.dsp import ISTFTCache, get_istft_cache, hamming
+
+        cache = ISTFTCache()
+        a = cache.get_norm_buffer(64, 16, 64, hamming(64), 8)
+        b = cache.get_norm_buffer(64, 16, 64, hamming(64), 8)
+        self.assertIs(a, b)
+        self.assertEqual(cache.cache_info()["norm_buffers"], 1)
+        self.assertIs(get_istft_cache(), get_istft_cache())
+
+    def test_istft_pads_window_once(self):
+        """Test a short window is padded and fingerprinted only once."""
+        import hashlib
+        from unittest.mock import patch
+
+        from mlx_audio.dsp import get_istft_cache, hamming, istft
+
+        cache = get_istft_cache()
+        cache.clear_cache()
+        window = hamming(48)
+        x = mx.zeros((33, 8), dtype=mx.complex64)
+        with patch("mlx_audio.dsp.hashlib.blake2b", wraps=hashlib.blake2b) as digest:
+            for _ in range(3):
+                mx.eval(istft(x, hop_length=16, win_length=64, window=window))
+        self.assertEqual(digest.call_count, 1)
+        self.assertIs(cache.padded_window(window, 64), cache.padded_window(window, 64))
+        self.assertEqual(cache.padded_window(window, 64).shape, (64,))
+
 
 class TestFeatures(unittest.TestCase):
     """Tests for feature extraction."""
@@ -206,6 +254,98 @@ class TestFeatures(unittest.TestCase):
 
         self.assertEqual(mlx_fbank.shape, tuple(torch_fbank.shape))
 
+    def test_fbank_batch_matches_single(self):
+        """Test compute_fbank_kaldi_batch against per-waveform fbanks."""
+        import numpy as np
+
+        from mlx_audio.dsp import compute_fbank_kaldi, compute_fbank_kaldi_batch
+
+        audio = mx.array(np.random.randn(3, 24000).astype(np.float32))
+        batched = compute_fbank_kaldi_batch(audio, dither=0.0)
+        mx.eval(batched)
+
+        self.assertEqual(batched.shape[0], 3)
+        for i in range(3):
+            single = compute_fbank_kaldi(audio[i], dither=0.0)
+            self.assertTrue(mx.allclose(batched[i], single, atol=1e-5))
+
+    def test_stft_batch_matches_single(self):
+        """Test dsp.stft on a (batch, samples) input."""
+        import numpy as np
+
+        from mlx_audio.dsp import hamming, stft
+
+        window = hamming(1920, periodic=False)
+        audio = mx.array(np.random.randn(2, 48000).astype(np.float32))
+
+        batched = stft(audio, 1920, 384, 1920, window, center=False)
+        mx.eval(batched)
+
+        self.assertEqual(batched.shape, (2, 121, 961))
+        for i in range(2):
+            single = stft(audio[i], 1920, 384, 1920, window, center=False)
+            self.assertTrue(mx.allclose(batched[i], single, atol=1e-4))
+
+
+class TestBatchedEnhancement(unittest.TestCase):
+    """Tests for batched window inference in MossFormer2SEModel."""
+
+    def setUp(self):
+        from mlx_audio.sts.models.mossformer2_se.config import MossFormer2SEConfig
+        from mlx_audio.sts.models.mossformer2_se.model import MossFormer2SEModel
+
+        def model(fbanks):
+            # Stand-in mask that depends on each frame's features
+            mask = mx.sigmoid(fbanks.mean(axis=-1, keepdims=True) / 10)
+            return [mx.broadcast_to(mask, (*fbanks.shape[:2], 961))]
+
+        config = MossFormer2SEConfig(
+            chunk_seconds=1.0,
+            one_time_decode_length=2,
+            decode_window=1,
+            auto_chunk_threshold=3.0,
+        )
+        self.model = MossFormer2SEModel(model, config)
+
+    def test_plan_windows_chunked_covers_input(self):
+        """Kept ranges of chunked windows tile the input without gaps."""
+        num_samples = 48000 * 3 + 500
+        padded_len, windows = self.model._plan_windows(num_samples, chunked=True)
+
+        self.assertEqual(padded_len, num_samples)
+        covered = 0
+        for start, length, keep_start, keep_end in windows:
+            self.assertEqual(start + keep_start, covered)
+            covered = start + keep_end
+        self.assertEqual(covered, num_samples)
+
+    def test_batch_size_does_not_change_output(self):
+        """Batched windows give the same audio as one window at a time."""
+        import numpy as np
+
+        mx.random.seed(0)
+        audio = np.random.randn(48000 * 4 + 777).astype(np.float32) * 0.1
+
+        for chunked in (False, True):
+            mx.random.seed(1)
+            single = self.model.enhance(audio, chunked=chunked, batch_size=1)
+            mx.random.seed(1)
+            batched = self.model.enhance(audio, chunked=chunked, batch_size=8)
+
+            self.assertEqual(single.shape, audio.shape)
+            np.testing.assert_allclose(single, batched, atol=1e-2)
+
+    def test_enhance_many_returns_one_output_per_input(self):
+        """enhance_many keeps input order and lengths."""
+        import numpy as np
+
+        audios = [
+            np.random.randn(n).astype(np.float32) * 0.1 for n in (48000, 30000, 48000)
+        ]
+        outputs = self.model.enhance_many(audios, batch_size=2)
+
+        self.assertEqual([len(o) for o in outputs], [len(a) for a in audios])
+
 
 class TestModelComponents(unittest.TestCase):
     """Tests for model components."""
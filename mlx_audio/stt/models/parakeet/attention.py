@@ -116,7 +116,7 @@ class RelPositionMultiHeadAttention(MultiHeadAttention):
 
         k = k.reshape(batch, k_seq, self.n_head, self.head_dim).transpose(0, 2, 1, 3)
         v = v.reshape(batch, k_seq, self.n_head, self.head_dim).transpose(0, 2, 1, 3)
-        p = p.reshape(batch, pos_len, self.n_head, self.head_dim).transpose(0, 2, 1, 3)
+        p = p.reshape(-1, pos_len, self.n_head, self.head_dim).transpose(0, 2, 1, 3)
 
         if cache is not None:
             k, v = cache.update_and_fetch(k, v)
@@ -76,3 +76,90 @@ def log_mel_spectrogram(x: mx.array, args: PreprocessArgs) -> mx.array:
     normalized_mel = mx.expand_dims(normalized_mel, axis=0)
 
     return normalized_mel.astype(original_dtype)
+
+
+class StreamingLogMel:
+    """Incremental :func:`log_mel_spectrogram` for pushed audio.
+
+    Only frames whose window is complete are computed; the remaining samples
+    wait for the next call. Normalization uses running statistics over all
+    frames seen so far instead of the whole utterance, so memory stays
+    constant however long the stream runs.
+    """
+
+    def __init__(self, args: PreprocessArgs):
+        self.args = args
+        window_fn = STR_TO_WINDOW_FN.get(args.window, None)
+        self.window = (
+            window_fn(args.win_length) if window_fn else hanning(args.win_length)
+        )
+        self.filters = mel_filters(
+            args.sample_rate,
+            args.n_fft,
+            args.features,
+            norm=args.normalize,
+            mel_scale=None,
+        )
+        self.preemph = getattr(args, "preemph", 0.97)
+        self._pad = args.n_fft // 2
+        self._samples = mx.zeros((0,))
+        self._last_sample = None
+        self._started = False
+        self._count = 0
+        self._sum = mx.zeros((args.features,))
+        self._sum_sq = mx.zeros((args.features,))
+
+    def __call__(self, audio: mx.array, flush: bool = False) -> mx.array:
+        """Push samples and return the new normalized frames
+        [1, frames, features]. ``flush`` pads and emits the final frames."""
+        audio = audio.astype(mx.float32)
+        if audio.shape[0] and self.preemph > 0:
+            previous = audio[:1] if self._last_sample is None else self._last_sample
+            shifted = mx.concatenate([previous, audio[:-1]])
+            emphasized = audio - self.preemph * shifted
+            if self._last_sample is None:
+                emphasized = mx.concatenate([audio[:1], emphasized[1:]])
+            self._last_sample = audio[-1:]
+            audio = emphasized
+        samples = mx.concatenate([self._samples, audio])
+
+        # Reflect padding on both ends, like the centered STFT
+        if not self._started:
+            if samples.shape[0] <= self._pad and not flush:
+                self._samples = samples
+                return mx.zeros((1, 0, self.args.features))
+            samples = mx.concatenate([samples[1 : self._pad + 1][::-1], samples])
+            self._started = True
+        if flush:
+            samples = mx.concatenate([samples, samples[-(self._pad + 1) : -1][::-1]])
+
+        n_fft, hop = self.args.n_fft, self.args.hop_length
+        num_frames = max((samples.shape[0] - n_fft) // hop + 1, 0)
+        self._samples = samples[num_frames * hop :]
+        if num_frames == 0:
+            return mx.zeros((1, 0, self.args.features))
+
+        spec = stft(
+            samples[: (num_frames - 1) * hop + n_fft],
+            n_fft,
+            hop,
+            self.args.win_length,
+            self.window,
+            center=False,
+        )
+        x = mx.log(mx.square(mx.abs(spec)) @ self.filters.T + 1e-5)
+
+        # Running statistics over every frame so far
+        self._count += num_frames
+        if self.args.normalize == "per_feature":
+            self._sum = self._sum + x.sum(axis=0)
+            self._sum_sq = self._sum_sq + mx.square(x).sum(axis=0)
+        else:
+            self._sum = self._sum + x.sum()
+            self._sum_sq = self._sum_sq + mx.square(x).sum()
+            self._count += num_frames * (self.args.features - 1)
+        mean = self._sum / self._count
+        std = mx.sqrt(mx.maximum(self._sum_sq / self._count - mean * mean, 0))
+        x = (x - mean) / (std + 1e-5)
+        mx.eval(self._samples, self._sum, self._sum_sq)
+        return mx.expand_dims(x, axis=0)
@@ -0,0 +1,62 @@
+import mlx.core as mx
+
+
+class ConformerCache:
+    """Streaming state of one Conformer block.
+
+    Keeps the attention keys and values of the last ``left_context`` encoder
+    frames and the input tail of the depthwise convolution, so a chunk only
+    attends to and convolves with a bounded history.
+    """
+
+    def __init__(self, left_context: int):
+        self.left_context = left_context
+        self.keys: mx.array | None = None
+        self.values: mx.array | None = None
+        self.conv_state: mx.array | None = None
+
+    @property
+    def offset(self) -> int:
+        """Number of cached frames the next chunk attends to."""
+        return 0 if self.keys is None else self.keys.shape[-2]
+
+    def update_and_fetch(
+        self, keys: mx.array, values: mx.array
+    ) -> tuple[mx.array, mx.array]:
+        """Append a chunk's keys and values [batch, heads, frames, dim] and
+        return them with the cached left context prepended."""
+        if self.keys is not None:
+            keys = mx.concatenate([self.keys, keys], axis=-2)
+            values = mx.concatenate([self.values, values], axis=-2)
+        start = max(keys.shape[-2] - self.left_context, 0)
+        self.keys = keys[..., start:, :]
+        self.values = values[..., start:, :]
+        return keys, values
+
+    def update_conv(self, x: mx.array, padding: int) -> mx.array:
+        """Prepend the last ``padding`` frames of the previous chunk to the
+        depthwise convolution input [batch, frames, channels]."""
+        if self.conv_state is None:
+            self.conv_state = mx.zeros((x.shape[0], padding, x.shape[2]), x.dtype)
+        x = mx.concatenate([self.conv_state, x], axis=1)
+        self.conv_state = x[:, x.shape[1] - padding :]
+        return x
+
+
+class EncoderCache:
+    """Streaming state of a :class:`Conformer`: the unconsumed input frames
+    of each strided subsampling convolution and one :class:`ConformerCache`
+    per block."""
+
+    def __init__(self, num_layers: int, left_context: int):
+        self.subsampling: dict[int, mx.array] = {}
+        self.layers = [ConformerCache(left_context) for _ in range(num_layers)]
+
+    def state(self) -> list[mx.array]:
+        """Arrays to evaluate after each chunk."""
+        arrays = list(self.subsampling.values())
+        for layer in self.layers:
+            arrays += [
+                a for a in (layer.keys, layer.values, layer.conv_state) if a is not None
+            ]
+        return arrays
@@ -9,6 +9,7 @@ from mlx_audio.stt.models.parakeet.attention import (
     RelPositionalEncoding,
     RelPositionMultiHeadAttention,
 )
+from mlx_audio.stt.models.parakeet.cache import ConformerCache, EncoderCache
 
 
 @dataclass
@@ -76,13 +77,19 @@ class Convolution(nn.Module):
             bias=args.use_bias,
         )
 
-    def __call__(self, x: mx.array) -> mx.array:
+    def __call__(self, x: mx.array, cache: ConformerCache | None = None) -> mx.array:
         # x = x.swapaxes(1, 2)
 
         x = self.pointwise_conv1(x)
         x = nn.glu(x, axis=2)  # might make it variable later
 
-        x = self.depthwise_conv(x)
+        if cache is not None:
+            # Left context comes from the previous chunk, the right edge of
+            # the chunk is zero padded
+            padding = self.depthwise_conv.padding
+            x = self.depthwise_conv(cache.update_conv(x, padding))[:, padding:]
+        else:
+            x = self.depthwise_conv(x)
         x = self.batch_norm(x)
         x = self.activation(x)
         x = self.pointwise_conv2(x)
@@ -137,7 +144,7 @@ class ConformerBlock(nn.Module):
             x_norm, x_norm, x_norm, mask=mask, pos_emb=pos_emb, cache=cache
         )
 
-        x += self.conv(self.norm_conv(x))
+        x += self.conv(self.norm_conv(x), cache=cache)
         x += 0.5 * self.feed_forward2(self.norm_feed_forward2(x))
 
         return self.norm_out(x)
@@ -270,6 +277,57 @@ class DwStridingSubsampling(nn.Module):
         x = self.out(x)
         return x, lengths
 
+    def stream(
+        self, x: mx.array, cache: dict[int, mx.array], flush: bool = False
+    ) -> mx.array:
+        """Subsample new mel frames [batch, frames, feat] incrementally.
+
+        Each strided convolution keeps the input frames it could not consume
+        yet in ``cache``, so chunked input produces the same frames as one
+        call over the whole sequence. ``flush`` adds the trailing padding and
+        emits the remaining frames at the end of the stream.
+        """
+        batch = x.shape[0]
+        x = mx.expand_dims(x, axis=-1) if x.shape[1] else None
+
+        for idx, layer in enumerate(self.conv):
+            if not isinstance(layer, nn.Conv2d) or layer.stride[0] == 1:
+                x = layer(x) if x is not None else None
+                continue
+
+            buffer = cache.get(idx)
+            if buffer is None:
+                if x is None:
+                    return mx.zeros((batch, 0, self.out.weight.shape[0]))
+                buffer = mx.zeros((batch, self._padding, *x.shape[2:]), x.dtype)
+            parts = [buffer] if x is None else [buffer, x]
+            if flush:
+                parts.append(mx.zeros((batch, self._padding, *buffer.shape[2:])))
+            x = mx.concatenate(parts, axis=1).astype(buffer.dtype)
+
+            frames = max((x.shape[1] - self._kernel_size) // self._stride + 1, 0)
+            cache[idx] = x[:, frames * self._stride :]
+            if frames == 0:
+                x = None
+                if not flush:
+                    break
+                continue
+            used = (frames - 1) * self._stride + self._kernel_size
+            x = mx.conv2d(
+                x[:, :used],
+                layer.weight,
+                stride=layer.stride,
+                padding=(0, self._padding),
+                groups=layer.groups,
+            )
+            if "bias" in layer:
+                x = x + layer.bias
+
+        if x is None:
+            return mx.zeros((batch, 0, self.out.weight.shape[0]))
+        x = x.transpose(0, 1, 3, 2).reshape(batch, x.shape[1], -1)
+        return self.out(x)
+
 
 class Conformer(nn.Module):
     def __init__(self, args: ConformerArgs):
@@ -329,3 +387,33 @@ class Conformer(nn.Module):
             x = layer(x, pos_emb=pos_emb, cache=c)
 
         return x, out_lengths
+
+    def make_cache(self, left_context: int) -> EncoderCache:
+        """Create the streaming state for :meth:`stream`, attending to at most
+        ``left_context`` previous encoder frames."""
+        return EncoderCache(len(self.layers), left_context)
+
+    def stream(self, x: mx.array, cache: EncoderCache, flush: bool = False) -> mx.array:
+        """Encode new mel frames [batch, frames, feat] of a live stream.
+
+        Only the new frames are computed: attention reads the cached keys and
+        values of the last ``left_context`` frames and the depthwise
+        convolutions their cached input tail, so the cost and memory per chunk
+        do not grow with the stream. Returns the new encoder frames, which may
+        be empty until enough input arrives for the subsampling.
+        """
+        if isinstance(self.pre_encode, DwStridingSubsampling):
+            x = self.pre_encode.stream(x, cache.subsampling, flush=flush)
+        else:
+            x = self.pre_encode(x)
+        if x.shape[1] == 0:
+            return x
+
+        pos_emb = None
+        if self.pos_enc is not None:
+            x, pos_emb = self.pos_enc(x, offset=cache.layers[0].offset)
+
+        for layer, c in zip(self.layers, cache.layers):
+            x = layer(x, pos_emb=pos_emb, cache=c)
+
+        return x
@@ -10,6 +10,8 @@ from huggingface_hub import hf_hub_download
 from mlx.utils import tree_flatten, tree_unflatten
 from tqdm import tqdm
 
+from mlx_audio.audio_io import info as audio_info
+from mlx_audio.audio_io import read_blocks
 from mlx_audio.stt.models.parakeet import tokenizer
 from mlx_audio.stt.models.parakeet.alignment import (
     AlignedResult,
@@ -19,7 +21,11 @@ from mlx_audio.stt.models.parakeet.alignment import (
     sentences_to_result,
     tokens_to_sentences,
 )
-from mlx_audio.stt.models.parakeet.audio import PreprocessArgs, log_mel_spectrogram
+from mlx_audio.stt.models.parakeet.audio import (
+    PreprocessArgs,
+    StreamingLogMel,
+    log_mel_spectrogram,
+)
 from mlx_audio.stt.models.parakeet.conformer import Conformer, ConformerArgs
 from mlx_audio.stt.models.parakeet.ctc import (
     AuxCTCArgs,
@@ -27,10 +33,12 @@ from mlx_audio.stt.models.parakeet.ctc import (
     ConvASRDecoderArgs,
 )
 from mlx_audio.stt.models.parakeet.rnnt import (
+    DecodingState,
     JointArgs,
     JointNetwork,
     PredictArgs,
     PredictNetwork,
+    greedy_batch_decode,
 )
 from mlx_audio.stt.utils import load_audio
 from mlx_audio.utils import from_dict
@@ -133,6 +141,141 @@ class StreamingResult:
     language: str = "en"
 
 
+class ParakeetStream:
+    """Push-style live transcription with a cache-aware Conformer.
+
+    Audio pushed with :meth:`feed` is turned into log-mel frames
+    incrementally and encoded in chunks of ``chunk_duration`` seconds. Each
+    chunk only attends to the last ``context_duration`` seconds of cached
+    encoder states, and the greedy transducer state carries over between
+    chunks, so nothing is recomputed or merged and the cost per chunk stays
+    flat for arbitrarily long streams.
+
+    The Conformer cannot see past the end of a chunk, so longer chunks trade
+    latency for accuracy closer to offline :meth:`Model.generate`.
+
+    Example:
+        >>> stream = model.create_stream(chunk_duration=1.0)
+        >>> for pcm in microphone_chunks():
+        ...     print(stream.feed(pcm).text, end="", flush=True)
+        >>> print(stream.finish().text)
+    """
+
+    def __init__(
+        self,
+        model: "Model",
+        chunk_duration: float = 1.0,
+        context_duration: float = 10.0,
+        dtype: mx.Dtype = mx.bfloat16,
+    ):
+        if not hasattr(model, "joint"):
+            raise ValueError("Streaming requires a Parakeet TDT or RNNT model")
+        args = model.preprocessor_config
+        self.model = model
+        self.dtype = dtype
+        self.frame_seconds = (
+            model.encoder_config.subsampling_factor * args.hop_length / args.sample_rate
+        )
+        self._features = StreamingLogMel(args)
+        self._cache = model.encoder.make_cache(
+            left_context=max(int(context_duration / self.frame_seconds), 1)
+        )
+        self._state: Optional[DecodingState] = None
+        self._chunk_frames = max(
+            int(chunk_duration * args.sample_rate / args.hop_length), 1
+        )
+        self._pending: List[mx.array] = []
+        self._pending_frames = 0
+        self._encoded_frames = 0
+        self._samples = 0
+        self._finished = False
+
+    @property
+    def audio_position(self) -> float:
+        """Seconds of audio pushed so far."""
+        return self._samples / self.model.preprocessor_config.sample_rate
+
+    def feed(self, audio: mx.array) -> StreamingResult:
+        """Push PCM samples at the model sample rate and return the tokens
+        decoded since the previous call."""
+        if self._finished:
+            raise RuntimeError("Stream is finished")
+        audio = mx.array(audio) if not isinstance(audio, mx.array) else audio
+        self._samples += audio.shape[0]
+        self._push(self._features(audio))
+        tokens = []
+        if self._pending_frames >= self._chunk_frames:
+            tokens = self._step()
+        return self._result(tokens, is_final=False)
+
+    def finish(self) -> StreamingResult:
+        """Flush the buffered audio and return the last tokens."""
+        if self._finished:
+            raise RuntimeError("Stream is finished")
+        self._push(self._features(mx.zeros((0,)), flush=True))
+        tokens = self._step(flush=True)
+        self._finished = True
+        return self._result(tokens, is_final=True)
+
+    def _push(self, mel: mx.array):
+        if mel.shape[1]:
+            self._pending.append(mel.astype(self.dtype))
+            self._pending_frames += mel.shape[1]
+
+    def _step(self, flush: bool = False) -> List[AlignedToken]:
+        mel = (
+            mx.concatenate(self._pending, axis=1)
+            if self._pending
+            else mx.zeros((1, 0, self.model.preprocessor_config.features), self.dtype)
+        )
+        self._pending, self._pending_frames = [], 0
+
+        features = self.model.encoder.stream(mel, self._cache, flush=flush)
+        mx.eval(features, self._cache.state())
+        num_frames = features.shape[1]
+        if num_frames == 0:
+            return []
+
+        if self._state is None:
+            self._state = DecodingState.initial(
+                self.model.decoder, 1, len(self.model.vocabulary), features.dtype
+            )
+        (hypothesis,) = greedy_batch_decode(
+            self.model.decoder,
+            self.model.joint,
+            features,
+            mx.array([num_frames]),
+            blank=len(self.model.vocabulary),
+            durations=getattr(self.model, "durations", None),
+            max_symbols=self.model.max_symbols,
+            state=self._state,
+        )
+        offset = self._encoded_frames
+        self._encoded_frames += num_frames
+        return [
+            AlignedToken(
+                token,
+                start=(offset + frame) * self.frame_seconds,
+                duration=duration * self.frame_seconds,
+                text=tokenizer.decode([token], self.model.vocabulary),
+            )
+            for token, frame, duration in hypothesis
+        ]
+
+    def _result(self, tokens: List[AlignedToken], is_final: bool) -> StreamingResult:
+        position = self.audio_position
+        return StreamingResult(
+            text="".join(token.text for token in tokens),
+            tokens=[token.id for token in tokens],
+            is_final=is_final,
+            start_time=tokens[0].start if tokens else position,
+            end_time=tokens[-1].end if tokens else position,
+            progress=1.0 if is_final else 0.0,
+            audio_position=position,
+            audio_duration=position,
+        )
+
+
 class ModelConfig:
     """Config wrapper for Parakeet models."""
 
@@ -168,6 +311,27 @@ class Model(nn.Module):
         """
         raise NotImplementedError
 
+    def _hypothesis_to_result(
+        self, hypothesis: list[tuple[int, int, int]]
+    ) -> AlignedResult:
+        """Build an aligned result from ``(token, frame, duration)`` triples
+        in encoder frames."""
+        frame_seconds = (
+            self.encoder_config.subsampling_factor
+            / self.preprocessor_config.sample_rate
+            * self.preprocessor_config.hop_length
+        )
+        tokens = [
+            AlignedToken(
+                token,
+                start=frame * frame_seconds,
+                duration=duration * frame_seconds,
+                text=tokenizer.decode([token], self.vocabulary),
+            )
+            for token, frame, duration in hypothesis
+        ]
+        return sentences_to_result(tokens_to_sentences(tokens))
+
     def decode_chunk(
         self, audio_data: mx.array, verbose: bool = False
     ) -> AlignedResult:
@@ -217,11 +381,26 @@ class Model(nn.Module):
                 **kwargs,
             )
 
+        sample_rate = self.preprocessor_config.sample_rate
+
+        if isinstance(audio, (str, Path)) and chunk_duration is not None:
+            file_info = audio_info(audio)
+            if file_info.duration > chunk_duration:
+                # Long files are decoded and resampled one chunk at a time
+                total_samples = -(
+                    -file_info.frames * sample_rate // file_info.samplerate
+                )
+                return self._transcribe_chunks(
+                    self._file_chunks(audio, chunk_duration, overlap_duration, dtype),
+                    total_samples,
+                    overlap_duration,
+                    chunk_callback,
+                    verbose,
+                )
+
         # Handle different audio input types
         if isinstance(audio, (str, Path)):
-            audio_data = load_audio(
-                audio, self.preprocessor_config.sample_rate, dtype=dtype
-            )
+            audio_data = load_audio(audio, sample_rate, dtype=dtype)
         else:
             # mx.array input
             audio_data = audio.astype(dtype) if audio.dtype != dtype else audio
@@ -229,31 +408,66 @@ class Model(nn.Module):
         if chunk_duration is None:
             return self.decode_chunk(audio_data, verbose)
 
-        audio_length_seconds = len(audio_data) / self.preprocessor_config.sample_rate
+        audio_length_seconds = len(audio_data) / sample_rate
 
         if audio_length_seconds <= chunk_duration:
             return self.decode_chunk(audio_data, verbose)
 
-        chunk_samples = int(chunk_duration * self.preprocessor_config.sample_rate)
-        overlap_samples = int(overlap_duration * self.preprocessor_config.sample_rate)
+        chunk_samples = int(chunk_duration * sample_rate)
+        overlap_samples = int(overlap_duration * sample_rate)
+        chunks = (
+            (start, audio_data[start : start + chunk_samples])
+            for start in range(0, len(audio_data), chunk_samples - overlap_samples)
+        )
+        return self._transcribe_chunks(
+            chunks, len(audio_data), overlap_duration, chunk_callback, verbose
+        )
 
+    def _file_chunks(
+        self,
+        path: Union[str, Path],
+        chunk_duration: float,
+        overlap_duration: float,
+        dtype: mx.Dtype,
+    ):
+        """Yield (start sample, chunk) windows of an audio file at the model rate."""
+        sample_rate = self.preprocessor_config.sample_rate
+        hop = round(chunk_duration * sample_rate) - round(
+            overlap_duration * sample_rate
+        )
+        blocks = read_blocks(
+            path,
+            chunk_duration,
+            target_sr=sample_rate,
+            overlap_seconds=overlap_duration,
+            mono=True,
+        )
+        for i, block in enumerate(blocks):
+            yield i * hop, mx.array(block, dtype=dtype)
+
+    def _transcribe_chunks(
+        self,
+        chunks,
+        total_samples: int,
+        overlap_duration: float,
+        chunk_callback: Optional[Callable],
+        verbose: bool,
+    ) -> AlignedResult:
+        """Decode overlapping (start, chunk) windows and merge their tokens."""
+        sample_rate = self.preprocessor_config.sample_rate
         all_tokens = []
 
-        for start in tqdm(
-            range(0, len(audio_data), chunk_samples - overlap_samples),
-            disable=not verbose,
-        ):
-            end = min(start + chunk_samples, len(audio_data))
+        for start, chunk_audio in tqdm(chunks, disable=not verbose):
+            end = start + len(chunk_audio)
 
             if chunk_callback is not None:
-                chunk_callback(end, len(audio_data))
+                chunk_callback(end, total_samples)
 
-            chunk_audio = audio_data[start:end]
             chunk_mel = log_mel_spectrogram(chunk_audio, self.preprocessor_config)
 
             chunk_result = self.decode(chunk_mel)[0]
 
-            chunk_offset = start / self.preprocessor_config.sample_rate
+            chunk_offset = start / sample_rate
             for sentence in chunk_result.sentences:
                 for token in sentence.tokens:
                     token.start += chunk_offset
@@ -292,6 +506,32 @@ class Model(nn.Module):
 
         return result
 
+    def create_stream(
+        self,
+        chunk_duration: float = 1.0,
+        context_duration: float = 10.0,
+        dtype: mx.Dtype = mx.bfloat16,
+    ) -> ParakeetStream:
+        """
+        Start a live transcription stream fed with :meth:`ParakeetStream.feed`.
+
+        Unlike :meth:`stream_generate`, the audio does not need to be known up
+        front and each chunk is encoded once with cached attention and
+        convolution state (TDT and RNNT models only).
+
+        Args:
+            chunk_duration: Audio encoded per step in seconds; shorter chunks
+                lower the latency at some cost in accuracy
+            context_duration: Seconds of past encoder states each chunk attends to
+            dtype: Data type for the encoder input
+        """
+        return ParakeetStream(
+            self,
+            chunk_duration=chunk_duration,
+            context_duration=context_duration,
+            dtype=dtype,
+        )
+
     def stream_generate(
         self,
         audio: Union[str, Path, mx.array],
@@ -508,91 +748,30 @@ class ParakeetTDT(Model):
         self.decoder = PredictNetwork(args.decoder)
         self.joint = JointNetwork(args.joint)
 
-    def decode(self, mel: mx.array) -> list[AlignedResult]:
+    def decode(
+        self, mel: mx.array, lengths: Optional[mx.array] = None
+    ) -> list[AlignedResult]:
         """
         Generate with skip token logic for the Parakeet model, handling batches and single input. Uses greedy decoding.
         mel: [batch, sequence, mel_dim] or [sequence, mel_dim]
+        lengths: valid mel frames per batch item, defaults to the full sequence
         """
-        batch_size: int = mel.shape[0]
         if len(mel.shape) == 2:
-            batch_size = 1
             mel = mx.expand_dims(mel, 0)
 
-        batch_features, lengths = self.encoder(mel)
+        batch_features, lengths = self.encoder(mel, lengths)
         mx.eval(batch_features, lengths)
 
-        results = []
-        for b in range(batch_size):
-            features = batch_features[b : b + 1]
-            max_length = int(lengths[b])
-
-            last_token = len(
-                self.vocabulary
-            )  # In TDT, space token is always len(vocab)
-            hypothesis = []
-
-            time = 0
-            new_symbols = 0
-            decoder_hidden = None
-
-            while time < max_length:
-                feature = features[:, time : time + 1]
-
-                current_token = (
-                    mx.array([[last_token]], dtype=mx.int32)
-                    if last_token != len(self.vocabulary)
-                    else None
-                )
-                decoder_output, (hidden, cell) = self.decoder(
-                    current_token, decoder_hidden
-                )
-
-                # cast
-                decoder_output = decoder_output.astype(feature.dtype)
-                proposed_decoder_hidden = (
-                    hidden.astype(feature.dtype),
-                    cell.astype(feature.dtype),
-                )
-
-                joint_output = self.joint(feature, decoder_output)
-
-                pred_token = mx.argmax(
-                    joint_output[0, 0, :, : len(self.vocabulary) + 1]
-                )
-                decision = mx.argmax(joint_output[0, 0, :, len(self.vocabulary) + 1 :])
-
-                if pred_token != len(self.vocabulary):
-                    hypothesis.append(
-                        AlignedToken(
-                            int(pred_token),
-                            start=time
-                            * self.encoder_config.subsampling_factor
-                            / self.preprocessor_config.sample_rate
-                            * self.preprocessor_config.hop_length,  # hop
-                            duration=self.durations[int(decision)]
-                            * self.encoder_config.subsampling_factor
-                            / self.preprocessor_config.sample_rate
-                            * self.preprocessor_config.hop_length,  # hop
-                            text=tokenizer.decode([int(pred_token)], self.vocabulary),
-                        )
-                    )
-                    last_token = int(pred_token)
-                    decoder_hidden = proposed_decoder_hidden
-
-                time += self.durations[int(decision)]
-                new_symbols += 1
-
-                if self.durations[int(decision)] != 0:
-                    new_symbols = 0
-                else:
-                    if self.max_symbols is not None and self.max_symbols <= new_symbols:
-                        time += 1
-                        new_symbols = 0
-
-            result = sentences_to_result(tokens_to_sentences(hypothesis))
-            results.append(result)
-
-        return results
+        hypotheses = greedy_batch_decode(
+            self.decoder,
+            self.joint,
+            batch_features,
+            lengths,
+            blank=len(self.vocabulary),  # In TDT, space token is always len(vocab)
+            durations=self.durations,
+            max_symbols=self.max_symbols,
+        )
+        return [self._hypothesis_to_result(h) for h in hypotheses]
 
 
 class ParakeetRNNT(Model):
@@ -615,84 +794,29 @@ class ParakeetRNNT(Model):
         self.decoder = PredictNetwork(args.decoder)
         self.joint = JointNetwork(args.joint)
 
-    def decode(self, mel: mx.array) -> list[AlignedResult]:
+    def decode(
+        self, mel: mx.array, lengths: Optional[mx.array] = None
+    ) -> list[AlignedResult]:
         """
         Generate with skip token logic for the Parakeet model, handling batches and single input. Uses greedy decoding.
         mel: [batch, sequence, mel_dim] or [sequence, mel_dim]
+        lengths: valid mel frames per batch item, defaults to the full sequence
         """
-        batch_size: int = mel.shape[0]
         if len(mel.shape) == 2:
-            batch_size = 1
             mel = mx.expand_dims(mel, 0)
 
-        batch_features, lengths = self.encoder(mel)
+        batch_features, lengths = self.encoder(mel, lengths)
         mx.eval(batch_features, lengths)
 
-        results = []
-        for b in range(batch_size):
-            features = batch_features[b : b + 1]
-            max_length = int(lengths[b])
-
-            last_token = len(self.vocabulary)
-            hypothesis = []
-
-            time = 0
-            new_symbols = 0
-            decoder_hidden = None
-
-            while time < max_length:
-                feature = features[:, time : time + 1]
-
-                current_token = (
-                    mx.array([[last_token]], dtype=mx.int32)
-                    if last_token != len(self.vocabulary)
-                    else None
-                )
-                decoder_output, (hidden, cell) = self.decoder(
-                    current_token, decoder_hidden
-                )
-
-                # cast
-                decoder_output = decoder_output.astype(feature.dtype)
-                proposed_decoder_hidden = (
-                    hidden.astype(feature.dtype),
-                    cell.astype(feature.dtype),
-                )
-
-                joint_output = self.joint(feature, decoder_output)
-
-                pred_token = mx.argmax(joint_output)
-
-                if pred_token != len(self.vocabulary):
-                    hypothesis.append(
-                        AlignedToken(
-                            int(pred_token),
-                            start=time
-                            * self.encoder_config.subsampling_factor
-                            / self.preprocessor_config.sample_rate
-                            * self.preprocessor_config.hop_length,  # hop
-                            duration=1
-                            * self.encoder_config.subsampling_factor
-                            / self.preprocessor_config.sample_rate
-                            * self.preprocessor_config.hop_length,  # hop
-                            text=tokenizer.decode([int(pred_token)], self.vocabulary),
-                        )
-                    )
-                    last_token = int(pred_token)
-                    decoder_hidden = proposed_decoder_hidden
-
-                    new_symbols += 1
-                    if self.max_symbols is not None and self.max_symbols <= new_symbols:
-                        time += 1
-                        new_symbols = 0
-                else:
-                    time += 1
-                    new_symbols = 0
-
-            result = sentences_to_result(tokens_to_sentences(hypothesis))
-            results.append(result)
-
-        return results
+        hypotheses = greedy_batch_decode(
+            self.decoder,
+            self.joint,
+            batch_features,
+            lengths,
+            blank=len(self.vocabulary),
+            max_symbols=self.max_symbols,
+        )
+        return [self._hypothesis_to_result(h) for h in hypotheses]
 
 
 class ParakeetCTC(Model):
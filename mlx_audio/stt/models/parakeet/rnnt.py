@@ -55,7 +55,8 @@ class LSTM(nn.Module):
     def __call__(
         self, x: mx.array, h_c: tuple[mx.array, mx.array] | None = None
     ) -> tuple[mx.array, tuple[mx.array, mx.array]]:
-        if self.batch_first:
+        # nn.LSTM steps over axis -2, so it expects batch-first input
+        if not self.batch_first:
             x = mx.transpose(x, (1, 0, 2))
 
         if h_c is None:
@@ -73,10 +74,10 @@ class LSTM(nn.Module):
 
             all_h_steps, all_c_steps = layer(outputs, hidden=h[i], cell=c[i])
             outputs = all_h_steps
-            next_h.append(all_h_steps[-1])
-            next_c.append(all_c_steps[-1])
+            next_h.append(all_h_steps[..., -1, :])
+            next_c.append(all_c_steps[..., -1, :])
 
-        if self.batch_first:
+        if not self.batch_first:
             outputs = mx.transpose(outputs, (1, 0, 2))
 
         final_h = mx.stack(next_h, axis=0)
@@ -155,3 +156,135 @@ class JointNetwork(nn.Module):
             x = layer(x)
 
         return x
+
+
+@dataclass
+class DecodingState:
+    """Greedy transducer state carried across chunks of a stream.
+
+    ``time`` is the next frame to decode relative to the start of the next
+    chunk; TDT durations can skip past the end of a chunk.
+    """
+
+    hidden: tuple[mx.array, mx.array]
+    last_token: mx.array
+    time: mx.array
+    new_symbols: mx.array
+
+    @classmethod
+    def initial(
+        cls, decoder: PredictNetwork, batch: int, blank: int, dtype: mx.Dtype
+    ) -> "DecodingState":
+        rnn = decoder.prediction["dec_rnn"]
+        shape = (rnn.num_layers, batch, rnn.hidden_size)
+        return cls(
+            hidden=(mx.zeros(shape, dtype), mx.zeros(shape, dtype)),
+            last_token=mx.full((batch,), blank, dtype=mx.int32),
+            time=mx.zeros((batch,), dtype=mx.int32),
+            new_symbols=mx.zeros((batch,), dtype=mx.int32),
+        )
+
+
+def greedy_batch_decode(
+    decoder: PredictNetwork,
+    joint: JointNetwork,
+    features: mx.array,
+    lengths: mx.array,
+    blank: int,
+    durations: list[int] | None = None,
+    max_symbols: int | None = None,
+    sync_interval: int = 16,
+    state: DecodingState | None = None,
+) -> list[list[tuple[int, int, int]]]:
+    """Greedy RNNT/TDT decoding of a whole batch in lockstep.
+
+    Every step runs the prediction and joint networks once for all
+    utterances, and masks the updates of utterances that emitted blank or
+    already reached their last frame. Time indices, predictor state and the
+    emitted tokens stay on device; the host only checks whether any
+    utterance is still active every ``sync_interval`` steps.
+
+    Args:
+        features: Encoder output [batch, frames, dim].
+        lengths: Valid encoder frames per utterance [batch].
+        blank: Blank token id (``len(vocabulary)``).
+        durations: TDT durations, or ``None`` for a plain RNNT joint.
+        max_symbols: Maximum symbols emitted per frame.
+        sync_interval: Steps between host syncs.
+        state: Decoder state to continue from, e.g. the previous chunk of a
+            stream. It is updated in place.
+
+    Returns:
+        Per utterance, a list of ``(token, frame, duration_frames)``.
+    """
+    batch, num_frames = features.shape[:2]
+    dtype = features.dtype
+    rnn = decoder.prediction["dec_rnn"]
+    if state is None:
+        state = DecodingState.initial(decoder, batch, blank, dtype)
+    hidden = state.hidden
+    last_token = state.last_token
+    time = state.time
+    new_symbols = state.new_symbols
+
+    lengths = lengths.astype(mx.int32)
+    duration_values = None if durations is None else mx.array(durations, mx.int32)
+
+    steps = []
+    while True:
+        active = time < lengths
+
+        # A blank "previous token" feeds a zero embedding, as at the start
+        has_token = last_token != blank
+        embedded = decoder.prediction["embed"](mx.where(has_token, last_token, 0))
+        embedded = embedded * has_token[:, None].astype(embedded.dtype)
+        decoder_output, (next_h, next_c) = rnn(embedded[:, None], hidden)
+
+        frame = mx.minimum(time, num_frames - 1)
+        feature = mx.take_along_axis(features, frame[:, None, None], axis=1)
+        logits = joint(feature, decoder_output.astype(dtype))[:, 0, 0]
+
+        if duration_values is None:
+            token = mx.argmax(logits, axis=-1).astype(mx.int32)
+            emit = active & (token != blank)
+            token_duration = mx.ones_like(token)
+            # A blank moves to the next frame, a symbol stays on it
+            advance = mx.where(emit, 0, 1)
+            symbols = mx.where(emit, new_symbols + 1, 0)
+        else:
+            token = mx.argmax(logits[:, : blank + 1], axis=-1).astype(mx.int32)
+            emit = active & (token != blank)
+            decision = mx.argmax(logits[:, blank + 1 :], axis=-1)
+            token_duration = duration_values[decision]
+            advance = token_duration
+            symbols = mx.where(advance == 0, new_symbols + 1, 0)
+        if max_symbols is not None:
+            capped = (symbols > 0) & (symbols >= max_symbols)
+            advance = advance + capped.astype(mx.int32)
+            symbols = mx.where(capped, 0, symbols)
+
+        steps.append(mx.stack([token, time, token_duration, emit.astype(mx.int32)]))
+        keep = emit[None, :, None]
+        hidden = (
+            mx.where(keep, next_h.astype(dtype), hidden[0]),
+            mx.where(keep, next_c.astype(dtype), hidden[1]),
+        )
+        last_token = mx.where(emit, token, last_token)
+        time = mx.where(active, time + advance, time)
+        new_symbols = mx.where(active, symbols, new_symbols)
+        mx.async_eval(steps[-1], time, last_token, new_symbols, hidden)
+
+        if len(steps) % sync_interval == 0 and not mx.any(time < lengths).item():
+            break
+
+    state.hidden = hidden
+    state.last_token = last_token
+    state.time = time - lengths
+    state.new_symbols = new_symbols
+
+    # [batch, steps, (token, frame, duration, emitted)], read back once
+    steps = mx.stack(steps, axis=-1).transpose(1, 2, 0).tolist()
+    return [
+        [(token, frame, duration) for token, frame, duration, emitted in row if emitted]
+        for row in steps
+    ]
@@ -15,6 +15,9 @@ from mlx_audio.stt.models.base import STTOutput
 
 from .config import AudioEncoderConfig, ModelConfig, TextConfig
 
+# <|im_end|>, <|endoftext|>
+EOS_TOKEN_IDS = [151645, 151643]
+
 
 @dataclass
 class StreamingResult:
@@ -300,17 +303,6 @@ class AudioEncoder(nn.Module):
         self.proj1 = nn.Linear(embed_dim, embed_dim)
         self.proj2 = nn.Linear(embed_dim, config.output_dim)
 
-    def _create_block_attention_mask(
-        self, seq_len: int, cu_seqlens: List[int], dtype: mx.Dtype
-    ) -> mx.array:
-        """Create attention mask for ragged/block attention."""
-        mask = mx.full((seq_len, seq_len), -1e9, dtype=dtype)
-        for i in range(len(cu_seqlens) - 1):
-            start = cu_seqlens[i]
-            end = cu_seqlens[i + 1]
-            mask[start:end, start:end] = 0.0
-        return mask
-
     def __call__(
         self,
         input_features: mx.array,
@@ -414,20 +406,29 @@ class AudioEncoder(nn.Module):
             if remainder != 0:
                 cu_chunk_lens.append(remainder)
 
-        cu_seqlens = np.cumsum(cu_chunk_lens).tolist()
+        cu_seqlens = np.cumsum(cu_chunk_lens)
+        seq_len, embed_dim = hidden_states.shape
+        if cu_seqlens[-1] < seq_len:
+            cu_seqlens = np.append(cu_seqlens, seq_len)
 
-        seq_len = hidden_states.shape[0]
-        attention_mask = self._create_block_attention_mask(
-            seq_len, cu_seqlens, hidden_states.dtype
-        )
-        attention_mask = attention_mask[None, None, :, :]
+        # Tokens only attend within their window, so encode the windows as a
+        # padded batch (W, T, T) rather than one sequence with a dense
+        # block-diagonal (seq_len, seq_len) mask
+        starts = cu_seqlens[:-1]
+        window_lens = np.diff(cu_seqlens)
+        positions = np.arange(window_lens.max())
+        valid = positions[None, :] < window_lens[:, None]
+        gather = np.where(valid, starts[:, None] + positions[None, :], 0)
 
-        hidden_states = hidden_states[None, :, :]
+        hidden_states = hidden_states[mx.array(gather)]
+        attention_mask = mx.array(valid)[:, None, None, :]
 
         for layer in self.layers:
             hidden_states = layer(hidden_states, mask=attention_mask)
 
-        hidden_states = hidden_states[0]
+        hidden_states = hidden_states.reshape(-1, embed_dim)[
+            mx.array(np.flatnonzero(valid))
+        ]
         hidden_states = self.ln_post(hidden_states)
         hidden_states = nn.gelu(self.proj1(hidden_states))
         hidden_states = self.proj2(hidden_states)
@@ -487,10 +488,14 @@ class TextAttention(nn.Module):
         keys = keys.transpose(0, 2, 1, 3)
         values = values.transpose(0, 2, 1, 3)
 
+        mask = None
         if cache is not None:
             offset = cache.offset
             queries = self.rope(queries, offset=offset)
             keys = self.rope(keys, offset=offset)
+            if isinstance(offset, mx.array):
+                # Left-padded batch cache: per-row positions, padding masked out
+                mask = cache.make_mask(L)
         else:
             offset = 0
             queries = self.rope(queries)
@@ -500,9 +505,10 @@ class TextAttention(nn.Module):
             keys, values = cache.update_and_fetch(keys, values)
 
         query_len = queries.shape[2]
-        mask = create_additive_causal_mask(query_len, offset=offset).astype(
-            queries.dtype
-        )
+        if mask is None:
+            mask = create_additive_causal_mask(query_len, offset=offset).astype(
+                queries.dtype
+            )
 
         output = mx.fast.scaled_dot_product_attention(
             queries, keys, values, scale=self.scale, mask=mask
@@ -633,33 +639,31 @@ class Qwen3ASRModel(nn.Module):
         """Build input embeddings with audio features merged in."""
         inputs_embeds = self.model.embed_tokens(input_ids)
         audio_features = audio_features.astype(inputs_embeds.dtype)
+        return self._merge_audio_features(inputs_embeds, input_ids, audio_features)
 
-        audio_token_mask = input_ids == self.config.audio_token_id
-
-        if audio_token_mask.any():
-            batch_size, seq_len, hidden_dim = inputs_embeds.shape
-            flat_mask = audio_token_mask.flatten()
-            flat_mask_np = np.array(flat_mask)
-            audio_indices = np.where(flat_mask_np)[0]
-
-            if len(audio_indices) > 0 and audio_features.shape[0] > 0:
-                num_to_replace = min(len(audio_indices), audio_features.shape[0])
-                flat_embeds = inputs_embeds.reshape(-1, hidden_dim)
-
-                result_list = []
-                audio_idx = 0
-                for i in range(flat_embeds.shape[0]):
-                    if audio_idx < num_to_replace and i == audio_indices[audio_idx]:
-                        result_list.append(audio_features[audio_idx])
-                        audio_idx += 1
-                    else:
-                        result_list.append(flat_embeds[i])
-
-                inputs_embeds = mx.stack(result_list, axis=0).reshape(
-                    batch_size, seq_len, hidden_dim
-                )
-
-        return inputs_embeds
+    def _merge_audio_features(
+        self,
+        inputs_embeds: mx.array,
+        input_ids: mx.array,
+        audio_features: mx.array,
+    ) -> mx.array:
+        """Replace audio placeholder embeddings with encoded audio features."""
+        if audio_features.shape[0] == 0:
+            return inputs_embeds
+
+        # The n-th audio placeholder takes the n-th audio feature row
+        hidden_dim = inputs_embeds.shape[-1]
+        audio_token_mask = (input_ids == self.config.audio_token_id).flatten()
+        audio_index = mx.cumsum(audio_token_mask.astype(mx.int32)) - 1
+        audio_token_mask = audio_token_mask & (audio_index < audio_features.shape[0])
+        audio_index = mx.clip(audio_index, 0, audio_features.shape[0] - 1)
+
+        flat_embeds = mx.where(
+            audio_token_mask[:, None],
+            audio_features[audio_index],
+            inputs_embeds.reshape(-1, hidden_dim),
+        )
+        return flat_embeds.reshape(inputs_embeds.shape)
 
     def _forward_with_embeds(
         self,
@@ -696,32 +700,9 @@ class Qwen3ASRModel(nn.Module):
                 input_features, feature_attention_mask
             )
             audio_features = audio_features.astype(inputs_embeds.dtype)
-
-            audio_token_mask = input_ids == self.config.audio_token_id
-
-            if audio_token_mask.any():
-                batch_size, seq_len, hidden_dim = inputs_embeds.shape
-
-                flat_mask = audio_token_mask.flatten()
-                flat_mask_np = np.array(flat_mask)
-                audio_indices = np.where(flat_mask_np)[0]
-
-                if len(audio_indices) > 0 and audio_features.shape[0] > 0:
-                    num_to_replace = min(len(audio_indices), audio_features.shape[0])
-                    flat_embeds = inputs_embeds.reshape(-1, hidden_dim)
-
-                    result_list = []
-                    audio_idx = 0
-                    for i in range(flat_embeds.shape[0]):
-                        if audio_idx < num_to_replace and i == audio_indices[audio_idx]:
-                            result_list.append(audio_features[audio_idx])
-                            audio_idx += 1
-                        else:
-                            result_list.append(flat_embeds[i])
-
-                    inputs_embeds = mx.stack(result_list, axis=0).reshape(
-                        batch_size, seq_len, hidden_dim
-                    )
+            inputs_embeds = self._merge_audio_features(
+                inputs_embeds, input_ids, audio_features
+            )
 
         hidden_states = self.model(inputs_embeds=inputs_embeds, cache=cache)
 
@@ -747,6 +728,15 @@ class Qwen3ASRModel(nn.Module):
 
         return [KVCache() for _ in range(self.config.text_config.num_hidden_layers)]
 
+    def make_batch_cache(self, left_padding: List[int]) -> List[Any]:
+        """Create a KV cache for a batch of left-padded prompts."""
+        from mlx_lm.models.cache import BatchKVCache
+
+        return [
+            BatchKVCache(left_padding)
+            for _ in range(self.config.text_config.num_hidden_layers)
+        ]
+
     @staticmethod
     def sanitize(weights: Dict[str, mx.array]) -> Dict[str, mx.array]:
         """Sanitize weights from HuggingFace/PyTorch format to MLX format."""
@@ -828,8 +818,21 @@ class Qwen3ASRModel(nn.Module):
             np.array(audio_input) if isinstance(audio_input, mx.array) else audio_input
         )
 
+        input_features, feature_attention_mask, num_audio_tokens = (
+            self._extract_features([audio_np])
+        )
+        return input_features, feature_attention_mask, num_audio_tokens[0]
+
+    def _extract_features(
+        self, audios: List[np.ndarray]
+    ) -> Tuple[mx.array, mx.array, List[int]]:
+        """Compute padded log-mel features for a batch of waveforms.
+
+        Returns:
+            Tuple of (input_features, feature_attention_mask, audio tokens per waveform).
+        """
         audio_inputs = self._feature_extractor(
-            audio_np,
+            audios,
             sampling_rate=16000,
             return_attention_mask=True,
             truncation=False,
@@ -841,7 +844,7 @@ class Qwen3ASRModel(nn.Module):
 
         audio_lengths = feature_attention_mask.sum(axis=-1)
         aftercnn_lens = _get_feat_extract_output_lengths(audio_lengths)
-        num_audio_tokens = int(aftercnn_lens[0].item())
+        num_audio_tokens = aftercnn_lens.tolist()
 
         return input_features, feature_attention_mask, num_audio_tokens
 
@@ -887,7 +890,6 @@ class Qwen3ASRModel(nn.Module):
             self._preprocess_audio(audio)
         )
         input_ids = self._build_prompt(num_audio_tokens, language)
-        eos_token_ids = [151645, 151643]
 
         # Step 1: Encode audio features
         with tqdm(
@@ -959,7 +961,7 @@ class Qwen3ASRModel(nn.Module):
             if gen_pbar is not None:
                 gen_pbar.update(1)
 
-            if token in eos_token_ids:
+            if token in EOS_TOKEN_IDS:
                 break
 
             yield token, logprobs
@@ -967,43 +969,130 @@ class Qwen3ASRModel(nn.Module):
         if gen_pbar is not None:
             gen_pbar.close()
 
-    def _generate_single_chunk(
+    def _generate_chunk_batch(
         self,
-        audio_chunk: np.ndarray,
+        audio_chunks: List[np.ndarray],
         *,
         max_tokens: int = 8192,
         sampler: Optional[Callable] = None,
         logits_processors: Optional[List[Callable]] = None,
         language: str = "English",
         prefill_step_size: int = 2048,
-        verbose: bool = False,
-    ) -> Tuple[str, int, int]:
-        """Generate transcription for a single audio chunk.
+    ) -> List[Tuple[List[int], int]]:
+        """Transcribe a batch of audio chunks in lockstep.
+
+        The audio features are padded and masked across the batch and encoded
+        in one pass. Prompts are left-padded into a shared batch KV cache, and
+        rows are dropped from the cache as soon as they emit an EOS token.
 
         Returns:
-            Tuple of (text, prompt_tokens, generation_tokens).
+            One (generated_tokens, prompt_tokens) tuple per chunk.
         """
-        generated_tokens = []
-        prompt_tokens = 0
+        sampler = sampler or (lambda logprobs: mx.argmax(logprobs, axis=-1))
 
-        for token, _ in self.stream_generate(
-            audio_chunk,
-            max_tokens=max_tokens,
-            sampler=sampler,
-            logits_processors=logits_processors,
-            language=language,
-            prefill_step_size=prefill_step_size,
-            verbose=verbose,
-        ):
-            if prompt_tokens == 0:
-                # Get prompt tokens from first iteration
-                _, _, num_audio_tokens = self._preprocess_audio(audio_chunk)
-                input_ids = self._build_prompt(num_audio_tokens, language)
-                prompt_tokens = input_ids.shape[1]
-            generated_tokens.append(int(token))
+        # Encode every chunk in one padded, masked pass
+        input_features, feature_attention_mask, num_audio_tokens = (
+            self._extract_features(audio_chunks)
+        )
+        audio_features = self.get_audio_features(input_features, feature_attention_mask)
+        audio_features = mx.split(
+            audio_features, np.cumsum(num_audio_tokens)[:-1].tolist()
+        )
 
-        text = self._tokenizer.decode(generated_tokens, skip_special_tokens=True)
-        return text, prompt_tokens, len(generated_tokens)
+        prompts = [self._build_prompt(n, language) for n in num_audio_tokens]
+        prompt_lengths = [ids.shape[1] for ids in prompts]
+        max_length = max(prompt_lengths)
+        left_padding = [max_length - length for length in prompt_lengths]
+        inputs_embeds = mx.concatenate(
+            [
+                mx.pad(
+                    self._build_inputs_embeds(ids, features),
+                    [(0, 0), (pad, 0), (0, 0)],
+                )
+                for ids, features, pad in zip(prompts, audio_features, left_padding)
+            ],
+            axis=0,
+        )
+        mx.eval(inputs_embeds)
+        del input_features, feature_attention_mask, audio_features
+
+        # Prefill all but the last prompt position without the LM head
+        cache = self.make_batch_cache(left_padding)
+        for start in range(0, max_length - 1, prefill_step_size):
+            end = min(start + prefill_step_size, max_length - 1)
+            self.model(inputs_embeds=inputs_embeds[:, start:end], cache=cache)
+            mx.eval([c.state for c in cache])
+        logits = self._forward_with_embeds(inputs_embeds[:, -1:], cache)
+        del inputs_embeds
+
+        # Repetition penalties look at each row's own prompt and output
+        histories = (
+            [ids[0] for ids in prompts] if logits_processors is not None else None
+        )
+
+        def sample(logits: mx.array) -> mx.array:
+            logits = logits[:, -1, :]
+            if histories is not None:
+                rows = []
+                for i, tokens in enumerate(histories):
+                    row = logits[i : i + 1]
+                    for processor in logits_processors:
+                        row = processor(tokens, row)
+                    rows.append(row)
+                logits = mx.concatenate(rows, axis=0)
+            logprobs = logits - mx.logsumexp(logits, axis=-1, keepdims=True)
+            return sampler(logprobs)
+
+        def step(y: mx.array) -> mx.array:
+            logits = self._forward_with_embeds(
+                self.model.embed_tokens(y[:, None]), cache
+            )
+            return sample(logits)
+
+        generated = [[] for _ in audio_chunks]
+        active = list(range(len(audio_chunks)))
+        y = sample(logits)
+        mx.async_eval(y)
+
+        for n in range(max_tokens):
+            # Without logits processors the next step only depends on device
+            # state, so queue it before reading this step's tokens
+            next_y = None
+            if histories is None and n + 1 < max_tokens:
+                next_y = step(y)
+                mx.async_eval(next_y)
+
+            keep = []
+            for i, (row, token) in enumerate(zip(active, y.tolist())):
+                if token not in EOS_TOKEN_IDS:
+                    generated[row].append(token)
+                    keep.append(i)
+
+            if not keep or n + 1 >= max_tokens:
+                break
+
+            if len(keep) < len(active):
+                active = [active[i] for i in keep]
+                keep = mx.array(keep)
+                for c in cache:
+                    c.filter(keep)
+                y = y[keep]
+                if next_y is not None:
+                    next_y = next_y[keep]
+                if histories is not None:
+                    histories = [histories[i] for i in keep.tolist()]
+
+            if histories is not None:
+                histories = [
+                    mx.concatenate([tokens, y[i : i + 1]])
+                    for i, tokens in enumerate(histories)
+                ]
+                next_y = step(y)
+                mx.async_eval(next_y)
+
+            y = next_y
+
+        return list(zip(generated, prompt_lengths))
 
     def generate(
         self,
@@ -1021,18 +1110,25 @@ class Qwen3ASRModel(nn.Module):
         prefill_step_size: int = 2048,
         chunk_duration: float = 1200.0,
         min_chunk_duration: float = 1.0,
+        batch_size: int = 8,
         verbose: bool = False,
         stream: bool = False,
         **kwargs,
-    ) -> Union[STTOutput, Generator[str, None, None]]:
+    ) -> Union[STTOutput, List[STTOutput], Generator[str, None, None]]:
         """Generate transcription from audio.
 
-        Automatically chunks long audio and processes sequentially.
+        Automatically chunks long audio. Chunks from all inputs are transcribed
+        together in batches of up to ``batch_size``.
 
         Args:
+            audio: A single audio input, or a list of inputs to transcribe together.
             chunk_duration: Maximum chunk duration in seconds (default: 1200 = 20 min).
             min_chunk_duration: Minimum chunk duration in seconds (default: 1.0).
+            batch_size: Maximum number of chunks decoded together (default: 8).
             stream: If True, return a generator that yields tokens as they are generated.
+
+        Returns:
+            One STTOutput, or a list with one STTOutput per input if ``audio`` is a list.
         """
         # If streaming requested, delegate to stream_transcribe
         if stream:
@@ -1066,21 +1162,24 @@ class Qwen3ASRModel(nn.Module):
                 "Tokenizer/FeatureExtractor not initialized. Call post_load_hook first."
             )
 
-        # Load audio
-        audio_input = audio[0] if isinstance(audio, list) else audio
-        if isinstance(audio_input, str):
-            audio_input = load_audio(audio_input)
-        audio_np = (
-            np.array(audio_input) if isinstance(audio_input, mx.array) else audio_input
-        )
-
-        # Split into chunks if needed
-        chunks = split_audio_into_chunks(
-            audio_np,
-            sr=self.sample_rate,
-            chunk_duration=chunk_duration,
-            min_chunk_duration=min_chunk_duration,
-        )
+        # Load audio and split every input into chunks
+        audio_list = audio if isinstance(audio, list) else [audio]
+        chunks = []
+        for index, audio_input in enumerate(audio_list):
+            if isinstance(audio_input, str):
+                audio_input = load_audio(audio_input)
+            audio_np = (
+                np.array(audio_input)
+                if isinstance(audio_input, mx.array)
+                else audio_input
+            )
+            for chunk_audio, offset_sec in split_audio_into_chunks(
+                audio_np,
+                sr=self.sample_rate,
+                chunk_duration=chunk_duration,
+                min_chunk_duration=min_chunk_duration,
+            ):
+                chunks.append((index, chunk_audio, offset_sec))
 
         sampler = make_sampler(
             temperature,
@@ -1099,67 +1198,76 @@ class Qwen3ASRModel(nn.Module):
             else None
         )
 
-        # Process chunks
-        all_texts = []
-        segments = []
-        total_prompt_tokens = 0
-        total_generation_tokens = 0
+        # Batch chunks of similar length together to keep padding small
+        order = sorted(range(len(chunks)), key=lambda i: -len(chunks[i][1]))
+        batches = [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+        results = [None] * len(chunks)
 
-        chunk_iter = tqdm(
-            chunks, desc="Processing chunks", disable=not verbose or len(chunks) == 1
-        )
-        for chunk_audio, offset_sec in chunk_iter:
-            actual_chunk_duration = len(chunk_audio) / self.sample_rate
-
-            text, prompt_toks, gen_toks = self._generate_single_chunk(
-                chunk_audio,
+        for batch in tqdm(
+            batches, desc="Processing chunks", disable=not verbose or len(batches) == 1
+        ):
+            outputs = self._generate_chunk_batch(
+                [chunks[i][1] for i in batch],
                 max_tokens=max_tokens,
                 sampler=sampler,
                 logits_processors=logits_processors,
                 language=language,
                 prefill_step_size=prefill_step_size,
-                verbose=verbose
-                and len(chunks) == 1,  # Only show inner progress for single chunk
-            )
-            all_texts.append(text)
-            total_prompt_tokens += prompt_toks
-            total_generation_tokens += gen_toks
-
-            # Create segment for this chunk
-            segments.append(
-                {
-                    "text": text,
-                    "start": offset_sec,
-                    "end": offset_sec + actual_chunk_duration,
-                }
             )
+            for i, output in zip(batch, outputs):
+                results[i] = output
 
-            # Clear cache between chunks
+            # Clear cache between batches
             mx.clear_cache()
 
         end_time = time.time()
+        total_time = end_time - start_time
 
-        # Combine transcriptions
-        full_text = " ".join(all_texts)
-
-        return STTOutput(
-            text=full_text,
-            segments=segments,
-            prompt_tokens=total_prompt_tokens,
-            generation_tokens=total_generation_tokens,
-            total_tokens=total_prompt_tokens + total_generation_tokens,
-            total_time=end_time - start_time,
-            prompt_tps=(
-                total_prompt_tokens / (end_time - start_time)
-                if end_time > start_time
-                else 0
-            ),
-            generation_tps=(
-                total_generation_tokens / (end_time - start_time)
-                if end_time > start_time
-                else 0
-            ),
-        )
+        outputs = []
+        for index in range(len(audio_list)):
+            all_texts = []
+            segments = []
+            total_prompt_tokens = 0
+            total_generation_tokens = 0
+
+            for (chunk_index, chunk_audio, offset_sec), (tokens, prompt_toks) in zip(
+                chunks, results
+            ):
+                if chunk_index != index:
+                    continue
+                text = self._tokenizer.decode(tokens, skip_special_tokens=True)
+                all_texts.append(text)
+                total_prompt_tokens += prompt_toks
+                total_generation_tokens += len(tokens)
+
+                # Create segment for this chunk
+                segments.append(
+                    {
+                        "text": text,
+                        "start": offset_sec,
+                        "end": offset_sec + len(chunk_audio) / self.sample_rate,
+                    }
+                )
+
+            outputs.append(
+                STTOutput(
+                    # Combine transcriptions
+                    text=" ".join(all_texts),
+                    segments=segments,
+                    prompt_tokens=total_prompt_tokens,
+                    generation_tokens=total_generation_tokens,
+                    total_tokens=total_prompt_tokens + total_generation_tokens,
+                    total_time=total_time,
+                    prompt_tps=(
+                        total_prompt_tokens / total_time if total_time > 0 else 0
+                    ),
+                    generation_tps=(
+                        total_generation_tokens / total_time if total_time > 0 else 0
+                    ),
+                )
+            )
+
+        return outputs if isinstance(audio, list) else outputs[0]
 
     def stream_transcribe(
         self,
@@ -80,3 +80,94 @@ def log_mel_spectrogram(
     log_spec = mx.maximum(log_spec, log_spec.max() - 8.0)
     log_spec = (log_spec + 4.0) / 4.0
     return log_spec
+
+
+class IncrementalLogMel:
+    """Compute the log-Mel spectrogram of a stream chunk by chunk.
+
+    Produces the same frames as :func:`log_mel_spectrogram` on the concatenated
+    audio: the STFT overlap (``N_FFT - HOP_LENGTH`` samples) is carried between
+    calls and the reflect padding is applied only at the true start and end of
+    the stream. The dynamic range clamp uses the running maximum, so frames
+    emitted before a louder passage arrives are clamped less aggressively than
+    they would be offline.
+
+    Example:
+        >>> log_mel = IncrementalLogMel(n_mels=80)
+        >>> for i, chunk in enumerate(chunks):
+        ...     mel = log_mel(chunk, final=i == len(chunks) - 1)
+    """
+
+    def __init__(self, n_mels: int = 80):
+        self.window = hanning(N_FFT)
+        self.filters = mel_filters(
+            SAMPLE_RATE, N_FFT, n_mels, norm="slaney", mel_scale=None
+        )
+        self.n_mels = n_mels
+        self.reset()
+
+    def reset(self):
+        self._buffer = mx.zeros((0,))
+        self._tail = mx.zeros((0,))
+        self._started = False
+        self._max = None
+
+    def __call__(self, audio, final: bool = False) -> mx.array:
+        """Return the frames completed by ``audio``, shape ``(n_frames, n_mels)``.
+
+        Args:
+            audio: The next samples of the 16 kHz waveform.
+            final: Flush the end of the stream (reflect padded like the
+                offline spectrogram). The state is reset afterwards.
+        """
+        if not isinstance(audio, mx.array):
+            audio = mx.array(audio)
+        audio = audio.astype(mx.float32)
+        pad = N_FFT // 2
+
+        self._tail = mx.concatenate([self._tail, audio])[-(pad + 1) :]
+        self._buffer = mx.concatenate([self._buffer, audio])
+        if not self._started:
+            if self._buffer.shape[0] <= pad:
+                # Not enough samples to reflect pad the start yet
+                if final:
+                    self.reset()
+                return mx.zeros((0, self.n_mels))
+            prefix = self._buffer[1 : pad + 1][::-1]
+            self._buffer = mx.concatenate([prefix, self._buffer])
+            self._started = True
+
+        if final:
+            suffix = self._tail[-(pad + 1) : -1][::-1]
+            self._buffer = mx.concatenate([self._buffer, suffix])
+
+        n_frames = 1 + (self._buffer.shape[0] - N_FFT) // HOP_LENGTH
+        if n_frames <= 0 or (final and n_frames <= 1):
+            if final:
+                self.reset()
+            return mx.zeros((0, self.n_mels))
+
+        freqs = stft(
+            self._buffer[: (n_frames - 1) * HOP_LENGTH + N_FFT],
+            window=self.window,
+            n_fft=N_FFT,
+            hop_length=HOP_LENGTH,
+            center=False,
+        )
+        if final:
+            # The offline spectrogram drops the frame centred past the end
+            freqs = freqs[:-1]
+        magnitudes = freqs.abs().square()
+        mel_spec = magnitudes @ self.filters.T
+
+        log_spec = mx.maximum(mel_spec, 1e-10).log10()
+        chunk_max = log_spec.max()
+        self._max = chunk_max if self._max is None else mx.maximum(self._max, chunk_max)
+        log_spec = mx.maximum(log_spec, self._max - 8.0)
+        log_spec = (log_spec + 4.0) / 4.0
+
+        if final:
+            self.reset()
+        else:
+            self._buffer = self._buffer[n_frames * HOP_LENGTH :]
+        return log_spec
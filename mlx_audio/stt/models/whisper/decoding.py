@@ -190,7 +190,10 @@ class Inference:
     def rearrange_kv_cache(self, source_indices):
         """Update the key-value cache according to the updated beams"""
         # update the key/value cache to contain the selected sequences
-        if source_indices != list(range(len(source_indices))):
+        # (indices given as an mx.array are gathered without a host sync)
+        if isinstance(source_indices, mx.array) or source_indices != list(
+            range(len(source_indices))
+        ):
             self.kv_cache = tree_map(lambda x: x[source_indices], self.kv_cache)
 
     def reset(self):
@@ -311,7 +314,7 @@ class GreedyDecoder(TokenDecoder):
         else:
             next_tokens = categorical(logits, self.temperature)
 
-        logprobs = logits - mx.logsumexp(logits, axis=-1)
+        logprobs = logits - mx.logsumexp(logits, axis=-1, keepdims=True)
 
         current_logprobs = logprobs[mx.arange(logprobs.shape[0]), next_tokens]
         sum_logprobs += current_logprobs * (tokens[:, -1] != self.eot)
@@ -329,6 +332,167 @@ class GreedyDecoder(TokenDecoder):
         return tokens, sum_logprobs
 
 
+class BeamSearchDecoder(TokenDecoder):
+    """Beam search over all audio inputs at once.
+
+    Every beam of every input is a row of the batch, so each step is a single
+    forward pass. Candidate selection, finished-sequence bookkeeping and the
+    KV cache reordering are array operations; nothing is pulled back to the
+    host until :meth:`finalize`.
+    """
+
+    def __init__(
+        self,
+        beam_size: int,
+        eot: int,
+        inference: Inference,
+        patience: Optional[float] = None,
+    ):
+        self.beam_size = beam_size
+        self.eot = eot
+        self.inference = inference
+        self.patience = patience or 1.0
+        self.max_candidates: int = round(beam_size * self.patience)
+
+        assert (
+            self.max_candidates > 0
+        ), f"Invalid beam size ({beam_size}) or patience ({patience})"
+        self.reset()
+
+    def reset(self):
+        # finished sequences per audio input, padded with EOT, their scores and
+        # how many of the max_candidates slots are used
+        self.finished_tokens = None
+        self.finished_logprobs = None
+        self.finished_count = None
+
+    def update(
+        self, tokens: mx.array, logits: mx.array, sum_logprobs: mx.array
+    ) -> Tuple[mx.array, bool, mx.array]:
+        n_rows, n_vocab = logits.shape
+        if n_rows % self.beam_size != 0:
+            raise ValueError(f"{n_rows} rows are not divisible by {self.beam_size}")
+        n_audio = n_rows // self.beam_size
+        n_candidates = 2 * self.beam_size
+        audio_idx = mx.arange(n_audio)[:, None]
+
+        first_step = self.finished_tokens is None
+        if first_step:
+            # one extra slot absorbs writes that should be dropped
+            self.finished_tokens = mx.full(
+                (n_audio, self.max_candidates + 1, tokens.shape[-1]),
+                self.eot,
+                dtype=tokens.dtype,
+            )
+            self.finished_logprobs = mx.full(
+                (n_audio, self.max_candidates + 1), -mx.inf
+            )
+            self.finished_count = mx.zeros((n_audio,), dtype=mx.int32)
+
+        logprobs = logits - mx.logsumexp(logits, axis=-1, keepdims=True)
+        scores = sum_logprobs[:, None] + logprobs
+        if first_step:
+            # all beams start from the same prefix; expand only the first one
+            first_beam = (mx.arange(n_rows) % self.beam_size == 0)[:, None]
+            scores = mx.where(first_beam, scores, -mx.inf)
+        scores = scores.reshape(n_audio, self.beam_size * n_vocab)
+
+        # the best 2 * beam_size continuations always hold beam_size non-EOT
+        # ones, since every beam contributes at most one EOT candidate
+        top = mx.argpartition(-scores, kth=n_candidates - 1, axis=-1)
+        top = top[:, :n_candidates]
+        top_logprobs = mx.take_along_axis(scores, top, axis=-1)
+        order = mx.argsort(-top_logprobs, axis=-1)
+        top = mx.take_along_axis(top, order, axis=-1)
+        top_logprobs = mx.take_along_axis(top_logprobs, order, axis=-1)
+        source_rows = top // n_vocab + audio_idx * self.beam_size
+        next_tokens = (top % n_vocab).astype(tokens.dtype)
+        is_eot = next_tokens == self.eot
+
+        # the next beams are the first beam_size non-EOT candidates
+        rank = mx.cumsum(mx.logical_not(is_eot).astype(mx.int32), axis=-1) - 1
+        selected = mx.argsort(mx.where(is_eot, n_candidates, rank), axis=-1)[
+            :, : self.beam_size
+        ]
+
+        # EOT candidates ranked above the last selected beam finish
+        position = mx.arange(n_candidates)[None, :]
+        finished = is_eot & (position < selected[:, -1:])
+        slot = (
+            self.finished_count[:, None]
+            + mx.cumsum(finished.astype(mx.int32), axis=-1)
+            - 1
+        )
+        slot = mx.where(
+            finished & (slot < self.max_candidates), slot, self.max_candidates
+        )
+        finished_tokens = mx.pad(
+            self.finished_tokens,
+            [(0, 0), (0, 0), (0, 1)],
+            constant_values=self.eot,
+        )
+        candidates = mx.concatenate(
+            [tokens[source_rows], next_tokens[..., None]], axis=-1
+        )
+        finished_tokens[audio_idx, slot] = candidates
+        self.finished_logprobs[audio_idx, slot] = top_logprobs
+        self.finished_tokens = finished_tokens
+        self.finished_count = mx.minimum(
+            self.finished_count + finished.sum(axis=-1), self.max_candidates
+        )
+
+        source_rows = mx.take_along_axis(source_rows, selected, axis=-1).flatten()
+        next_tokens = mx.take_along_axis(next_tokens, selected, axis=-1).flatten()
+        sum_logprobs = mx.take_along_axis(top_logprobs, selected, axis=-1).flatten()
+        self.inference.rearrange_kv_cache(source_rows)
+        tokens = mx.concatenate([tokens[source_rows], next_tokens[:, None]], axis=-1)
+
+        completed = mx.all(self.finished_count >= self.max_candidates)
+        return tokens, completed, sum_logprobs
+
+    def finalize(self, preceding_tokens: mx.array, sum_logprobs: mx.array):
+        n_audio, n_beams, length = preceding_tokens.shape
+        live_tokens = mx.pad(
+            preceding_tokens, [(0, 0), (0, 0), (0, 1)], constant_values=self.eot
+        )
+        if self.finished_tokens is None:
+            return live_tokens, sum_logprobs
+
+        finished_tokens = self.finished_tokens[:, : self.max_candidates]
+        finished_logprobs = self.finished_logprobs[:, : self.max_candidates]
+        # a step past completion may have grown the finished buffer
+        length = max(live_tokens.shape[-1], finished_tokens.shape[-1])
+        live_tokens, finished_tokens = (
+            mx.pad(
+                t,
+                [(0, 0), (0, 0), (0, length - t.shape[-1])],
+                constant_values=self.eot,
+            )
+            for t in (live_tokens, finished_tokens)
+        )
+
+        # fill up to beam_size candidates with the best unfinished beams, which
+        # are kept sorted by score
+        count = self.finished_count[:, None]
+        valid = mx.concatenate(
+            [
+                mx.arange(self.max_candidates)[None] < count,
+                mx.arange(n_beams)[None] < self.beam_size - count,
+            ],
+            axis=-1,
+        )
+        tokens = mx.concatenate([finished_tokens, live_tokens], axis=1)
+        logprobs = mx.concatenate([finished_logprobs, sum_logprobs], axis=1)
+
+        # unused slots repeat a valid candidate so they never change the ranking
+        filler = mx.where(count > 0, 0, self.max_candidates)
+        filler_tokens = mx.take_along_axis(tokens, filler[..., None], axis=1)
+        filler_logprobs = mx.take_along_axis(logprobs, filler, axis=1)
+        tokens = mx.where(valid[..., None], tokens, filler_tokens)
+        logprobs = mx.where(valid, logprobs, filler_logprobs)
+        return tokens, logprobs
+
+
 class LogitFilter:
     def apply(self, logits: mx.array, tokens: mx.array) -> mx.array:
         """Apply any filtering or masking to logits
@@ -426,7 +590,7 @@ class ApplyTimestampRules(LogitFilter):
 
         # if sum of probability over timestamps is above any other token, sample timestamp
         mask = mx.array(mask)
-        logprobs = logits - mx.logsumexp(logits, axis=-1)
+        logprobs = logits - mx.logsumexp(logits, axis=-1, keepdims=True)
         timestamp_logprob = logprobs[:, self.tokenizer.timestamp_begin :].logsumexp(
             axis=-1, keepdims=True
         )
@@ -475,7 +639,9 @@ class DecodingTask:
 
         # decoder: implements how to select the next tokens, given the autoregressive distribution
         if options.beam_size is not None:
-            raise NotImplementedError("Beam search decoder is not yet implemented")
+            self.decoder = BeamSearchDecoder(
+                options.beam_size, tokenizer.eot, self.inference, options.patience
+            )
         else:
             self.decoder = GreedyDecoder(options.temperature, tokenizer.eot)
 
@@ -658,9 +824,8 @@ class DecodingTask:
             tokens = mx.broadcast_to(
                 tokens, [n_audio, self.n_group, len(self.initial_tokens)]
             )
-            tokens = tokens.reshape(
-                tokens, (n_audio * self.n_group, len(self.initial_tokens))
-            )
+            tokens = tokens.reshape(n_audio * self.n_group, len(self.initial_tokens))
+            audio_features = mx.repeat(audio_features, self.n_group, axis=0)
 
         # call the main sampling loop
         tokens, sum_logprobs, no_speech_probs = self._main_loop(audio_features, tokens)
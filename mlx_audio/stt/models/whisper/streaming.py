@@ -22,11 +22,15 @@ class StreamingConfig:
             Lower = faster but may cut words. Default 25 (~0.5s at 50 tokens/sec).
         min_chunk_duration: Minimum audio duration (seconds) before processing.
         emit_partial: Whether to emit partial (uncommitted) results.
+        incremental: Reuse the decoder KV cache of already emitted tokens and
+            the encoder output across chunks instead of re-decoding the whole
+            window from the SOT sequence on every chunk.
     """
 
     frame_threshold: int = 25
     min_chunk_duration: float = 0.5
     emit_partial: bool = True
+    incremental: bool = True
 
 
 @dataclass
@@ -107,6 +111,13 @@ class StreamingDecoder:
     The key insight is that we accumulate mel spectrograms across chunks rather
     than processing each chunk independently. This allows the model to maintain
     context as more audio arrives.
+
+    In incremental mode (the default) emitted tokens become a fixed decoder
+    prefix: their self-attention keys/values are kept between chunks and only
+    the cross-attention is recomputed against the new encoder output, so each
+    chunk decodes just the new tokens. The encoder only runs when new frames
+    arrive. When the 30-second window (or half the text context) fills up, the
+    audio already covered by emitted tokens is dropped and a new window starts.
     """
 
     def __init__(
@@ -135,9 +146,7 @@ class StreamingDecoder:
         self.config = config or StreamingConfig()
         self.inference = Inference(model)
         self.tokenizer = model.get_tokenizer(language=language or "en", task=task)
-        self._emitted_tokens = []
-        self._pending_tokens = []
-        self._accumulated_mel = None
+        self.reset()
 
         # Use sot_sequence with notimestamps for text-only output
         self._sot_sequence = self.tokenizer.sot_sequence_including_notimestamps
@@ -160,6 +169,65 @@ class StreamingDecoder:
         self._emitted_tokens = []
         self._pending_tokens = []
         self._accumulated_mel = None
+        self._audio_features = None
+        self._reset_context()
+
+    def _reset_context(self):
+        # Tokens decoded in the current window and the decoder cache covering
+        # the SOT sequence plus all of them but the last
+        self._context_tokens = []
+        self._prefix_kv_cache = None
+        # Mel frames of the current window already covered by emitted tokens
+        self._consumed_frames = 0
+
+    def _append_mel(self, mel: mx.array):
+        from mlx_audio.stt.models.whisper.audio import N_FRAMES
+
+        if mel.shape[0] == 0:
+            return
+
+        # Accumulate mel spectrogram across chunks
+        if self._accumulated_mel is None:
+            self._accumulated_mel = mel
+        else:
+            self._accumulated_mel = mx.concatenate([self._accumulated_mel, mel], axis=0)
+        self._audio_features = None
+
+        overflow = self._accumulated_mel.shape[0] - N_FRAMES
+        if not self.config.incremental:
+            # Trim to max 30 seconds if accumulated too much (sliding window)
+            if overflow > 0:
+                self._accumulated_mel = self._accumulated_mel[-N_FRAMES:]
+            return
+
+        context_full = (
+            len(self._sot_sequence) + len(self._context_tokens)
+            >= self.model.dims.n_text_ctx // 2
+        )
+        if overflow > 0 or context_full:
+            # Start a new window after the audio the emitted tokens cover
+            drop = max(overflow, self._consumed_frames)
+            self._accumulated_mel = self._accumulated_mel[drop:]
+            self._reset_context()
+
+    def _encode(self) -> mx.array:
+        from mlx_audio.stt.models.whisper.audio import N_FRAMES, pad_or_trim
+
+        if self._audio_features is None:
+            # Pad mel to required size for encoder
+            mel_padded = pad_or_trim(self._accumulated_mel, N_FRAMES, axis=-2)
+
+            # Add batch dimension if needed
+            if mel_padded.ndim == 2:
+                mel_padded = mel_padded[None, :]
+
+            self._audio_features = self.model.encoder(
+                mel_padded.astype(self.model.dtype)
+            )
+            if self._prefix_kv_cache is not None:
+                # Cross-attention keys/values are stale for the new features
+                self._prefix_kv_cache = [(kv, None) for kv, _ in self._prefix_kv_cache]
+        return self._audio_features
 
     def decode_chunk(self, mel: mx.array, is_last: bool = False) -> StreamingResult:
         """Decode an audio chunk using AlignAtt streaming.
@@ -175,46 +243,40 @@ class StreamingDecoder:
         Returns:
             StreamingResult with decoded text and metadata.
         """
-        from mlx_audio.stt.models.whisper.audio import (
-            N_FRAMES,
-            TOKENS_PER_SECOND,
-            pad_or_trim,
-        )
+        from mlx_audio.stt.models.whisper.audio import TOKENS_PER_SECOND
 
-        # Accumulate mel spectrogram across chunks
+        self._append_mel(mel)
         if self._accumulated_mel is None:
-            self._accumulated_mel = mel
-        else:
-            self._accumulated_mel = mx.concatenate([self._accumulated_mel, mel], axis=0)
-
-        # Trim to max 30 seconds if accumulated too much (sliding window)
-        if self._accumulated_mel.shape[0] > N_FRAMES:
-            self._accumulated_mel = self._accumulated_mel[-N_FRAMES:]
-
-        # Reset KV cache for fresh decoding of accumulated audio
-        self.inference.reset()
-
-        # Pad mel to required size for encoder
-        mel_padded = pad_or_trim(self._accumulated_mel, N_FRAMES, axis=-2)
-
-        # Add batch dimension if needed
-        if mel_padded.ndim == 2:
-            mel_padded = mel_padded[None, :]
+            return StreamingResult(
+                text="", tokens=[], is_final=is_last, start_time=0.0, end_time=0.0
+            )
 
-        # Encode audio
-        audio_features = self.model.encoder(mel_padded.astype(self.model.dtype))
+        # Encode audio (cached until new frames arrive)
+        audio_features = self._encode()
         content_frames = self._accumulated_mel.shape[0] // 2  # Encoder has stride 2
 
-        # Initialize tokens with SOT sequence (including notimestamps)
-        tokens = mx.array([list(self._sot_sequence)])
+        # Start from the SOT sequence (including notimestamps), followed by the
+        # tokens already decoded in this window when decoding incrementally
+        if self.config.incremental:
+            prefix = list(self._sot_sequence) + self._context_tokens
+            if self._prefix_kv_cache is not None:
+                self.inference.kv_cache = list(self._prefix_kv_cache)
+            else:
+                self.inference.reset()
+        else:
+            prefix = list(self._sot_sequence)
+            self.inference.reset()
+        tokens = mx.array([prefix])
 
         # Decode loop with AlignAtt
-        # First iteration: pass all initial tokens; subsequent: only last token
-        first_iteration = True
-        for _ in range(self.model.dims.n_text_ctx // 2):
-            inputs = tokens if first_iteration else tokens[:, -1:]
-            first_iteration = False
-
+        # First iteration: pass all uncached tokens; subsequent: only last token
+        inputs = tokens if self.inference.kv_cache is None else tokens[:, -1:]
+        alignment_heads = getattr(self.model, "alignment_heads", None)
+        most_attended = None
+        max_steps = min(
+            self.model.dims.n_text_ctx // 2, self.model.dims.n_text_ctx - len(prefix)
+        )
+        for _ in range(max_steps):
             logits, cross_qk = self.inference.logits_with_cross_qk(
                 inputs,
                 audio_features,
@@ -234,15 +296,11 @@ class StreamingDecoder:
                 break
 
             tokens = mx.concatenate([tokens, mx.array([[next_token]])], axis=-1)
+            inputs = tokens[:, -1:]
 
             # Check AlignAtt condition (only if we have alignment heads)
-            if (
-                hasattr(self.model, "alignment_heads")
-                and self.model.alignment_heads is not None
-            ):
-                most_attended = get_most_attended_frame(
-                    cross_qk, self.model.alignment_heads
-                )
+            if alignment_heads is not None:
+                most_attended = get_most_attended_frame(cross_qk, alignment_heads)
                 threshold = 4 if is_last else self.config.frame_threshold
                 if should_emit(
                     most_attended,
@@ -251,16 +309,36 @@ class StreamingDecoder:
                 ):
                     break
 
-        # Extract text tokens (excluding special tokens)
-        text_tokens = [
-            t
-            for t in tokens[0].tolist()
-            if t < self.tokenizer.eot and t not in self.tokenizer.sot_sequence
-        ]
+        decoded = tokens[0].tolist()
 
-        # Calculate what's new since last emission
-        new_tokens = text_tokens[len(self._emitted_tokens) :]
-        self._emitted_tokens = text_tokens
+        # Extract text tokens (excluding special tokens)
+        def text_only(token_ids):
+            return [
+                t
+                for t in token_ids
+                if t < self.tokenizer.eot and t not in self.tokenizer.sot_sequence
+            ]
+
+        if self.config.incremental:
+            new_tokens = text_only(decoded[len(prefix) :])
+            self._emitted_tokens = self._emitted_tokens + new_tokens
+            self._context_tokens = decoded[len(self._sot_sequence) :]
+            # Keep the cache for every token but the last, which is fed as the
+            # first input of the next chunk
+            keep = len(decoded) - 1
+            self._prefix_kv_cache = [
+                ((kv[0][:, :keep], kv[1][:, :keep]), cross_kv)
+                for kv, cross_kv in self.inference.kv_cache
+            ]
+            if alignment_heads is None:
+                self._consumed_frames = self._accumulated_mel.shape[0]
+            elif most_attended is not None:
+                self._consumed_frames = 2 * most_attended
+        else:
+            text_tokens = text_only(decoded)
+            # Calculate what's new since last emission
+            new_tokens = text_tokens[len(self._emitted_tokens) :]
+            self._emitted_tokens = text_tokens
 
         emit_start_time = (
             len(self._emitted_tokens) - len(new_tokens)
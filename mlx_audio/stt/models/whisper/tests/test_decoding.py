@@ -0,0 +1,144 @@
+"""Tests for Whisper decoding strategies."""
+
+import math
+from unittest.mock import MagicMock
+
+import mlx.core as mx
+import pytest
+
+
+class RecordingInference:
+    """Stands in for Inference and records KV cache reorderings."""
+
+    def __init__(self):
+        self.source_indices = []
+
+    def rearrange_kv_cache(self, source_indices):
+        self.source_indices.append(source_indices.tolist())
+
+
+def log_probs(*rows):
+    return mx.log(mx.array(rows, dtype=mx.float32))
+
+
+class TestBeamSearchDecoder:
+    """Test the vectorized beam search decoder."""
+
+    EOT = 3
+
+    def test_update_and_finalize(self):
+        """Beams branch, finished sequences are kept and ranked at the end."""
+        from mlx_audio.stt.models.whisper.decoding import BeamSearchDecoder
+
+        inference = RecordingInference()
+        decoder = BeamSearchDecoder(2, self.EOT, inference)
+        tokens = mx.array([[9, 9], [9, 9]])
+
+        # Both beams share the prefix, so only the first one is expanded:
+        # EOT finishes and the next two candidates become the beams
+        logits = log_probs([0.1, 0.3, 0.2, 0.4], [0.1, 0.3, 0.2, 0.4])
+        tokens, completed, sum_logprobs = decoder.update(tokens, logits, mx.zeros((2,)))
+        assert tokens.tolist() == [[9, 9, 1], [9, 9, 2]]
+        assert inference.source_indices == [[0, 0]]
+        assert not completed
+        assert decoder.finished_count.tolist() == [1]
+
+        # The second beam ends on EOT and fills the last finished slot
+        logits = log_probs([0.5, 0.4, 0.05, 0.05], [0.05, 0.05, 0.1, 0.8])
+        tokens, completed, sum_logprobs = decoder.update(tokens, logits, sum_logprobs)
+        assert tokens.tolist() == [[9, 9, 1, 0], [9, 9, 1, 1]]
+        assert inference.source_indices[-1] == [0, 0]
+        assert completed
+
+        candidates, scores = decoder.finalize(
+            tokens.reshape(1, 2, -1), sum_logprobs.reshape(1, 2)
+        )
+        # Unused slots repeat a finished candidate
+        ranked = dict(
+            zip(
+                (tuple(t[: t.index(self.EOT)]) for t in candidates.tolist()[0]),
+                scores.tolist()[0],
+            )
+        )
+        assert ranked == pytest.approx(
+            {(9, 9): math.log(0.4), (9, 9, 2): math.log(0.16)}
+        )
+
+    def test_patience_and_unfinished_beams(self):
+        """Patience waits for more candidates; live beams fill missing ones."""
+        from mlx_audio.stt.models.whisper.decoding import BeamSearchDecoder
+
+        decoder = BeamSearchDecoder(2, self.EOT, RecordingInference(), patience=2.0)
+        assert decoder.max_candidates == 4
+
+        logits = log_probs([0.1, 0.3, 0.2, 0.4], [0.1, 0.3, 0.2, 0.4])
+        tokens, completed, sum_logprobs = decoder.update(
+            mx.array([[9], [9]]), logits, mx.zeros((2,))
+        )
+        assert not completed
+
+        # Stopped early: the best live beam is added to reach beam_size
+        candidates, scores = decoder.finalize(
+            tokens.reshape(1, 2, -1), sum_logprobs.reshape(1, 2)
+        )
+        candidates = {tuple(t[: t.index(self.EOT)]) for t in candidates.tolist()[0]}
+        assert candidates == {(9,), (9, 1)}
+
+
+class TestBeamSearchDecoding:
+    """Test beam search through DecodingTask with a tiny model."""
+
+    @pytest.fixture
+    def tiny_model(self):
+        from mlx_audio.stt.models.whisper.whisper import Model, ModelDimensions
+
+        dims = ModelDimensions(
+            n_mels=80,
+            n_audio_ctx=1500,
+            n_audio_state=32,
+            n_audio_head=2,
+            n_audio_layer=1,
+            n_vocab=64,
+            n_text_ctx=64,
+            n_text_state=32,
+            n_text_head=2,
+            n_text_layer=2,
+        )
+        mx.random.seed(0)
+        model = Model(dims, dtype=mx.float32)
+
+        tokenizer = MagicMock()
+        tokenizer.eot = 50
+        tokenizer.sot = 51
+        tokenizer.sot_sequence = (51, 52)
+        tokenizer.sot_sequence_including_notimestamps = (51, 52, 53)
+        tokenizer.transcribe, tokenizer.translate = 54, 55
+        tokenizer.sot_prev, tokenizer.sot_lm = 56, 57
+        tokenizer.no_speech = None
+        tokenizer.non_speech_tokens = []
+        tokenizer.encode = lambda text: [1]
+        tokenizer.decode = lambda tokens: " ".join(map(str, tokens))
+        model.get_tokenizer = lambda language=None, task=None: tokenizer
+        return model
+
+    def _decode(self, model, mel, **kwargs):
+        from mlx_audio.stt.models.whisper.decoding import DecodingOptions, decode
+
+        options = DecodingOptions(
+            language="en", without_timestamps=True, fp16=False, **kwargs
+        )
+        return decode(model, mel, options)
+
+    def test_single_beam_matches_greedy(self, tiny_model):
+        mel = mx.random.normal((2, 3000, 80))
+        greedy = self._decode(tiny_model, mel, temperature=0.0)
+        beam = self._decode(tiny_model, mel, beam_size=1)
+        assert [r.tokens for r in beam] == [r.tokens for r in greedy]
+
+    def test_beam_search_batch(self, tiny_model):
+        mel = mx.random.normal((2, 3000, 80))
+        greedy = self._decode(tiny_model, mel, temperature=0.0)
+        beam = self._decode(tiny_model, mel, beam_size=4, patience=1.5)
+        assert len(beam) == 2
+        for b, g in zip(beam, greedy):
+            assert b.avg_logprob >= g.avg_logprob - 1e-4
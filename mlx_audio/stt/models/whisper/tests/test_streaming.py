@@ -471,3 +471,148 @@ class TestSharedHelpers:
         assert len(tokens) > 0
         # Should include non-speech tokens
         assert any(t in tokens for t in tokenizer.non_speech_tokens)
+
+
+class TestIncrementalLogMel:
+    """Test chunked log-mel computation."""
+
+    def test_matches_offline_spectrogram(self):
+        """Chunked frames equal the spectrogram of the whole signal."""
+        import mlx.core as mx
+
+        from mlx_audio.stt.models.whisper.audio import (
+            IncrementalLogMel,
+            log_mel_spectrogram,
+        )
+
+        audio = np.random.default_rng(0).standard_normal(16037).astype(np.float32)
+        expected = log_mel_spectrogram(audio * 0.1)
+
+        log_mel = IncrementalLogMel()
+        frames, start = [], 0
+        for size in [150, 1000, 37, 4000, 5000, 6000]:
+            end = min(start + size, len(audio))
+            frames.append(log_mel(audio[start:end] * 0.1, final=end == len(audio)))
+            start = end
+
+        result = mx.concatenate(frames)
+        assert result.shape == expected.shape
+        assert mx.allclose(result, expected, atol=1e-5)
+
+
+class TestIncrementalDecoding:
+    """Test prefix and encoder reuse in StreamingDecoder."""
+
+    @pytest.fixture
+    def tiny_model(self):
+        """Create a tiny random Whisper model with a stub tokenizer."""
+        from unittest.mock import MagicMock
+
+        import mlx.core as mx
+
+        from mlx_audio.stt.models.whisper.whisper import Model, ModelDimensions
+
+        dims = ModelDimensions(
+            n_mels=80,
+            n_audio_ctx=1500,
+            n_audio_state=32,
+            n_audio_head=2,
+            n_audio_layer=1,
+            n_vocab=64,
+            n_text_ctx=64,
+            n_text_state=32,
+            n_text_head=2,
+            n_text_layer=2,
+        )
+        mx.random.seed(0)
+        model = Model(dims, dtype=mx.float32)
+
+        tokenizer = MagicMock()
+        tokenizer.eot = 50
+        tokenizer.sot_sequence = (51, 52)
+        tokenizer.sot_sequence_including_notimestamps = (51, 52, 53)
+        tokenizer.no_timestamps = 53
+        tokenizer.transcribe, tokenizer.translate = 54, 55
+        tokenizer.sot, tokenizer.sot_prev, tokenizer.sot_lm = 51, 56, 57
+        tokenizer.no_speech = None
+        tokenizer.non_speech_tokens = []
+        tokenizer.encode = lambda text: [1]
+        tokenizer.decode = lambda tokens: " ".join(map(str, tokens))
+        model.get_tokenizer = lambda language=None, task=None: tokenizer
+        return model
+
+    def _record_calls(self, decoder):
+        inputs, encoded = [], []
+        logits_with_cross_qk = decoder.inference.logits_with_cross_qk
+        encoder = decoder.model.encoder
+
+        def record_logits(tokens, audio_features):
+            inputs.append(tokens.shape[1])
+            return logits_with_cross_qk(tokens, audio_features)
+
+        def record_encoder(mel):
+            encoded.append(mel.shape)
+            return encoder(mel)
+
+        decoder.inference.logits_with_cross_qk = record_logits
+        decoder.model.encoder = record_encoder
+        return inputs, encoded
+
+    def test_reuses_prefix_and_encoder_output(self, tiny_model):
+        """Later chunks feed one token and skip the encoder without new audio."""
+        import mlx.core as mx
+
+        from mlx_audio.stt.models.whisper.streaming import StreamingDecoder
+
+        decoder = StreamingDecoder(tiny_model)
+        inputs, encoded = self._record_calls(decoder)
+        mel = mx.random.normal((100, 80))
+
+        decoder.decode_chunk(mel)
+        assert inputs[0] == 3  # SOT sequence
+        del inputs[:]
+
+        decoder.decode_chunk(mel)
+        decoder.decode_chunk(mx.zeros((0, 80)), is_last=True)
+        assert all(n == 1 for n in inputs)
+        assert len(encoded) == 2
+
+    def test_prefix_cache_matches_full_decode(self, tiny_model):
+        """The kept cache equals a fresh forward pass over the same tokens."""
+        import mlx.core as mx
+
+        from mlx_audio.stt.models.whisper.streaming import StreamingDecoder
+
+        decoder = StreamingDecoder(tiny_model)
+        decoder.decode_chunk(mx.random.normal((100, 80)))
+        # Chunks without new frames keep decoding against the same features
+        for _ in range(3):
+            decoder.decode_chunk(mx.zeros((0, 80)))
+
+        tokens = list(decoder._sot_sequence) + decoder._context_tokens
+        assert len(tokens) > 4
+        _, kv_cache, _ = tiny_model.decoder(
+            mx.array([tokens[:-1]]), decoder._audio_features
+        )
+        for (kv, _), (expected, _) in zip(decoder._prefix_kv_cache, kv_cache):
+            assert kv[0].shape == expected[0].shape
+            assert mx.allclose(kv[0], expected[0], atol=1e-4)
+            assert mx.allclose(kv[1], expected[1], atol=1e-4)
+
+    def test_full_redecode_mode(self, tiny_model):
+        """incremental=False re-decodes from the SOT sequence on every chunk."""
+        import mlx.core as mx
+
+        from mlx_audio.stt.models.whisper.streaming import (
+            StreamingConfig,
+            StreamingDecoder,
+        )
+
+        decoder = StreamingDecoder(tiny_model, StreamingConfig(incremental=False))
+        inputs, _ = self._record_calls(decoder)
+        mel = mx.random.normal((100, 80))
+
+        decoder.decode_chunk(mel)
+        calls = len(inputs)
+        decoder.decode_chunk(mel)
+        assert inputs[0] == 3 and inputs[calls] == 3
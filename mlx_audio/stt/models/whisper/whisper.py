@@ -23,6 +23,7 @@ from .audio import (
     N_FRAMES,
     N_SAMPLES,
     SAMPLE_RATE,
+    IncrementalLogMel,
     log_mel_spectrogram,
     pad_or_trim,
 )
@@ -259,6 +260,63 @@ def _get_end(segments: List[dict]) -> Optional[float]:
     )
 
 
+def _plan_windows(
+    seek_clips: List[Tuple[int, int]],
+    audio: Optional[mx.array] = None,
+    vad_mode: int = 2,
+    search_seconds: float = 5.0,
+) -> List[Tuple[int, int]]:
+    """Split the clips into windows of at most ``N_FRAMES`` mel frames.
+
+    Without ``audio`` the windows are back-to-back 30-second chunks. With
+    ``audio``, WebRTC VAD picks the cut points: each window ends in the last
+    non-speech frame within ``search_seconds`` of its 30-second limit (so words
+    are not split across windows), and windows without any speech are dropped.
+    """
+    if audio is None:
+        return [
+            (start, min(start + N_FRAMES, end))
+            for clip_start, end in seek_clips
+            for start in range(clip_start, end, N_FRAMES)
+        ]
+
+    import webrtcvad
+
+    vad = webrtcvad.Vad(vad_mode)
+    vad_frame = SAMPLE_RATE * 30 // 1000  # 30 ms
+    mel_per_vad = vad_frame // HOP_LENGTH
+    pcm = (np.clip(np.array(audio), -1.0, 1.0) * 32767).astype(np.int16)
+    speech = np.array(
+        [
+            vad.is_speech(pcm[i : i + vad_frame].tobytes(), SAMPLE_RATE)
+            for i in range(0, len(pcm) - vad_frame + 1, vad_frame)
+        ],
+        dtype=bool,
+    )
+    if len(speech) == 0:
+        return []
+
+    def has_speech(start, end):
+        return speech[start // mel_per_vad : -(-end // mel_per_vad)].any()
+
+    search = round(search_seconds * FRAMES_PER_SECOND) // mel_per_vad
+    windows = []
+    for seek, end in seek_clips:
+        while seek < end:
+            cut = min(seek + N_FRAMES, end)
+            if cut < end:
+                limit = cut // mel_per_vad
+                candidates = np.flatnonzero(~speech[max(0, limit - search) : limit])
+                if len(candidates) > 0:
+                    # middle of the last silent VAD frame before the limit
+                    silent = max(0, limit - search) + candidates[-1]
+                    cut = max(seek + 1, int(silent) * mel_per_vad + mel_per_vad // 2)
+            if has_speech(seek, cut):
+                windows.append((seek, cut))
+            seek = cut
+    return windows
+
+
 @dataclass
 class STTOutput:
     text: str
@@ -515,6 +573,10 @@ class Model(nn.Module):
         all_heads[self.dims.n_text_layer // 2 :] = True
         self._alignment_heads = mx.array(np.asarray(all_heads.nonzero()).T)
 
+    @property
+    def alignment_heads(self):
+        return self._alignment_heads
+
     def set_alignment_heads(self, dump: Union[bytes, np.ndarray]):
         if isinstance(dump, np.ndarray):
             self._alignment_heads = mx.array(dump)
@@ -783,6 +845,8 @@ class Model(nn.Module):
         append_punctuations: str = "\"'.。,，!！?？:：”)]}、",
         clip_timestamps: Union[str, List[float]] = "0",
         hallucination_silence_threshold: Optional[float] = None,
+        batch_size: int = 1,
+        vad_segmentation: bool = False,
         **decode_options,
     ):
         """
@@ -842,6 +906,17 @@ class Model(nn.Module):
             When word_timestamps is True, skip silent periods longer than this threshold (in seconds)
             when a possible hallucination is detected
 
+        batch_size: int
+            Number of 30-second windows encoded and decoded together. Values above 1 pre-segment
+            the audio and transcribe the windows independently, which requires
+            `condition_on_previous_text=False`. `initial_prompt` is then used for every window,
+            windows are not re-aligned to the last timestamp and `hallucination_silence_threshold`
+            is ignored.
+
+        vad_segmentation: bool
+            With `batch_size` > 1, cut windows at non-speech frames found by WebRTC VAD instead
+            of every 30 seconds, and skip windows without speech.
+
         Returns
         -------
         A dictionary containing the resulting text ("text") and segment-level details ("segments"), and
@@ -853,8 +928,19 @@ class Model(nn.Module):
                 audio, chunk_duration=chunk_duration, **decode_options
             )
 
+        if batch_size > 1 and condition_on_previous_text:
+            raise ValueError(
+                "batch_size > 1 decodes windows independently and requires "
+                "condition_on_previous_text=False"
+            )
+
         decode_options.pop("max_tokens", None)
         decode_options.pop("generation_stream", None)
+        if batch_size > 1 and vad_segmentation and isinstance(audio, str):
+            from mlx_audio.stt.utils import load_audio
+
+            # keep the waveform around for VAD
+            audio = load_audio(audio)
         # Use shared audio preparation
         mel, content_frames = self._prepare_audio(audio)
         content_duration = float(content_frames * HOP_LENGTH / SAMPLE_RATE)
@@ -900,45 +986,71 @@ class Model(nn.Module):
         if word_timestamps and task == "translate":
             warnings.warn("Word-level timestamps on translations may not be reliable.")
 
+        temperatures = (
+            [temperature] if isinstance(temperature, (int, float)) else temperature
+        )
+
+        def decoding_options(t: float) -> DecodingOptions:
+            kwargs = {**decode_options}
+            if t > 0:
+                # disable beam_size and patience when t > 0
+                kwargs.pop("beam_size", None)
+                kwargs.pop("patience", None)
+            else:
+                # disable best_of when t == 0
+                kwargs.pop("best_of", None)
+            return DecodingOptions(**kwargs, temperature=t)
+
+        def needs_fallback(decode_result: DecodingResult) -> bool:
+            needs_fallback = False
+            if (
+                compression_ratio_threshold is not None
+                and decode_result.compression_ratio > compression_ratio_threshold
+            ):
+                needs_fallback = True  # too repetitive
+            if (
+                logprob_threshold is not None
+                and decode_result.avg_logprob < logprob_threshold
+            ):
+                needs_fallback = True  # average log probability is too low
+            if (
+                no_speech_threshold is not None
+                and decode_result.no_speech_prob > no_speech_threshold
+            ):
+                needs_fallback = False  # silence
+            return needs_fallback
+
         def decode_with_fallback(segment: mx.array) -> DecodingResult:
-            temperatures = (
-                [temperature] if isinstance(temperature, (int, float)) else temperature
-            )
             decode_result = None
 
             for t in temperatures:
-                kwargs = {**decode_options}
-                if t > 0:
-                    # disable beam_size and patience when t > 0
-                    kwargs.pop("beam_size", None)
-                    kwargs.pop("patience", None)
-                else:
-                    # disable best_of when t == 0
-                    kwargs.pop("best_of", None)
+                decode_result = self.decode(segment, decoding_options(t))
+                if not needs_fallback(decode_result):
+                    break
 
-                options = DecodingOptions(**kwargs, temperature=t)
-                decode_result = self.decode(segment, options)
+            return decode_result
 
-                needs_fallback = False
-                if (
-                    compression_ratio_threshold is not None
-                    and decode_result.compression_ratio > compression_ratio_threshold
-                ):
-                    needs_fallback = True  # too repetitive
-                if (
-                    logprob_threshold is not None
-                    and decode_result.avg_logprob < logprob_threshold
-                ):
-                    needs_fallback = True  # average log probability is too low
-                if (
-                    no_speech_threshold is not None
-                    and decode_result.no_speech_prob > no_speech_threshold
-                ):
-                    needs_fallback = False  # silence
-                if not needs_fallback:
+        def decode_batch_with_fallback(segments: mx.array) -> List[DecodingResult]:
+            # only the windows that fail at one temperature are retried at the next
+            results = [None] * segments.shape[0]
+            pending = list(range(segments.shape[0]))
+
+            for t in temperatures:
+                if len(pending) < len(results):
+                    batch = segments[mx.array(pending)]
+                else:
+                    batch = segments
+                decoded = self.decode(batch, decoding_options(t))
+                retry = []
+                for i, decode_result in zip(pending, decoded):
+                    results[i] = decode_result
+                    if needs_fallback(decode_result):
+                        retry.append(i)
+                pending = retry
+                if not pending:
                     break
 
-            return decode_result
+            return results
 
         clip_idx = 0
         seek = seek_clips[clip_idx][0]
@@ -975,6 +1087,156 @@ class Model(nn.Module):
                 "no_speech_prob": result.no_speech_prob,
             }
 
+        def window_segments(
+            tokens: np.ndarray, result: DecodingResult, segment_size: int
+        ) -> List[dict]:
+            # Segments of a window decoded without seeking back to its last
+            # timestamp: an unfinished trailing segment runs to the window end
+            time_offset = float(seek * HOP_LENGTH / SAMPLE_RATE)
+            segment_duration = segment_size * HOP_LENGTH / SAMPLE_RATE
+            timestamp_tokens = tokens >= tokenizer.timestamp_begin
+            consecutive = np.where(
+                np.logical_and(timestamp_tokens[:-1], timestamp_tokens[1:])
+            )[0]
+            consecutive += 1
+            if len(consecutive) == 0:
+                duration = segment_duration
+                timestamps = tokens[timestamp_tokens.nonzero()[0]]
+                if (
+                    len(timestamps) > 0
+                    and timestamps[-1].item() != tokenizer.timestamp_begin
+                ):
+                    duration = (
+                        timestamps[-1].item() - tokenizer.timestamp_begin
+                    ) * time_precision
+                return [
+                    new_segment(
+                        start=time_offset,
+                        end=time_offset + duration,
+                        tokens=tokens,
+                        result=result,
+                    )
+                ]
+
+            segments = []
+            slices = consecutive.tolist() + [len(tokens)]
+            last_slice = 0
+            for current_slice in slices:
+                sliced_tokens = tokens[last_slice:current_slice]
+                last_slice = current_slice
+                if not (sliced_tokens < tokenizer.timestamp_begin).any():
+                    continue  # nothing but timestamps
+                start_timestamp_pos = (
+                    sliced_tokens[0].item() - tokenizer.timestamp_begin
+                )
+                if sliced_tokens[-1] >= tokenizer.timestamp_begin:
+                    end = (
+                        time_offset
+                        + (sliced_tokens[-1].item() - tokenizer.timestamp_begin)
+                        * time_precision
+                    )
+                else:
+                    end = time_offset + segment_duration
+                segments.append(
+                    new_segment(
+                        start=time_offset + start_timestamp_pos * time_precision,
+                        end=end,
+                        tokens=sliced_tokens,
+                        result=result,
+                    )
+                )
+            return segments
+
+        def add_segments(current_segments: List[dict]):
+            if verbose:
+                for segment in current_segments:
+                    start, end, text = (
+                        segment["start"],
+                        segment["end"],
+                        segment["text"],
+                    )
+                    line = f"[{_format_timestamp(start)} --> {_format_timestamp(end)}] {text}"
+                    print(make_safe(line))
+
+            # if a segment is instantaneous or does not contain text, clear it
+            for segment in current_segments:
+                if segment["start"] == segment["end"] or segment["text"].strip() == "":
+                    segment["text"] = ""
+                    segment["tokens"] = []
+                    segment["words"] = []
+
+            all_segments.extend(
+                [
+                    {"id": i, **segment}
+                    for i, segment in enumerate(
+                        current_segments, start=len(all_segments)
+                    )
+                ]
+            )
+            all_tokens.extend(
+                [token for segment in current_segments for token in segment["tokens"]]
+            )
+
+        if batch_size > 1:
+            windows = _plan_windows(seek_clips, audio if vad_segmentation else None)
+            decode_options["prompt"] = initial_prompt_tokens
+            last_speech_timestamp = 0.0
+            with tqdm.tqdm(
+                total=content_frames, unit="frames", disable=verbose is not False
+            ) as pbar:
+                for i in range(0, len(windows), batch_size):
+                    batch_windows = windows[i : i + batch_size]
+                    # one encoder call and one batched decode for the whole batch
+                    mel_segments = mx.stack(
+                        [
+                            pad_or_trim(mel[start:end], N_FRAMES, axis=-2)
+                            for start, end in batch_windows
+                        ]
+                    ).astype(self.dtype)
+                    results = decode_batch_with_fallback(mel_segments)
+
+                    for (start, end), mel_segment, result in zip(
+                        batch_windows, mel_segments, results
+                    ):
+                        seek = start
+                        pbar.update(end - start)
+                        if no_speech_threshold is not None:
+                            # no voice activity check
+                            should_skip = result.no_speech_prob > no_speech_threshold
+                            if (
+                                logprob_threshold is not None
+                                and result.avg_logprob > logprob_threshold
+                            ):
+                                should_skip = False
+                            if should_skip:
+                                continue
+
+                        current_segments = window_segments(
+                            np.array(result.tokens), result, end - start
+                        )
+                        if word_timestamps:
+                            add_word_timestamps(
+                                segments=current_segments,
+                                model=self,
+                                tokenizer=tokenizer,
+                                mel=mel_segment,
+                                num_frames=end - start,
+                                prepend_punctuations=prepend_punctuations,
+                                append_punctuations=append_punctuations,
+                                last_speech_timestamp=last_speech_timestamp,
+                            )
+                            last_word_end = _get_end(current_segments)
+                            if last_word_end is not None:
+                                last_speech_timestamp = last_word_end
+                        add_segments(current_segments)
+
+            mx.clear_cache()
+            return STTOutput(
+                text=tokenizer.decode(all_tokens[len(initial_prompt_tokens) :]),
+                segments=all_segments,
+                language=language,
+            )
+
         # show the progress bar when verbose is False (if True, transcribed text will be printed)
         with tqdm.tqdm(
             total=content_frames, unit="frames", disable=verbose is not False
@@ -1205,41 +1467,7 @@ class Model(nn.Module):
                         if last_word_end is not None:
                             last_speech_timestamp = last_word_end
 
-                    if verbose:
-                        for segment in current_segments:
-                            start, end, text = (
-                                segment["start"],
-                                segment["end"],
-                                segment["text"],
-                            )
-                            line = f"[{_format_timestamp(start)} --> {_format_timestamp(end)}] {text}"
-                            print(make_safe(line))
-
-                    # if a segment is instantaneous or does not contain text, clear it
-                    for i, segment in enumerate(current_segments):
-                        if (
-                            segment["start"] == segment["end"]
-                            or segment["text"].strip() == ""
-                        ):
-                            segment["text"] = ""
-                            segment["tokens"] = []
-                            segment["words"] = []
-
-                    all_segments.extend(
-                        [
-                            {"id": i, **segment}
-                            for i, segment in enumerate(
-                                current_segments, start=len(all_segments)
-                            )
-                        ]
-                    )
-                    all_tokens.extend(
-                        [
-                            token
-                            for segment in current_segments
-                            for token in segment["tokens"]
-                        ]
-                    )
+                    add_segments(current_segments)
 
                     if not condition_on_previous_text or result.temperature > 0.5:
                         # do not feed the prompt tokens if a high temperature was used
@@ -1318,6 +1546,8 @@ class Model(nn.Module):
         # Configure streaming
         config = StreamingConfig(frame_threshold=frame_threshold)
         decoder = StreamingDecoder(self, config, language=language, task=task)
+        # Carries the STFT overlap between chunks instead of re-padding each one
+        log_mel = IncrementalLogMel(n_mels=self.dims.n_mels)
 
         # Process audio in chunks
         chunk_samples = int(chunk_duration * SAMPLE_RATE)
@@ -1329,7 +1559,7 @@ class Model(nn.Module):
             chunk = audio[start:end]
             is_last = end >= total_samples
 
-            mel = log_mel_spectrogram(np.array(chunk), n_mels=self.dims.n_mels)
+            mel = log_mel(chunk, final=is_last)
             result = decoder.decode_chunk(mel, is_last=is_last)
 
             # Add progress info
@@ -1,3 +1,4 @@
+import dataclasses
 import json
 import unittest
 from pathlib import Path
@@ -258,6 +259,84 @@ class TestWhisperModel(unittest.TestCase):
         self.assertEqual(args_pad_call[0].shape, (100, self.dims.n_mels))
         self.assertEqual(args_pad_call[1], self.N_FRAMES)
 
+    def _tiny_model(self):
+        dims = self.ModelDimensions(
+            n_mels=80,
+            n_audio_ctx=1500,
+            n_audio_state=32,
+            n_audio_head=2,
+            n_audio_layer=1,
+            n_vocab=64,
+            n_text_ctx=64,
+            n_text_state=32,
+            n_text_head=2,
+            n_text_layer=2,
+        )
+        mx.random.seed(0)
+        model = self.Model(dims, dtype=mx.float32)
+
+        tokenizer = MagicMock(eot=50, sot=51, timestamp_begin=60, no_speech=None)
+        tokenizer.sot_sequence = (51, 52)
+        tokenizer.sot_sequence_including_notimestamps = (51, 52, 53)
+        tokenizer.transcribe, tokenizer.translate = 54, 55
+        tokenizer.sot_prev, tokenizer.sot_lm = 56, 57
+        tokenizer.non_speech_tokens = []
+        tokenizer.encode.return_value = [1]
+        tokenizer.decode.side_effect = lambda tokens: " ".join(map(str, tokens))
+        model.get_tokenizer = MagicMock(return_value=tokenizer)
+        return model
+
+    def test_generate_batched_matches_sequential(self):
+        """Batched windows give the same segments as the sequential loop."""
+        model = self._tiny_model()
+        audio = np.random.default_rng(0).standard_normal(16000 * 70) * 0.1
+        options = dict(
+            language="en",
+            without_timestamps=True,
+            fp16=False,
+            temperature=0.0,
+            condition_on_previous_text=False,
+        )
+
+        sequential = model.generate(audio.astype(np.float32), **options)
+        with patch.object(model, "decode", wraps=model.decode) as mock_decode:
+            batched = model.generate(audio.astype(np.float32), batch_size=2, **options)
+
+        # 3 windows: one batch of 2 and one of 1
+        self.assertEqual(
+            [call.args[0].shape[0] for call in mock_decode.call_args_list], [2, 1]
+        )
+        self.assertEqual(
+            [(s["start"], s["end"], s["tokens"]) for s in batched.segments],
+            [(s["start"], s["end"], s["tokens"]) for s in sequential.segments],
+        )
+        self.assertEqual(batched.text, sequential.text)
+
+        with self.assertRaises(ValueError):
+            model.generate(audio, batch_size=2, language="en")
+
+    def test_plan_windows_vad(self):
+        """VAD cut points fall in silence and silent windows are dropped."""
+        from mlx_audio.stt.models.whisper.whisper import _plan_windows
+
+        sr = self.SAMPLE_RATE
+        t = np.arange(sr * 100) / sr
+        audio = np.zeros_like(t, dtype=np.float32)
+        for start, end in [(1, 28), (32, 55)]:
+            speech = slice(start * sr, end * sr)
+            audio[speech] = 0.5 * np.sin(2 * np.pi * 220 * t[speech])
+
+        self.assertEqual(
+            _plan_windows([(0, 10000)]),
+            [(0, 3000), (3000, 6000), (6000, 9000), (9000, 10000)],
+        )
+        windows = _plan_windows([(0, 10000)], mx.array(audio))
+        # The first cut lands in the 28-32 s pause, the silent tail is skipped
+        self.assertEqual(len(windows), 2)
+        self.assertTrue(2800 <= windows[0][1] <= 3000)
+        self.assertEqual(windows[1][0], windows[0][1])
+        self.assertLessEqual(windows[1][1] - windows[1][0], self.N_FRAMES)
+
 
 class TestParakeetModel(unittest.TestCase):
 
@@ -395,6 +474,221 @@ class TestParakeetModel(unittest.TestCase):
         self.assertEqual(model.vocabulary, dummy_vocabulary)
         self.assertEqual(model.durations, [0, 1, 2, 3])
 
+    def _make_transducer(self, tdt=True, blank_bias=0.0):
+        from mlx_audio.stt.models.parakeet.parakeet import Model
+
+        vocabulary = [" ", "a", "b", "c", "d", "e", "▁f", "g"]
+        config = {
+            "target": "nemo.collections.asr.models.rnnt_bpe_models.EncDecRNNTBPEModel",
+            "model_defaults": {"tdt_durations": [0, 1, 2, 3] if tdt else None},
+            "preprocessor": {
+                "sample_rate": 16000,
+                "normalize": "per_feature",
+                "window_size": 0.025,
+                "window_stride": 0.01,
+                "window": "hann",
+                "features": 16,
+                "n_fft": 512,
+                "dither": 0.0,
+            },
+            "encoder": {
+                "feat_in": 16,
+                "n_layers": 1,
+                "d_model": 32,
+                "n_heads": 2,
+                "self_attention_model": "rel_pos",
+                "subsampling": "dw_striding",
+                "pos_emb_max_len": 5000,
+                "ff_expansion_factor": 2,
+                "subsampling_factor": 4,
+                "subsampling_conv_channels": 8,
+                "conv_kernel_size": 9,
+            },
+            "decoder": {
+                "blank_as_pad": True,
+                "vocab_size": len(vocabulary),
+                "prednet": {"pred_hidden": 16, "pred_rnn_layers": 2},
+            },
+            "joint": {
+                "num_classes": len(vocabulary),
+                "vocabulary": vocabulary,
+                "num_extra_outputs": 4 if tdt else 0,
+                "jointnet": {
+                    "encoder_hidden": 32,
+                    "pred_hidden": 16,
+                    "joint_hidden": 24,
+                    "activation": "relu",
+                },
+            },
+            "decoding": {"greedy": {"max_symbols": 3}},
+        }
+        if tdt:
+            config["decoding"].update(model_type="tdt", durations=[0, 1, 2, 3])
+
+        mx.random.seed(0)
+        model = Model.from_config(config)
+        # Bias the blank logit so random weights emit a mix of blanks and symbols
+        output = model.joint.joint_net[-1]
+        output.bias = output.bias.at[len(vocabulary)].add(blank_bias)
+        mx.eval(model.parameters())
+        return model
+
+    @staticmethod
+    def _token_ids(result):
+        return [
+            (token.id, round(token.start, 4), round(token.duration, 4))
+            for sentence in result.sentences
+            for token in sentence.tokens
+        ]
+
+    def test_transducer_batched_decode_matches_single(self):
+        """Batched greedy decoding reproduces per-utterance decoding."""
+        for tdt, blank_bias in ((True, 0.0), (False, 0.4)):
+            with self.subTest(tdt=tdt):
+                model = self._make_transducer(tdt, blank_bias)
+                mel = mx.random.normal((3, 160, 16))
+
+                batched = [self._token_ids(r) for r in model.decode(mel)]
+                single = [self._token_ids(model.decode(mel[b])[0]) for b in range(3)]
+                self.assertEqual(batched, single)
+                self.assertTrue(any(batched))
+
+    def test_greedy_batch_decode_respects_lengths(self):
+        """Padded frames beyond an utterance's length are never decoded."""
+        from mlx_audio.stt.models.parakeet.rnnt import greedy_batch_decode
+
+        model = self._make_transducer(tdt=False, blank_bias=0.4)
+        features = mx.random.normal((2, 12, 32))
+        blank = len(model.vocabulary)
+
+        batched = greedy_batch_decode(
+            model.decoder,
+            model.joint,
+            features,
+            mx.array([12, 5]),
+            blank=blank,
+            max_symbols=3,
+            sync_interval=4,
+        )
+        single = greedy_batch_decode(
+            model.decoder,
+            model.joint,
+            features[1:, :5],
+            mx.array([5]),
+            blank=blank,
+            max_symbols=3,
+        )
+        self.assertTrue(all(frame < 5 for _, frame, _ in batched[1]))
+        self.assertEqual(batched[1], single[0])
+
+    def test_greedy_decode_state_carries_across_chunks(self):
+        """Decoding a stream chunk by chunk matches decoding it at once."""
+        from mlx_audio.stt.models.parakeet.rnnt import (
+            DecodingState,
+            greedy_batch_decode,
+        )
+
+        model = self._make_transducer(tdt=True)
+        features = mx.random.normal((1, 30, 32))
+        kwargs = dict(
+            blank=len(model.vocabulary), durations=model.durations, max_symbols=3
+        )
+
+        (expected,) = greedy_batch_decode(
+            model.decoder, model.joint, features, mx.array([30]), **kwargs
+        )
+        state = DecodingState.initial(model.decoder, 1, kwargs["blank"], mx.float32)
+        streamed = []
+        for start, end in ((0, 7), (7, 8), (8, 30)):
+            (chunk,) = greedy_batch_decode(
+                model.decoder,
+                model.joint,
+                features[:, start:end],
+                mx.array([end - start]),
+                state=state,
+                **kwargs,
+            )
+            streamed += [(t, start + f, d) for t, f, d in chunk]
+        self.assertEqual(streamed, expected)
+
+    def test_subsampling_stream_matches_offline(self):
+        """Incremental subsampling yields the frames of a single pass."""
+        model = self._make_transducer()
+        mel = mx.random.normal((1, 103, 16))
+        expected, lengths = model.encoder.pre_encode(mel, mx.array([103]))
+
+        cache = {}
+        chunks = [
+            model.encoder.pre_encode.stream(mel[:, start:end], cache)
+            for start, end in ((0, 5), (5, 6), (6, 40), (40, 103))
+        ]
+        chunks.append(model.encoder.pre_encode.stream(mel[:, :0], cache, flush=True))
+        streamed = mx.concatenate(chunks, axis=1)
+
+        self.assertEqual(streamed.shape[1], lengths.item())
+        self.assertTrue(mx.allclose(streamed, expected, atol=1e-5))
+
+        # One chunk with unlimited context is exactly the offline encoder
+        cache = model.encoder.make_cache(left_context=1000)
+        streamed = model.encoder.stream(mel, cache, flush=True)
+        self.assertTrue(mx.allclose(streamed, model.encoder(mel)[0], atol=1e-5))
+
+    def test_generate_chunked_file_matches_array(self):
+        """Chunked transcription of a file streams it in the same windows."""
+        import tempfile
+
+        from mlx_audio.audio_io import write as audio_write
+        from mlx_audio.stt.utils import load_audio
+
+        model = self._make_transducer(tdt=True)
+        audio = np.random.default_rng(0).uniform(-0.5, 0.5, 16000 * 6)
+
+        def transcribe(source):
+            calls = []
+            result = model.generate(
+                source,
+                dtype=mx.float32,
+                chunk_duration=2.0,
+                overlap_duration=0.5,
+                chunk_callback=lambda end, total: calls.append((end, total)),
+            )
+            return result, calls
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "speech.wav"
+            audio_write(path, audio.astype(np.float32), 16000)
+            streamed, streamed_calls = transcribe(path)
+            loaded, loaded_calls = transcribe(load_audio(str(path)))
+
+        self.assertEqual(streamed_calls, loaded_calls)
+        self.assertEqual(streamed_calls[-1], (96000, 96000))
+        self.assertEqual(streamed.text, loaded.text)
+
+    def test_parakeet_stream_feed(self):
+        """Live streams keep bounded state and report absolute timestamps."""
+        model = self._make_transducer(tdt=True)
+        stream = model.create_stream(
+            chunk_duration=0.5, context_duration=1.0, dtype=mx.float32
+        )
+        audio = mx.random.normal((16000 * 6,))
+
+        results = [
+            stream.feed(audio[start : start + 1000])
+            for start in range(0, audio.shape[0], 1000)
+        ]
+        results.append(stream.finish())
+
+        self.assertFalse(any(r.is_final for r in results[:-1]))
+        self.assertTrue(results[-1].is_final)
+        self.assertAlmostEqual(results[-1].audio_position, 6.0)
+        # 6 s at 40 ms per encoder frame, with 1 s of attention context
+        self.assertEqual(stream._encoded_frames, 151)
+        self.assertEqual(stream._cache.layers[0].keys.shape[-2], 25)
+        starts = [r.start_time for r in results if r.tokens]
+        self.assertEqual(starts, sorted(starts))
+        with self.assertRaises(RuntimeError):
+            stream.feed(audio[:100])
+
 
 class TestGLMASRModel(unittest.TestCase):
     """Tests for the GLM-ASR model."""
@@ -1186,6 +1480,52 @@ class TestQwen3ASRModel(unittest.TestCase):
 
         self.assertEqual(logits.shape, (1, 5, self.text_config.vocab_size))
 
+    def test_qwen3_asr_model_forward_batch_with_audio(self):
+        """Batched forward merges each row's audio features like single rows."""
+        mx.random.seed(0)
+        # The placeholder must be inside the small test vocabulary, the audio
+        # features must match the text hidden size and the encoder uses the
+        # real 100-frame chunks so its token count matches the prompt
+        audio_id = self.text_config.vocab_size - 1
+        audio_config = dataclasses.replace(
+            self.audio_config,
+            n_window=50,
+            n_window_infer=200,
+            output_dim=self.text_config.hidden_size,
+        )
+        model = self.Qwen3ASRModel(
+            self.ModelConfig(
+                audio_config=audio_config,
+                text_config=self.text_config,
+                audio_token_id=audio_id,
+            )
+        )
+
+        input_features = mx.random.normal((2, 80, 300))
+        feature_attention_mask = mx.array([[1] * 300, [1] * 180 + [0] * 120])
+        num_audio = self._get_feat_extract_output_lengths(
+            feature_attention_mask.sum(axis=-1)
+        ).tolist()
+        rows = [[1, 2] + [audio_id] * n + [3] for n in num_audio]
+        width = max(len(row) for row in rows)
+        input_ids = mx.array([row + [0] * (width - len(row)) for row in rows])
+
+        logits = model(
+            input_ids,
+            input_features=input_features,
+            feature_attention_mask=feature_attention_mask,
+        )
+        self.assertEqual(logits.shape, (2, width, self.text_config.vocab_size))
+
+        for i, row in enumerate(rows):
+            expected = model(
+                mx.array([row]),
+                input_features=input_features[i : i + 1, :, : 300 - 120 * i],
+            )
+            np.testing.assert_allclose(
+                logits[i, : len(row)], expected[0], atol=1e-4, rtol=1e-4
+            )
+
     def test_qwen3_asr_model_sample_rate(self):
         model = self.Qwen3ASRModel(self.model_config)
         self.assertEqual(model.sample_rate, 16000)
@@ -1353,6 +1693,93 @@ class TestQwen3ASRModel(unittest.TestCase):
         # ForcedAligner sanitize should keep lm_head
         self.assertIn("lm_head.weight", sanitized)
 
+    def _make_batch_asr_model(self):
+        """Tiny ASR model with a stand-in tokenizer and feature extractor."""
+        audio_config = self.AudioEncoderConfig(
+            **{**self.audio_config.__dict__, "output_dim": 64}
+        )
+        text_config = self.TextConfig(
+            **{**self.text_config.__dict__, "tie_word_embeddings": False}
+        )
+        config = self.ModelConfig(
+            audio_config=audio_config,
+            text_config=text_config,
+            audio_token_id=7,
+        )
+        mx.random.seed(0)
+        model = self.Qwen3ASRModel(config)
+        mx.eval(model.parameters())
+
+        class Tokenizer:
+            def encode(self, prompt, return_tensors=None):
+                n = prompt.count("<|audio_pad|>")
+                return np.array([[1, 2, 3] + [7] * n + [4, 5]])
+
+            def decode(self, tokens, skip_special_tokens=False):
+                return " ".join(str(t) for t in tokens)
+
+        def feature_extractor(audios, **kwargs):
+            frames = [len(a) // 160 for a in audios]
+            features = np.zeros((len(audios), 80, max(frames)), dtype=np.float32)
+            mask = np.zeros((len(audios), max(frames)), dtype=np.int32)
+            for i, (audio, n) in enumerate(zip(audios, frames)):
+                features[i, :, :n] = audio[: n * 160].reshape(n, 160)[:, :80].T
+                mask[i, :n] = 1
+            return {"input_features": features, "attention_mask": mask}
+
+        model._tokenizer = Tokenizer()
+        model._feature_extractor = feature_extractor
+        return model
+
+    def test_qwen3_asr_batched_generate_matches_sequential(self):
+        from mlx_audio.stt.models.qwen3_asr import qwen3_asr
+
+        model = self._make_batch_asr_model()
+        rng = np.random.default_rng(0)
+        audios = [
+            rng.standard_normal(n).astype(np.float32) for n in (16000, 20000, 24000)
+        ]
+
+        def reference(audio, **kwargs):
+            return [
+                int(t) for t, _ in model.stream_generate(audio, max_tokens=8, **kwargs)
+            ]
+
+        # Stop the first input early so rows finish at different steps
+        eos = reference(audios[0])[4]
+        with patch.object(qwen3_asr, "EOS_TOKEN_IDS", [eos]):
+            expected = [reference(audio) for audio in audios]
+            outputs = model.generate(audios, max_tokens=8, batch_size=2)
+
+        self.assertIsInstance(outputs, list)
+        self.assertEqual(len(outputs), len(audios))
+        self.assertEqual(len(expected[0]), 4)
+        for output, tokens in zip(outputs, expected):
+            self.assertEqual(output.text, " ".join(str(t) for t in tokens))
+            self.assertEqual(output.generation_tokens, len(tokens))
+            self.assertEqual(len(output.segments), 1)
+
+        single = model.generate(audios[1], max_tokens=8)
+        self.assertNotIsInstance(single, list)
+
+    def test_qwen3_asr_batched_generate_repetition_penalty(self):
+        from mlx_lm.sample_utils import make_logits_processors
+
+        model = self._make_batch_asr_model()
+        rng = np.random.default_rng(1)
+        audios = [rng.standard_normal(n).astype(np.float32) for n in (16000, 24000)]
+        processors = make_logits_processors(repetition_penalty=1.5)
+
+        outputs = model.generate(audios, max_tokens=8, repetition_penalty=1.5)
+        for audio, output in zip(audios, outputs):
+            tokens = [
+                int(t)
+                for t, _ in model.stream_generate(
+                    audio, max_tokens=8, logits_processors=processors
+                )
+            ]
+            self.assertEqual(output.text, " ".join(str(t) for t in tokens))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ import mlx.core as mx
 import mlx.nn as nn
 import numpy as np
 
+from mlx_audio.dsp import resample
 from mlx_audio.utils import base_load_model, get_model_path, load_config
 
 SAMPLE_RATE = 16000
@@ -18,13 +19,7 @@ MODEL_REMAPPING = {
 
 
 def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
-    from scipy import signal
-
-    gcd = np.gcd(orig_sr, target_sr)
-    up = target_sr // gcd
-    down = orig_sr // gcd
-    resampled = signal.resample_poly(audio, up, down, padtype="edge")
-    return resampled
+    return resample(audio, orig_sr, target_sr, padtype="edge")
 
 
 def load_audio(
@@ -48,12 +43,13 @@ def load_audio(
     -------
     A NumPy array containing the audio waveform, in float32 dtype.
     """
-    from mlx_audio.audio_io import read as audio_read
+    from mlx_audio.audio_io import read_blocks
 
-    audio, sample_rate = audio_read(file, always_2d=True)
-    if sample_rate != sr:
-        audio = resample_audio(audio, sample_rate, sr)
-    return mx.array(audio, dtype=dtype).mean(axis=1)
+    # Downmix and resample block by block so long recordings never exist
+    # as a full-length multi-channel float64 copy
+    blocks = list(read_blocks(file, 60.0, target_sr=sr, mono=True))
+    audio = np.concatenate(blocks) if blocks else np.zeros((0,), dtype=np.float32)
+    return mx.array(audio, dtype=dtype)
 
 
 def load_model(
@@ -0,0 +1,199 @@
+"""Tests for mlx_audio.audio_io encoding and ffmpeg streaming."""
+
+import io
+import shutil
+import time
+import wave
+
+import mlx.core as mx
+import numpy as np
+import pytest
+
+from mlx_audio.audio_io import (
+    FFmpegDecoder,
+    FFmpegEncoder,
+    WavStreamWriter,
+    info,
+    read,
+    read_blocks,
+    wav_header,
+    write,
+)
+
+
+def _tone(n=2400, channels=None):
+    t = np.arange(n) / 24000
+    audio = 0.5 * np.sin(2 * np.pi * 440 * t).astype(np.float32)
+    if channels:
+        audio = np.stack([audio] * channels, axis=1)
+    return audio
+
+
+def test_write_wav_bytesio_roundtrip():
+    """WAV written to BytesIO is a standard file that decodes to the input."""
+    audio = _tone()
+    buffer = io.BytesIO()
+    write(buffer, audio, 24000)
+    assert buffer.tell() == 0
+
+    with wave.open(io.BytesIO(buffer.getvalue())) as f:
+        assert f.getframerate() == 24000
+        assert f.getnchannels() == 1
+        assert f.getsampwidth() == 2
+        assert f.getnframes() == len(audio)
+
+    decoded, sample_rate = read(buffer, dtype="float32")
+    assert sample_rate == 24000
+    np.testing.assert_allclose(decoded, audio, atol=1e-4)
+
+
+def test_write_mlx_and_stereo():
+    """MLX arrays and multi-channel audio encode like their NumPy equivalent."""
+    audio = _tone()
+    expected = io.BytesIO()
+    write(expected, audio, 24000)
+    for data in (mx.array(audio), mx.array(audio).astype(mx.bfloat16)):
+        buffer = io.BytesIO()
+        write(buffer, data, 24000)
+        assert len(buffer.getvalue()) == len(expected.getvalue())
+
+    buffer = io.BytesIO()
+    write(buffer, _tone(channels=2), 24000)
+    decoded, _ = read(buffer)
+    assert decoded.shape == (2400, 2)
+
+
+def test_write_pcm(tmp_path):
+    audio = (_tone() * 32767).astype(np.int16)
+    path = tmp_path / "speech.pcm"
+    write(path, audio, 24000, format="pcm")
+    assert np.array_equal(np.fromfile(path, dtype="<i2"), audio)
+
+
+def test_wav_stream_encode_is_one_container():
+    """Streamed blocks concatenate into a single WAV of unknown length."""
+    audio = _tone(4800)
+    writer = WavStreamWriter(24000)
+    stream = writer.encode(audio[:1000]) + writer.encode(mx.array(audio[1000:]))
+
+    assert stream[:4] == b"RIFF" and stream.count(b"RIFF") == 1
+    assert stream[:44] == wav_header(24000, 1)
+    assert writer.num_frames == 4800
+    decoded, _ = read(io.BytesIO(stream), dtype="float32")
+    np.testing.assert_allclose(decoded, audio, atol=1e-4)
+
+
+def test_wav_stream_write_patches_header(tmp_path):
+    """Writing to a seekable file leaves a header with the final sizes."""
+    audio = _tone(4800, channels=2)
+    path = tmp_path / "stream.wav"
+    with open(path, "wb") as f, WavStreamWriter(24000, file=f) as writer:
+        for start in range(0, len(audio), 1000):
+            writer.write(audio[start : start + 1000])
+
+    expected = io.BytesIO()
+    write(expected, audio, 24000)
+    assert path.read_bytes() == expected.getvalue()
+
+
+@pytest.mark.parametrize("format", ["wav", "flac", "mp3"])
+def test_read_blocks_matches_read(tmp_path, format):
+    """Blocks concatenate to the decoded file, resampled like resample_poly."""
+    from scipy.signal import resample_poly
+
+    audio = _tone(30000, channels=2)
+    path = tmp_path / f"speech.{format}"
+    write(path, audio, 24000)
+    expected, sample_rate = read(path)
+    assert info(path) == (sample_rate, 2, len(expected))
+
+    native = list(read_blocks(path, 0.5, dtype="int16"))
+    assert [len(block) for block in native] == [12000, 12000, len(expected) - 24000]
+    np.testing.assert_array_equal(np.concatenate(native), read(path, dtype="int16")[0])
+
+    blocks = list(read_blocks(path, 0.5, target_sr=16000, dtype="float64", mono=True))
+    assert all(block.ndim == 1 for block in blocks)
+    np.testing.assert_allclose(
+        np.concatenate(blocks),
+        resample_poly(expected.mean(axis=1), 2, 3),
+        atol=1e-9,
+    )
+
+
+def test_read_blocks_overlap(tmp_path):
+    audio = _tone(24000)
+    path = tmp_path / "speech.wav"
+    write(path, audio, 24000)
+
+    blocks = list(read_blocks(path, 0.25, overlap_seconds=0.05, always_2d=True))
+    assert all(block.shape[1] == 1 for block in blocks)
+    for previous, block in zip(blocks, blocks[1:]):
+        np.testing.assert_array_equal(previous[-1200:], block[:1200])
+    # Hop of 0.2 s: windows start every 4800 frames until the audio is covered
+    assert len(blocks) == 5 and len(blocks[-1]) == 24000 - 4 * 4800
+
+    with pytest.raises(ValueError):
+        next(read_blocks(path, 0.25, overlap_seconds=0.25))
+
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+)
+
+
+@requires_ffmpeg
+def test_ffmpeg_encoder_streams_one_file():
+    """Blocks fed to one encoder decode back as a single continuous stream."""
+    audio = _tone(24000)
+    with FFmpegEncoder(24000, format="mp3") as encoder:
+        stream = b"".join(
+            encoder.encode(audio[start : start + 4000])
+            for start in range(0, len(audio), 4000)
+        )
+        stream += encoder.close()
+
+    decoded, sample_rate = read(io.BytesIO(stream), dtype="float32")
+    assert sample_rate == 24000
+    # MP3 pads with encoder delay but must not lose or repeat blocks
+    assert abs(len(decoded) - len(audio)) < 2400
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("format", ["mp3", "flac", "aac"])
+def test_ffmpeg_encoder_first_block_is_not_buffered(format):
+    """The first short block is encoded right away instead of after probing."""
+    with FFmpegEncoder(24000, format=format) as encoder:
+        encoded = encoder.encode(_tone(12000))
+        # encode() does not wait for ffmpeg, so poll with empty blocks
+        deadline = time.monotonic() + 2.0
+        while not encoded and time.monotonic() < deadline:
+            time.sleep(0.01)
+            encoded = encoder.encode(np.zeros(0, dtype=np.float32))
+        assert len(encoded) > 0
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("format", ["flac", "aac"])
+def test_ffmpeg_decoder_roundtrip(format):
+    """Decoding reads the stream parameters from ffmpeg's own WAV header."""
+    audio = _tone(4800, channels=2)
+    buffer = io.BytesIO()
+    write(buffer, audio, 24000, format=format)
+
+    with FFmpegDecoder(buffer.getvalue(), block_frames=1000) as decoder:
+        assert decoder.sample_rate == 24000
+        assert decoder.nchannels == 2
+        blocks = list(decoder)
+    assert all(block.shape[1] == 2 for block in blocks)
+    decoded = np.concatenate(blocks)
+    if format == "flac":
+        expected = (audio * 32767).astype(np.int16)
+        assert np.array_equal(decoded, expected)
+    else:
+        assert abs(len(decoded) - len(audio)) < 2400
+
+
+@requires_ffmpeg
+def test_ffmpeg_decoder_error():
+    with pytest.raises(RuntimeError, match="ffmpeg decoding failed"):
+        FFmpegDecoder(b"not audio")
@@ -1,6 +1,11 @@
+import asyncio
 import io
+import os
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import mlx.core as mx
 import numpy as np
 import pytest
 
@@ -12,7 +17,16 @@ pytest.importorskip("multipart", reason="python-multipart is required for server
 
 from fastapi.testclient import TestClient
 
-from mlx_audio.server import app
+from mlx_audio.server import (
+    InferenceExecutor,
+    InferenceQueueFull,
+    ModelProvider,
+    SpeechRequest,
+    app,
+    batch_engine_for,
+    generate_audio,
+)
+from mlx_audio.tts.batching import ContinuousBatchingEngine
 
 
 @pytest.fixture
@@ -26,7 +40,7 @@ def mock_model_provider():
     with patch(
         "mlx_audio.server.model_provider", new_callable=AsyncMock
     ) as mock_provider:
-        mock_provider.load_model = MagicMock()
+        mock_provider.load_model = AsyncMock()
         yield mock_provider
 
 
@@ -63,6 +77,267 @@ def test_add_model(client, mock_model_provider):
     mock_model_provider.load_model.assert_called_once_with("test_model")
 
 
+def test_model_stats(client, mock_model_provider):
+    # Test that the model stats endpoint exposes registry metrics
+    mock_model_provider.get_stats = AsyncMock(
+        return_value={"hits": 3, "misses": 1, "evictions": 0, "models": []}
+    )
+    response = client.get("/v1/models/stats")
+    assert response.status_code == 200
+    assert response.json() == {"hits": 3, "misses": 1, "evictions": 0, "models": []}
+
+
+def fake_loader(sizes, calls, delay=0.0):
+    def load(model_name):
+        calls.append(model_name)
+        time.sleep(delay)
+        return {"weight": mx.zeros((sizes[model_name] // 4,), dtype=mx.float32)}
+
+    return load
+
+
+async def test_model_provider_single_flight():
+    # Concurrent requests for a cold model share one load
+    calls = []
+    provider = ModelProvider()
+    with patch("mlx_audio.server.load_model", fake_loader({"a": 64}, calls, 0.05)):
+        results = await asyncio.gather(*(provider.load_model("a") for _ in range(4)))
+
+    assert calls == ["a"]
+    assert all(result is results[0] for result in results)
+    stats = await provider.get_stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 3
+    assert stats["loads"] == 1
+
+    await provider.load_model("a")
+    assert (await provider.get_stats())["hits"] == 1
+
+
+async def test_model_provider_preloads_voices_and_warms_up():
+    class VoiceModel(dict):
+        def __init__(self):
+            super().__init__(weight=mx.zeros((4,)))
+            self.preloaded = []
+            self.warmed_up = False
+
+        def preload_voices(self, voices):
+            self.preloaded.extend(voices)
+
+        def warmup(self):
+            self.warmed_up = True
+
+    provider = ModelProvider(
+        preload_voices=["af_heart", "af_bella,af_jessica"], warmup=True
+    )
+    with patch("mlx_audio.server.load_model", lambda name: VoiceModel()):
+        model = await provider.load_model("kokoro")
+    assert model.preloaded == ["af_heart", "af_bella,af_jessica"]
+    assert model.warmed_up
+
+    # Models without a voice cache load as usual
+    with patch("mlx_audio.server.load_model", fake_loader({"a": 64}, [])):
+        await provider.load_model("a")
+
+
+async def test_model_provider_lru_eviction():
+    # Least recently used models are evicted once the budget is exceeded
+    calls = []
+    sizes = {"a": 400, "b": 400, "c": 400}
+    provider = ModelProvider(memory_budget=1000)
+    with patch("mlx_audio.server.load_model", fake_loader(sizes, calls)):
+        await provider.load_model("a")
+        await provider.load_model("b")
+        await provider.load_model("a")  # "b" is now least recently used
+        await provider.load_model("c")
+
+    assert await provider.get_available_models() == ["a", "c"]
+    stats = await provider.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_used"] == 800
+
+
+async def test_model_provider_pinned_models_are_not_evicted():
+    calls = []
+    sizes = {"a": 400, "b": 400, "c": 400}
+    provider = ModelProvider(memory_budget=1000, pinned_models=["a"])
+    with patch("mlx_audio.server.load_model", fake_loader(sizes, calls)):
+        await provider.load_model("a")
+        await provider.load_model("b")
+        await provider.load_model("c")
+
+    assert await provider.get_available_models() == ["a", "c"]
+    stats = await provider.get_stats()
+    assert [m["pinned"] for m in stats["models"]] == [True, False]
+
+
+async def test_model_provider_failed_load_is_retried():
+    provider = ModelProvider()
+    with patch("mlx_audio.server.load_model", side_effect=ValueError("boom")):
+        with pytest.raises(ValueError):
+            await provider.load_model("a")
+
+    assert (await provider.get_stats())["load_failures"] == 1
+    with patch("mlx_audio.server.load_model", fake_loader({"a": 4}, [])):
+        await provider.load_model("a")
+    assert await provider.get_available_models() == ["a"]
+
+
+async def test_inference_executor_run_and_iterate():
+    executor = InferenceExecutor()
+    try:
+        assert await executor.run(lambda x, y=0: x + y, 2, y=3) == 5
+
+        chunks = [chunk async for chunk in executor.iterate(lambda: iter(range(3)))]
+        assert chunks == [0, 1, 2]
+
+        with pytest.raises(ValueError):
+            await executor.run(lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+        stats = executor.get_stats()
+        assert stats["completed"] == 2
+        assert stats["failed"] == 1
+        assert stats["queue_depth"] == 0
+    finally:
+        executor.shutdown()
+
+
+async def test_inference_executor_keeps_event_loop_responsive():
+    # Blocking model work must not stall other coroutines
+    executor = InferenceExecutor()
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    try:
+        await asyncio.gather(executor.run(time.sleep, 0.2), ticker())
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.15
+    finally:
+        executor.shutdown()
+
+
+async def test_inference_executor_cancels_stream_on_close():
+    executor = InferenceExecutor()
+    produced = []
+    closed = threading.Event()
+
+    def generate():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                time.sleep(0.005)
+                yield i
+        finally:
+            closed.set()
+
+    try:
+        stream = executor.iterate(generate)
+        assert await stream.__anext__() == 0
+        await stream.aclose()
+
+        assert await asyncio.to_thread(closed.wait, 2.0)
+        assert len(produced) < 1000
+        executor.shutdown()
+        assert executor.get_stats()["cancelled"] == 1
+    finally:
+        executor.shutdown()
+
+
+async def test_inference_executor_cleans_up_after_job():
+    executor = InferenceExecutor(max_queue_size=1)
+    events = []
+    release = threading.Event()
+
+    def generate():
+        yield 0
+        release.wait(2.0)
+        events.append("read")
+        yield 1
+
+    try:
+        stream = executor.iterate(generate, cleanup=lambda: events.append("cleanup"))
+        assert await stream.__anext__() == 0
+        # The client goes away while the worker still uses the job's inputs
+        await stream.aclose()
+        assert events == []
+
+        # Queued behind it: a job that is skipped, then one that is rejected
+        skipped = asyncio.ensure_future(
+            executor.run(generate, cleanup=lambda: events.append("skipped"))
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(InferenceQueueFull):
+            executor.iterate(generate, cleanup=lambda: events.append("rejected"))
+        assert events == ["rejected"]
+        skipped.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await skipped
+
+        release.set()
+        await asyncio.to_thread(executor.shutdown)
+        assert events == ["rejected", "read", "cleanup", "skipped"]
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+async def test_inference_executor_stream_backpressure():
+    executor = InferenceExecutor(max_buffered_chunks=2)
+    produced = []
+
+    def generate():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    try:
+        stream = executor.iterate(generate)
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.2)
+        # The worker waits for the slow consumer instead of buffering everything
+        assert len(produced) <= 5
+
+        assert [chunk async for chunk in stream] == list(range(1, 100))
+    finally:
+        executor.shutdown()
+
+
+async def test_inference_executor_rejects_when_queue_full():
+    executor = InferenceExecutor(max_queue_size=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        while executor.get_stats()["active"] == 0:
+            await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(InferenceQueueFull):
+            await executor.run(lambda: "rejected")
+        assert executor.get_stats()["queue_depth"] == 1
+        assert executor.get_stats()["rejected"] == 1
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        assert executor.get_stats()["max_wait_time"] > 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_inference_stats(client):
+    response = client.get("/v1/inference/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert "queue_depth" in data
+    assert "avg_wait_time" in data
+
+
 def test_remove_model_success(client, mock_model_provider):
     # Test that the remove_model endpoint returns a 204 status code
     mock_model_provider.remove_model = AsyncMock(return_value=True)
@@ -108,7 +383,7 @@ def test_tts_speech(client, mock_model_provider):
     mock_tts_model = MagicMock()
     mock_tts_model.generate = MagicMock(wraps=sync_mock_audio_stream_generator)
 
-    mock_model_provider.load_model = MagicMock(return_value=mock_tts_model)
+    mock_model_provider.load_model = AsyncMock(return_value=mock_tts_model)
 
     payload = {"model": "test_tts_model", "input": "Hello world", "voice": "alloy"}
     response = client.post("/v1/audio/speech", json=payload)
@@ -134,6 +409,236 @@ def test_tts_speech(client, mock_model_provider):
         pytest.fail(f"Failed to read or validate MP3 content: {e}")
 
 
+class ToneBatchEngine(ContinuousBatchingEngine):
+    """Batching engine that finishes every sequence after one step."""
+
+    def __init__(self, max_batch_size=8):
+        super().__init__(max_batch_size=max_batch_size)
+        self.submitted_texts = []
+        self._reset()
+
+    def _reset(self):
+        self.rows = []
+
+    @property
+    def num_active(self):
+        return len(self.rows)
+
+    def submit_text(self, text, params, voice=None, **kwargs):
+        segments = [s for s in text.split("\n") if s.strip()]
+        self.submitted_texts.extend(segments)
+        return [
+            self.submit(params, segment_idx=i, text=segment)
+            for i, segment in enumerate(segments)
+        ]
+
+    def _admit(self, request):
+        self.rows.append(request)
+
+    def _remove(self, requests):
+        self.rows = [r for r in self.rows if r not in requests]
+
+    def _step(self):
+        finished = []
+        for request in self.rows:
+            (result,) = sync_mock_audio_stream_generator(request.inputs["text"])
+            finished.append((request, result))
+        self.rows = []
+        return finished
+
+
+class SlowToneBatchEngine(ToneBatchEngine):
+    """Batching engine whose "long" segments take many 10 ms steps."""
+
+    def _admit(self, request):
+        steps = 50 if request.inputs["text"] == "long" else 1
+        self.rows.append([request, steps])
+
+    def _remove(self, requests):
+        self.rows = [row for row in self.rows if row[0] not in requests]
+
+    def _step(self):
+        time.sleep(0.01)
+        finished = []
+        for row in self.rows:
+            row[1] -= 1
+            if row[1] == 0:
+                (result,) = sync_mock_audio_stream_generator(row[0].inputs["text"])
+                finished.append((row[0], result))
+        self.rows = [row for row in self.rows if row[1] > 0]
+        return finished
+
+
+def batching_model(engine):
+    model = MagicMock()
+    model.make_batch_engine = MagicMock(return_value=engine)
+    model._batch_engine = None
+    return model
+
+
+async def test_batched_requests_do_not_wait_for_each_other():
+    executor = InferenceExecutor(num_workers=1)
+    engine = SlowToneBatchEngine()
+    model = batching_model(engine)
+    try:
+        with patch("mlx_audio.server.inference_executor", executor):
+            slow = generate_audio(model, SpeechRequest(model="m", input="long"))
+            slow_chunk = asyncio.ensure_future(slow.__anext__())
+            await asyncio.sleep(0.05)
+
+            # The only worker is busy stepping the batch for the slow request,
+            # which also finishes this one's segment and hands it over
+            fast = generate_audio(model, SpeechRequest(model="m", input="short"))
+            assert len(await asyncio.wait_for(fast.__anext__(), 0.3)) > 0
+            assert not slow_chunk.done()
+
+            assert len(await slow_chunk) > 0
+            await fast.aclose()
+            await slow.aclose()
+    finally:
+        await asyncio.to_thread(executor.shutdown)
+        engine.close()
+
+
+async def test_batched_request_ignores_stalled_consumer():
+    executor = InferenceExecutor(num_workers=1, max_buffered_chunks=1)
+    engine = ToneBatchEngine(max_batch_size=2)
+    model = batching_model(engine)
+    segments = "\n".join(["segment"] * 10)
+    try:
+        with patch("mlx_audio.server.inference_executor", executor):
+            # Reads its first chunk and then never again
+            stalled = generate_audio(
+                model, SpeechRequest(model="m", input=segments, response_format="pcm")
+            )
+            assert len(await stalled.__anext__()) > 0
+
+            other = generate_audio(
+                model, SpeechRequest(model="m", input=segments, response_format="pcm")
+            )
+
+            async def read_all():
+                return [chunk async for chunk in other]
+
+            chunks = await asyncio.wait_for(read_all(), 2.0)
+            assert len(chunks) == 10
+            await stalled.aclose()
+    finally:
+        await asyncio.to_thread(executor.shutdown)
+        engine.close()
+
+
+def test_tts_speech_continuous_batching(client, mock_model_provider):
+    engine = ToneBatchEngine()
+    mock_tts_model = MagicMock()
+    mock_tts_model.make_batch_engine = MagicMock(return_value=engine)
+    mock_tts_model._batch_engine = None
+    mock_model_provider.load_model = AsyncMock(return_value=mock_tts_model)
+
+    payload = {
+        "model": "test_tts_model",
+        "input": "Hello\nworld",
+        "response_format": "wav",
+    }
+    response = client.post("/v1/audio/speech", json=payload)
+    assert response.status_code == 200
+
+    # Both segments went through the shared engine instead of generate()
+    mock_tts_model.generate.assert_not_called()
+    assert engine.submitted_texts == ["Hello", "world"]
+    assert engine.get_stats()["completed"] == 2
+    assert len(response.content) > 2 * 16000 * 2
+
+    # Segments are streamed as one continuous WAV
+    assert response.content.count(b"RIFF") == 1
+    audio_data, sample_rate = audio_read(io.BytesIO(response.content))
+    assert sample_rate == 16000
+    assert len(audio_data) == 2 * 16000
+    engine.close()
+
+
+def test_tts_speech_continuous_batching_flac(client, mock_model_provider):
+    engine = ToneBatchEngine()
+    mock_tts_model = MagicMock()
+    mock_tts_model.make_batch_engine = MagicMock(return_value=engine)
+    mock_tts_model._batch_engine = None
+    mock_model_provider.load_model = AsyncMock(return_value=mock_tts_model)
+
+    payload = {
+        "model": "test_tts_model",
+        "input": "Hello\nworld",
+        "response_format": "flac",
+    }
+    response = client.post("/v1/audio/speech", json=payload)
+    assert response.status_code == 200
+
+    # Segments share one ffmpeg encoder, so the response is a single FLAC file
+    assert response.content.count(b"fLaC") == 1
+    audio_data, sample_rate = audio_read(io.BytesIO(response.content))
+    assert sample_rate == 16000
+    assert len(audio_data) == 2 * 16000
+    engine.close()
+
+
+def test_tts_batching_rejects_when_queue_full(client, mock_model_provider):
+    engine = ToneBatchEngine()
+    mock_tts_model = MagicMock()
+    mock_tts_model.make_batch_engine = MagicMock(return_value=engine)
+    mock_tts_model._batch_engine = None
+    mock_model_provider.load_model = AsyncMock(return_value=mock_tts_model)
+
+    executor = MagicMock()
+    executor.submit.side_effect = InferenceQueueFull("full")
+    with patch("mlx_audio.server.inference_executor", executor):
+        response = client.post(
+            "/v1/audio/speech",
+            json={"model": "test_tts_model", "input": "Hello\nworld"},
+        )
+    assert response.status_code == 503
+    # The rejected segments do not linger in the engine queue
+    stats = engine.get_stats()
+    assert stats["queued"] == 0
+    assert stats["cancelled"] == 2
+
+
+def test_tts_batching_rejects_speed(client, mock_model_provider):
+    mock_tts_model = MagicMock()
+    mock_tts_model.make_batch_engine = MagicMock(return_value=ToneBatchEngine())
+    mock_tts_model._batch_engine = None
+    mock_model_provider.load_model = AsyncMock(return_value=mock_tts_model)
+
+    payload = {"model": "test_tts_model", "input": "Hello", "speed": 1.5}
+    response = client.post("/v1/audio/speech", json=payload)
+    assert response.status_code == 400
+    assert "speed" in response.json()["detail"]
+
+
+def test_tts_batching_skips_voice_cloning():
+    mock_tts_model = MagicMock()
+    mock_tts_model.make_batch_engine = MagicMock(return_value=ToneBatchEngine())
+    mock_tts_model._batch_engine = None
+
+    payload = SpeechRequest(model="test_tts_model", input="Hello", ref_audio="a.wav")
+    assert batch_engine_for(mock_tts_model, payload) is None
+    mock_tts_model.make_batch_engine.assert_not_called()
+
+    payload = SpeechRequest(model="test_tts_model", input="Hello")
+    engine = batch_engine_for(mock_tts_model, payload)
+    assert isinstance(engine, ToneBatchEngine)
+    assert batch_engine_for(mock_tts_model, payload) is engine
+
+
+def test_speech_batching_stats(client, mock_model_provider):
+    mock_model_provider.get_batching_stats = AsyncMock(
+        return_value={"test_tts_model": {"active": 2, "tokens_per_sec": 100.0}}
+    )
+    response = client.get("/v1/audio/speech/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["models"]["test_tts_model"]["active"] == 2
+    assert "max_batch_size" in data
+
+
 def test_stt_transcriptions(client, mock_model_provider):
     # Test that the stt_transcriptions endpoint returns a 200 status code
     mock_stt_model = MagicMock()
@@ -141,7 +646,7 @@ def test_stt_transcriptions(client, mock_model_provider):
         return_value={"text": "This is a test transcription."}
     )
 
-    mock_model_provider.load_model = MagicMock(return_value=mock_stt_model)
+    mock_model_provider.load_model = AsyncMock(return_value=mock_stt_model)
 
     sample_rate = 16000
     duration = 1
@@ -165,4 +670,67 @@ def test_stt_transcriptions(client, mock_model_provider):
     mock_model_provider.load_model.assert_called_once_with("test_stt_model")
     mock_stt_model.generate.assert_called_once()
 
-    assert mock_stt_model.generate.call_args[0][0].startswith("/tmp/")
+    # Audio is decoded in memory and passed to the model as a waveform
+    stt_input = mock_stt_model.generate.call_args[0][0]
+    assert isinstance(stt_input, mx.array)
+    assert stt_input.dtype == mx.float32
+    assert stt_input.ndim == 1
+    assert abs(stt_input.shape[0] - sample_rate * duration) < sample_rate * 0.1
+
+
+def test_stt_transcriptions_resamples_to_model_rate(client, mock_model_provider):
+    # Test that uploads are resampled to the model's declared sample rate
+    mock_stt_model = MagicMock()
+    mock_stt_model.sample_rate = 16000
+    mock_stt_model.generate = MagicMock(return_value={"text": "resampled"})
+
+    mock_model_provider.load_model = AsyncMock(return_value=mock_stt_model)
+
+    sample_rate = 48000
+    audio_data = np.zeros(sample_rate, dtype=np.float32)
+
+    buffer = io.BytesIO()
+    audio_write(buffer, audio_data, sample_rate, format="wav")
+    buffer.seek(0)
+
+    response = client.post(
+        "/v1/audio/transcriptions",
+        files={"file": ("test.wav", buffer, "audio/wav")},
+        data={"model": "test_stt_model"},
+    )
+
+    assert response.status_code == 200
+    stt_input = mock_stt_model.generate.call_args[0][0]
+    assert isinstance(stt_input, mx.array)
+    assert stt_input.shape[0] == 16000
+
+
+def test_stt_transcriptions_path_only_model(client, mock_model_provider):
+    # Test that models which only accept paths get a temporary WAV file
+    mock_stt_model = MagicMock()
+    seen = {}
+
+    def generate(path, **kwargs):
+        seen["path"] = path
+        seen["exists"] = os.path.exists(path)
+        return {"text": "from file"}
+
+    mock_stt_model.generate = MagicMock(side_effect=generate)
+    mock_model_provider.load_model = AsyncMock(return_value=mock_stt_model)
+
+    buffer = io.BytesIO()
+    audio_write(buffer, np.zeros(16000, dtype=np.float32), 16000, format="wav")
+    buffer.seek(0)
+
+    with patch("mlx_audio.server.accepts_array_input", return_value=False):
+        response = client.post(
+            "/v1/audio/transcriptions",
+            files={"file": ("test.wav", buffer, "audio/wav")},
+            data={"model": "test_stt_model"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"text": "from file"}
+    assert seen["path"].endswith(".wav")
+    assert seen["exists"]
+    assert not os.path.exists(seen["path"])
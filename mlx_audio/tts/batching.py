@@ -0,0 +1,329 @@
+"""Continuous batching for autoregressive TTS talkers.
+
+Concurrent requests share a single batched decode step instead of running one
+``generate`` loop each. Every sequence keeps its own slot in a batched KV cache
+and its own sampling parameters; sequences leave the batch when they emit EOS
+(or hit their token limit) and queued requests are admitted between steps, so
+the batch stays full while traffic lasts.
+
+The engine owns no thread. Whoever waits for a request drives the batch with
+:meth:`ContinuousBatchingEngine.drive` or :meth:`ContinuousBatchingEngine.results`
+(in the server, jobs on the shared inference executor). Every step advances
+all sequences in the batch, not only the driver's own, and each finished
+sequence is delivered through its request's future right away.
+
+Models opt in by implementing ``make_batch_engine(max_batch_size)`` and
+returning a :class:`ContinuousBatchingEngine` subclass.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import mlx.core as mx
+
+from .models.base import GenerationResult
+
+
+@dataclass
+class SamplingParams:
+    temperature: float = 0.9
+    top_k: int = 0
+    top_p: float = 1.0
+    repetition_penalty: float = 1.0
+    # ``None`` uses the engine's model-specific default
+    max_tokens: Optional[int] = None
+
+
+class BatchRequest:
+    """A single sequence submitted to a :class:`ContinuousBatchingEngine`.
+
+    ``inputs`` holds the model-specific arguments used to build the prompt when
+    the request is admitted. ``future`` resolves to the finished
+    :class:`GenerationResult` (``None`` when the sequence produced no audio or
+    was cancelled) or to the exception raised while decoding it.
+    """
+
+    _uids = itertools.count()
+
+    def __init__(
+        self,
+        inputs: Dict[str, Any],
+        params: SamplingParams,
+        segment_idx: int = 0,
+    ):
+        self.uid = next(self._uids)
+        self.inputs = inputs
+        self.params = params
+        self.segment_idx = segment_idx
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.cancelled = threading.Event()
+        self.future: Future = Future()
+
+    def result(self, timeout: Optional[float] = None) -> Optional[GenerationResult]:
+        """Block until the sequence finishes and return its result.
+
+        Someone has to drive the engine meanwhile; see
+        :meth:`ContinuousBatchingEngine.results`.
+        """
+        return self.future.result(timeout)
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _finish(self, item):
+        if self.future.done():
+            return
+        if isinstance(item, BaseException):
+            self.future.set_exception(item)
+        else:
+            self.future.set_result(item)
+
+
+class ContinuousBatchingEngine:
+    """Scheduler for a model's batched decode loop.
+
+    Subclasses own the batched model state and implement:
+
+    - ``num_active``: number of sequences currently in the batch.
+    - ``_admit(request)``: prefill a request and add it to the batch.
+    - ``_step()``: run one decode step for the whole batch and return
+      ``(request, result)`` pairs for the sequences that finished.
+    - ``_remove(requests)``: drop sequences from the batch.
+    - ``_reset()``: drop all batch state.
+
+    Requests are queued with :meth:`submit` and decoded by the threads that
+    iterate :meth:`results`. Steps are serialized, so any number of threads
+    may drive the same engine; between steps queued requests are admitted
+    until ``max_batch_size`` sequences are active.
+    """
+
+    def __init__(self, max_batch_size: int = 8):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_batch_size = max_batch_size
+        self._pending: deque = deque()
+        self._active: Dict[int, BatchRequest] = {}
+        self._lock = threading.Lock()
+        self._step_lock = threading.Lock()
+        self._closed = False
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "steps": 0,
+            "tokens": 0,
+            "decode_time": 0.0,
+            "max_batch_size_seen": 0,
+        }
+
+    @property
+    def num_active(self) -> int:
+        raise NotImplementedError
+
+    def _admit(self, request: BatchRequest):
+        raise NotImplementedError
+
+    def _step(self) -> List[Tuple[BatchRequest, Optional[GenerationResult]]]:
+        raise NotImplementedError
+
+    def _remove(self, requests: List[BatchRequest]):
+        raise NotImplementedError
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def submit(
+        self, params: SamplingParams, segment_idx: int = 0, **inputs
+    ) -> BatchRequest:
+        """Queue a sequence for generation and return its request handle."""
+        request = BatchRequest(inputs, params, segment_idx=segment_idx)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Batching engine is closed")
+            self._pending.append(request)
+            self.stats["submitted"] += 1
+        return request
+
+    def cancel(self, requests: List[BatchRequest]):
+        """Cancel ``requests``. Queued ones are dropped right away and running
+        ones leave the batch at the next step."""
+        with self._lock:
+            for request in requests:
+                request.cancel()
+            dropped = [r for r in self._pending if r.cancelled.is_set()]
+            for request in dropped:
+                self._pending.remove(request)
+            self.stats["cancelled"] += len(dropped)
+        for request in dropped:
+            request._finish(None)
+
+    def drive(self, request: BatchRequest):
+        """Decode on the calling thread until ``request`` finishes.
+
+        The thread takes turns stepping the batch with any other thread
+        driving the same engine. Other requests finished meanwhile resolve
+        their own futures, so their owners get them without driving.
+        """
+        while not request.done():
+            with self._step_lock:
+                if not request.done() and not self._run_step():
+                    break
+
+    def results(
+        self, requests: List[BatchRequest]
+    ) -> Iterator[Optional[GenerationResult]]:
+        """Decode until each of ``requests`` finishes and yield its result, in order.
+
+        Raises:
+            Exception: The error that made a request fail.
+        """
+        for request in requests:
+            self.drive(request)
+            yield request.result()
+
+    def close(self):
+        """Drop the batch and fail any unfinished requests."""
+        with self._lock:
+            self._closed = True
+        with self._step_lock:
+            self._reset()
+            with self._lock:
+                unfinished = list(self._pending) + list(self._active.values())
+                self._pending.clear()
+                self._active.clear()
+        for request in unfinished:
+            request._finish(RuntimeError("Batching engine is closed"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["queued"] = len(self._pending)
+            stats["active"] = len(self._active)
+        stats["max_batch_size"] = self.max_batch_size
+        stats["tokens_per_sec"] = (
+            stats["tokens"] / stats["decode_time"] if stats["decode_time"] else 0.0
+        )
+        stats["avg_batch_size"] = (
+            stats["tokens"] / stats["steps"] if stats["steps"] else 0.0
+        )
+        return stats
+
+    def _next_admissions(self) -> List[BatchRequest]:
+        """Pop the queued requests that fit in the batch."""
+        with self._lock:
+            admitted = []
+            while (
+                self._pending
+                and len(self._active) + len(admitted) < self.max_batch_size
+            ):
+                admitted.append(self._pending.popleft())
+            return admitted
+
+    def _drop_cancelled(self):
+        with self._lock:
+            pending = [r for r in self._pending if r.cancelled.is_set()]
+            for request in pending:
+                self._pending.remove(request)
+            active = [r for r in self._active.values() if r.cancelled.is_set()]
+            for request in active:
+                del self._active[request.uid]
+            self.stats["cancelled"] += len(pending) + len(active)
+        if active:
+            self._remove(active)
+        for request in pending + active:
+            request._finish(None)
+
+    def _run_step(self) -> bool:
+        """Admit queued requests and run one decode step.
+
+        Must be called with ``_step_lock`` held. Returns ``False`` when there
+        is nothing left to decode.
+        """
+        if self._closed:
+            return False
+        for request in self._next_admissions():
+            if request.cancelled.is_set():
+                with self._lock:
+                    self.stats["cancelled"] += 1
+                request._finish(None)
+                continue
+            try:
+                request.started_at = time.perf_counter()
+                self._admit(request)
+            except Exception as e:
+                with self._lock:
+                    self.stats["failed"] += 1
+                request._finish(e)
+                continue
+            with self._lock:
+                self._active[request.uid] = request
+
+        self._drop_cancelled()
+        if not self._active:
+            return bool(self._pending)
+
+        batch_size = self.num_active
+        tic = time.perf_counter()
+        try:
+            finished = self._step()
+        except Exception as e:
+            with self._lock:
+                failed = list(self._active.values())
+                self._active.clear()
+                self.stats["failed"] += len(failed)
+            self._reset()
+            for request in failed:
+                request._finish(e)
+            mx.clear_cache()
+            return True
+
+        with self._lock:
+            self.stats["steps"] += 1
+            self.stats["tokens"] += batch_size
+            self.stats["decode_time"] += time.perf_counter() - tic
+            self.stats["max_batch_size_seen"] = max(
+                self.stats["max_batch_size_seen"], batch_size
+            )
+            for request, _ in finished:
+                self._active.pop(request.uid, None)
+            self.stats["completed"] += len(finished)
+        for request, result in finished:
+            request._finish(result)
+        if finished and not self._active:
+            mx.clear_cache()
+        return True
+
+
+_engine_lock = threading.Lock()
+
+
+def get_batch_engine(
+    model, max_batch_size: int = 8
+) -> Optional[ContinuousBatchingEngine]:
+    """Return the shared batching engine of ``model``, creating it if needed.
+
+    Returns ``None`` for models that do not support continuous batching.
+    """
+    factory = getattr(model, "make_batch_engine", None)
+    if factory is None or max_batch_size < 1:
+        return None
+    with _engine_lock:
+        engine = getattr(model, "_batch_engine", None)
+        if isinstance(engine, ContinuousBatchingEngine):
+            engine.max_batch_size = max_batch_size
+            return engine
+        engine = factory(max_batch_size=max_batch_size)
+        if not isinstance(engine, ContinuousBatchingEngine):
+            return None
+        model._batch_engine = engine
+    return engine
@@ -106,7 +106,7 @@ def generate_audio(
     text: str,
     model: Optional[Union[str, nn.Module]] = None,
     max_tokens: int = 1200,
-    voice: str = "af_heart",
+    voice: Optional[str] = None,
     instruct: Optional[str] = None,
     speed: float = 1.0,
     lang_code: str = "en",
@@ -135,6 +135,7 @@ def generate_audio(
     - text (str): The input text to be converted to speech.
     - model (str): The TTS model to use.
     - voice (str): The voice style to use (also used as speaker for Qwen3-TTS models).
+      Models use their default voice when it is None.
     - instruct (str): Instruction for emotion/style (CustomVoice) or voice description (VoiceDesign).
     - temperature (float): The temperature for the model.
     - speed (float): Playback speed multiplier.
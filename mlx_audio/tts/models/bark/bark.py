@@ -4,14 +4,13 @@ import math
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import mlx.core as mx
 import mlx.nn as nn
 import numpy as np
 import tqdm
 from mlx.utils import tree_map, tree_unflatten
-from mlx_lm.models.base import create_causal_mask
 from scipy.io.wavfile import write as write_wav
 from transformers import BertTokenizer
 
@@ -137,6 +136,40 @@ class LayerNorm(nn.Module):
         return x
 
 
+class KVCache:
+    """
+    Key/value cache of one attention layer with a fixed capacity.
+
+    The buffers are allocated on the first update and written in place, so a
+    generation step copies only the new keys and values instead of
+    concatenating the whole history. ``reset`` keeps the buffers for reuse.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.keys = None
+        self.values = None
+        self.offset = 0
+
+    def update_and_fetch(self, keys: mx.array, values: mx.array):
+        B, H, T, D = keys.shape
+        end = self.offset + T
+        if end > self.capacity:
+            raise ValueError(
+                f"Sequence of length {end} exceeds the block size {self.capacity}"
+            )
+        if self.keys is None or self.keys.shape[0] != B:
+            self.keys = mx.zeros((B, H, self.capacity, D), dtype=keys.dtype)
+            self.values = mx.zeros((B, H, self.capacity, D), dtype=values.dtype)
+        self.keys[:, :, self.offset : end, :] = keys
+        self.values[:, :, self.offset : end, :] = values
+        self.offset = end
+        return self.keys[:, :, :end, :], self.values[:, :, :end, :]
+
+    def reset(self):
+        self.offset = 0
+
+
 class CausalSelfAttention(nn.Module):
     def __init__(
         self, args: Union[SemanticConfig, CoarseAcousticsConfig, FineAcousticsConfig]
@@ -149,40 +182,43 @@ class CausalSelfAttention(nn.Module):
         self.n_head = args.n_head
         self.n_embd = args.n_embd
         self.dropout = args.dropout
+        # Unused causal mask buffer, kept so checkpoints that include it load
         self.bias = (
             mx.tril(mx.ones([args.block_size, args.block_size]))
             .reshape(1, 1, args.block_size, args.block_size)
             .astype(mx.float32)
         )
 
-    def __call__(self, x, past_kv=None, use_cache=False):
+    def __call__(self, x, cache: Optional[KVCache] = None):
         B, T, C = x.shape
         query, key, value = mx.split(self.att_proj(x), 3, axis=2)
         key = key.reshape(B, T, self.n_head, C // self.n_head).transpose(0, 2, 1, 3)
         query = query.reshape(B, T, self.n_head, C // self.n_head).transpose(0, 2, 1, 3)
         value = value.reshape(B, T, self.n_head, C // self.n_head).transpose(0, 2, 1, 3)
-        if past_kv is not None:
-            past_key, past_value = past_kv
-            key = mx.concatenate([past_key, key], axis=-2)
-            value = mx.concatenate([past_value, value], axis=-2)
-
-        FULL_T = key.shape[-2]
-        if use_cache is True:
-            present = (key, value)
+
+        offset = 0
+        if cache is not None:
+            offset = cache.offset
+            key, value = cache.update_and_fetch(key, value)
+
+        if T == 1:
+            mask = None
+        elif offset == 0:
+            mask = "causal"
         else:
-            present = None
+            mask = mx.arange(offset, offset + T)[:, None] >= mx.arange(offset + T)
 
         y = mx.fast.scaled_dot_product_attention(
             query,
             key,
             value,
             scale=1.0 / math.sqrt(key.shape[3]),
-            mask=self.bias[:, :, FULL_T - T : FULL_T, :FULL_T],
+            mask=mask,
         )
         y = self.attn_dropout(y)
         y = y.transpose(0, 2, 1, 3).reshape(B, T, C)
         y = self.resid_dropout(self.out_proj(y))
-        return (y, present)
+        return y
 
 
 class NonCausalSelfAttention(nn.Module):
@@ -245,13 +281,10 @@ class Block(nn.Module):
         self.mlp = MLP(args)
         self.layer_idx = layer_idx
 
-    def __call__(self, x: mx.array, past_kv=None, use_cache=False):
-        attn_output, prev_kvs = self.attn(
-            self.layernorm_1(x), past_kv=past_kv, use_cache=use_cache
-        )
-        x = x + attn_output
+    def __call__(self, x: mx.array, cache: Optional[KVCache] = None):
+        x = x + self.attn(self.layernorm_1(x), cache=cache)
         x = x + self.mlp(self.layernorm_2(x))
-        return (x, prev_kvs)
+        return x
 
 
 class FineBlock(nn.Module):
@@ -280,40 +313,40 @@ class GPT(nn.Module):
         self.layernorm_final = LayerNorm(args.n_embd, bias=False)
         self.lm_head = nn.Linear(args.n_embd, args.output_vocab_size, bias=False)
 
+    def make_cache(self) -> List[KVCache]:
+        """Return an empty per-layer KV cache holding up to ``block_size`` tokens."""
+        return [KVCache(self.args.block_size) for _ in self.layers]
+
     def __call__(
         self,
         x: mx.array,
         merge_context: bool = False,
-        past_kv: mx.array = None,
+        cache: Optional[List[KVCache]] = None,
         position_ids: mx.array = None,
-        use_cache: bool = False,
-    ) -> mx.array:
+    ) -> Tuple[mx.array, Optional[List[KVCache]]]:
         b, t = x.shape
 
-        if past_kv is not None:
-            assert t == 1
-            tok_emb = self.input_embeds_layer(x)
-        else:
-            if merge_context:
-                assert x.shape[1] >= 256 + 256 + 1
-                t = x.shape[1] - 256
-                tok_emb = mx.concatenate(
-                    [
-                        self.input_embeds_layer(x[:, :256])
-                        + self.input_embeds_layer(x[:, 256 : 256 + 256]),
-                        self.input_embeds_layer(x[:, 256 + 256 :]),
-                    ],
-                    axis=1,
-                )
-            else:
-                tok_emb = self.input_embeds_layer(x)
-
         # past length
-        if past_kv is None:
-            past_length = 0
-            past_kv = tuple([None] * len(self.layers))
+        past_length = cache[0].offset if cache is not None else 0
+
+        if merge_context and past_length == 0:
+            # The prompt sums text and history embeddings; later steps are
+            # single tokens fed on top of the cache
+            assert x.shape[1] >= 256 + 256 + 1
+            t = x.shape[1] - 256
+            tok_emb = mx.concatenate(
+                [
+                    self.input_embeds_layer(x[:, :256])
+                    + self.input_embeds_layer(x[:, 256 : 256 + 256]),
+                    self.input_embeds_layer(x[:, 256 + 256 :]),
+                ],
+                axis=1,
+            )
         else:
-            past_length = past_kv[0][0].shape[-2]
+            tok_emb = self.input_embeds_layer(x)
+
+        if cache is None:
+            cache = [None] * len(self.layers)
 
         if position_ids is None:
             position_ids = mx.arange(past_length, t + past_length)
@@ -324,13 +357,8 @@ class GPT(nn.Module):
         )  # position embeddings of shape (1, t, n_embd)
         x = self.drop(tok_emb + pos_emb)
 
-        new_kv = () if use_cache else None
-
-        for i, (block, past_layer_kv) in enumerate(zip(self.layers, past_kv)):
-            x, kv = block(x, past_kv=past_layer_kv, use_cache=use_cache)
-
-            if use_cache:
-                new_kv = new_kv + (kv,)
+        for block, layer_cache in zip(self.layers, cache):
+            x = block(x, cache=layer_cache)
 
         x = self.layernorm_final(x)
 
@@ -338,7 +366,7 @@ class GPT(nn.Module):
             x[:, -1:, :]
         )  # note: using list [-1] to preserve the time dim
 
-        return (logits, new_kv)
+        return (logits, None if cache[0] is None else cache)
 
 
 class FineGPT(nn.Module):
@@ -455,7 +483,14 @@ class Model(nn.Module):
     def sample_rate(self):
         return self.config.sample_rate
 
-    def generate(self, text: str, voice: str = None, **kwargs):
+    def generate(
+        self,
+        text: str,
+        voice: str = None,
+        stream: bool = False,
+        streaming_interval: float = 2.0,
+        **kwargs,
+    ):
         pipeline = Pipeline(
             model=self,
             tokenizer=self.tokenizer,
@@ -466,7 +501,13 @@ class Model(nn.Module):
         start_time = time.time()
 
         for segment_idx, (audio, tokens) in enumerate(
-            pipeline(text, voice=voice, use_kv_caching=True, **kwargs)
+            pipeline(
+                text,
+                voice=voice,
+                stream=stream,
+                streaming_interval=streaming_interval,
+                **kwargs,
+            )
         ):
             # Track per-segment generation time
             segment_time = time.time() - start_time
@@ -522,7 +563,9 @@ class Model(nn.Module):
                 },
                 processing_time_seconds=segment_time,
                 peak_memory_usage=mx.get_peak_memory() / 1e9,
+                is_streaming_chunk=stream,
             )
 
             # Clear cache after each segment to avoid memory leaks
             mx.clear_cache()
+            start_time = time.time()
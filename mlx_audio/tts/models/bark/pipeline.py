@@ -1,7 +1,7 @@
 import math
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import mlx.core as mx
 import mlx.nn as nn
@@ -119,19 +119,8 @@ class Pipeline:
         self.tokenizer = tokenizer
         self.codec_model, _ = Encodec.from_pretrained(config.codec_path)
 
-    def generate_text_semantic(
-        self,
-        text: str,
-        voice: str = "announcer",
-        temperature: float = 0.7,
-        use_kv_caching: bool = False,
-        allow_early_stop: bool = True,
-        **kwargs,
-    ):
-        """Generate semantic tokens from text."""
-        verbose = kwargs.get("verbose", False)
-        if verbose:
-            print("Generating semantic tokens...")
+    def _semantic_prompt(self, text: str, voice: Optional[str]):
+        """Build the semantic model prompt: text, voice history and infer token."""
         if voice is not None:
             voice_prompt = _load_voice_prompt(voice)
             semantic_history = mx.array(voice_prompt["semantic_prompt"])
@@ -177,16 +166,21 @@ class Pipeline:
             .reshape(1, -1)
             .astype(mx.int64)
         )
+        return x, encoded_text
+
+    def _semantic_tokens(
+        self,
+        x: mx.array,
+        temperature: float = 0.7,
+        allow_early_stop: bool = True,
+        verbose: bool = False,
+    ) -> Iterator[int]:
+        """Sample semantic tokens one at a time after prefilling prompt ``x``."""
         n_tot_steps = 768
-        kv_cache = None
+        cache = self.model.semantic.make_cache()
+        x_input = x
         for i in tqdm.tqdm(range(n_tot_steps), disable=not verbose):
-            if use_kv_caching and kv_cache is not None:
-                x_input = x[:, -1:]
-            else:
-                x_input = x
-            logits, kv_cache = self.model.semantic(
-                x_input, merge_context=True, use_cache=use_kv_caching, past_kv=kv_cache
-            )
+            logits, _ = self.model.semantic(x_input, merge_context=True, cache=cache)
             relevant_logits = logits[0, 0, :SEMANTIC_VOCAB_SIZE]
             if allow_early_stop:
                 # Early stop
@@ -198,128 +192,171 @@ class Pipeline:
                 relevant_logits * 1 / (temperature), num_samples=1
             ).astype(mx.int32)
 
-            if next_token == SEMANTIC_VOCAB_SIZE:
-                print(f"Early stop at step {i} with token {next_token.tolist()}")
-                break
-            x = mx.concatenate([x, next_token.reshape(1, -1)], axis=1)
-            if i == n_tot_steps - 1:
+            token = next_token.item()
+            if token == SEMANTIC_VOCAB_SIZE:
+                if verbose:
+                    print(f"Early stop at step {i} with token {token}")
                 break
-        out = x.squeeze()[256 + 256 + 1 :]
-        return out, encoded_text
+            yield token
+            # Only the new token is fed; earlier positions live in the cache
+            x_input = next_token.reshape(1, 1)
 
-    def generate_coarse(
+    def generate_text_semantic(
         self,
-        x_semantic: mx.array,
+        text: str,
         voice: str = "announcer",
         temperature: float = 0.7,
-        max_coarse_history: int = 60,  # min 60 (faster), max 630 (more context)
-        sliding_window_len: int = 60,
-        use_kv_caching: bool = False,
+        allow_early_stop: bool = True,
         **kwargs,
     ):
-        """Generate coarse tokens from semantic tokens."""
+        """Generate semantic tokens from text."""
         verbose = kwargs.get("verbose", False)
         if verbose:
-            print("Generating coarse tokens...")
+            print("Generating semantic tokens...")
+        x, encoded_text = self._semantic_prompt(text, voice)
+        tokens = list(
+            self._semantic_tokens(x, temperature, allow_early_stop, verbose=verbose)
+        )
+        out = mx.array(tokens, dtype=mx.int32)
+        return out, encoded_text
+
+    def _coarse_prompt(self, voice: Optional[str], max_semantic_history: int):
+        """Return the semantic and flattened coarse histories of ``voice``."""
+        semantic_to_coarse_ratio = (
+            COARSE_RATE_HZ / SEMANTIC_RATE_HZ * N_COARSE_CODEBOOKS
+        )
+        if voice is None:
+            return mx.array([], dtype=mx.int32), mx.array([], dtype=mx.int32)
+
+        voice_prompt = _load_voice_prompt(voice)
+        x_semantic_history = mx.array(voice_prompt["semantic_prompt"])
+        x_coarse_history = mx.array(voice_prompt["coarse_prompt"])
+        assert (
+            isinstance(x_semantic_history, mx.array)
+            and len(x_semantic_history.shape) == 1
+            and len(x_semantic_history) > 0
+            and x_semantic_history.min() >= 0
+            and x_semantic_history.max() <= SEMANTIC_VOCAB_SIZE - 1
+            and isinstance(x_coarse_history, mx.array)
+            and len(x_coarse_history.shape) == 2
+            and x_coarse_history.shape[0] == N_COARSE_CODEBOOKS
+            and x_coarse_history.shape[-1] >= 0
+            and x_coarse_history.min() >= 0
+            and x_coarse_history.max() <= CODEBOOK_SIZE - 1
+            and (
+                round(x_coarse_history.shape[-1] / len(x_semantic_history), 1)
+                == round(semantic_to_coarse_ratio / N_COARSE_CODEBOOKS, 1)
+            )
+        )
+        x_coarse_history = _flatten_codebooks(x_coarse_history) + SEMANTIC_VOCAB_SIZE
+        # trim histories correctly
+        n_semantic_hist_provided = min(
+            max_semantic_history,
+            len(x_semantic_history) - len(x_semantic_history) % 2,
+            int(math.floor(len(x_coarse_history) / semantic_to_coarse_ratio)),
+        )
+        n_coarse_hist_provided = int(
+            round(n_semantic_hist_provided * semantic_to_coarse_ratio)
+        )
+        x_semantic_history = x_semantic_history[-n_semantic_hist_provided:].astype(
+            mx.int32
+        )
+        x_coarse_history = x_coarse_history[-n_coarse_hist_provided:].astype(mx.int32)
+        # TODO: bit of a hack for time alignment (sounds better)
+        x_coarse_history = x_coarse_history[:-2]
+        return x_semantic_history, x_coarse_history
+
+    def _coarse_windows(
+        self,
+        semantic_tokens: Iterable[int],
+        voice: Optional[str] = "announcer",
+        temperature: float = 0.7,
+        max_coarse_history: int = 60,
+        sliding_window_len: int = 60,
+        **kwargs,
+    ) -> Iterator[mx.array]:
+        """
+        Yield the flattened coarse tokens of each sliding window.
+
+        Semantic tokens are pulled from ``semantic_tokens`` only as far as the
+        next window reads, so windows can be generated while the semantic
+        stage is still running. The result is the same as running the windows
+        over the complete semantic sequence.
+        """
         semantic_to_coarse_ratio = (
             COARSE_RATE_HZ / SEMANTIC_RATE_HZ * N_COARSE_CODEBOOKS
         )
         max_semantic_history = int(
             math.floor(max_coarse_history / semantic_to_coarse_ratio)
         )
-        if voice is not None:
-            voice_prompt = _load_voice_prompt(voice)
-            x_semantic_history = mx.array(voice_prompt["semantic_prompt"])
-            x_coarse_history = mx.array(voice_prompt["coarse_prompt"])
-            assert (
-                isinstance(x_semantic_history, mx.array)
-                and len(x_semantic_history.shape) == 1
-                and len(x_semantic_history) > 0
-                and x_semantic_history.min() >= 0
-                and x_semantic_history.max() <= SEMANTIC_VOCAB_SIZE - 1
-                and isinstance(x_coarse_history, mx.array)
-                and len(x_coarse_history.shape) == 2
-                and x_coarse_history.shape[0] == N_COARSE_CODEBOOKS
-                and x_coarse_history.shape[-1] >= 0
-                and x_coarse_history.min() >= 0
-                and x_coarse_history.max() <= CODEBOOK_SIZE - 1
-                and (
-                    round(x_coarse_history.shape[-1] / len(x_semantic_history), 1)
-                    == round(semantic_to_coarse_ratio / N_COARSE_CODEBOOKS, 1)
+        x_semantic_history, x_coarse_history = self._coarse_prompt(
+            voice, max_semantic_history
+        )
+        x_semantic = x_semantic_history.tolist()
+        x_coarse_in = x_coarse_history.reshape(1, -1)
+        base_semantic_idx = len(x_semantic)
+        semantic_iter = iter(semantic_tokens)
+        semantic_done = False
+
+        def pull(n):
+            # Buffer semantic tokens until there are n or the stage is done
+            nonlocal semantic_done
+            while not semantic_done and len(x_semantic) < n:
+                try:
+                    x_semantic.append(next(semantic_iter))
+                except StopIteration:
+                    semantic_done = True
+
+        def n_steps():
+            # Coarse steps covered by the semantic tokens buffered so far
+            n_semantic = len(x_semantic) - base_semantic_idx
+            return int(
+                round(
+                    math.floor(
+                        n_semantic * semantic_to_coarse_ratio / N_COARSE_CODEBOOKS
+                    )
+                    * N_COARSE_CODEBOOKS
                 )
             )
-            x_coarse_history = (
-                _flatten_codebooks(x_coarse_history) + SEMANTIC_VOCAB_SIZE
-            )
-            # trim histories correctly
-            n_semantic_hist_provided = min(
-                max_semantic_history,
-                len(x_semantic_history) - len(x_semantic_history) % 2,
-                int(math.floor(len(x_coarse_history) / semantic_to_coarse_ratio)),
-            )
-            n_coarse_hist_provided = int(
-                round(n_semantic_hist_provided * semantic_to_coarse_ratio)
-            )
-            x_semantic_history = x_semantic_history[-n_semantic_hist_provided:].astype(
-                mx.int32
-            )
-            x_coarse_history = x_coarse_history[-n_coarse_hist_provided:].astype(
-                mx.int32
-            )
-            # TODO: bit of a hack for time alignment (sounds better)
-            x_coarse_history = x_coarse_history[:-2]
-        else:
-            x_semantic_history = mx.array([], dtype=mx.int32)
-            x_coarse_history = mx.array([], dtype=mx.int32)
 
-        n_steps = int(
-            round(
-                math.floor(
-                    len(x_semantic) * semantic_to_coarse_ratio / N_COARSE_CODEBOOKS
-                )
-                * N_COARSE_CODEBOOKS
-            )
-        )
-        x_semantic = mx.concatenate([x_semantic_history, x_semantic]).astype(mx.int32)
-        x_coarse = x_coarse_history.astype(mx.int32)
-        base_semantic_idx = len(x_semantic_history)
-        # Inference
-        x_semantic_in = x_semantic.reshape(1, -1)
-        x_coarse_in = x_coarse.reshape(1, -1)
-        n_window_steps = int(round(n_steps / sliding_window_len))
+        def has_next_step(n_step):
+            while not semantic_done and n_step >= n_steps():
+                pull(len(x_semantic) + 1)
+            return n_step < n_steps()
+
+        cache = self.model.coarse_acoustics.make_cache()
         n_step = 0
-        for _ in tqdm.tqdm(
-            range(n_window_steps), total=n_window_steps, disable=not verbose
-        ):
+        while True:
             semantic_idx = base_semantic_idx + int(
                 round(n_step / semantic_to_coarse_ratio)
             )
-            x_in = x_semantic_in[:, max(0, semantic_idx - max_semantic_history) :]
-            x_in = x_in[:, :256]
+            start = max(0, semantic_idx - max_semantic_history)
+            pull(start + 256)
+            if not has_next_step(n_step):
+                break
+
+            x_in = mx.array(x_semantic[start : start + 256], dtype=mx.int32)
             x_in = mx.pad(
                 x_in,
-                ((0, 0), (0, 256 - x_in.shape[-1])),
+                (0, 256 - x_in.shape[-1]),
                 constant_values=COARSE_SEMANTIC_PAD_TOKEN,
-            )
-            x_in = mx.concatenate(
+            ).reshape(1, -1)
+            x_input = mx.concatenate(
                 [
                     x_in,
-                    mx.array([COARSE_INFER_TOKEN]).reshape(1, -1),
+                    mx.array([COARSE_INFER_TOKEN], dtype=mx.int32).reshape(1, -1),
                     x_coarse_in[:, -max_coarse_history:],
                 ],
                 axis=1,
             )
-            kv_cache = None
+            for c in cache:
+                c.reset()
+            window = []
             for _ in range(sliding_window_len):
-                if n_step >= n_steps:
-                    continue
+                if not has_next_step(n_step):
+                    break
                 is_major_step = n_step % N_COARSE_CODEBOOKS == 0
-                x_input = (
-                    x_in[:, -1:] if use_kv_caching and kv_cache is not None else x_in
-                )
-                logits, kv_cache = self.model.coarse_acoustics(
-                    x_input, use_cache=use_kv_caching, past_kv=kv_cache
-                )
+                logits, _ = self.model.coarse_acoustics(x_input, cache=cache)
                 logit_start_idx = (
                     SEMANTIC_VOCAB_SIZE + (1 - int(is_major_step)) * CODEBOOK_SIZE
                 )
@@ -332,33 +369,70 @@ class Pipeline:
                     relevant_logits * (1 / temperature), num_samples=1
                 ).astype(mx.int32)
 
-                item_next += logit_start_idx
-                x_coarse_in = mx.concatenate(
-                    [x_coarse_in, item_next.reshape(1, 1)], axis=1
-                )
-                x_in = mx.concatenate([x_in, item_next.reshape(1, 1)], axis=1)
+                item_next = (item_next + logit_start_idx).reshape(1, 1)
+                mx.async_eval(item_next)
+                window.append(item_next)
+                x_input = item_next
                 n_step += 1
 
-        gen_coarse_arr = x_coarse_in[0, len(x_coarse_history) :]
+            window = mx.concatenate(window, axis=1)
+            x_coarse_in = mx.concatenate([x_coarse_in, window], axis=1)
+            yield window[0]
+
+    @staticmethod
+    def _coarse_codes(coarse_tokens: mx.array) -> mx.array:
+        """Unflatten coarse tokens into (N_COARSE_CODEBOOKS, frames) codes."""
         gen_coarse_audio_arr = (
-            gen_coarse_arr.reshape(-1, N_COARSE_CODEBOOKS).T - SEMANTIC_VOCAB_SIZE
+            coarse_tokens.reshape(-1, N_COARSE_CODEBOOKS).T - SEMANTIC_VOCAB_SIZE
         )
         for n in range(1, N_COARSE_CODEBOOKS):
             gen_coarse_audio_arr[n, :] -= n * CODEBOOK_SIZE
-
         return gen_coarse_audio_arr
 
+    def generate_coarse(
+        self,
+        x_semantic: mx.array,
+        voice: str = "announcer",
+        temperature: float = 0.7,
+        max_coarse_history: int = 60,  # min 60 (faster), max 630 (more context)
+        sliding_window_len: int = 60,
+        **kwargs,
+    ):
+        """Generate coarse tokens from semantic tokens."""
+        verbose = kwargs.get("verbose", False)
+        if verbose:
+            print("Generating coarse tokens...")
+        windows = list(
+            self._coarse_windows(
+                x_semantic.tolist(),
+                voice,
+                temperature,
+                max_coarse_history=max_coarse_history,
+                sliding_window_len=sliding_window_len,
+            )
+        )
+        gen_coarse_arr = (
+            mx.concatenate(windows) if windows else mx.array([], dtype=mx.int32)
+        )
+        return self._coarse_codes(gen_coarse_arr)
+
     def generate_fine(
         self,
         x_coarse_gen: mx.array,
         temperature: float = 0.7,
+        x_fine_history: Optional[mx.array] = None,
         **kwargs,
     ):
+        """
+        Generate fine tokens from coarse tokens.
+
+        ``x_fine_history`` holds previously generated fine tokens (all
+        codebooks) that precede ``x_coarse_gen``; up to 512 frames of it are
+        used as left context and are not returned.
+        """
         verbose = kwargs.get("verbose", False)
-        """Generate fine tokens from coarse tokens."""
         if verbose:
             print("Generating fine tokens...")
-        x_fine_history = None
         n_coarse = x_coarse_gen.shape[0]
         in_arr = mx.concatenate(
             [
@@ -369,6 +443,10 @@ class Pipeline:
             axis=0,
         )
         n_history = 0
+        if x_fine_history is not None:
+            x_fine_history = x_fine_history[:, -512:].astype(in_arr.dtype)
+            in_arr = mx.concatenate([x_fine_history, in_arr], axis=1)
+            n_history = x_fine_history.shape[1]
         n_remove_from_end = 0
         # need to pad if too short (since non-causal model)
         if in_arr.shape[1] < 1024:
@@ -425,18 +503,76 @@ class Pipeline:
         voice: str = None,
         temperature: float = 0.7,
         speed: float = 1.0,
-        use_kv_caching: bool = False,
+        stream: bool = False,
+        streaming_interval: float = 2.0,
+        codec_context_frames: int = 75,
         **kwargs,
     ):
-        semantic_tokens, tokens = self.generate_text_semantic(
-            text, voice, temperature, use_kv_caching, **kwargs
+        """
+        Synthesize ``text``.
+
+        The stages are chained lazily: coarse windows start as soon as the
+        semantic tokens they read exist. With ``stream=True`` the fine and
+        codec stages also run every ``streaming_interval`` seconds of coarse
+        tokens, using the previous fine tokens as history, and each chunk of
+        audio is yielded as soon as it is decoded.
+        """
+        verbose = kwargs.get("verbose", False)
+        x, tokens = self._semantic_prompt(text, voice)
+        semantic_tokens = self._semantic_tokens(
+            x,
+            temperature,
+            kwargs.get("allow_early_stop", True),
+            verbose=verbose,
         )
-        coarse_tokens = self.generate_coarse(
-            semantic_tokens, voice, temperature, use_kv_caching, **kwargs
+        coarse_windows = self._coarse_windows(
+            semantic_tokens, voice, temperature, **kwargs
         )
-        fine_tokens = self.generate_fine(coarse_tokens, temperature, **kwargs)
-        # TODO: adjust speed
-        # audio_arr = adjust_speed(fine_tokens, speed)
-        audio_arr = codec_decode(self.codec_model, fine_tokens)
 
-        yield Result(audio=audio_arr, tokens=tokens)
+        if not stream:
+            windows = list(coarse_windows)
+            coarse_tokens = self._coarse_codes(
+                mx.concatenate(windows) if windows else mx.array([], dtype=mx.int32)
+            )
+            fine_tokens = self.generate_fine(coarse_tokens, temperature, **kwargs)
+            # TODO: adjust speed
+            # audio_arr = adjust_speed(fine_tokens, speed)
+            audio_arr = codec_decode(self.codec_model, fine_tokens)
+            yield Result(audio=audio_arr, tokens=tokens)
+            return
+
+        chunk_frames = max(1, int(round(streaming_interval * COARSE_RATE_HZ)))
+        samples_per_frame = SAMPLE_RATE // COARSE_RATE_HZ
+        fine_history = None
+        pending = mx.array([], dtype=mx.int32)
+
+        def decode_chunk(coarse_chunk):
+            nonlocal fine_history
+            fine_tokens = self.generate_fine(
+                self._coarse_codes(coarse_chunk),
+                temperature,
+                x_fine_history=fine_history,
+                **kwargs,
+            )
+            n_new = fine_tokens.shape[1]
+            if fine_history is not None:
+                fine_tokens = mx.concatenate([fine_history, fine_tokens], axis=1)
+            # Decode with left context so chunk boundaries are seamless
+            n_context = min(codec_context_frames, fine_tokens.shape[1] - n_new)
+            audio_arr = codec_decode(
+                self.codec_model, fine_tokens[:, -n_new - n_context :]
+            )
+            audio_arr = audio_arr[:, n_context * samples_per_frame :]
+            fine_history = fine_tokens[:, -512:]
+            mx.eval(audio_arr, fine_history)
+            return audio_arr
+
+        for window in coarse_windows:
+            pending = mx.concatenate([pending, window])
+            chunk_len = chunk_frames * N_COARSE_CODEBOOKS
+            while pending.shape[0] >= chunk_len:
+                yield Result(audio=decode_chunk(pending[:chunk_len]), tokens=tokens)
+                pending = pending[chunk_len:]
+        n_left = pending.shape[0] - pending.shape[0] % N_COARSE_CODEBOOKS
+        if n_left > 0:
+            yield Result(audio=decode_chunk(pending[:n_left]), tokens=tokens)
@@ -1,18 +1,19 @@
 # Copyright (c) 2025, Prince Canuma and contributors (https://github.com/Blaizzy/mlx-audio)
 
-import math
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Generator, Optional, Union
+from typing import Dict, Generator, List, Optional, Union
 
-import librosa
 import mlx.core as mx
 import mlx.nn as nn
 import numpy as np
-from scipy import signal
+
+from mlx_audio.dsp import resample
+from mlx_audio.utils import load_audio
 
 from ..base import GenerationResult
+from .conds_cache import ConditionalsCache, default_cache_dir
 from .config import ModelConfig
 from .s3gen import S3Token2Wav
 from .s3tokenizer import S3TokenizerV2, log_mel_spectrogram
@@ -34,7 +35,7 @@ SPACE = "[SPACE]"
 
 def resample_audio(audio: mx.array, orig_sr: int, target_sr: int) -> mx.array:
     """
-    Resample audio to a target sample rate using scipy.
+    Resample audio to a target sample rate with the shared polyphase resampler.
 
     Args:
         audio: Audio waveform as MLX array (samples,) or (channels, samples)
@@ -46,21 +47,8 @@ def resample_audio(audio: mx.array, orig_sr: int, target_sr: int) -> mx.array:
     """
     if orig_sr == target_sr:
         return audio
-
-    # Convert to numpy for scipy
-    import numpy as np
-
-    audio_np = np.array(audio)
-
-    # Calculate resampling factors
-    gcd = math.gcd(orig_sr, target_sr)
-    up = target_sr // gcd
-    down = orig_sr // gcd
-
-    # Resample
-    resampled = signal.resample_poly(audio_np, up, down, padtype="edge")
-
-    return mx.array(resampled)
+    audio = mx.array(audio).astype(mx.float32)
+    return resample(audio, orig_sr, target_sr, axis=-1, padtype="edge")
 
 
 def punc_norm(text: str) -> str:
@@ -207,6 +195,11 @@ class Model(nn.Module):
             self.ve = ve
             self._conds = conds
 
+        # Conditionals of reference clips already seen, keyed by their content
+        self.conds_cache = ConditionalsCache(
+            Conditionals, T3Cond, "chatterbox", cache_dir=default_cache_dir()
+        )
+
         # S3 tokenizer for speech token extraction (initialized lazily or during load_weights)
         self._s3_tokenizer = S3TokenizerV2("speech_tokenizer_v2_25hz")
         # Text tokenizer (initialized during load_weights if model_path is available)
@@ -632,22 +625,65 @@ class Model(nn.Module):
 
         return model
 
+    def preload_voices(self, voices: List[str]):
+        """
+        Prepare the conditionals of reference clips ahead of the requests
+        that use them.
+
+        Clips are loaded the way ``mlx_audio.tts.generate`` and the server
+        load ``ref_audio``, so later requests with the same audio hit the
+        cache. Each voice may also be selected by its path with ``voice=``.
+
+        Args:
+            voices: Paths to reference audio files
+        """
+        for voice in voices:
+            ref_wav = load_audio(voice, sample_rate=self.sample_rate)
+            self.prepare_conditionals(ref_wav, self.sample_rate, name=voice)
+
     def prepare_conditionals(
         self,
         ref_wav: Union[str, mx.array, np.ndarray],
         ref_sr: int,
         exaggeration: float = 0.5,
+        name: Optional[str] = None,
     ) -> Conditionals:
         """
         Prepare conditioning from a reference audio clip.
 
+        Results are cached in ``self.conds_cache`` by the content of the clip;
+        set it to None to always recompute.
+
         Args:
             ref_wav: Reference waveform (samples,) or (1, samples)
             ref_sr: Reference sample rate
             exaggeration: Emotion exaggeration factor (0-1)
+            name: Pin the result in the cache under this voice name
 
         Returns:
             Conditionals object with T3 and S3Gen conditioning
+        """
+        cache = self.conds_cache
+        conds = None
+        if cache is not None:
+            key = cache.key(ref_wav, ref_sr=ref_sr)
+            conds = cache.get(key)
+        if conds is None:
+            conds = self._compute_conditionals(ref_wav, ref_sr)
+        if cache is not None:
+            cache.put(key, conds, pin=name is not None, name=name)
+
+        # Cached conditionals are shared, so never modify them in place
+        return Conditionals(
+            replace(conds.t3, emotion_adv=mx.ones((1, 1, 1)) * exaggeration),
+            conds.gen,
+        )
+
+    def _compute_conditionals(
+        self, ref_wav: Union[str, mx.array, np.ndarray], ref_sr: int
+    ) -> Conditionals:
+        """
+        Compute the conditioning of a reference clip (see prepare_conditionals).
 
         Note:
             Following the original PyTorch implementation:
@@ -658,8 +694,7 @@ class Model(nn.Module):
         """
         # Ensure 1D waveform
         if isinstance(ref_wav, str):
-            ref_wav, ref_sr = librosa.load(ref_wav, sr=S3GEN_SR)
-            ref_wav = mx.array(ref_wav)
+            ref_wav, ref_sr = load_audio(ref_wav, sample_rate=S3GEN_SR), S3GEN_SR
 
         if ref_wav.ndim == 2:
             ref_wav = ref_wav.squeeze(0)
@@ -722,7 +757,7 @@ class Model(nn.Module):
         t3_cond = T3Cond(
             speaker_emb=ve_embed,
             cond_prompt_speech_tokens=t3_cond_prompt_tokens,
-            emotion_adv=mx.ones((1, 1, 1)) * exaggeration,
+            emotion_adv=mx.ones((1, 1, 1)) * 0.5,
         )
 
         return Conditionals(t3_cond, s3gen_ref_dict)
@@ -772,7 +807,7 @@ class Model(nn.Module):
             top_p: Top-p (nucleus) sampling threshold
             max_new_tokens: Maximum number of tokens to generate
             ref_audio: Alias for audio_prompt (for mlx_audio.tts.generate compatibility)
-            voice: Ignored (Chatterbox uses reference audio for voice cloning)
+            voice: Name of a voice registered with preload_voices (optional)
             speed: Ignored (Chatterbox doesn't support speed adjustment)
             lang_code: Ignored (Chatterbox is English-only)
             max_tokens: Alias for max_new_tokens
@@ -800,17 +835,29 @@ class Model(nn.Module):
                 conds = self.prepare_conditionals(
                     audio_prompt, audio_prompt_sr, exaggeration
                 )
-            elif self._conds is not None:
+            elif voice is not None:
+                if self.conds_cache is not None:
+                    conds = self.conds_cache.get_voice(voice)
+                if conds is None:
+                    raise ValueError(
+                        f"Unknown voice '{voice}'. Register it with preload_voices() "
+                        "or provide audio_prompt for voice cloning."
+                    )
+            if conds is None and self._conds is not None:
                 conds = self._conds
-            else:
+            if conds is None:
                 raise ValueError(
                     "No conditionals available. Either provide audio_prompt/audio_prompt_sr "
                     "for voice cloning, or ensure conds.safetensors is in the model directory."
                 )
 
-        # Update exaggeration if needed
-        if exaggeration != float(conds.t3.emotion_adv[0, 0, 0]):
-            conds.t3.emotion_adv = mx.ones((1, 1, 1)) * exaggeration
+        # Update exaggeration if needed (conditionals may be shared, so copy)
+        # Conditionals stored by older versions may hold a 0-d emotion_adv
+        if exaggeration != float(conds.t3.emotion_adv.reshape(-1)[0]):
+            conds = Conditionals(
+                replace(conds.t3, emotion_adv=mx.ones((1, 1, 1)) * exaggeration),
+                conds.gen,
+            )
 
         # Normalize and tokenize text
         text = punc_norm(text)
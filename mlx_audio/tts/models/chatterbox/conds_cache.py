@@ -0,0 +1,200 @@
+# Copyright (c) 2025, Prince Canuma and contributors (https://github.com/Blaizzy/mlx-audio)
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import mlx.core as mx
+import numpy as np
+
+# Directory of the on-disk conditionals store used by the Chatterbox models
+CACHE_DIR_ENV = "MLX_AUDIO_CONDS_CACHE_DIR"
+
+
+def default_cache_dir() -> Optional[str]:
+    """Return the on-disk store set with ``MLX_AUDIO_CONDS_CACHE_DIR``, if any."""
+    return os.getenv(CACHE_DIR_ENV) or None
+
+
+class ConditionalsCache:
+    """
+    Content-addressed cache of speaker conditionals for Chatterbox models.
+
+    Preparing conditionals from a reference clip resamples it twice, runs the
+    S3 tokenizer twice, embeds it with S3Gen and the voice encoder. Voices
+    usually come from a small catalog, so results are kept in an in-memory
+    LRU keyed by a hash of the reference audio and, when ``cache_dir`` is set,
+    in one safetensors file per voice that survives restarts.
+
+    Entries stored with ``pin=True`` (e.g. by ``preload_voices``) are never
+    evicted, and those stored with a ``name`` can be looked up by it.
+
+    Args:
+        conditionals_cls: Conditionals dataclass of the model (``t3`` and ``gen``).
+        t3_cond_cls: T3Cond dataclass of the model.
+        namespace: Mixed into every key so models never share entries.
+        max_entries: Maximum number of unpinned entries kept in memory.
+        cache_dir: Optional directory of the on-disk store. The models pass
+            ``MLX_AUDIO_CONDS_CACHE_DIR`` (see :func:`default_cache_dir`).
+    """
+
+    def __init__(
+        self,
+        conditionals_cls: type,
+        t3_cond_cls: type,
+        namespace: str,
+        max_entries: int = 16,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ):
+        self.conditionals_cls = conditionals_cls
+        self.t3_cond_cls = t3_cond_cls
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._pinned: Dict[str, Any] = {}
+        self._names: Dict[str, str] = {}
+        self._file_digests: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, ref_audio: Union[str, mx.array, np.ndarray], **params) -> str:
+        """
+        Key of a reference clip: a hash of its samples (or file bytes for a
+        path) together with any preprocessing parameters.
+        """
+        h = hashlib.blake2b(self.namespace.encode(), digest_size=16)
+        if isinstance(ref_audio, (str, Path)):
+            h.update(b"file:" + self._file_digest(str(ref_audio)).encode())
+        else:
+            audio = np.ascontiguousarray(np.asarray(ref_audio, dtype=np.float32))
+            h.update(f"array:{audio.shape}".encode())
+            h.update(audio.data)
+        for name in sorted(params):
+            h.update(f"|{name}={params[name]!r}".encode())
+        return h.hexdigest()
+
+    def _file_digest(self, path: str) -> str:
+        # Hash each file once; unchanged files are recognised by their stat
+        stat = os.stat(path)
+        stamp = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._file_digests.get(stamp)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+            digest = h.hexdigest()
+            with self._lock:
+                self._file_digests[stamp] = digest
+        return digest
+
+    def get(self, key: str):
+        """Return the cached conditionals for ``key``, loading them from
+        ``cache_dir`` if needed, else None."""
+        with self._lock:
+            conds = self._pinned.get(key)
+            if conds is None:
+                conds = self._entries.get(key)
+                if conds is not None:
+                    self._entries.move_to_end(key)
+            if conds is not None:
+                self.hits += 1
+                return conds
+
+        path = self._path(key)
+        if path is not None and path.exists():
+            conds = self._load(path)
+            self.put(key, conds)
+            with self._lock:
+                self.disk_hits += 1
+            return conds
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get_voice(self, name: str):
+        """Return the conditionals stored under voice ``name``, else None."""
+        with self._lock:
+            key = self._names.get(name)
+        return None if key is None else self.get(key)
+
+    def put(self, key: str, conds, pin: bool = False, name: Optional[str] = None):
+        """Store conditionals under ``key`` and in ``cache_dir`` if set."""
+        arrays = self._to_arrays(conds)
+        mx.eval(list(arrays.values()))
+
+        with self._lock:
+            if name is not None:
+                self._names[name] = key
+            if pin or key in self._pinned:
+                self._entries.pop(key, None)
+                self._pinned[key] = conds
+            else:
+                self._entries[key] = conds
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        path = self._path(key)
+        if path is not None and not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary name so readers never see a partial file
+            tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.safetensors")
+            mx.save_safetensors(str(tmp), arrays)
+            os.replace(tmp, path)
+
+    def clear(self, include_pinned: bool = False):
+        """Drop in-memory entries (the on-disk store is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+            if include_pinned:
+                self._pinned.clear()
+                self._names.clear()
+
+    def cache_info(self) -> dict:
+        """Return cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "pinned": len(self._pinned),
+                "names": sorted(self._names),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return Path(self.cache_dir) / f"{key}.safetensors"
+
+    @staticmethod
+    def _to_arrays(conds) -> Dict[str, mx.array]:
+        # Same layout as the conds.safetensors shipped with the checkpoints
+        arrays = {}
+        for f in fields(conds.t3):
+            value = getattr(conds.t3, f.name)
+            if isinstance(value, mx.array):
+                arrays[f"t3.{f.name}"] = value
+        for name, value in conds.gen.items():
+            if isinstance(value, mx.array):
+                arrays[f"gen.{name}"] = value
+        return arrays
+
+    def _load(self, path: Path):
+        arrays = mx.load(str(path))
+        t3 = {k[3:]: v for k, v in arrays.items() if k.startswith("t3.")}
+        gen = {k[4:]: v for k, v in arrays.items() if k.startswith("gen.")}
+        return self.conditionals_cls(self.t3_cond_cls(**t3), gen)
@@ -4,6 +4,8 @@ from typing import Dict, List, Optional
 import mlx.core as mx
 import mlx.nn as nn
 
+from mlx_audio.dsp import get_istft_cache
+
 
 def hann_window_periodic(size: int) -> mx.array:
     """
@@ -365,19 +367,13 @@ def istft(
     # Pure MLX overlap-add
     output_length = (num_frames - 1) * hop_length + n_fft
 
-    # Create index arrays for scatter-add
-    frame_offsets = mx.arange(num_frames) * hop_length
-    sample_indices = mx.arange(n_fft)
-    # indices[f, s] = frame_offsets[f] + sample_indices[s]
-    indices = frame_offsets[:, None] + sample_indices[None, :]  # (num_frames, n_fft)
-    indices_flat = indices.flatten()  # (num_frames * n_fft,)
-
-    # Window squared for normalization - compute once (same for all batches)
-    window_sq = window**2
-    window_sum = mx.zeros(output_length)
-    window_updates = mx.tile(window_sq, (num_frames,))
-    window_sum = window_sum.at[indices_flat].add(window_updates)
-    window_sum = mx.maximum(window_sum, 1e-8)
+    # Scatter-add positions and the squared-window normalization are shared
+    # across calls with the same frame count
+    cache = get_istft_cache()
+    indices_flat = cache.get_positions(num_frames, n_fft, hop_length)
+    window_sum = cache.get_norm_buffer(
+        n_fft, hop_length, n_fft, window, num_frames, eps=1e-8
+    )
 
     # Vectorized overlap-add for all batch items at once
     # frames is (B, n_fft, num_frames), need (B, num_frames, n_fft) for indexing
@@ -4,17 +4,19 @@ import logging
 import math
 import os
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Generator, Optional, Union
+from typing import Generator, List, Optional, Union
 
-import librosa
 import mlx.core as mx
 import mlx.nn as nn
 import numpy as np
 
+from mlx_audio.dsp import resample
 from mlx_audio.tts.models.base import GenerationResult
+from mlx_audio.utils import load_audio
 
+from ..chatterbox.conds_cache import ConditionalsCache, default_cache_dir
 from .models.s3gen import S3GEN_SIL, S3GEN_SR, S3Gen
 from .models.s3tokenizer import S3TokenizerV2, log_mel_spectrogram
 from .models.t3 import T3, T3Cond, T3Config
@@ -137,6 +139,10 @@ class ChatterboxTurboTTS(nn.Module):
         self._s3tokenizer = s3tokenizer or S3TokenizerV2("speech_tokenizer_v2_25hz")
         self.conds = conds
         self.local_path = local_path
+        # Conditionals of reference clips already seen, keyed by their content
+        self.conds_cache = ConditionalsCache(
+            Conditionals, T3Cond, "chatterbox_turbo", cache_dir=default_cache_dir()
+        )
 
     @property
     def sample_rate(self) -> int:
@@ -698,26 +704,93 @@ class ChatterboxTurboTTS(nn.Module):
 
         return s3gen_ref_dict, t3_cond_prompt_tokens
 
+    def preload_voices(self, voices: List[str]):
+        """
+        Prepare the conditionals of reference clips ahead of the requests
+        that use them.
+
+        Clips are loaded the way ``mlx_audio.tts.generate`` and the server
+        load ``ref_audio``, so later requests with the same audio hit the
+        cache. Each voice may also be selected by its path with ``voice=``.
+
+        Args:
+            voices: Paths to reference audio files
+        """
+        for voice in voices:
+            ref_audio = load_audio(voice, sample_rate=self.sample_rate)
+            self.prepare_conditionals(ref_audio, self.sample_rate, name=voice)
+
+    def _voice_conditionals(self, voice: Optional[str]) -> Optional[Conditionals]:
+        """Look up the conditionals of a voice registered with preload_voices.
+
+        Returns None when no voice is given. The model's own conditionals are
+        left untouched, so the voice only applies to the calling request.
+
+        Raises:
+            ValueError: If ``voice`` was not registered.
+        """
+        if voice is None:
+            return None
+        conds = None
+        if self.conds_cache is not None:
+            conds = self.conds_cache.get_voice(voice)
+        if conds is None:
+            raise ValueError(
+                f"Unknown voice '{voice}'. Register it with preload_voices() "
+                "or provide ref_audio for voice cloning."
+            )
+        return conds
+
     def prepare_conditionals(
         self,
         ref_audio: Union[str, mx.array, np.ndarray],
         sample_rate: Optional[int] = None,
         exaggeration: float = 0.5,
         norm_loudness: bool = True,
+        name: Optional[str] = None,
     ):
         """
         Prepare conditioning from a reference audio file or array.
 
+        Results are cached in ``self.conds_cache`` by the content of the clip;
+        set it to None to always recompute.
+
         Args:
             ref_audio: Path to reference audio file or audio array (should be > 5 seconds)
             sample_rate: Sample rate of audio array (required if ref_audio is array)
             exaggeration: Emotion exaggeration factor (not used in Turbo)
             norm_loudness: Whether to normalize loudness
+            name: Pin the result in the cache under this voice name
         """
+        cache = self.conds_cache
+        conds = None
+        if cache is not None:
+            key = cache.key(
+                ref_audio, sample_rate=sample_rate, norm_loudness=norm_loudness
+            )
+            conds = cache.get(key)
+        if conds is None:
+            conds = self._compute_conditionals(ref_audio, sample_rate, norm_loudness)
+        if cache is not None:
+            cache.put(key, conds, pin=name is not None, name=name)
+
+        # Cached conditionals are shared, so never modify them in place
+        emotion_adv = mx.array([[[exaggeration]]]) if self.t3.hp.emotion_adv else None
+        self._conds = Conditionals(
+            replace(conds.t3, emotion_adv=emotion_adv), conds.gen
+        )
+
+    def _compute_conditionals(
+        self,
+        ref_audio: Union[str, mx.array, np.ndarray],
+        sample_rate: Optional[int],
+        norm_loudness: bool,
+    ) -> Conditionals:
+        """Compute the conditioning of a reference clip (see prepare_conditionals)."""
         # Handle string path vs array input
         if isinstance(ref_audio, str):
             # Load reference audio at 24kHz for S3Gen
-            ref_wav_24k, _sr = librosa.load(ref_audio, sr=S3GEN_SR)
+            ref_wav_24k = np.array(load_audio(ref_audio, sample_rate=S3GEN_SR))
         else:
             # Convert mx.array to numpy if needed
             if isinstance(ref_audio, mx.array):
@@ -728,8 +801,8 @@ class ChatterboxTurboTTS(nn.Module):
             # Resample to S3GEN_SR if sample_rate provided and different
             input_sr = sample_rate if sample_rate is not None else S3GEN_SR
             if input_sr != S3GEN_SR:
-                ref_wav_24k = librosa.resample(
-                    ref_wav_24k, orig_sr=input_sr, target_sr=S3GEN_SR
+                ref_wav_24k = resample(
+                    ref_wav_24k.astype(np.float32), input_sr, S3GEN_SR
                 )
 
         assert (
@@ -740,7 +813,7 @@ class ChatterboxTurboTTS(nn.Module):
             ref_wav_24k = self.norm_loudness(ref_wav_24k, S3GEN_SR)
 
         # Resample to 16kHz for S3Tokenizer and voice encoder
-        ref_wav_16k = librosa.resample(ref_wav_24k, orig_sr=S3GEN_SR, target_sr=S3_SR)
+        ref_wav_16k = resample(ref_wav_24k, S3GEN_SR, S3_SR)
 
         # Trim 24kHz audio to decoder conditioning length
         ref_wav_24k_trimmed = ref_wav_24k[: self.DEC_COND_LEN]
@@ -760,12 +833,9 @@ class ChatterboxTurboTTS(nn.Module):
         t3_cond = T3Cond(
             speaker_emb=ve_embed,
             cond_prompt_speech_tokens=t3_cond_prompt_tokens,
-            emotion_adv=(
-                mx.array([[[exaggeration]]]) if self.t3.hp.emotion_adv else None
-            ),
         )
 
-        self._conds = Conditionals(t3_cond, s3gen_ref_dict)
+        return Conditionals(t3_cond, s3gen_ref_dict)
 
     def generate(
         self,
@@ -836,6 +906,7 @@ class ChatterboxTurboTTS(nn.Module):
             return
 
         # Prepare conditionals if audio prompt provided
+        conds = None
         if ref_audio is not None:
             self.prepare_conditionals(
                 ref_audio,
@@ -844,9 +915,12 @@ class ChatterboxTurboTTS(nn.Module):
                 norm_loudness=norm_loudness,
             )
         else:
+            conds = self._voice_conditionals(kwargs.get("voice"))
+        if conds is None:
             assert (
                 self._conds is not None
             ), "Please `prepare_conditionals` first or specify `ref_audio`"
+            conds = self._conds
 
         # Warn about unsupported parameters
         if cfg_weight > 0.0 or exaggeration > 0.0 or min_p > 0.0:
@@ -919,7 +993,7 @@ class ChatterboxTurboTTS(nn.Module):
 
             # Generate speech tokens with T3
             speech_tokens = self.t3.inference_turbo(
-                t3_cond=self._conds.t3,
+                t3_cond=conds.t3,
                 text_tokens=text_tokens,
                 temperature=temperature,
                 top_k=top_k,
@@ -942,7 +1016,7 @@ class ChatterboxTurboTTS(nn.Module):
             # Generate waveform with S3Gen
             wav, _ = self.s3gen.inference(
                 speech_tokens=speech_tokens,
-                ref_dict=self._conds.gen,
+                ref_dict=conds.gen,
                 n_cfm_timesteps=2,  # Turbo uses 2 steps
             )
 
@@ -1051,6 +1125,7 @@ class ChatterboxTurboTTS(nn.Module):
         import re
 
         # Prepare conditionals if audio prompt provided
+        conds = None
         if ref_audio is not None:
             self.prepare_conditionals(
                 ref_audio,
@@ -1059,9 +1134,12 @@ class ChatterboxTurboTTS(nn.Module):
                 norm_loudness=norm_loudness,
             )
         else:
+            conds = self._voice_conditionals(kwargs.get("voice"))
+        if conds is None:
             assert (
                 self._conds is not None
             ), "Please `prepare_conditionals` first or specify `ref_audio`"
+            conds = self._conds
 
         # Warn about unsupported parameters
         if cfg_weight > 0.0 or exaggeration > 0.0 or min_p > 0.0:
@@ -1141,7 +1219,7 @@ class ChatterboxTurboTTS(nn.Module):
 
             # Generate speech tokens in chunks
             for token_chunk, is_final in self.t3.inference_turbo_stream(
-                t3_cond=self._conds.t3,
+                t3_cond=conds.t3,
                 text_tokens=text_tokens,
                 temperature=temperature,
                 top_k=top_k,
@@ -1185,7 +1263,7 @@ class ChatterboxTurboTTS(nn.Module):
                         # For final chunk, use standard inference for complete audio
                         full_audio, _ = self.s3gen.inference(
                             speech_tokens=valid_tokens,
-                            ref_dict=self._conds.gen,
+                            ref_dict=conds.gen,
                             n_cfm_timesteps=2,  # Turbo uses 2 steps
                         )
                         mx.eval(full_audio)
@@ -1207,7 +1285,7 @@ class ChatterboxTurboTTS(nn.Module):
                     else:
                         new_audio, total_samples = self.s3gen.inference_stream(
                             speech_tokens=valid_tokens,
-                            ref_dict=self._conds.gen,
+                            ref_dict=conds.gen,
                             n_cfm_timesteps=2,  # Turbo uses 2 steps
                             prev_audio_samples=prev_audio_samples,
                             is_final=is_final,
@@ -7,6 +7,8 @@ import mlx.nn as nn
 import numpy as np
 from scipy.signal import get_window
 
+from mlx_audio.dsp import get_istft_cache
+
 
 def get_padding(kernel_size: int, dilation: int = 1) -> int:
     """Calculate padding for same output size."""
@@ -501,7 +503,7 @@ class HiFTGenerator(nn.Module):
 
     def _istft(self, magnitude: mx.array, phase: mx.array) -> mx.array:
         """
-        Inverse STFT using numpy for efficient overlap-add.
+        Inverse STFT with a vectorized on-device overlap-add.
         Matches PyTorch torch.istft with center=True (default).
 
         Args:
@@ -517,47 +519,22 @@ class HiFTGenerator(nn.Module):
         # Clamp magnitude for stability
         magnitude = mx.clip(magnitude, a_min=None, a_max=1e2)
 
-        B, _, T = magnitude.shape
-
-        # Reconstruct complex spectrogram
-        real = magnitude * mx.cos(phase)
-        imag = magnitude * mx.sin(phase)
-
-        # Create complex array: shape (B, F, T) -> need (B, T, F) for irfft
-        spec_real = real.transpose(0, 2, 1)  # (B, T, F)
-        spec_imag = imag.transpose(0, 2, 1)  # (B, T, F)
-
-        # Perform IRFFT on each frame using MLX
-        frames = mx.fft.irfft(spec_real + 1j * spec_imag, n=n_fft, axis=-1)
-
-        # Convert to numpy for efficient overlap-add
-        frames_np = np.array(frames)  # (B, T, n_fft)
-        window_np = np.array(self.stft_window)
-
-        # Apply synthesis window
-        frames_np = frames_np * window_np[None, None, :]
-
-        # Overlap-add synthesis using numpy (much faster than MLX loops)
-        output_length = (T - 1) * hop_len + n_fft
-        audio_np = np.zeros((B, output_length), dtype=np.float32)
-        window_sum = np.zeros(output_length, dtype=np.float32)
-
-        for i in range(T):
-            start = i * hop_len
-            audio_np[:, start : start + n_fft] += frames_np[:, i, :]
-            window_sum[start : start + n_fft] += window_np**2
-
-        # Normalize by window overlap
-        window_sum = np.maximum(window_sum, 1e-8)
-        audio_np = audio_np / window_sum[None, :]
-
-        # Trim center padding to match PyTorch torch.istft with center=True
-        # Output length should be (T - 1) * hop_len for centered STFT
-        pad = n_fft // 2
-        expected_len = (T - 1) * hop_len
-        audio_np = audio_np[:, pad : pad + expected_len]
-
-        return mx.array(audio_np)
+        T = magnitude.shape[-1]
+
+        # Overlap-add on device with the shared, cached window normalization.
+        # Trimming center padding matches PyTorch torch.istft with center=True:
+        # output length is (T - 1) * hop_len for a centered STFT
+        return get_istft_cache().istft(
+            magnitude * mx.cos(phase),
+            magnitude * mx.sin(phase),
+            n_fft,
+            hop_len,
+            n_fft,
+            self.stft_window,
+            center=True,
+            audio_length=(T - 1) * hop_len,
+            eps=1e-8,
+        )
 
     def decode(self, x: mx.array, s: mx.array) -> mx.array:
         """
@@ -1,6 +1,7 @@
+import math
 import re
 import time
-from typing import List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import mlx.core as mx
 import mlx.nn as nn
@@ -15,19 +16,35 @@ from mlx_audio.utils import load_audio
 from ..base import GenerationResult
 from .audio import audio_to_codebook, codebook_to_audio
 from .config import DiaConfig
-from .layers import DiaModel, KVCache
+from .layers import DiaModel, KVCache, _str_to_dtype
 
+# Decode steps attend over the self-attention cache in blocks of this many
+# positions, so one compiled step serves every position of a block
+_STEP_BLOCK = 256
 
-def _sample_next_token(
-    logits_BCxV: mx.array,
-    temperature: float,
-    sampler: callable,
-) -> mx.array:
-    if temperature == 0.0:
-        return mx.argmax(logits_BCxV, axis=-1)
 
-    sampled = sampler(logits_BCxV)
-    return sampled
+class _StepKVCache:
+    """Fixed-size self-attention cache of one decoder layer in a decode step."""
+
+    def __init__(self, k: mx.array, v: mx.array, pos: mx.array, length: int):
+        self.k = k
+        self.v = v
+        self.pos = pos
+        self.length = length
+
+    def update_and_fetch(self, k: mx.array, v: mx.array):
+        # Write at a position given as an array, so the step is shape-static
+        self.k = mx.slice_update(self.k, k.astype(self.k.dtype), self.pos, axes=(2,))
+        self.v = mx.slice_update(self.v, v.astype(self.v.dtype), self.pos, axes=(2,))
+        return self.k[:, :, : self.length, :], self.v[:, :, : self.length, :]
+
+
+class _DecodeSteps:
+    """Compiled decode steps of one sampling setup, keyed by attended length."""
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.steps: Dict[int, Callable] = {}
 
 
 class Model(nn.Module):
@@ -44,6 +61,8 @@ class Model(nn.Module):
         self.config = DiaConfig.load_dict(config)
         self.model = DiaModel(self.config)
         self.dac_model = DAC.from_pretrained("mlx-community/descript-audio-codec-44khz")
+        # Kept across calls so compiled decode steps are reused
+        self._decode_steps = _DecodeSteps(None)
 
     @classmethod
     def from_local(cls, config_path: str, checkpoint_path: str) -> "Dia":
@@ -239,6 +258,7 @@ class Model(nn.Module):
         verbose: bool = False,
         ref_audio: Optional[Union[str, mx.array]] = None,
         ref_text: Optional[str] = None,
+        batch_size: int = 1,
         **kwargs,
     ):
         # Load reference audio if provided (handles file paths and mx.array)
@@ -255,11 +275,12 @@ class Model(nn.Module):
             else:
                 segments.append(p)
 
-        for segment_index, segment in enumerate(segments):
+        # Segments are decoded batch_size at a time, each with its own CFG pair
+        for batch_start in range(0, len(segments), batch_size):
             time_start = time.perf_counter()
 
-            audio, token_count = self._generate(
-                segment,
+            outputs = self._generate_batch(
+                segments[batch_start : batch_start + batch_size],
                 max_tokens=max_tokens,
                 ref_audio=ref_audio,
                 ref_text=ref_text,
@@ -267,51 +288,182 @@ class Model(nn.Module):
 
             time_end = time.perf_counter()
 
-            samples = audio.shape[0] if audio is not None else 0
-            assert samples > 0, "No audio generated"
+            for offset, (audio, token_count) in enumerate(outputs):
+                yield self._generation_result(
+                    audio,
+                    token_count,
+                    segment_idx=batch_start + offset,
+                    elapsed_time=time_end - time_start,
+                )
+
+            # Clear cache after each segment to avoid memory leaks
+            mx.clear_cache()
+
+    def _generation_result(
+        self,
+        audio: mx.array,
+        token_count: int,
+        segment_idx: int,
+        elapsed_time: float,
+    ) -> GenerationResult:
+        samples = audio.shape[0] if audio is not None else 0
+        assert samples > 0, "No audio generated"
+
+        sample_rate = self.config.model.sample_rate
+        audio_duration_seconds = samples / sample_rate
+
+        rtf = elapsed_time / audio_duration_seconds if audio_duration_seconds > 0 else 0
+
+        duration_mins = int(audio_duration_seconds // 60)
+        duration_secs = int(audio_duration_seconds % 60)
+        duration_ms = int((audio_duration_seconds % 1) * 1000)
+        duration_hours = int(audio_duration_seconds // 3600)
+        duration_str = f"{duration_hours:02d}:{duration_mins:02d}:{duration_secs:02d}.{duration_ms:03d}"
+
+        return GenerationResult(
+            audio=audio,
+            samples=samples,
+            sample_rate=sample_rate,
+            segment_idx=segment_idx,
+            token_count=token_count,
+            audio_duration=duration_str,
+            real_time_factor=rtf,
+            prompt={
+                "tokens": token_count,
+                "tokens-per-sec": (
+                    round(token_count / elapsed_time, 2) if elapsed_time > 0 else 0
+                ),
+            },
+            audio_samples={
+                "samples": samples,
+                "samples-per-sec": (
+                    round(samples / elapsed_time, 2) if elapsed_time > 0 else 0
+                ),
+            },
+            processing_time_seconds=elapsed_time,
+            peak_memory_usage=mx.get_peak_memory() / 1e9,
+        )
 
-            sample_rate = self.config.model.sample_rate
-            audio_duration_seconds = samples / sample_rate
+    def _decode_step(
+        self,
+        length: int,
+        temperature: float,
+        top_p: float,
+        cfg_filter_top_k: int,
+        compiled: bool = True,
+    ) -> Callable:
+        """
+        Return the decode step attending over the first ``length`` cache
+        positions.
+
+        One step runs the decoder on the CFG batch (unconditional rows first,
+        then conditional rows), writes the self-attention caches at ``pos``,
+        combines the logits with CFG, keeps the ``cfg_filter_top_k`` best
+        tokens, samples every channel and applies the delay pattern and the
+        EOS/PAD bookkeeping of each prompt. Steps are compiled once per
+        sampling setup and length, with the random state threaded through.
+        """
+        key = (temperature, top_p, cfg_filter_top_k)
+        if self._decode_steps.key != key:
+            self._decode_steps = _DecodeSteps(key)
+        step = self._decode_steps.steps.get(length) if compiled else None
+        if step is not None:
+            return step
+
+        data_config = self.config.data
+        audio_bos_value = int(data_config.audio_bos_value)
+        audio_eos_value = int(data_config.audio_eos_value)
+        audio_pad_value = int(data_config.audio_pad_value)
+        delay_pattern = mx.array(data_config.delay_pattern, dtype=mx.int32)
+        max_delay_pattern = max(data_config.delay_pattern)
+        extra_steps_after_eos = 30
+        sampler = make_sampler(temperature, top_p)
+        decoder = self.model.decoder
+
+        def decode_step(
+            tokens_BxC,
+            pos,
+            generation_step,
+            eos_countdown_B,
+            cfg_scale,
+            cross_attn_mask,
+            keys,
+            values,
+            cross_keys,
+            cross_values,
+        ):
+            B, C = tokens_BxC.shape
+            tgt_ids = mx.expand_dims(mx.concatenate([tokens_BxC, tokens_BxC]), 1)
+            self_cache = [_StepKVCache(k, v, pos, length) for k, v in zip(keys, values)]
+            cross_cache = [
+                KVCache(0, 0, 0, k=k, v=v) for k, v in zip(cross_keys, cross_values)
+            ]
+            self_attn_mask = (mx.arange(length) <= pos).reshape(1, 1, 1, length)
+            logits = decoder.decode_step(
+                tgt_ids_Bx1xC=tgt_ids,
+                tgt_pos_Bx1=mx.broadcast_to(pos, (2 * B, 1)),
+                encoder_out=None,
+                self_attn_mask=self_attn_mask,
+                cross_attn_mask=cross_attn_mask,
+                self_attention_cache=self_cache,
+                cross_attention_cache=cross_cache,
+            )
 
-            elapsed_time = time_end - time_start
-            rtf = (
-                elapsed_time / audio_duration_seconds
-                if audio_duration_seconds > 0
-                else 0
+            # CFG over the audio tokens and EOS only
+            logits = logits[:, -1, :, : audio_eos_value + 1].reshape(2, B, C, -1)
+            uncond_logits, cond_logits = logits[0], logits[1]
+            logits = cond_logits + cfg_scale * (cond_logits - uncond_logits)
+            if cfg_filter_top_k is not None and cfg_filter_top_k > 0:
+                kth = -mx.partition(-logits, cfg_filter_top_k - 1, axis=-1)
+                kth = kth[..., cfg_filter_top_k - 1 : cfg_filter_top_k]
+                logits = mx.where(logits >= kth, logits, -float("inf"))
+            logprobs = logits - mx.logsumexp(logits, axis=-1, keepdims=True)
+            pred_BxC = sampler(logprobs.reshape(B * C, -1)).reshape(B, C)
+            pred_BxC = pred_BxC.astype(mx.int32)
+
+            # Channels start after their delay
+            pred_BxC = mx.where(
+                generation_step >= delay_pattern, pred_BxC, audio_bos_value
             )
 
-            duration_mins = int(audio_duration_seconds // 60)
-            duration_secs = int(audio_duration_seconds % 60)
-            duration_ms = int((audio_duration_seconds % 1) * 1000)
-            duration_hours = int(audio_duration_seconds // 3600)
-            duration_str = f"{duration_hours:02d}:{duration_mins:02d}:{duration_secs:02d}.{duration_ms:03d}"
-
-            yield GenerationResult(
-                audio=audio,
-                samples=samples,
-                sample_rate=sample_rate,
-                segment_idx=segment_index,
-                token_count=token_count,
-                audio_duration=duration_str,
-                real_time_factor=rtf,
-                prompt={
-                    "tokens": token_count,
-                    "tokens-per-sec": (
-                        round(token_count / elapsed_time, 2) if elapsed_time > 0 else 0
-                    ),
-                },
-                audio_samples={
-                    "samples": samples,
-                    "samples-per-sec": (
-                        round(samples / elapsed_time, 2) if elapsed_time > 0 else 0
-                    ),
-                },
-                processing_time_seconds=time_end - time_start,
-                peak_memory_usage=mx.get_peak_memory() / 1e9,
+            # After channel 0 emits EOS, write EOS then PAD along the delays
+            done_B = eos_countdown_B == 0
+            eos_countdown_B = mx.where(
+                (eos_countdown_B < 0) & (pred_BxC[:, 0] == audio_eos_value),
+                extra_steps_after_eos,
+                eos_countdown_B,
             )
+            active_B = eos_countdown_B > 0
+            step_after_eos = (max_delay_pattern - eos_countdown_B)[:, None]
+            pred_BxC = mx.where(
+                active_B[:, None] & (step_after_eos == delay_pattern),
+                audio_eos_value,
+                pred_BxC,
+            )
+            pred_BxC = mx.where(
+                (active_B[:, None] & (step_after_eos > delay_pattern))
+                | done_B[:, None],
+                audio_pad_value,
+                pred_BxC,
+            )
+            eos_countdown_B = mx.where(active_B, eos_countdown_B - 1, eos_countdown_B)
 
-            # Clear cache after each segment to avoid memory leaks
-            mx.clear_cache()
+            return (
+                pred_BxC,
+                eos_countdown_B,
+                [c.k for c in self_cache],
+                [c.v for c in self_cache],
+            )
+
+        if not compiled:
+            return decode_step
+        step = mx.compile(
+            decode_step,
+            inputs=[mx.random.state, self.model.state],
+            outputs=[mx.random.state],
+        )
+        self._decode_steps.steps[length] = step
+        return step
 
     def _generate(
         self,
@@ -324,32 +476,66 @@ class Model(nn.Module):
         cfg_filter_top_k: int = 35,
         ref_audio: Optional[Union[str, mx.array]] = None,
         ref_text: Optional[str] = None,
-    ) -> np.ndarray:
+    ) -> Tuple[mx.array, int]:
         """
         Generates audio from a text prompt (and optional audio prompt) using the Dia model.
 
         Returns:
-            A numpy array of generated audio samples.
+            The generated audio samples and the number of decoding steps.
+        """
+        return self._generate_batch(
+            [text],
+            max_tokens=max_tokens,
+            cfg_scale=cfg_scale,
+            temperature=temperature,
+            top_p=top_p,
+            use_cfg_filter=use_cfg_filter,
+            cfg_filter_top_k=cfg_filter_top_k,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+        )[0]
+
+    def _generate_codes(
+        self,
+        texts: List[str],
+        max_tokens: Optional[int] = None,
+        cfg_scale: float = 3.0,
+        temperature: float = 1.3,
+        top_p: float = 0.95,
+        use_cfg_filter: bool = True,
+        cfg_filter_top_k: int = 35,
+        ref_audio: Optional[Union[str, mx.array]] = None,
+        ref_text: Optional[str] = None,
+        compiled: bool = True,
+        verbose: bool = True,
+    ) -> List[mx.array]:
+        """
+        Decode audio codes for a batch of prompts.
+
+        Every prompt gets an unconditional and a conditional row. Decoding
+        stops once every prompt has finished its EOS countdown.
+
+        Returns:
+            For each prompt, the generated (T, C) codes with the delay
+            pattern still applied.
         """
         num_channels = self.config.data.channels
         audio_bos_value = int(self.config.data.audio_bos_value)
-        audio_eos_value = int(self.config.data.audio_eos_value)
-        audio_pad_value = int(self.config.data.audio_pad_value)
         delay_pattern = self.config.data.delay_pattern
         max_tokens = self.config.data.audio_length if max_tokens is None else max_tokens
-        delay_tensor = mx.array(delay_pattern, dtype=mx.int32)
         max_delay_pattern = max(delay_pattern)
+        B = len(texts)
 
         if ref_text is not None:
-            text = ref_text.strip() + " " + text
+            texts = [ref_text.strip() + " " + text for text in texts]
 
-        (
-            cond_src_BxS,
-            cond_src_positions_BxS,
-            cond_src_padding_mask_BxS,
-            cond_enc_self_attn_mask_Bx1xSxS,
-        ) = self._prepare_text_input(text)
+        inputs = [self._prepare_text_input(text) for text in texts]
+        cond_src_BxS = mx.concatenate([x[0] for x in inputs])
+        cond_src_positions_BxS = mx.concatenate([x[1] for x in inputs])
+        cond_src_padding_mask_BxS = mx.concatenate([x[2] for x in inputs])
+        cond_enc_self_attn_mask_Bx1xSxS = mx.concatenate([x[3] for x in inputs])
 
+        # Rows are [uncond_0..uncond_B-1, cond_0..cond_B-1]
         unc_src_BxS = mx.zeros_like(cond_src_BxS)
         src_BxS = mx.concatenate([unc_src_BxS, cond_src_BxS], axis=0)
         src_positions_BxS = mx.concatenate(
@@ -368,57 +554,66 @@ class Model(nn.Module):
             src_positions=src_positions_BxS,
             deterministic=True,
             attn_mask=enc_self_attn_mask_Bx1xSxS,
-        )  # Shape: (B, S, E)
+        )  # Shape: (2B, S, E)
 
         # 3. Prepare Decoder Inputs
-        # 3-1. Allocate KV Cache (Static)
+        # 3-1. Precompute the cross-attention KV once per generation
         decoder_cross_attention_cache: list[KVCache] = (
             self.model.decoder.precompute_cross_attention_kv(
                 max_tokens, encoder_out, src_positions_BxS
             )
         )
 
-        decoder_self_attention_cache: list[KVCache] = []
-        for _ in range(self.model.decoder.num_layers):
-            decoder_self_attention_cache.append(
-                KVCache(
-                    self.config.model.decoder.gqa_query_heads,
-                    max_tokens,
-                    self.config.model.decoder.gqa_head_dim,
-                )
-            )
-
         # 3-2. Initialize Decoder Inputs
         generated_BxTxC = mx.full(
-            (2, 1, num_channels),
+            (B, 1, num_channels),
             vals=audio_bos_value,
             dtype=mx.int32,
         )
-
         current_step = 0
-        prompt_len_inc_bos = 1  # Start with BOS length
-
-        # 3-3. Load Audio Prompt (if provided)
+        audio_prompt_codebook = None
         if ref_audio is not None:
             audio_prompt = mx.array(ref_audio)[None, None, ...]  # 1, C, T
 
             audio_prompt_codebook = audio_to_codebook(
                 self.dac_model, audio_prompt, data_config=self.config.data
             )
-            audio_prompt_codebook = mx.concatenate(
-                [audio_prompt_codebook, audio_prompt_codebook], axis=0
-            )
             generated_BxTxC = mx.concatenate(
-                [generated_BxTxC, audio_prompt_codebook], axis=1
+                [
+                    generated_BxTxC,
+                    mx.broadcast_to(
+                        audio_prompt_codebook,
+                        (B, *audio_prompt_codebook.shape[1:]),
+                    ).astype(mx.int32),
+                ],
+                axis=1,
             )
+            current_step = generated_BxTxC.shape[1] - 1
+
+        # 3-3. Allocate the self-attention KV caches (static)
+        dec_config = self.config.model.decoder
+        cache_len = math.ceil((current_step + max_tokens) / _STEP_BLOCK) * _STEP_BLOCK
+        compute_dtype = _str_to_dtype(self.config.training.dtype) or mx.float32
+        decoder_self_attention_cache = [
+            KVCache(
+                dec_config.kv_heads,
+                cache_len,
+                dec_config.gqa_head_dim,
+                batch_size=2 * B,
+                dtype=compute_dtype,
+            )
+            for _ in range(self.model.decoder.num_layers)
+        ]
 
-            prefill_len = generated_BxTxC.shape[1]
-            prompt_len_inc_bos = prefill_len
+        # 3-4. Prefill with the audio prompt (if provided)
+        if ref_audio is not None:
+            prefill_BxTxC = mx.concatenate([generated_BxTxC, generated_BxTxC])
+            prefill_len = prefill_BxTxC.shape[1]
             prefill_tgt_pos = mx.broadcast_to(
-                mx.expand_dims(mx.arange(prefill_len), 0), (2, prefill_len)
+                mx.expand_dims(mx.arange(prefill_len), 0), (2 * B, prefill_len)
             )
             prefill_tgt_padding_mask = mx.any(
-                generated_BxTxC != audio_pad_value, axis=2
+                prefill_BxTxC != self.config.data.audio_pad_value, axis=2
             )
 
             prefill_self_attn_mask = self._create_attn_mask(
@@ -433,7 +628,7 @@ class Model(nn.Module):
             )
 
             _ = self.model.decoder(
-                tgt_ids_BxTxC=generated_BxTxC,
+                tgt_ids_BxTxC=prefill_BxTxC,
                 encoder_out=encoder_out,
                 tgt_positions=prefill_tgt_pos,
                 src_positions=src_positions_BxS,
@@ -444,154 +639,94 @@ class Model(nn.Module):
                 cross_attention_cache=decoder_cross_attention_cache,
             )
 
-            current_step = prefill_len - 1
-
-        # 4. Autoregressive Generation Loop
-        eos_detected_channel_0 = False
-        eos_countdown = -1
-        extra_steps_after_eos = 30
-
-        # Make generated_BxTxC a fixed size tensor
-        # Length is either 1 + max tokens or 1 + prompt len + max tokens
-        padding = mx.full(
-            (2, max_tokens, num_channels),
-            vals=-1,
-            dtype=mx.int32,
-        )
-        generated_BxTxC = mx.concatenate([generated_BxTxC, padding], axis=1)
-
-        decode_step = self.model.decoder.decode_step
-
-        tgt_padding_mask = mx.any(
-            mx.expand_dims(generated_BxTxC[:, -1, :], 1) != audio_pad_value, axis=2
-        )  # [B, 1]
-
         # Generated tokens are never PAD, so we use fixed mask
         decoder_cross_attn_mask = self._create_attn_mask(
-            tgt_padding_mask,  # Query mask [B, 1]
-            src_padding_mask_BxS,  # Key mask [B, S]
+            mx.ones((2 * B, 1), dtype=mx.bool_),  # Query mask [2B, 1]
+            src_padding_mask_BxS,  # Key mask [2B, S]
             is_causal=False,
-        )  # [B, 1, 1, S]
-
-        top_k = -1
-        if use_cfg_filter and cfg_filter_top_k is not None:
-            top_k = cfg_filter_top_k
-        sampler = make_sampler(temperature, top_p, top_k=top_k)
-
-        for step in trange(current_step, current_step + max_tokens):
-            tgt_ids_Bx1xC = mx.expand_dims(generated_BxTxC[:, step, :], 1)
-            tgt_pos_Bx1 = mx.full(
-                (2, 1),
-                vals=step,
-                dtype=mx.int32,
-            )
+        )  # [2B, 1, 1, S]
 
-            logits_Bx1xCxV = decode_step(
-                tgt_ids_Bx1xC=tgt_ids_Bx1xC,
-                tgt_pos_Bx1=tgt_pos_Bx1,
-                encoder_out=encoder_out,
-                self_attn_mask=None,
-                cross_attn_mask=decoder_cross_attn_mask,
-                self_attention_cache=decoder_self_attention_cache,
-                cross_attention_cache=decoder_cross_attention_cache,
-            )
-
-            V = self.config.model.tgt_vocab_size
-            logits_last_BxCxV = logits_Bx1xCxV[:, -1, :, :]  # B, C, V
-            uncond_logits_CxV = logits_last_BxCxV[0, :, :]
-            cond_logits_CxV = logits_last_BxCxV[1, :, :]
-
-            cfg_logits_CxV = cond_logits_CxV + cfg_scale * (
-                cond_logits_CxV - uncond_logits_CxV
-            )
-
-            logits_CxV = mx.reshape(cfg_logits_CxV, (-1, V))  # C, V
-
-            # Create a mask for setting tokens beyond 1025 to -inf
-            inf_mask = mx.full(logits_CxV.shape, -float("inf"), dtype=logits_CxV.dtype)
-            keep_mask = mx.concatenate(
-                [
-                    mx.ones((logits_CxV.shape[0], 1025)),
-                    mx.zeros((logits_CxV.shape[0], logits_CxV.shape[1] - 1025)),
-                ],
-                axis=1,
+        # 4. Autoregressive Generation Loop
+        if not use_cfg_filter:
+            cfg_filter_top_k = None
+        keys = [c.k for c in decoder_self_attention_cache]
+        values = [c.v for c in decoder_self_attention_cache]
+        cross_keys = [c.k for c in decoder_cross_attention_cache]
+        cross_values = [c.v for c in decoder_cross_attention_cache]
+        cfg_scale = mx.array(cfg_scale, dtype=mx.float32)
+        tokens_BxC = generated_BxTxC[:, -1, :]
+        eos_countdown_B = mx.full((B,), -1, dtype=mx.int32)
+
+        preds = []
+        countdowns = []
+        for step in trange(
+            current_step, current_step + max_tokens, disable=not verbose
+        ):
+            length = min(cache_len, (step // _STEP_BLOCK + 1) * _STEP_BLOCK)
+            decode_step = self._decode_step(
+                length, temperature, top_p, cfg_filter_top_k, compiled=compiled
             )
-            logits_CxV = mx.where(keep_mask == 1, logits_CxV, inf_mask)
-
-            # Sample next token
-            pred_C = _sample_next_token(
-                logits_CxV,
-                temperature=temperature,
-                sampler=sampler,
+            # With an audio prompt every channel is already past its delay
+            generation_step = (
+                step - current_step if ref_audio is None else max_delay_pattern
             )
-
-            generation_step_index = step - current_step
-            if ref_audio is None:
-                pred_C = mx.where(
-                    generation_step_index >= delay_tensor,
-                    pred_C,
-                    mx.full(pred_C.shape, audio_bos_value, dtype=pred_C.dtype),
-                )
-
-            # Update generated tokens for next step
-            pred_C_expanded = mx.broadcast_to(
-                mx.expand_dims(pred_C, 0), (2, num_channels)
+            tokens_BxC, eos_countdown_B, keys, values = decode_step(
+                tokens_BxC,
+                mx.array([step], dtype=mx.int32),
+                mx.array(generation_step, dtype=mx.int32),
+                eos_countdown_B,
+                cfg_scale,
+                decoder_cross_attn_mask,
+                keys,
+                values,
+                cross_keys,
+                cross_values,
             )
+            mx.async_eval(tokens_BxC, eos_countdown_B)
+            preds.append(tokens_BxC)
+            countdowns.append(eos_countdown_B)
+            # Check the previous step while this one runs
+            if len(countdowns) > 1 and mx.all(countdowns[-2] == 0).item():
+                break
+
+        # A prompt ends at the step its EOS countdown reaches zero; the token
+        # of that step is dropped, as is the last one without an EOS
+        countdowns = mx.stack(countdowns, axis=1)  # (B, steps)
+        finished = countdowns == 0
+        end = mx.where(
+            mx.any(finished, axis=1),
+            mx.argmax(finished, axis=1),
+            len(preds) - 1,
+        ).tolist()
+        preds = mx.stack(preds, axis=1)  # (B, steps, C)
+        return [preds[b, : end[b]] for b in range(B)]
+
+    def _generate_batch(
+        self,
+        texts: List[str],
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> List[Tuple[mx.array, int]]:
+        """
+        Generates audio for a batch of text prompts in one decoding loop.
 
-            # Split the tensor into parts: before the update, the update itself, and after the update
-            before_update = generated_BxTxC[:, : step + 1, :]
-            new_token = mx.expand_dims(
-                pred_C_expanded, 1
-            )  # Shape: (2, 1, num_channels)
-            after_update = generated_BxTxC[:, step + 2 :, :]
-            generated_BxTxC = mx.concatenate(
-                [before_update, new_token, after_update], axis=1
+        Returns:
+            For each prompt, the generated audio samples and the number of
+            decoding steps.
+        """
+        max_tokens = self.config.data.audio_length if max_tokens is None else max_tokens
+        num_channels = self.config.data.channels
+        outputs = []
+        for generated_codes in self._generate_codes(
+            texts, max_tokens=max_tokens, **kwargs
+        ):
+            audio = codebook_to_audio(
+                generated_codes.transpose(1, 0),
+                self.dac_model,
+                self.config.data.delay_pattern,
+                B=1,
+                T=max_tokens,
+                C=num_channels,
             )
-
-            if not eos_detected_channel_0 and pred_C[0] == audio_eos_value:
-                print(f"EOS detected at step {step} for channel 0")
-                eos_detected_channel_0 = True
-                eos_countdown = extra_steps_after_eos
-
-            if eos_countdown > 0:
-                step_after_eos = max_delay_pattern - eos_countdown
-                for i, d in enumerate(delay_pattern):
-                    if step_after_eos == d:
-                        # Update EOS token
-                        # Create new array with updated value at position i in the current sequence
-                        eos_values = mx.zeros((2, num_channels), dtype=mx.int32)
-                        eos_values = eos_values.at[:, i].add(audio_eos_value)
-                        # Replace the values at step+1
-                        generated_BxTxC = generated_BxTxC.astype(mx.int32)
-                        generated_BxTxC = generated_BxTxC.at[:, step + 1, :].add(
-                            eos_values
-                        )
-                    elif step_after_eos > d:
-                        # Update PAD token
-                        # Create new array with updated value at position i in the current sequence
-                        pad_values = mx.zeros((2, num_channels), dtype=mx.int32)
-                        pad_values = pad_values.at[:, i].add(audio_pad_value)
-                        # Replace the values at step+1
-                        generated_BxTxC = generated_BxTxC.astype(mx.int32)
-                        generated_BxTxC = generated_BxTxC.at[:, step + 1, :].add(
-                            pad_values
-                        )
-
-                eos_countdown -= 1
-                if eos_countdown == 0:
-                    break
-
-            generation_step_index = step - current_step + 1
-
-        output_codes = generated_BxTxC[:, prompt_len_inc_bos : step + 1, :]
-        generated_codes = output_codes[0]
-
-        audio = codebook_to_audio(
-            generated_codes.transpose(1, 0),
-            self.dac_model,
-            delay_pattern,
-            B=1,
-            T=max_tokens,
-            C=num_channels,
-        )
-        return audio.squeeze(), generation_step_index
+            outputs.append((audio.squeeze(), generated_codes.shape[0] + 1))
+        return outputs
@@ -1,4 +1,4 @@
-from typing import Any, List, Optional, Tuple
+from typing import List, Optional, Tuple
 
 import mlx.core as mx
 import mlx.nn as nn
@@ -184,9 +184,19 @@ class RotaryEmbedding(nn.Module):
 
 
 class KVCache:
-    def __init__(self, num_heads, max_len, head_dim, k=None, v=None):
-        self.k = mx.zeros((2, num_heads, max_len, head_dim)) if k is None else k
-        self.v = mx.zeros((2, num_heads, max_len, head_dim)) if v is None else v
+    def __init__(
+        self,
+        num_heads,
+        max_len,
+        head_dim,
+        k=None,
+        v=None,
+        batch_size=2,
+        dtype=mx.float32,
+    ):
+        shape = (batch_size, num_heads, max_len, head_dim)
+        self.k = mx.zeros(shape, dtype=dtype) if k is None else k
+        self.v = mx.zeros(shape, dtype=dtype) if v is None else v
         self.current_idx = 0
         self.max_len = max_len
 
@@ -341,50 +351,34 @@ class Attention(nn.Module):
                 Xk_BxSxKxH, position=kv_positions
             )  # (B, S, K, H)
 
+            # S=1 for Decode Step
+            # K/V keep num_kv_heads; attention broadcasts them over the
+            # query head groups (GQA), so caches are not repeated per group
             Xk_BxKxSxH = mx.transpose(Xk_BxSxKxH, (0, 2, 1, 3))  # (B, K, S, H)
             Xv_BxKxSxH = mx.transpose(Xv_BxSxKxH, (0, 2, 1, 3))  # (B, K, S, H)
-            # S=1 for Decode Step
-
-            if self.num_gqa_groups > 1:
-                # repeat "b k s h -> b (k g) s h" - repeat each k head g times
-                b, k, s, h = Xk_BxKxSxH.shape
-                # Expand k dim, then tile along new axis, then reshape
-                Xk_BxNxSxH = mx.repeat(Xk_BxKxSxH, self.num_gqa_groups, axis=1)
-                Xv_BxNxSxH = mx.repeat(Xv_BxKxSxH, self.num_gqa_groups, axis=1)
-            else:
-                Xk_BxNxSxH = Xk_BxKxSxH
-                Xv_BxNxSxH = Xv_BxKxSxH
 
             # Encoder Self Attention
             if cache is None:
-                attn_k = Xk_BxNxSxH
-                attn_v = Xv_BxNxSxH
+                attn_k = Xk_BxKxSxH
+                attn_v = Xv_BxKxSxH
             # Decoder Self Attention
             else:
                 # In prefill mode, we fill in cache until prefill length
                 if prefill:
-                    attn_k, attn_v = Xk_BxNxSxH, Xv_BxNxSxH
+                    attn_k, attn_v = Xk_BxKxSxH, Xv_BxKxSxH
                     cache.prefill_kv(attn_k, attn_v)
                 # In decode step, we add current K/V to cache step by step
                 else:
-                    attn_k, attn_v = cache.update_and_fetch(Xk_BxNxSxH, Xv_BxNxSxH)
-
-        # Attention Calculation
-        attn_scores = mx.matmul(Xq_BxNxTxH, attn_k.swapaxes(2, 3))
-
-        # Apply Scaling
-        scale_factor = 1.0
-        attn_scores = attn_scores * scale_factor
-
-        # Apply Attention Mask
-        if attn_mask is not None:
-            # Add large negative value where mask is False/0
-            attn_scores = mx.where(
-                attn_mask, attn_scores, -1e9
-            )  # Using -1e9 for numerical stability
-
-        attn_weights = mx.softmax(attn_scores, axis=-1)
-        attn_output = mx.matmul(attn_weights, attn_v)
+                    attn_k, attn_v = cache.update_and_fetch(Xk_BxKxSxH, Xv_BxKxSxH)
+
+        # Attention Calculation (unscaled, masked positions are excluded)
+        attn_output = mx.fast.scaled_dot_product_attention(
+            Xq_BxNxTxH,
+            attn_k.astype(Xq_BxNxTxH.dtype),
+            attn_v.astype(Xq_BxNxTxH.dtype),
+            scale=1.0,
+            mask=attn_mask,
+        )
 
         attn_output = mx.transpose(attn_output, (0, 2, 1, 3))  # (B, T, N, H)
         output = self.o_proj(attn_output)
@@ -696,7 +690,7 @@ class Decoder(nn.Module):
         tgt_ids_Bx1xC: mx.array,  # [B, 1, C]
         tgt_pos_Bx1: mx.array,  # [B, 1]
         encoder_out: mx.array,  # [B, S, E]
-        self_attn_mask: Any,  # None
+        self_attn_mask: Optional[mx.array],  # None or [B, 1, 1, T]
         cross_attn_mask: mx.array,  # [B, 1, 1, S]
         self_attention_cache: List[KVCache],
         cross_attention_cache: List[KVCache],
@@ -704,15 +698,13 @@ class Decoder(nn.Module):
         """
         Performs a single decoding step, managing KV caches layer by layer.
 
+        ``self_attn_mask`` is None when the caches only return the filled
+        positions, or selects the valid positions of caches that return a
+        fixed-size buffer (as in the compiled decode step).
+
         Returns:
-            A tuple containing:
-            - logits_Bx1xCV: The final output logits for the current step (B, 1, C*V), cast to float32.
-            - new_cache: The updated KV cache for the next decoding step.
+            logits_Bx1xCxV: The final output logits for the current step, cast to float32.
         """
-        assert (
-            self_attn_mask is None
-        ), "Self-attention mask should be None, kept for pattern"
-
         x = None
         for i in range(self.num_channels):
             channel_tokens = tgt_ids_Bx1xC[..., i]
@@ -728,7 +720,7 @@ class Decoder(nn.Module):
                 src_positions=None,  # CA KV is already computed
                 tgt_positions=tgt_pos_Bx1,  # (2, 1)
                 deterministic=True,
-                self_attn_mask=None,
+                self_attn_mask=self_attn_mask,
                 cross_attn_mask=cross_attn_mask,
                 self_attn_cache=self_cache,
                 cross_attn_cache=cross_cache,
@@ -849,7 +841,10 @@ class DiaModel(nn.Module):
             self_attn_module = layer.self_attention
             self_attention_cache.append(
                 KVCache(
-                    self_attn_module.num_query_heads, max_len, self_attn_module.head_dim
+                    self_attn_module.num_kv_heads,
+                    max_len,
+                    self_attn_module.head_dim,
+                    batch_size=tgt_BxTxC.shape[0],
                 )
             )
 
@@ -1,7 +1,7 @@
 import time
 from dataclasses import dataclass
 from numbers import Number
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Union
 
 import mlx.core as mx
 import mlx.nn as nn
@@ -10,6 +10,7 @@ from ..base import BaseModelArgs, GenerationResult, check_array_shape
 from .istftnet import Decoder
 from .modules import AlbertModelArgs, CustomAlbert, ProsodyPredictor, TextEncoder
 from .pipeline import KokoroPipeline
+from .voice import VoiceCache
 
 
 def sanitize_lstm_weights(key: str, state_dict: mx.array) -> dict:
@@ -71,7 +72,13 @@ class Model(nn.Module):
 
     REPO_ID = "prince-canuma/Kokoro-82M"
 
-    def __init__(self, config: ModelConfig, repo_id: str = None):
+    # Decoder input lengths (in frames) compiled by warmup(). Compiled graphs
+    # are keyed by input shape, so other lengths are compiled on first use.
+    WARMUP_FRAMES = (64, 128, 256, 512)
+
+    def __init__(
+        self, config: ModelConfig, repo_id: str = None, voice_cache_size: int = 32
+    ):
         super().__init__()
         self.repo_id = repo_id
         self.config = config
@@ -102,6 +109,8 @@ class Model(nn.Module):
             **config.istftnet,
         )
         self._pipelines: Dict[str, KokoroPipeline] = {}  # Cache for pipelines
+        # Voice packs shared by all pipelines, kept across generate calls
+        self.voice_cache = VoiceCache(max_size=voice_cache_size)
 
     @dataclass
     class Output:
@@ -139,12 +148,13 @@ class Model(nn.Module):
         duration = self.predictor.duration_proj(x)
         duration = mx.sigmoid(duration).sum(axis=-1) / speed
         pred_dur = mx.clip(mx.round(duration), a_min=1, a_max=None).astype(mx.int32)[0]
-        indices = mx.concatenate(
-            [mx.repeat(mx.array(i), int(n)) for i, n in enumerate(pred_dur)]
+        # Frame j is aligned to the token whose [start, end) span contains it
+        ends = mx.cumsum(pred_dur)
+        frames = mx.arange(ends[-1].item())
+        pred_aln_trg = (frames[None, :] >= (ends - pred_dur)[:, None]) & (
+            frames[None, :] < ends[:, None]
         )
-        pred_aln_trg = mx.zeros((input_ids.shape[1], indices.shape[0]))
-        pred_aln_trg[indices, mx.arange(indices.shape[0])] = 1
-        pred_aln_trg = pred_aln_trg[None, :]
+        pred_aln_trg = pred_aln_trg.astype(mx.float32)[None, :]
         en = d.transpose(0, 2, 1) @ pred_aln_trg
         F0_pred, N_pred = self.predictor.F0Ntrain(en, s)
         t_en = self.text_encoder(
@@ -152,7 +162,9 @@ class Model(nn.Module):
         )  # Working fine in MLX
         asr = t_en @ pred_aln_trg
 
-        decoder = mx.compile(decoder) if decoder is not None else self.decoder
+        decoder = self._compile_decoder(
+            decoder if decoder is not None else self.decoder
+        )
         audio = decoder(asr, F0_pred, N_pred, ref_s[:, :128])[0]  # Working fine in MLX
 
         # Evaluate the computation graph for audio and pred_dur before returning
@@ -160,6 +172,38 @@ class Model(nn.Module):
 
         return self.Output(audio=audio, pred_dur=pred_dur) if return_output else audio
 
+    @staticmethod
+    def _compile_decoder(decoder):
+        """Compile ``decoder`` once and keep the result on the decoder itself,
+        so it is reused across calls and released together with it."""
+        compiled = getattr(decoder, "_compiled", None)
+        if compiled is None:
+            # The random state is threaded through so the source noise still
+            # changes between calls
+            inputs = [mx.random.state]
+            if isinstance(decoder, nn.Module):
+                inputs.append(decoder.state)
+            compiled = mx.compile(decoder, inputs=inputs, outputs=[mx.random.state])
+            try:
+                # Set as a plain attribute so it stays out of the module state
+                object.__setattr__(decoder, "_compiled", compiled)
+            except AttributeError:
+                pass  # e.g. bound methods, which cannot hold attributes
+        return compiled
+
+    def warmup(self, frame_lengths: Optional[List[int]] = None):
+        """Compile the decoder for ``frame_lengths`` (``WARMUP_FRAMES`` by
+        default) so requests of those lengths do not pay for it."""
+        decoder = self._compile_decoder(self.decoder)
+        for n_frames in frame_lengths or self.WARMUP_FRAMES:
+            audio = decoder(
+                mx.zeros((1, self.config.hidden_dim, n_frames)),
+                mx.zeros((1, 2 * n_frames)),
+                mx.zeros((1, 2 * n_frames)),
+                mx.zeros((1, self.config.style_dim)),
+            )
+            mx.eval(audio)
+
     def sanitize(self, weights):
         sanitized_weights = {}
         for key, state_dict in weights.items():
@@ -254,9 +298,17 @@ class Model(nn.Module):
                 model=self,
                 repo_id=self.REPO_ID if self.repo_id is None else self.repo_id,
                 lang_code=lang_code,
+                voice_cache=self.voice_cache,
             )
         return self._pipelines[lang_code]
 
+    def preload_voices(self, voices: List[str], lang_code: str = "a"):
+        """Load voice packs (or blends like ``"af_bella,af_jessica"``) into the
+        voice cache ahead of the first request that uses them."""
+        pipeline = self._get_pipeline(lang_code)
+        for voice in voices:
+            pipeline.load_voice(voice)
+
     def generate(
         self,
         text: str,
@@ -268,8 +320,6 @@ class Model(nn.Module):
     ):
         pipeline = self._get_pipeline(lang_code)
 
-        pipeline.voices = {}  # Reset voices
-
         if voice is None:
             voice = "af_heart"
 
@@ -10,7 +10,7 @@ import mlx.nn as nn
 from huggingface_hub import snapshot_download
 from misaki import en, espeak
 
-from .voice import load_voice_tensor
+from .voice import VoiceCache, load_voice_tensor
 
 ALIASES = {
     "en": "a",
@@ -73,6 +73,7 @@ class KokoroPipeline:
         model: nn.Module,
         repo_id: str,
         trf: bool = False,
+        voice_cache: Optional[VoiceCache] = None,
     ):
         """Initialize a KokoroPipeline.
 
@@ -80,6 +81,8 @@ class KokoroPipeline:
             lang_code: Language code for G2P processing
             model: KokoroModel instance, True to create new model, False for no model
             trf: Whether to use transformer-based G2P
+            voice_cache: Voice pack cache to use, shared with other pipelines of
+                the same model. A private cache is created if None.
             device: Override default device selection ('cuda' or 'cpu', or None for auto)
                    If None, will auto-select cuda if available
                    If 'cuda' and not available, will explicitly raise an error
@@ -92,7 +95,7 @@ class KokoroPipeline:
         if repo_id is None:
             raise ValueError("repo_id is required to load voices")
         self.model = model
-        self.voices = {}
+        self.voices = voice_cache if voice_cache is not None else VoiceCache()
         if lang_code in "ab":
             try:
                 fallback = espeak.EspeakFallback(british=lang_code == "b")
@@ -131,8 +134,9 @@ class KokoroPipeline:
             self.g2p = espeak.EspeakG2P(language=language)
 
     def load_single_voice(self, voice: str) -> mx.array:
-        if voice in self.voices:
-            return self.voices[voice]
+        pack = self.voices.get(voice)
+        if pack is not None:
+            return pack
 
         if voice.endswith(".safetensors"):
             # Direct path to safetensors file
@@ -177,12 +181,14 @@ class KokoroPipeline:
     load_voice is a helper function that lazily downloads and loads a voice:
     Single voice can be requested (e.g. 'af_bella') or multiple voices (e.g. 'af_bella,af_jessica').
     If multiple voices are requested, they are averaged.
+    Loaded voices and blends are kept in the pipeline's voice cache.
     Delimiter is optional and defaults to ','.
     """
 
     def load_voice(self, voice: str, delimiter: str = ",") -> mx.array:
-        if voice in self.voices:
-            return self.voices[voice]
+        pack = self.voices.get(voice)
+        if pack is not None:
+            return pack
         logging.debug(f"Loading voice: {voice}")
         packs = [self.load_single_voice(v) for v in voice.split(delimiter)]
         if len(packs) == 1:
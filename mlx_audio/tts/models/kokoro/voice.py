@@ -1,3 +1,7 @@
+import threading
+from collections import OrderedDict
+from typing import Iterator, Optional
+
 import mlx.core as mx
 
 
@@ -13,3 +17,69 @@ def load_voice_tensor(path: str) -> mx.array:
     """
     weights = mx.load(path)
     return weights["voice"]
+
+
+class VoiceCache:
+    """
+    Thread-safe LRU cache of voice packs keyed by voice spec.
+
+    Keys are the voice strings passed to ``KokoroPipeline.load_voice``: single
+    voices (``"af_heart"``), blends (``"af_bella,af_jessica"``) or paths to
+    ``.safetensors`` files. One cache is shared by all pipelines of a model, so
+    a voice is resolved and loaded once and later requests skip the hub lookup.
+    Packs are evaluated on insertion so cached entries can be used from any
+    thread.
+
+    Args:
+        max_size: Maximum number of voice packs to keep. The least recently
+            used pack is evicted once it is exceeded.
+    """
+
+    def __init__(self, max_size: int = 32):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._packs: "OrderedDict[str, mx.array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, voice: str) -> bool:
+        with self._lock:
+            return voice in self._packs
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._packs)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._packs))
+
+    def __getitem__(self, voice: str) -> mx.array:
+        pack = self.get(voice)
+        if pack is None:
+            raise KeyError(voice)
+        return pack
+
+    def __setitem__(self, voice: str, pack: mx.array):
+        mx.eval(pack)
+        with self._lock:
+            self._packs[voice] = pack
+            self._packs.move_to_end(voice)
+            while len(self._packs) > self.max_size:
+                self._packs.popitem(last=False)
+
+    def get(self, voice: str, default: Optional[mx.array] = None) -> mx.array:
+        with self._lock:
+            pack = self._packs.get(voice)
+            if pack is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._packs.move_to_end(voice)
+            return pack
+
+    def clear(self):
+        with self._lock:
+            self._packs.clear()
@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional, Tuple
+
+import mlx.core as mx
+from mlx_lm.generate import BatchGenerator
+from mlx_lm.sample_utils import make_logits_processors, make_sampler
+
+from mlx_audio.tts.batching import (
+    BatchRequest,
+    ContinuousBatchingEngine,
+    SamplingParams,
+)
+
+from ..base import GenerationResult
+from .llama import decode_audio_from_codes
+
+END_OF_SPEECH_TOKEN = 128258
+
+
+class LlamaTTSBatchEngine(ContinuousBatchingEngine):
+    """Continuous batching for Llama-based TTS models (Orpheus).
+
+    Token generation is delegated to mlx_lm's ``BatchGenerator``, which keeps a
+    left-padded ``BatchKVCache`` and per-sequence samplers and logits
+    processors. Finished sequences are decoded to audio with SNAC. Voice
+    cloning from reference audio is not batched and should go through
+    :meth:`Model.generate`.
+    """
+
+    default_max_tokens = 1200
+
+    def __init__(self, model, max_batch_size: int = 8):
+        super().__init__(max_batch_size=max_batch_size)
+        self.model = model
+        self._generator: Optional[BatchGenerator] = None
+        self._sequences: Dict[int, Tuple[BatchRequest, List[int]]] = {}
+
+    @property
+    def num_active(self) -> int:
+        return len(self._sequences)
+
+    def _reset(self):
+        if self._generator is not None:
+            self._generator.close()
+        self._generator = None
+        self._sequences = {}
+
+    def submit_text(
+        self,
+        text: str,
+        params: SamplingParams,
+        voice: Optional[str] = None,
+        split_pattern: str = "\n",
+        **kwargs,
+    ) -> List[BatchRequest]:
+        """Queue one sequence per ``split_pattern`` segment of ``text``.
+
+        Returns:
+            One :class:`BatchRequest` per segment, in order.
+        """
+        prompt_text = text.replace("\\n", "\n").replace("\\t", "\t")
+        if split_pattern:
+            segments = [p for p in prompt_text.split(split_pattern) if p.strip()]
+        else:
+            segments = [prompt_text]
+        return [
+            self.submit(params, segment_idx=segment_idx, text=segment, voice=voice)
+            for segment_idx, segment in enumerate(segments)
+        ]
+
+    def _admit(self, request: BatchRequest):
+        if self._generator is None:
+            # prefill_batch_size=1 lets a request join as soon as a slot frees up
+            self._generator = BatchGenerator(
+                self.model,
+                stop_tokens={END_OF_SPEECH_TOKEN},
+                completion_batch_size=self.max_batch_size,
+                prefill_batch_size=1,
+            )
+        self._generator.completion_batch_size = self.max_batch_size
+
+        params = request.params
+        input_ids = self.model.prepare_input_ids(
+            request.inputs["text"], request.inputs["voice"]
+        )
+        sampler = make_sampler(
+            params.temperature,
+            params.top_p,
+            top_k=params.top_k if params.top_k else -1,
+        )
+        logits_processors = make_logits_processors(None, params.repetition_penalty, 20)
+        (uid,) = self._generator.insert(
+            [input_ids[0].tolist()],
+            max_tokens=[params.max_tokens or self.default_max_tokens],
+            samplers=[sampler],
+            logits_processors=[logits_processors],
+        )
+        self._sequences[uid] = (request, [])
+
+    def _remove(self, requests: List[BatchRequest]):
+        uids = {request.uid for request in requests}
+        removed = [
+            uid for uid, (request, _) in self._sequences.items() if request.uid in uids
+        ]
+        self._generator.remove(removed)
+        for uid in removed:
+            del self._sequences[uid]
+
+    def _step(self) -> List[Tuple[BatchRequest, Optional[GenerationResult]]]:
+        finished = []
+        for response in self._generator.next():
+            sequence = self._sequences.get(response.uid)
+            if sequence is None:
+                continue
+            request, tokens = sequence
+            tokens.append(response.token)
+            if response.finish_reason is not None:
+                del self._sequences[response.uid]
+                finished.append((request, self._decode(request, tokens)))
+        return finished
+
+    def _decode(
+        self, request: BatchRequest, tokens: List[int]
+    ) -> Optional[GenerationResult]:
+        code_lists = self.model.parse_output(mx.array(tokens)[None, :])
+        if not code_lists or len(code_lists[0]) == 0:
+            return None
+
+        audio = decode_audio_from_codes(code_lists[0])[0]
+        mx.eval(audio)
+        if audio.shape[0] == 0:
+            return None
+        return self.model.generate_result(
+            audio=audio,
+            start_time=request.started_at,
+            token_count=len(tokens),
+            segment_idx=request.segment_idx,
+        )
@@ -10,7 +10,7 @@ from mlx_lm.sample_utils import make_logits_processors, make_sampler
 from tqdm import tqdm
 from transformers import AutoTokenizer
 
-from mlx_audio.codec.models.snac import SNAC
+from mlx_audio.codec.models.snac import SNAC, SNACFrameBuffer, SNACStreamingDecoder
 from mlx_audio.utils import load_audio
 
 from ..base import GenerationResult
@@ -54,57 +54,6 @@ def decode_audio_from_codes(code_list):
     return audio_hat
 
 
-def codes_to_layers(code_list):
-    """Convert flat code list to layered format for SNAC."""
-    layer_1 = []
-    layer_2 = []
-    layer_3 = []
-    for i in range((len(code_list) + 1) // 7):
-        layer_1.append(code_list[7 * i])
-        layer_2.append(code_list[7 * i + 1] - 4096)
-        layer_3.append(code_list[7 * i + 2] - (2 * 4096))
-        layer_3.append(code_list[7 * i + 3] - (3 * 4096))
-        layer_2.append(code_list[7 * i + 4] - (4 * 4096))
-        layer_3.append(code_list[7 * i + 5] - (5 * 4096))
-        layer_3.append(code_list[7 * i + 6] - (6 * 4096))
-    return [
-        mx.expand_dims(mx.array(layer_1), 0),
-        mx.expand_dims(mx.array(layer_2), 0),
-        mx.expand_dims(mx.array(layer_3), 0),
-    ]
-
-
-def decode_audio_stream(code_list, prev_codes=None, context_frames=8):
-    """Streaming decode with context for smooth transitions.
-
-    Args:
-        code_list: Flat list of NEW codes from the model (not cumulative)
-        prev_codes: Previous context codes (layered format) or None
-        context_frames: Number of context frames for smooth decoding
-
-    Returns:
-        Tuple of (audio, new_context_codes)
-    """
-    codes = codes_to_layers(code_list)
-    audio, new_context = snac_model.decode_stream(codes, prev_codes, context_frames)
-    return audio.squeeze(-1), new_context
-
-
-def get_new_codes(all_codes, prev_code_count):
-    """Extract only the new codes from the full code list.
-
-    Args:
-        all_codes: Full list of codes generated so far
-        prev_code_count: Number of codes already processed
-
-    Returns:
-        List of new codes (empty if none)
-    """
-    if len(all_codes) <= prev_code_count:
-        return []
-    return all_codes[prev_code_count:]
-
-
 def encode_audio_to_codes(audio):
     audio = audio[None, None, :]
 
@@ -143,6 +92,13 @@ class Model(LlamaModel):
     def sample_rate(self):
         return self.config.sample_rate
 
+    def make_batch_engine(self, max_batch_size: int = 8):
+        """Create a continuous-batching engine that decodes concurrent
+        requests in a shared step (see ``mlx_audio.tts.batching``)."""
+        from .batching import LlamaTTSBatchEngine
+
+        return LlamaTTSBatchEngine(self, max_batch_size=max_batch_size)
+
     def parse_output(self, input_ids):
         token_to_find = 128257
         token_to_remove = 128258
@@ -406,10 +362,10 @@ class Model(LlamaModel):
 
             generated_token_count = 0
             yielded_token_count = 0
-            prev_code_count = 0
 
-            # Streaming decode context
-            prev_context_codes = None
+            # Audio codes are grouped into SNAC frames as they are generated
+            frames = SNACFrameBuffer(token_offset=128266)
+            decoder = SNACStreamingDecoder(snac_model) if stream else None
 
             # Generate tokens for this segment
             for i, response in enumerate(
@@ -427,71 +383,26 @@ class Model(LlamaModel):
                     desc=f"Segment {segment_idx + 1}/{len(prompts)}",
                 )
             ):
-                next_token = mx.array([response.token])
-                input_ids = mx.concatenate([input_ids, next_token[None, :]], axis=1)
+                next_token = response.token
                 generated_token_count += 1
 
                 if i % 50 == 0:
                     mx.clear_cache()
 
+                if next_token == 128257:  # Start of speech
+                    frames.reset()
+                    if decoder is not None:
+                        decoder.reset()
+                elif next_token != 128258:
+                    frames.append(next_token)
+
                 # Stream partial audio at intervals
                 if stream and generated_token_count % streaming_token_interval == 0:
-                    code_lists = self.parse_output(input_ids)
-                    if code_lists and len(code_lists[0]) > 0:
-                        all_codes = code_lists[0]
-                        # Get only new codes since last decode
-                        new_codes = get_new_codes(all_codes, prev_code_count)
-
-                        # Need at least 7 codes for one frame
-                        if len(new_codes) >= 7:
-                            # Trim to complete frames (multiples of 7)
-                            num_frames = len(new_codes) // 7
-                            new_codes = new_codes[: num_frames * 7]
-
-                            # Use streaming decode with context
-                            audio, prev_context_codes = decode_audio_stream(
-                                new_codes,
-                                prev_context_codes,
-                                context_frames=8,
-                            )
-                            audio = audio[0]  # Remove batch dim
-
-                            if audio.shape[0] > 0:
-                                yield self.generate_result(
-                                    audio=audio,
-                                    start_time=time_start,
-                                    token_count=generated_token_count
-                                    - yielded_token_count,
-                                    segment_idx=segment_idx,
-                                )
-                                yielded_token_count = generated_token_count
-                                prev_code_count += len(new_codes)
-                                time_start = time.perf_counter()
-
-                if next_token == 128258:  # End of speech
-                    break
-
-            # Decode and yield remaining audio for this segment
-            code_lists = self.parse_output(input_ids)
-
-            for code_list in code_lists:
-                if len(code_list) == 0:
-                    continue
-
-                if stream:
-                    # Get remaining codes not yet decoded
-                    remaining_codes = get_new_codes(code_list, prev_code_count)
-                    if len(remaining_codes) >= 7:
-                        # Trim to complete frames
-                        num_frames = len(remaining_codes) // 7
-                        remaining_codes = remaining_codes[: num_frames * 7]
-
-                        audio, _ = decode_audio_stream(
-                            remaining_codes,
-                            prev_context_codes,
-                            context_frames=8,
-                        )
-                        audio = audio[0]
+                    codes = frames.new_codes()
+                    if codes is not None:
+                        # Only the new frames are decoded; the decoder carries
+                        # the convolution state of the previous ones
+                        audio = decoder.decode_frames(codes)[0, :, 0]
 
                         if audio.shape[0] > 0:
                             yield self.generate_result(
@@ -500,17 +411,29 @@ class Model(LlamaModel):
                                 token_count=generated_token_count - yielded_token_count,
                                 segment_idx=segment_idx,
                             )
-                else:
-                    # Non-streaming: decode all at once
-                    audio = decode_audio_from_codes(code_list)[0]
-
-                    if audio.shape[0] > 0:
-                        yield self.generate_result(
-                            audio=audio,
-                            start_time=time_start,
-                            token_count=generated_token_count - yielded_token_count,
-                            segment_idx=segment_idx,
-                        )
+                            yielded_token_count = generated_token_count
+                            time_start = time.perf_counter()
+
+                if next_token == 128258:  # End of speech
+                    break
+
+            # Decode and yield remaining audio for this segment
+            if stream:
+                codes = frames.new_codes()
+                chunks = [decoder.decode_frames(codes)] if codes is not None else []
+                audio = mx.concatenate(chunks + [decoder.flush()], axis=1)[0, :, 0]
+            elif len(frames) > 0:
+                audio = snac_model.decode(frames.codes()).squeeze(-1)[0]
+            else:
+                audio = None
+
+            if audio is not None and audio.shape[0] > 0:
+                yield self.generate_result(
+                    audio=audio,
+                    start_time=time_start,
+                    token_count=generated_token_count - yielded_token_count,
+                    segment_idx=segment_idx,
+                )
 
             # Clear cache after each segment to avoid memory buildup
             mx.clear_cache()
@@ -10,7 +10,7 @@ from mlx_lm.models.qwen3 import ModelArgs as Qwen3ModelConfig
 from mlx_lm.sample_utils import make_logits_processors, make_sampler
 from tqdm import tqdm
 
-from mlx_audio.codec.models.snac import SNAC
+from mlx_audio.codec.models.snac import SNAC, SNACFrameBuffer, SNACStreamingDecoder
 from mlx_audio.utils import load_audio
 
 from ..base import GenerationResult
@@ -337,7 +337,10 @@ class Model(Qwen3Model):
 
             generated_token_count = 0
             yielded_token_count = 0
-            yielded_frame_count = 0
+
+            # Audio codes are grouped into SNAC frames as they are generated
+            frames = SNACFrameBuffer(token_offset=AUDIO_TOKENS_START)
+            decoder = SNACStreamingDecoder(snac_model) if stream else None
 
             # Generate tokens for this segment
             for i, response in enumerate(
@@ -355,47 +358,54 @@ class Model(Qwen3Model):
                     desc=f"Segment {segment_idx + 1}/{len(prompts)}",
                 )
             ):
-                next_token = mx.array([response.token])
-                input_ids = mx.concatenate([input_ids, next_token[None, :]], axis=1)
+                next_token = response.token
                 generated_token_count += 1
 
                 if i % 50 == 0:
                     mx.clear_cache()
 
+                if next_token == START_OF_SPEECH:
+                    frames.reset()
+                    if decoder is not None:
+                        decoder.reset()
+                elif next_token != END_OF_SPEECH:
+                    frames.append(next_token)
+
                 # Stream partial audio at intervals
                 if stream and generated_token_count % streaming_token_interval == 0:
-                    code_lists = self.parse_output(input_ids)
-                    if code_lists and len(code_lists[0]) > 0:
-                        audio = decode_audio_from_codes(code_lists[0])[0]
-                        if audio.shape[0] > yielded_frame_count:
+                    codes = frames.new_codes()
+                    if codes is not None:
+                        audio = decoder.decode_frames(codes)[0, :, 0]
+                        if audio.shape[0] > 0:
                             yield self.generate_result(
-                                audio=audio[yielded_frame_count:],
+                                audio=audio,
                                 start_time=time_start,
                                 token_count=generated_token_count - yielded_token_count,
                                 segment_idx=segment_idx,
                             )
                             yielded_token_count = generated_token_count
-                            yielded_frame_count = audio.shape[0]
                             time_start = time.perf_counter()
 
                 if next_token == END_OF_SPEECH:  # 151671
                     break
 
             # Decode and yield remaining audio for this segment
-            code_lists = self.parse_output(input_ids)
-
-            for code_list in code_lists:
-                if len(code_list) == 0:
-                    continue
-                audio = decode_audio_from_codes(code_list)[0]
-
-                if audio.shape[0] > yielded_frame_count:
-                    yield self.generate_result(
-                        audio=audio[yielded_frame_count:],
-                        start_time=time_start,
-                        token_count=generated_token_count - yielded_token_count,
-                        segment_idx=segment_idx,
-                    )
+            if stream:
+                codes = frames.new_codes()
+                chunks = [decoder.decode_frames(codes)] if codes is not None else []
+                audio = mx.concatenate(chunks + [decoder.flush()], axis=1)[0, :, 0]
+            elif len(frames) > 0:
+                audio = snac_model.decode(frames.codes()).squeeze(-1)[0]
+            else:
+                audio = None
+
+            if audio is not None and audio.shape[0] > 0:
+                yield self.generate_result(
+                    audio=audio,
+                    start_time=time_start,
+                    token_count=generated_token_count - yielded_token_count,
+                    segment_idx=segment_idx,
+                )
 
             # Clear cache after each segment to avoid memory buildup
             mx.clear_cache()
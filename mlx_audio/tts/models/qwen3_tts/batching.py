@@ -0,0 +1,376 @@
+# Copyright (c) 2025, Prince Canuma and contributors (https://github.com/Blaizzy/mlx-audio)
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import mlx.core as mx
+from mlx_lm.models.cache import BatchKVCache
+
+from mlx_audio.tts.batching import (
+    BatchRequest,
+    ContinuousBatchingEngine,
+    SamplingParams,
+)
+from mlx_audio.tts.models.base import GenerationResult
+
+from .qwen3_tts import format_duration
+
+
+class Qwen3TTSBatchEngine(ContinuousBatchingEngine):
+    """Continuous batching for the Qwen3-TTS talker and code predictor.
+
+    Each admitted request is prefilled on its own and merged into a shared
+    ``BatchKVCache``; every step then runs the talker and the code predictor
+    once for all active sequences. Voice cloning from reference audio is not
+    batched and should go through :meth:`Model.generate`.
+    """
+
+    default_max_tokens = 4096
+
+    def __init__(self, model, max_batch_size: int = 8):
+        super().__init__(max_batch_size=max_batch_size)
+        self.model = model
+        config = model.config.talker_config
+        self.eos_token_id = config.codec_eos_token_id
+        # Suppress special tokens [vocab_size-1024, vocab_size) except EOS
+        self.suppress_tokens = mx.array(
+            [
+                i
+                for i in range(config.vocab_size - 1024, config.vocab_size)
+                if i != self.eos_token_id
+            ],
+            dtype=mx.int32,
+        )
+        self._reset()
+
+    def _reset(self):
+        self._requests: List[BatchRequest] = []
+        self._cache: Optional[List[BatchKVCache]] = None
+        self._input_embeds: Optional[mx.array] = None
+        self._token_counts: Optional[mx.array] = None
+        self._trailing: List[mx.array] = []
+        self._trailing_idx: List[int] = []
+        self._pad_embeds: List[mx.array] = []
+        self._codes: List[List[mx.array]] = []
+        self._max_tokens: List[int] = []
+        self._groups: Optional[List[Tuple[tuple, Optional[mx.array]]]] = None
+        self._order: Optional[mx.array] = None
+
+    @property
+    def num_active(self) -> int:
+        return len(self._requests)
+
+    def submit_text(
+        self,
+        text: str,
+        params: SamplingParams,
+        voice: Optional[str] = None,
+        instruct: Optional[str] = None,
+        lang_code: str = "auto",
+        split_pattern: str = "\n",
+    ) -> List[BatchRequest]:
+        """Validate a request the same way ``Model.generate`` does and queue it.
+
+        Base models split ``text`` on ``split_pattern`` and queue one sequence
+        per segment so the segments are decoded concurrently.
+
+        Returns:
+            One :class:`BatchRequest` per segment, in order.
+        """
+        model = self.model
+        tts_model_type = getattr(model.config, "tts_model_type", "base")
+        if model.speech_tokenizer is None:
+            raise ValueError("Speech tokenizer not loaded")
+
+        if tts_model_type == "voice_design":
+            if not instruct:
+                raise ValueError(
+                    "VoiceDesign model requires 'instruct' to describe the voice "
+                    "(e.g., 'A cheerful young female voice with high pitch')"
+                )
+            speaker, segments = None, [text]
+        elif tts_model_type == "custom_voice":
+            if not voice:
+                raise ValueError(
+                    "CustomVoice model requires 'voice' (speaker name) "
+                    "(e.g., 'Chelsie', 'Ethan', 'Vivian')"
+                )
+            if voice.lower() not in [s.lower() for s in model.supported_speakers]:
+                raise ValueError(
+                    f"Speaker '{voice}' not supported. Available: {model.supported_speakers}"
+                )
+            speaker, segments = voice, [text]
+        else:
+            speaker, instruct = voice, None
+            if split_pattern:
+                segments = [s.strip() for s in text.split(split_pattern) if s.strip()]
+            else:
+                segments = [text]
+
+        return [
+            self.submit(
+                params,
+                segment_idx=segment_idx,
+                text=segment,
+                speaker=speaker,
+                instruct=instruct,
+                language=lang_code or "auto",
+                cap_tokens=tts_model_type != "base",
+            )
+            for segment_idx, segment in enumerate(segments)
+        ]
+
+    def _admit(self, request: BatchRequest):
+        model = self.model
+        talker = model.talker
+        inputs = request.inputs
+
+        input_embeds, trailing_text_hidden, tts_pad_embed = (
+            model._prepare_generation_inputs(
+                inputs["text"],
+                language=inputs["language"],
+                speaker=inputs["speaker"],
+                instruct=inputs["instruct"],
+            )
+        )
+
+        max_tokens = request.params.max_tokens or self.default_max_tokens
+        if inputs["cap_tokens"]:
+            # Same runaway-generation cap as Model._generate_with_instruct
+            target_token_count = len(model.tokenizer.encode(inputs["text"]))
+            max_tokens = min(max_tokens, max(75, target_token_count * 6))
+
+        # Prefill everything but the last position, which is fed by the next
+        # batched step together with the other sequences.
+        prompt_cache = talker.make_cache()
+        talker(input_embeds[:, :-1, :], cache=prompt_cache)
+        mx.eval([c.state for c in prompt_cache])
+        cache = [BatchKVCache.merge([c]) for c in prompt_cache]
+
+        vocab_size = model.config.talker_config.vocab_size
+        if self._cache is None:
+            self._cache = cache
+            self._input_embeds = input_embeds[:, -1:, :]
+            self._token_counts = mx.zeros((1, vocab_size), dtype=mx.int32)
+        else:
+            for batch_cache, new_cache in zip(self._cache, cache):
+                batch_cache.extend(new_cache)
+            self._input_embeds = mx.concatenate(
+                [self._input_embeds, input_embeds[:, -1:, :]], axis=0
+            )
+            self._token_counts = mx.concatenate(
+                [self._token_counts, mx.zeros((1, vocab_size), dtype=mx.int32)],
+                axis=0,
+            )
+
+        self._requests.append(request)
+        self._trailing.append(trailing_text_hidden)
+        self._trailing_idx.append(0)
+        self._pad_embeds.append(tts_pad_embed)
+        self._codes.append([])
+        self._max_tokens.append(max_tokens)
+        self._groups = None
+
+    def _remove(self, requests: List[BatchRequest]):
+        uids = {request.uid for request in requests}
+        self._filter(
+            [i for i, request in enumerate(self._requests) if request.uid not in uids]
+        )
+
+    def _filter(self, keep: List[int]):
+        if not keep:
+            self._reset()
+            return
+        if len(keep) == len(self._requests):
+            return
+        for c in self._cache:
+            c.filter(keep)
+        keep_idx = mx.array(keep)
+        self._input_embeds = self._input_embeds[keep_idx]
+        self._token_counts = self._token_counts[keep_idx]
+        for name in (
+            "_requests",
+            "_trailing",
+            "_trailing_idx",
+            "_pad_embeds",
+            "_codes",
+            "_max_tokens",
+        ):
+            values = getattr(self, name)
+            setattr(self, name, [values[i] for i in keep])
+        self._groups = None
+
+    def _sampling_groups(self) -> List[Tuple[tuple, Optional[mx.array]]]:
+        """Batch rows grouped by sampling parameters, as ``(params, rows)``.
+
+        ``rows`` is ``None`` when every sequence samples the same way.
+        """
+        if self._groups is None:
+            rows: Dict[tuple, List[int]] = {}
+            for i, request in enumerate(self._requests):
+                p = request.params
+                key = (p.temperature, p.top_k or 0, p.top_p, p.repetition_penalty)
+                rows.setdefault(key, []).append(i)
+            if len(rows) == 1:
+                self._groups = [(next(iter(rows)), None)]
+                self._order = None
+            else:
+                self._groups = [(key, mx.array(idx)) for key, idx in rows.items()]
+                # Position of each row in the concatenated group outputs
+                flat = [i for idx in rows.values() for i in idx]
+                order = [0] * len(flat)
+                for position, i in enumerate(flat):
+                    order[i] = position
+                self._order = mx.array(order)
+        return self._groups
+
+    def _sample(
+        self, logits: mx.array, token_counts: Optional[mx.array] = None, **kwargs
+    ) -> mx.array:
+        """Sample one token per row [batch] with ``Model._sample_token``,
+        one call per group of rows that share sampling parameters."""
+        tokens = []
+        for (
+            temperature,
+            top_k,
+            top_p,
+            repetition_penalty,
+        ), rows in self._sampling_groups():
+            group_logits, group_counts = logits, token_counts
+            if rows is not None:
+                group_logits = logits[rows]
+                if token_counts is not None:
+                    group_counts = token_counts[rows]
+            tokens.append(
+                self.model._sample_token(
+                    group_logits,
+                    temperature=temperature,
+                    top_k=top_k,
+                    top_p=top_p,
+                    repetition_penalty=repetition_penalty,
+                    token_counts=group_counts,
+                    **kwargs,
+                )
+            )
+        if self._order is None:
+            tokens = tokens[0]
+        else:
+            tokens = mx.concatenate(tokens, axis=0)[self._order]
+        return tokens[:, 0].astype(mx.int32)
+
+    def _step(self) -> List[Tuple[BatchRequest, Optional[GenerationResult]]]:
+        talker = self.model.talker
+        code_predictor = talker.code_predictor
+        num_code_groups = self.model.config.talker_config.num_code_groups
+
+        logits, hidden = talker(self._input_embeds, cache=self._cache)
+
+        # First codebook for every sequence
+        next_token = self._sample(
+            logits,
+            token_counts=self._token_counts,
+            suppress_tokens=self.suppress_tokens,
+            eos_token_id=self.eos_token_id,
+        )
+
+        # Remaining codebooks with the code predictor, batched across sequences
+        code_tokens = [next_token]
+        code_cache = code_predictor.make_cache()
+        for code_idx in range(num_code_groups - 1):
+            if code_idx == 0:
+                code_0_embed = talker.get_input_embeddings()(next_token[:, None])
+                code_input = mx.concatenate([hidden[:, -1:, :], code_0_embed], axis=1)
+            else:
+                code_input = code_predictor.codec_embedding[code_idx - 1](
+                    code_tokens[-1][:, None]
+                )
+            code_logits, code_cache, _ = code_predictor(
+                code_input, cache=code_cache, generation_step=code_idx
+            )
+            code_tokens.append(self._sample(code_logits))
+        codes = mx.stack(code_tokens, axis=1)  # [batch, num_code_groups]
+
+        # Next input: text (trailing text or pad) + sum of codec embeddings
+        codec_embed = talker.get_input_embeddings()(next_token[:, None])
+        for i, code in enumerate(code_tokens[1:]):
+            codec_embed = codec_embed + code_predictor.codec_embedding[i](code[:, None])
+        text_embeds = []
+        for i, trailing in enumerate(self._trailing):
+            idx = self._trailing_idx[i]
+            if idx < trailing.shape[1]:
+                text_embeds.append(trailing[:, idx : idx + 1, :])
+                self._trailing_idx[i] = idx + 1
+            else:
+                text_embeds.append(self._pad_embeds[i])
+        self._input_embeds = mx.concatenate(text_embeds, axis=0) + codec_embed
+
+        vocab_size = self._token_counts.shape[-1]
+        self._token_counts = self._token_counts + (
+            mx.arange(vocab_size)[None, :] == next_token[:, None]
+        ).astype(mx.int32)
+
+        mx.eval(codes, self._input_embeds, self._token_counts)
+        tokens = next_token.tolist()
+
+        finished = []
+        keep = []
+        for i, request in enumerate(self._requests):
+            if tokens[i] == self.eos_token_id:
+                finished.append(i)
+                continue
+            self._codes[i].append(codes[i])
+            if len(self._codes[i]) >= self._max_tokens[i]:
+                finished.append(i)
+            else:
+                keep.append(i)
+
+        results = [(self._requests[i], self._decode(i)) for i in finished]
+        if finished:
+            self._filter(keep)
+        return results
+
+    def _decode(self, row: int) -> Optional[GenerationResult]:
+        model = self.model
+        request = self._requests[row]
+        generated_codes = self._codes[row]
+        if not generated_codes:
+            return None
+
+        codes = mx.stack(generated_codes, axis=0)[None]  # [1, seq_len, groups]
+        audio, audio_lengths = model.speech_tokenizer.decode(codes)
+        audio = audio[0]
+
+        # Trim to valid length
+        valid_len = int(audio_lengths[0])
+        if valid_len > 0 and valid_len < audio.shape[0]:
+            audio = audio[:valid_len]
+        mx.eval(audio)
+
+        elapsed_time = time.perf_counter() - request.started_at
+        samples = audio.shape[0]
+        token_count = len(generated_codes)
+        duration_seconds = samples / model.sample_rate
+
+        return GenerationResult(
+            audio=audio,
+            samples=samples,
+            sample_rate=model.sample_rate,
+            segment_idx=request.segment_idx,
+            token_count=token_count,
+            audio_duration=format_duration(duration_seconds),
+            real_time_factor=(
+                duration_seconds / elapsed_time if elapsed_time > 0 else 0
+            ),
+            prompt={
+                "tokens": token_count,
+                "tokens-per-sec": (
+                    token_count / elapsed_time if elapsed_time > 0 else 0
+                ),
+            },
+            audio_samples={
+                "samples": samples,
+                "samples-per-sec": (samples / elapsed_time if elapsed_time > 0 else 0),
+            },
+            processing_time_seconds=elapsed_time,
+            peak_memory_usage=mx.get_peak_memory() / 1e9,
+        )
@@ -134,6 +134,17 @@ def format_duration(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
 
 
+# Free MLX's buffer cache once it holds more than this many bytes. Clearing it
+# after every step forces fresh allocations, so generation only clears it
+# under memory pressure.
+CACHE_CLEAR_THRESHOLD = 1 << 30
+
+
+def clear_cache_if_needed(threshold: int = CACHE_CLEAR_THRESHOLD):
+    if mx.get_cache_memory() > threshold:
+        mx.clear_cache()
+
+
 class Model(nn.Module):
 
     def __init__(self, config: ModelConfig):
@@ -597,15 +608,16 @@ class Model(nn.Module):
         top_p: float = 1.0,
         repetition_penalty: float = 1.05,
         generated_tokens: Optional[List[int]] = None,
-        suppress_tokens: Optional[List[int]] = None,
+        suppress_tokens: Optional[Union[List[int], mx.array]] = None,
         eos_token_id: Optional[int] = None,
         min_p: float = 0.0,
+        token_counts: Optional[mx.array] = None,
     ) -> mx.array:
 
         logits = logits[:, -1, :]  # Get last position [1, vocab_size]
 
         # Suppress invalid tokens (set to -inf) - pure MLX
-        if suppress_tokens:
+        if suppress_tokens is not None and len(suppress_tokens) > 0:
             suppress_idx = mx.array(suppress_tokens, dtype=mx.int32)
             logits = mx.put_along_axis(
                 logits,
@@ -614,8 +626,14 @@ class Model(nn.Module):
                 axis=-1,
             )
 
-        # Apply repetition penalty
-        if generated_tokens and repetition_penalty != 1.0:
+        # Apply repetition penalty, from on-device token counts [1, vocab_size]
+        # or from a list of previously generated tokens
+        if token_counts is not None and repetition_penalty != 1.0:
+            penalized = mx.where(
+                logits < 0, logits * repetition_penalty, logits / repetition_penalty
+            )
+            logits = mx.where(token_counts > 0, penalized, logits)
+        elif generated_tokens and repetition_penalty != 1.0:
             unique_tokens = list(set(generated_tokens))
             valid_tokens = [t for t in unique_tokens if t < logits.shape[-1]]
             if valid_tokens:
@@ -656,6 +674,117 @@ class Model(nn.Module):
         token = categorical_sampling(logits, temperature)
         return token[:, None]
 
+    def _generate_codes(
+        self,
+        input_embeds: mx.array,
+        trailing_text_hidden: mx.array,
+        tts_pad_embed: mx.array,
+        max_tokens: int,
+        temperature: float = 0.9,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        repetition_penalty: float = 1.05,
+    ) -> Generator[mx.array, None, None]:
+        """Run the talker and code predictor, yielding one frame of codes
+        [1, num_code_groups] per step until EOS or ``max_tokens``.
+
+        The repetition-penalty history is kept on device as per-token counts,
+        and each step is queued with ``mx.async_eval`` before the previous
+        step's token is read back for the EOS check, so the host never waits
+        on the step it is about to schedule.
+        """
+        talker = self.talker
+        code_predictor = talker.code_predictor
+        config = self.config.talker_config
+        eos_token_id = config.codec_eos_token_id
+        cache = talker.make_cache()
+
+        # Suppress special tokens [vocab_size-1024, vocab_size) except EOS
+        suppress_tokens = mx.array(
+            [
+                i
+                for i in range(config.vocab_size - 1024, config.vocab_size)
+                if i != eos_token_id
+            ],
+            dtype=mx.int32,
+        )
+        trailing_idx = 0
+
+        def step(input_embeds, token_counts):
+            nonlocal trailing_idx
+            logits, hidden = talker(input_embeds, cache=cache)
+
+            # Sample first codebook token (with special token suppression)
+            next_token = self._sample_token(
+                logits,
+                temperature=temperature,
+                top_k=top_k,
+                top_p=top_p,
+                repetition_penalty=repetition_penalty,
+                suppress_tokens=suppress_tokens,
+                eos_token_id=eos_token_id,
+                token_counts=token_counts,
+            )
+
+            # Generate remaining codebook tokens with code predictor
+            code_tokens = [next_token]
+            code_cache = code_predictor.make_cache()
+            for code_idx in range(config.num_code_groups - 1):
+                if code_idx == 0:
+                    # Prefill: [hidden_state, code_0_embed] as one sequence
+                    code_0_embed = talker.get_input_embeddings()(next_token)
+                    code_input = mx.concatenate(
+                        [hidden[:, -1:, :], code_0_embed], axis=1
+                    )
+                else:
+                    # The KV cache provides context from previous positions
+                    code_input = code_predictor.codec_embedding[code_idx - 1](
+                        code_tokens[-1]
+                    )
+                code_logits, code_cache, _ = code_predictor(
+                    code_input, cache=code_cache, generation_step=code_idx
+                )
+                code_tokens.append(
+                    self._sample_token(
+                        code_logits, temperature=temperature, top_k=top_k, top_p=top_p
+                    )
+                )
+            codes = mx.concatenate(code_tokens, axis=1)  # [1, num_code_groups]
+
+            # Next input: trailing text (or pad) + sum of codec embeddings
+            if trailing_idx < trailing_text_hidden.shape[1]:
+                text_embed = trailing_text_hidden[:, trailing_idx : trailing_idx + 1]
+                trailing_idx += 1
+            else:
+                text_embed = tts_pad_embed
+            codec_embed = talker.get_input_embeddings()(next_token)
+            for i, code in enumerate(code_tokens[1:]):
+                codec_embed = codec_embed + code_predictor.codec_embedding[i](code)
+
+            token_counts = token_counts.at[0, next_token[0, 0]].add(1)
+            return codes, text_embed + codec_embed, token_counts
+
+        token_counts = mx.zeros((1, config.vocab_size), dtype=mx.int32)
+        pending = step(input_embeds, token_counts)
+        mx.async_eval(pending)
+        for n in range(max_tokens):
+            codes, input_embeds, token_counts = pending
+            if n + 1 < max_tokens:
+                # Queue the next step before syncing on this one's token
+                pending = step(input_embeds, token_counts)
+                mx.async_eval(pending)
+            if codes[0, 0].item() == eos_token_id:
+                break
+            yield codes
+            clear_cache_if_needed()
+
+    def make_batch_engine(self, max_batch_size: int = 8):
+        """Create a continuous-batching engine that decodes concurrent
+        requests in a shared talker step (see ``mlx_audio.tts.batching``)."""
+        from .batching import Qwen3TTSBatchEngine
+
+        return Qwen3TTSBatchEngine(self, max_batch_size=max_batch_size)
+
     def _decode_chunk(self, codes: mx.array, chunk_tokens: int = 100) -> mx.array:
         """Decode a chunk of codes to audio.
 
@@ -845,19 +974,7 @@ class Model(nn.Module):
                 )
             )
 
-            # Initialize cache using mlx_lm's KVCache
-            cache = self.talker.make_cache()
             generated_codes = []
-            config = self.config.talker_config
-            eos_token_id = config.codec_eos_token_id
-            trailing_idx = 0
-
-            # Suppress special tokens [vocab_size-1024, vocab_size) except EOS
-            suppress_tokens = [
-                i
-                for i in range(config.vocab_size - 1024, config.vocab_size)
-                if i != eos_token_id
-            ]
 
             # Streaming state
             # At 12.5 Hz, 25 tokens ≈ 2 seconds of audio
@@ -865,104 +982,17 @@ class Model(nn.Module):
             decoded_tokens = 0  # Track how many tokens we've decoded and yielded
             context_size = 25  # Overlap tokens for smooth audio transitions (25 gives ~0.04% error vs full decode)
 
-            for step in range(max_tokens):
-                # Forward pass through talker
-                logits, hidden = self.talker(
-                    input_embeds,
-                    cache=cache,
-                )
-
-                # Sample first codebook token (with special token suppression)
-                next_token = self._sample_token(
-                    logits,
-                    temperature=temperature,
-                    top_k=top_k,
-                    top_p=top_p,
-                    repetition_penalty=repetition_penalty,
-                    generated_tokens=(
-                        [int(c[0, 0]) for c in generated_codes]
-                        if generated_codes
-                        else None
-                    ),
-                    suppress_tokens=suppress_tokens,
-                    eos_token_id=eos_token_id,
-                )
-
-                # Check for EOS
-                if int(next_token[0, 0]) == eos_token_id:
-                    break
-
-                # Generate remaining codebook tokens with code predictor
-                code_tokens = [next_token]
-                code_hidden = hidden[:, -1:, :]
-                code_cache = self.talker.code_predictor.make_cache()
-
-                for code_idx in range(config.num_code_groups - 1):
-                    if code_idx == 0:
-                        # Prefill: concatenate [hidden_state, code_0_embed] as sequence
-                        # This matches PyTorch where inputs_embeds.shape[1] > 1
-                        code_0_embed = self.talker.get_input_embeddings()(next_token)
-                        code_input = mx.concatenate(
-                            [code_hidden, code_0_embed], axis=1
-                        )  # [1, 2, hidden]
-                    else:
-                        # Generation: just pass embedding of previous code token
-                        # The KV cache provides context from previous positions
-                        code_embed = self.talker.code_predictor.codec_embedding[
-                            code_idx - 1
-                        ](code_tokens[-1])
-                        code_input = code_embed  # [1, 1, hidden]
-
-                    # Code predictor forward
-                    code_logits, code_cache, _ = self.talker.code_predictor(
-                        code_input,
-                        cache=code_cache,
-                        generation_step=code_idx,
-                    )
-
-                    # Sample
-                    next_code = self._sample_token(
-                        code_logits,
-                        temperature=temperature,
-                        top_k=top_k,
-                        top_p=top_p,
-                    )
-                    code_tokens.append(next_code)
-
-                # Stack all codebook tokens
-                all_codes = mx.concatenate(code_tokens, axis=1)  # [1, num_code_groups]
-                generated_codes.append(all_codes)
-
-                del code_cache
-                mx.clear_cache()
-
-                # Prepare next input
-                # Add trailing text if available
-                if trailing_idx < trailing_text_hidden.shape[1]:
-                    text_embed = trailing_text_hidden[
-                        :, trailing_idx : trailing_idx + 1, :
-                    ]
-                    trailing_idx += 1
-                else:
-                    text_embed = tts_pad_embed
-
-                # Codec embedding for next step
-                codec_embed = self.talker.get_input_embeddings()(next_token)
-                for i, code in enumerate(code_tokens[1:]):
-                    codec_embed = (
-                        codec_embed
-                        + self.talker.code_predictor.codec_embedding[i](code)
-                    )
-
-                input_embeds = text_embed + codec_embed
-
-                mx.eval(input_embeds)
-
-                # Periodically clear cache to prevent memory buildup during long generation
-                if step > 0 and step % 50 == 0:
-                    mx.clear_cache()
-
-                # Update progress bar
+            for codes in self._generate_codes(
+                input_embeds,
+                trailing_text_hidden,
+                tts_pad_embed,
+                max_tokens,
+                temperature=temperature,
+                top_k=top_k,
+                top_p=top_p,
+                repetition_penalty=repetition_penalty,
+            ):
+                generated_codes.append(codes)
                 pbar.update(1)
 
                 # Streaming: decode and yield audio chunks during generation
@@ -1290,17 +1320,7 @@ class Model(nn.Module):
         target_token_count = len(self.tokenizer.encode(text))
         effective_max_tokens = min(max_tokens, max(75, target_token_count * 6))
 
-        # Initialize cache
-        cache = self.talker.make_cache()
         generated_codes = []
-        config = self.config.talker_config
-        eos_token_id = config.codec_eos_token_id
-        suppress_tokens = [
-            i
-            for i in range(config.vocab_size - 1024, config.vocab_size)
-            if i != eos_token_id
-        ]
-        trailing_idx = 0
 
         # Create progress bar for token generation
         pbar = tqdm(
@@ -1317,84 +1337,17 @@ class Model(nn.Module):
         decoded_tokens = 0  # Track how many tokens we've decoded and yielded
         context_size = 25  # Overlap tokens for smooth audio transitions (25 gives ~0.04% error vs full decode)
 
-        for step in range(effective_max_tokens):
-            # Forward pass through talker
-            logits, hidden = self.talker(input_embeds, cache=cache)
-
-            # Sample first codebook token
-            next_token = self._sample_token(
-                logits,
-                temperature=temperature,
-                top_k=top_k,
-                top_p=top_p,
-                repetition_penalty=repetition_penalty,
-                generated_tokens=(
-                    [int(c[0, 0]) for c in generated_codes] if generated_codes else None
-                ),
-                suppress_tokens=suppress_tokens,
-                eos_token_id=eos_token_id,
-            )
-
-            # Check for EOS
-            if int(next_token[0, 0]) == eos_token_id:
-                break
-
-            # Generate remaining codebook tokens with code predictor
-            code_tokens = [next_token]
-            code_hidden = hidden[:, -1:, :]
-            code_cache = self.talker.code_predictor.make_cache()
-
-            for code_idx in range(config.num_code_groups - 1):
-                if code_idx == 0:
-                    code_0_embed = self.talker.get_input_embeddings()(next_token)
-                    code_input = mx.concatenate([code_hidden, code_0_embed], axis=1)
-                else:
-                    code_embed = self.talker.code_predictor.codec_embedding[
-                        code_idx - 1
-                    ](code_tokens[-1])
-                    code_input = code_embed
-
-                code_logits, code_cache, _ = self.talker.code_predictor(
-                    code_input,
-                    cache=code_cache,
-                    generation_step=code_idx,
-                )
-
-                next_code = self._sample_token(
-                    code_logits,
-                    temperature=temperature,
-                    top_k=top_k,
-                    top_p=top_p,
-                )
-                code_tokens.append(next_code)
-
-            # Stack all codebook tokens
-            all_codes = mx.concatenate(code_tokens, axis=1)
-            generated_codes.append(all_codes)
-
-            del code_cache
-            mx.clear_cache()
-
-            # Prepare next input
-            if trailing_idx < trailing_text_hidden.shape[1]:
-                text_embed = trailing_text_hidden[:, trailing_idx : trailing_idx + 1, :]
-                trailing_idx += 1
-            else:
-                text_embed = tts_pad_embed
-
-            codec_embed = self.talker.get_input_embeddings()(next_token)
-            for i, code in enumerate(code_tokens[1:]):
-                codec_embed = codec_embed + self.talker.code_predictor.codec_embedding[
-                    i
-                ](code)
-
-            input_embeds = text_embed + codec_embed
-            mx.eval(input_embeds)
-
-            # Periodically clear cache to prevent memory buildup during long generation
-            if step > 0 and step % 50 == 0:
-                mx.clear_cache()
-
+        for codes in self._generate_codes(
+            input_embeds,
+            trailing_text_hidden,
+            tts_pad_embed,
+            effective_max_tokens,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            repetition_penalty=repetition_penalty,
+        ):
+            generated_codes.append(codes)
             pbar.update(1)
 
             # Streaming: decode and yield audio chunks during generation
@@ -1585,17 +1538,7 @@ class Model(nn.Module):
         target_token_count = len(self.tokenizer.encode(text))
         effective_max_tokens = min(max_tokens, max(75, target_token_count * 6))
 
-        # Initialize cache
-        cache = self.talker.make_cache()
         generated_codes = []
-        config = self.config.talker_config
-        eos_token_id = config.codec_eos_token_id
-        suppress_tokens = [
-            i
-            for i in range(config.vocab_size - 1024, config.vocab_size)
-            if i != eos_token_id
-        ]
-        trailing_idx = 0
 
         # Streaming state
         # At 12.5 Hz, 25 tokens ≈ 2 seconds of audio
@@ -1612,84 +1555,17 @@ class Model(nn.Module):
             leave=False,
         )
 
-        for step in range(effective_max_tokens):
-            # Forward pass through talker
-            logits, hidden = self.talker(input_embeds, cache=cache)
-
-            # Sample first codebook token
-            next_token = self._sample_token(
-                logits,
-                temperature=temperature,
-                top_k=top_k,
-                top_p=top_p,
-                repetition_penalty=repetition_penalty,
-                generated_tokens=(
-                    [int(c[0, 0]) for c in generated_codes] if generated_codes else None
-                ),
-                suppress_tokens=suppress_tokens,
-                eos_token_id=eos_token_id,
-            )
-
-            # Check for EOS
-            if int(next_token[0, 0]) == eos_token_id:
-                break
-
-            # Generate remaining codebook tokens with code predictor
-            code_tokens = [next_token]
-            code_hidden = hidden[:, -1:, :]
-            code_cache = self.talker.code_predictor.make_cache()
-
-            for code_idx in range(config.num_code_groups - 1):
-                if code_idx == 0:
-                    code_0_embed = self.talker.get_input_embeddings()(next_token)
-                    code_input = mx.concatenate([code_hidden, code_0_embed], axis=1)
-                else:
-                    code_embed = self.talker.code_predictor.codec_embedding[
-                        code_idx - 1
-                    ](code_tokens[-1])
-                    code_input = code_embed
-
-                code_logits, code_cache, _ = self.talker.code_predictor(
-                    code_input,
-                    cache=code_cache,
-                    generation_step=code_idx,
-                )
-
-                next_code = self._sample_token(
-                    code_logits,
-                    temperature=temperature,
-                    top_k=top_k,
-                    top_p=top_p,
-                )
-                code_tokens.append(next_code)
-
-            # Stack all codebook tokens
-            all_codes = mx.concatenate(code_tokens, axis=1)
-            generated_codes.append(all_codes)
-
-            del code_cache
-            mx.clear_cache()
-
-            # Prepare next input
-            if trailing_idx < trailing_text_hidden.shape[1]:
-                text_embed = trailing_text_hidden[:, trailing_idx : trailing_idx + 1, :]
-                trailing_idx += 1
-            else:
-                text_embed = tts_pad_embed
-
-            codec_embed = self.talker.get_input_embeddings()(next_token)
-            for i, code in enumerate(code_tokens[1:]):
-                codec_embed = codec_embed + self.talker.code_predictor.codec_embedding[
-                    i
-                ](code)
-
-            input_embeds = text_embed + codec_embed
-            mx.eval(input_embeds)
-
-            # Periodically clear cache to prevent memory buildup during long generation
-            if step > 0 and step % 50 == 0:
-                mx.clear_cache()
-
+        for codes in self._generate_codes(
+            input_embeds,
+            trailing_text_hidden,
+            tts_pad_embed,
+            effective_max_tokens,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            repetition_penalty=repetition_penalty,
+        ):
+            generated_codes.append(codes)
             pbar.update(1)
 
             # Streaming: decode and yield audio chunks during generation
@@ -454,15 +454,23 @@ class Qwen3TTSTalkerModel(nn.Module):
         # Generate position ids if not provided
         if position_ids is None:
             # 3D position for MRoPE: [3, batch, seq_len]
-            pos = mx.arange(offset, offset + seq_len)[None, :].astype(mx.int32)
-            pos = mx.broadcast_to(pos, (batch, seq_len))
+            if isinstance(offset, mx.array):
+                # BatchKVCache tracks one offset per sequence
+                pos = offset[:, None] + mx.arange(seq_len)[None, :]
+                pos = pos.astype(mx.int32)
+            else:
+                pos = mx.arange(offset, offset + seq_len)[None, :].astype(mx.int32)
+                pos = mx.broadcast_to(pos, (batch, seq_len))
             position_ids = mx.stack([pos, pos, pos], axis=0)
 
         # Compute position embeddings
         position_embeddings = self.rotary_emb(inputs_embeds, position_ids)
 
         # Create causal mask if not provided
-        if mask is None and seq_len > 1:
+        if mask is None and isinstance(offset, mx.array):
+            # BatchKVCache mask also hides the left padding of shorter sequences
+            mask = cache[0].make_mask(seq_len)
+        elif mask is None and seq_len > 1:
             mask = nn.MultiHeadAttention.create_additive_causal_mask(seq_len)
             mask = mask.astype(inputs_embeds.dtype)
 
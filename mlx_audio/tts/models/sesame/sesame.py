@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import re
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
@@ -14,13 +16,13 @@ from mlx_lm.models.cache import make_prompt_cache
 from mlx_lm.models.llama import LlamaModel
 from mlx_lm.models.llama import ModelArgs as LlamaModelArgs
 from mlx_lm.sample_utils import make_sampler
-from scipy import signal
 from tokenizers.processors import TemplateProcessing
 from tqdm import tqdm
 from transformers import AutoTokenizer
 
 from mlx_audio.audio_io import read as audio_read
 from mlx_audio.codec.models.mimi import Mimi, MimiStreamingDecoder
+from mlx_audio.dsp import resample
 from mlx_audio.utils import load_audio
 
 from ..base import GenerationResult
@@ -36,11 +38,90 @@ TOKENIZER_REPO = "unsloth/Llama-3.2-1B"
 
 
 def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
-    gcd = np.gcd(orig_sr, target_sr)
-    up = target_sr // gcd
-    down = orig_sr // gcd
-    resampled = signal.resample_poly(audio, up, down, padtype="edge")
-    return resampled
+    return resample(audio, orig_sr, target_sr, padtype="edge")
+
+
+class LRUCache:
+    """Small least-recently-used mapping for per-voice prompt state."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _array_key(*arrays: mx.array) -> str:
+    """Content hash of one or more arrays."""
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        a = np.asarray(a)
+        h.update(f"{a.dtype}{a.shape}".encode())
+        h.update(np.ascontiguousarray(a).data)
+    return h.hexdigest()
+
+
+class DepthDecoderCache:
+    """
+    Preallocated KV cache of the depth decoder.
+
+    A frame is decoded in ``audio_num_codebooks`` positions (the backbone
+    state and codebook 0, then one per remaining codebook), so the buffers
+    are allocated once per batch size and every frame writes them again from
+    offset 0 instead of allocating a new cache. Each codebook step reads a
+    fixed prefix of the buffers, so it has static shapes and is compiled once
+    per sampler.
+    """
+
+    def __init__(self, num_layers: int):
+        self.num_layers = num_layers
+        self.keys: List[mx.array] = []
+        self.values: List[mx.array] = []
+        self.sampler = None
+        self.steps: Dict[int, Callable] = {}
+
+    def allocate(self, shape: Tuple[int, ...], dtype: mx.Dtype):
+        """Make sure the buffers are ``shape`` (batch, kv_heads, positions,
+        head_dim) and ``dtype``."""
+        if self.keys and self.keys[0].shape == shape and self.keys[0].dtype == dtype:
+            return
+        self.keys = [mx.zeros(shape, dtype) for _ in range(self.num_layers)]
+        self.values = [mx.zeros(shape, dtype) for _ in range(self.num_layers)]
+
+
+class _DepthLayerCache:
+    """One layer of a :class:`DepthDecoderCache` during a codebook step."""
+
+    def __init__(self, keys: mx.array, values: mx.array, offset: int):
+        self.keys = keys
+        self.values = values
+        self.offset = offset
+
+    def update_and_fetch(self, keys: mx.array, values: mx.array):
+        prev = self.offset
+        self.offset += keys.shape[2]
+        self.keys[..., prev : self.offset, :] = keys
+        self.values[..., prev : self.offset, :] = values
+        return self.keys[..., : self.offset, :], self.values[..., : self.offset, :]
+
+    def make_mask(self, N: int, return_array: bool = False, window_size=None):
+        return "causal" if N > 1 else None
 
 
 @dataclass
@@ -312,7 +393,7 @@ class SesameModel(nn.Module):
             backbone_args = create_llama_model_args(self.args.backbone_flavor)
 
         self.backbone_cache = make_prompt_cache(self.backbone)
-        self.decoder_cache = make_prompt_cache(self.decoder)
+        self.decoder_cache = DepthDecoderCache(len(self.decoder.layers))
         self.caches_enabled = True
 
     def caches_are_enabled(self):
@@ -322,8 +403,32 @@ class SesameModel(nn.Module):
         if self.backbone_cache is not None:
             self.backbone_cache = make_prompt_cache(self.backbone)
 
-        if self.decoder_cache is not None:
-            self.decoder_cache = make_prompt_cache(self.decoder)
+    def prefill(self, tokens: mx.array, tokens_mask: mx.array):
+        """Run the backbone over prompt frames to fill its cache, without
+        sampling a frame."""
+        assert self.caches_are_enabled(), "backbone caches are not enabled"
+
+        embeds = self._embed_tokens(tokens)
+        h = mx.sum(embeds * mx.expand_dims(tokens_mask, -1), axis=2)
+        self.backbone(h, cache=self.backbone_cache)
+
+    def snapshot_caches(self) -> List[Tuple[mx.array, mx.array]]:
+        """Keys and values of the backbone cache, trimmed to its length."""
+        return [
+            (c.keys[..., : c.offset, :], c.values[..., : c.offset, :])
+            for c in self.backbone_cache
+        ]
+
+    def restore_caches(self, snapshot: List[Tuple[mx.array, mx.array]]):
+        """Restore the backbone cache from ``snapshot_caches``.
+
+        The snapshot arrays are exactly as long as the cache, so the next
+        update reallocates instead of writing into them: a snapshot can be
+        restored any number of times.
+        """
+        self.backbone_cache = make_prompt_cache(self.backbone)
+        for c, state in zip(self.backbone_cache, snapshot):
+            c.state = state
 
     def generate_frame(
         self,
@@ -345,30 +450,60 @@ class SesameModel(nn.Module):
         c0_embed = self._embed_audio(0, c0_sample)
 
         curr_h = mx.concat([mx.expand_dims(last_h, 1), c0_embed], axis=1)
-        curr_sample = c0_sample
-        curr_pos = mx.arange(curr_h.shape[1], dtype=mx.int32)
-        curr_pos = mx.expand_dims(curr_pos, 0)
-        curr_pos = mx.broadcast_to(curr_pos, (curr_h.shape[0], curr_h.shape[1]))
-
-        # reset decoder cache for new frame
-
-        self.decoder_cache = make_prompt_cache(self.decoder)
-
+        samples = [c0_sample]
+
+        # Remaining codebooks, one compiled depth decoder step each
+        cache = self.decoder_cache
+        attn = self.decoder.layers[0].self_attn
+        cache.allocate(
+            (
+                curr_h.shape[0],
+                attn.n_kv_heads,
+                self.args.audio_num_codebooks,
+                attn.head_dim,
+            ),
+            curr_h.dtype,
+        )
         for i in range(1, self.args.audio_num_codebooks):
-            decoder_h = self.decoder(
-                self.projection(curr_h),
-                cache=self.decoder_cache,
+            ci_sample, curr_h, cache.keys, cache.values = self._depth_step(i, sampler)(
+                curr_h, cache.keys, cache.values
+            )
+            samples.append(ci_sample)
+
+        return mx.concat(samples, axis=1)
+
+    def _depth_step(self, codebook: int, sampler: Callable[..., mx.array]):
+        cache = self.decoder_cache
+        if cache.sampler is not sampler:
+            cache.sampler = sampler
+            cache.steps = {}
+        step = cache.steps.get(codebook)
+        if step is not None:
+            return step
+
+        # Codebook 1 also writes the backbone state and codebook 0
+        offset = 0 if codebook == 1 else codebook
+
+        def depth_step(h, keys, values):
+            layers = [_DepthLayerCache(k, v, offset) for k, v in zip(keys, values)]
+            h = self.decoder(self.projection(h), cache=layers)
+            logits = mx.matmul(h[:, -1, :], self.audio_head[codebook - 1])
+            sample = mx.expand_dims(sampler(logits), axis=-1)
+            return (
+                sample,
+                self._embed_audio(codebook, sample),
+                [c.keys for c in layers],
+                [c.values for c in layers],
             )
 
-            ci_logits = mx.matmul(decoder_h[:, -1, :], self.audio_head[i - 1])
-            ci_sample = mx.expand_dims(sampler(ci_logits), axis=-1)
-            ci_embed = self._embed_audio(i, ci_sample)
-
-            curr_h = ci_embed
-            curr_sample = mx.concat([curr_sample, ci_sample], axis=1)
-            curr_pos = curr_pos[:, -1:] + 1
-
-        return curr_sample
+        # The random state is threaded through so sampling still varies
+        step = mx.compile(
+            depth_step,
+            inputs=[mx.random.state, self.state],
+            outputs=[mx.random.state],
+        )
+        cache.steps[codebook] = step
+        return step
 
     def _embed_audio(self, codebook: int, tokens: mx.array) -> mx.array:
         return self.audio_embeddings(tokens + codebook * self.args.audio_vocab_size)
@@ -442,6 +577,20 @@ class Model(nn.Module):
 
         self._sample_rate = mimi.cfg.sample_rate
 
+        # Kept across calls so the compiled depth decoder steps are reused
+        self._default_sampler = make_sampler(temp=0.9, top_k=50)
+
+        # Per-voice state reused across requests and lines of a script
+        self._speaker_prompts = LRUCache(8)
+        self._audio_tokens = LRUCache(16)
+        self._context_caches = LRUCache(4)
+
+    def clear_prompt_cache(self):
+        """Drop cached speaker prompts, prompt audio tokens and KV snapshots."""
+        self._speaker_prompts.clear()
+        self._audio_tokens.clear()
+        self._context_caches.clear()
+
     def model_quant_predicate(self, p, m):
         """
         Model modules to skip during quantization
@@ -482,8 +631,13 @@ class Model(nn.Module):
         frame_tokens = []
         frame_masks = []
 
-        # (K, T)
-        audio_tokens = self._audio_tokenizer.encode(audio[None, None, ...])[0]
+        # (K, T), encoded once per reference clip
+        key = _array_key(audio)
+        audio_tokens = self._audio_tokens.get(key)
+        if audio_tokens is None:
+            audio_tokens = self._audio_tokenizer.encode(audio[None, None, ...])[0]
+            mx.eval(audio_tokens)
+            self._audio_tokens.put(key, audio_tokens)
 
         # add EOS frame
         if add_eos:
@@ -556,6 +710,13 @@ class Model(nn.Module):
     def default_speaker_prompt(
         self, voice: str, repo_id="sesame/csm-1b"
     ) -> List[Segment]:
+        prompt = self._speaker_prompts.get((repo_id, voice))
+        if prompt is None:
+            prompt = self._load_speaker_prompt(voice, repo_id)
+            self._speaker_prompts.put((repo_id, voice), prompt)
+        return [prompt]
+
+    def _load_speaker_prompt(self, voice: str, repo_id: str) -> Segment:
         SPEAKER_PROMPTS = {
             "conversational_a": {
                 "text": (
@@ -589,8 +750,21 @@ class Model(nn.Module):
         except Exception:
             prompt_text = SPEAKER_PROMPTS[voice]["text"]
 
-        prompt = self.prepare_prompt(prompt_text, 0, prompt_path, 24_000)
-        return [prompt]
+        return self.prepare_prompt(prompt_text, 0, prompt_path, 24_000)
+
+    def _prefill_context(self, tokens: mx.array, tokens_mask: mx.array):
+        """Fill the backbone cache with the speaker context, restoring a
+        snapshot when the same context was prefilled before."""
+        key = _array_key(tokens, tokens_mask)
+        snapshot = self._context_caches.get(key)
+        if snapshot is None:
+            self.model.reset_caches()
+            self.model.prefill(tokens[None], tokens_mask[None])
+            snapshot = self.model.snapshot_caches()
+            mx.eval(snapshot)
+            self._context_caches.put(key, snapshot)
+        else:
+            self.model.restore_caches(snapshot)
 
     def generate_result(
         self, samples, start_time: float, stream: bool = False
@@ -703,7 +877,7 @@ class Model(nn.Module):
                 ),
             )
 
-        sampler = sampler or make_sampler(temp=0.9, top_k=50)
+        sampler = sampler or self._default_sampler
         max_audio_frames = int(max_audio_length_ms / 80)
         streaming_interval_tokens = int(streaming_interval * 12.5)
 
@@ -718,6 +892,8 @@ class Model(nn.Module):
                         speaker=speaker, text=generation_text, audio=context[0].audio
                     )
                 ]
+            else:
+                current_context = context
 
             start_time = time.perf_counter()
 
@@ -733,12 +909,21 @@ class Model(nn.Module):
                 tokens.append(segment_tokens)
                 tokens_mask.append(segment_tokens_mask)
 
+            # The speaker context is the same for every line, so its prefill
+            # is restored from a snapshot and only the new text is prefilled
+            context_len = 0
             if not voice_match:
+                context_len = sum(t.shape[0] for t in tokens)
+                if context_len > 0:
+                    self._prefill_context(
+                        mx.concat(tokens, axis=0).astype(mx.int32),
+                        mx.concat(tokens_mask, axis=0).astype(mx.bool_),
+                    )
                 gen_segment_tokens, gen_segment_tokens_mask = (
                     self._tokenize_text_segment(prompt, speaker)
                 )
-                tokens.append(gen_segment_tokens)
-                tokens_mask.append(gen_segment_tokens_mask)
+                tokens = [gen_segment_tokens]
+                tokens_mask = [gen_segment_tokens_mask]
 
             prompt_tokens = mx.concat(tokens, axis=0).astype(mx.int32)
             prompt_tokens_mask = mx.concat(tokens_mask, axis=0).astype(mx.bool_)
@@ -747,13 +932,13 @@ class Model(nn.Module):
             curr_tokens = mx.expand_dims(prompt_tokens, axis=0)
             curr_tokens_mask = mx.expand_dims(prompt_tokens_mask, axis=0)
             curr_pos = mx.expand_dims(
-                mx.arange(0, prompt_tokens.shape[0]), axis=0
+                mx.arange(context_len, context_len + prompt_tokens.shape[0]), axis=0
             ).astype(mx.int32)
             generated_frame_count = 0
             yielded_frame_count = 0
 
             max_seq_len = 2048 - max_audio_frames
-            if curr_tokens.shape[1] >= max_seq_len:
+            if context_len + curr_tokens.shape[1] >= max_seq_len:
                 raise ValueError(
                     f"Inputs too long, must be below max_seq_len - max_audio_frames: {max_seq_len}"
                 )
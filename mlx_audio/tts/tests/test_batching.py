@@ -0,0 +1,240 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import mlx.core as mx
+import numpy as np
+
+from mlx_audio.tts.batching import (
+    BatchRequest,
+    ContinuousBatchingEngine,
+    SamplingParams,
+    get_batch_engine,
+)
+from mlx_audio.tts.models.base import GenerationResult
+
+
+class CountingEngine(ContinuousBatchingEngine):
+    """Engine whose sequences finish after ``inputs["length"]`` steps."""
+
+    def __init__(self, max_batch_size=2):
+        super().__init__(max_batch_size=max_batch_size)
+        self.step_sizes = []
+        self.after_step = None
+        self._reset()
+
+    def _reset(self):
+        self.rows = []
+
+    @property
+    def num_active(self):
+        return len(self.rows)
+
+    def _admit(self, request):
+        if request.inputs.get("fail"):
+            raise ValueError("bad request")
+        self.rows.append([request, 0])
+
+    def _remove(self, requests):
+        uids = {r.uid for r in requests}
+        self.rows = [row for row in self.rows if row[0].uid not in uids]
+
+    def _step(self):
+        self.step_sizes.append(len(self.rows))
+        finished = []
+        for row in self.rows:
+            row[1] += 1
+            if row[1] >= row[0].inputs["length"]:
+                finished.append((row[0], row[1]))
+        done = {request.uid for request, _ in finished}
+        self.rows = [row for row in self.rows if row[0].uid not in done]
+        if self.after_step is not None:
+            self.after_step()
+        return finished
+
+
+class TestContinuousBatchingEngine(unittest.TestCase):
+    def test_batches_concurrent_requests(self):
+        engine = CountingEngine(max_batch_size=2)
+        requests = [
+            engine.submit(SamplingParams(), length=length) for length in (3, 1, 2)
+        ]
+
+        self.assertEqual(list(engine.results(requests)), [3, 1, 2])
+        # The third request only joins once a slot frees up
+        self.assertEqual(max(engine.step_sizes), 2)
+        self.assertEqual(sum(engine.step_sizes), 6)
+        stats = engine.get_stats()
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["max_batch_size_seen"], 2)
+        self.assertEqual(stats["tokens"], 6)
+        engine.close()
+
+    def test_drivers_share_the_batch(self):
+        engine = CountingEngine(max_batch_size=4)
+        requests = [engine.submit(SamplingParams(), length=50) for _ in range(4)]
+        results = {}
+
+        def drive(i):
+            results[i] = list(engine.results([requests[i]]))
+
+        threads = [threading.Thread(target=drive, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(results, {i: [50] for i in range(4)})
+        # Steps are serialized and every step advances the whole batch
+        self.assertEqual(engine.step_sizes, [4] * 50)
+
+    def test_admission_failure_is_isolated(self):
+        engine = CountingEngine()
+        bad = engine.submit(SamplingParams(), length=1, fail=True)
+        good = engine.submit(SamplingParams(), length=2)
+
+        with self.assertRaises(ValueError):
+            list(engine.results([bad, good]))
+        self.assertEqual(list(engine.results([good])), [2])
+        self.assertEqual(engine.get_stats()["failed"], 1)
+        engine.close()
+
+    def test_cancel_frees_batch_slot(self):
+        engine = CountingEngine(max_batch_size=1)
+        long_request = engine.submit(SamplingParams(), length=1000)
+        waiting = engine.submit(SamplingParams(), length=1)
+        engine.after_step = lambda: engine.cancel([long_request])
+
+        self.assertEqual(list(engine.results([long_request, waiting])), [None, 1])
+        self.assertEqual(engine.step_sizes, [1, 1])
+        self.assertEqual(engine.get_stats()["cancelled"], 1)
+        engine.close()
+
+    def test_cancel_drops_queued_requests(self):
+        engine = CountingEngine()
+        queued = engine.submit(SamplingParams(), length=1)
+        engine.cancel([queued])
+
+        self.assertIsNone(queued.result(timeout=0))
+        self.assertEqual(engine.get_stats()["queued"], 0)
+        self.assertEqual(engine.step_sizes, [])
+
+    def test_close_fails_pending_requests(self):
+        engine = CountingEngine(max_batch_size=1)
+        done = engine.submit(SamplingParams(), length=1)
+        self.assertEqual(list(engine.results([done])), [1])
+        queued = engine.submit(SamplingParams(), length=1)
+        engine.close()
+
+        with self.assertRaises(RuntimeError):
+            queued.result(timeout=0)
+        with self.assertRaises(RuntimeError):
+            engine.submit(SamplingParams(), length=1)
+
+    def test_get_batch_engine(self):
+        class Model:
+            def make_batch_engine(self, max_batch_size=8):
+                return CountingEngine(max_batch_size=max_batch_size)
+
+        model = Model()
+        engine = get_batch_engine(model, max_batch_size=4)
+        self.assertIsInstance(engine, CountingEngine)
+        self.assertIs(get_batch_engine(model, max_batch_size=2), engine)
+        self.assertEqual(engine.max_batch_size, 2)
+
+        self.assertIsNone(get_batch_engine(object()))
+        self.assertIsNone(get_batch_engine(MagicMock()))
+
+
+class TestQwen3TTSBatchEngine(unittest.TestCase):
+    def _make_model(self):
+        from mlx_audio.tts.models.qwen3_tts import Model, ModelConfig
+        from mlx_audio.tts.tests.test_models import TestQwen3TTSModel
+
+        config = TestQwen3TTSModel()._default_config("base")
+        # Special-token suppression covers the top 1024 codec ids
+        config["talker_config"]["vocab_size"] = 1100
+        config.update(tts_pad_token_id=97, tts_bos_token_id=98, tts_eos_token_id=99)
+
+        mx.random.seed(0)
+        model = Model(ModelConfig.from_dict(config))
+        mx.eval(model.parameters())
+
+        model.tokenizer = MagicMock()
+        model.tokenizer.encode = lambda text: [ord(c) % 90 for c in text]
+        decoded = []
+
+        def decode(codes):
+            mx.eval(codes)
+            decoded.append(np.array(codes[0]))
+            samples = codes.shape[1] * 8
+            return mx.zeros((1, samples)), mx.array([samples])
+
+        model.speech_tokenizer = MagicMock()
+        model.speech_tokenizer.decode = decode
+        return model, decoded
+
+    def test_matches_sequential_generation(self):
+        model, decoded = self._make_model()
+        texts = ["hello there", "a much longer sentence to synthesize", "hi"]
+
+        expected = []
+        for text in texts:
+            decoded.clear()
+            list(model.generate(text, temperature=0, max_tokens=10))
+            expected.append(decoded[0])
+
+        decoded.clear()
+        engine = model.make_batch_engine(max_batch_size=2)
+        params = SamplingParams(temperature=0, repetition_penalty=1.05, max_tokens=10)
+        requests = engine.submit_text("\n".join(texts), params)
+        results = list(engine.results(requests))
+        engine.close()
+
+        self.assertEqual([r.segment_idx for r in results], [0, 1, 2])
+        self.assertTrue(all(isinstance(r, GenerationResult) for r in results))
+        self.assertEqual(engine.get_stats()["max_batch_size_seen"], 2)
+        # Greedy decoding in a shared batch reproduces batch-size-1 codes
+        for codes in expected:
+            self.assertTrue(any(np.array_equal(codes, got) for got in decoded))
+
+    def test_samples_per_row_parameters(self):
+        model, _ = self._make_model()
+        engine = model.make_batch_engine()
+        engine._requests = [
+            BatchRequest({}, SamplingParams(temperature=0.0)),
+            BatchRequest({}, SamplingParams(temperature=1.0, top_k=1)),
+            BatchRequest({}, SamplingParams(temperature=0.0)),
+            BatchRequest({}, SamplingParams(temperature=0.0, repetition_penalty=4.0)),
+        ]
+        logits = mx.array(
+            [
+                [0.0, 5.0, 4.0, 1.0],
+                [0.0, 1.0, 5.0, 0.0],
+                [0.0, 5.0, 4.0, 1.0],
+                [0.0, 5.0, 4.0, 4.5],
+            ]
+        )[:, None, :]
+        token_counts = mx.array([[0, 1, 0, 0]] * 4)
+        with patch.object(
+            model, "_sample_token", wraps=model._sample_token
+        ) as sample_token:
+            tokens = engine._sample(logits, token_counts=token_counts)
+
+        # One _sample_token call per distinct set of parameters, with the
+        # results put back in row order; the penalty only applies to row 3
+        self.assertEqual(sample_token.call_count, 3)
+        self.assertEqual(tokens.tolist(), [1, 2, 1, 3])
+
+    def test_validates_like_generate(self):
+        model, _ = self._make_model()
+        model.config.tts_model_type = "custom_voice"
+        engine = model.make_batch_engine()
+        with self.assertRaises(ValueError):
+            engine.submit_text("hello", SamplingParams())
+        with self.assertRaises(ValueError):
+            engine.submit_text("hello", SamplingParams(), voice="nobody")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import importlib.resources
+import os
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -6,6 +7,7 @@ import mlx.core as mx
 import mlx.nn as nn
 import numpy as np
 from misaki import en
+from mlx.utils import tree_map
 
 
 # Create a patch for the deprecated open_text function
@@ -135,6 +137,77 @@ class TestKokoroModel(unittest.TestCase):
         self.assertIsInstance(model, nn.Module)
         self.assertEqual(model.vocab, {"a": 1, "b": 2})
 
+    def test_passed_decoder_is_compiled_once(self):
+        """A decoder passed to __call__ is compiled once and kept on it."""
+        from mlx_audio.tts.models.kokoro.kokoro import Model
+
+        class FakeDecoder(nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.scale = mx.array(2.0)
+                self.traces = 0
+
+            def __call__(self, asr, F0_curve, N, s):
+                self.traces += 1
+                return asr * self.scale + mx.random.normal(asr.shape) * 0
+
+        decoder = FakeDecoder()
+        compiled = Model._compile_decoder(decoder)
+        self.assertIs(Model._compile_decoder(decoder), compiled)
+        self.assertIs(decoder._compiled, compiled)
+        self.assertNotIn("_compiled", decoder.state)
+
+        asr = mx.ones((1, 4, 8))
+        for _ in range(3):
+            out = compiled(asr, None, None, None)
+            self.assertTrue(mx.allclose(out, asr * 2))
+        self.assertEqual(decoder.traces, 1)
+
+    def test_default_decoder_is_compiled(self):
+        """__call__ and warmup share the compiled model decoder."""
+        from mlx_audio.tts.models.kokoro.kokoro import Model
+
+        class FakeDecoder(nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.scale = mx.array(2.0)
+                self.traced = []
+
+            def __call__(self, asr, F0_curve, N, s):
+                self.traced.append(asr.shape[-1])
+                return asr * self.scale
+
+        with patch.object(Model, "__init__", return_value=None):
+            model = Model.__new__(Model)
+        nn.Module.__init__(model)
+        model.vocab = {"a": 1, "b": 2}
+        model.context_length = 16
+        model.config = MagicMock(hidden_dim=4, style_dim=128)
+        model.decoder = FakeDecoder()
+        model.bert = MagicMock(return_value=(mx.zeros((1, 4, 8)), None))
+        model.bert_encoder = MagicMock(return_value=mx.zeros((1, 4, 6)))
+        model.text_encoder = MagicMock(return_value=mx.ones((1, 4, 4)))
+        model.predictor = MagicMock()
+        model.predictor.text_encoder.return_value = mx.zeros((1, 4, 6))
+        model.predictor.lstm.return_value = (mx.zeros((1, 4, 6)), None)
+        # Two frames per token
+        model.predictor.duration_proj.return_value = mx.full((1, 4, 2), 20.0)
+        model.predictor.F0Ntrain.return_value = (
+            mx.zeros((1, 16)),
+            mx.zeros((1, 16)),
+        )
+
+        model.warmup([8, 16])
+        self.assertEqual(model.decoder.traced, [8, 16])
+
+        ref_s = mx.zeros((1, 256))
+        for speed in (1, 1, 2):
+            audio = model("ab", ref_s, speed=speed)
+            self.assertEqual(audio.shape, (4, 8 // speed))
+            self.assertTrue(mx.allclose(audio, mx.full(audio.shape, 2.0)))
+        # Lengths compiled by warmup are reused; a new length is traced once
+        self.assertEqual(model.decoder.traced, [8, 16, 4])
+
     def test_output_dataclass(self):
         """Test KokoroModel.Output dataclass."""
         # Import inside the test method
@@ -248,6 +321,51 @@ class TestKokoroPipeline(unittest.TestCase):
                     self.assertIn("voice1", pipeline.voices)
                     self.assertIn("voice2", pipeline.voices)
 
+    def test_voice_cache(self):
+        """Test that voices and blends are served from the shared LRU cache."""
+        from mlx_audio.tts.models.kokoro.pipeline import KokoroPipeline
+        from mlx_audio.tts.models.kokoro.voice import VoiceCache
+
+        with patch.object(KokoroPipeline, "__init__", return_value=None):
+            with patch(
+                "mlx_audio.tts.models.kokoro.pipeline.load_voice_tensor"
+            ) as load_voice_tensor:
+                with patch(
+                    "mlx_audio.tts.models.kokoro.pipeline.snapshot_download"
+                ) as mock_snapshot_download:
+                    cache = VoiceCache(max_size=3)
+                    pipelines = []
+                    for _ in range(2):
+                        pipeline = KokoroPipeline.__new__(KokoroPipeline)
+                        pipeline.lang_code = "a"
+                        pipeline.repo_id = "mlx-community/kokoro-tts"
+                        pipeline.voices = cache
+                        pipelines.append(pipeline)
+
+                    mock_snapshot_download.return_value = "/mock/path"
+                    # Each pack is filled with its voice name length
+                    load_voice_tensor.side_effect = lambda f: mx.full(
+                        (2, 1, 4), float(len(f.split("/")[-1].split(".")[0]))
+                    )
+
+                    blend = pipelines[0].load_voice("af_a,af_bb")
+                    self.assertTrue(mx.allclose(blend, mx.full((2, 1, 4), 4.5)))
+                    self.assertEqual(load_voice_tensor.call_count, 2)
+
+                    # Repeated requests, from any pipeline, skip the hub and disk
+                    mock_snapshot_download.reset_mock()
+                    self.assertIs(pipelines[1].load_voice("af_a,af_bb"), blend)
+                    pipelines[1].load_voice("af_a")
+                    mock_snapshot_download.assert_not_called()
+                    self.assertEqual(load_voice_tensor.call_count, 2)
+
+                    # The least recently used entry ("af_bb") is evicted
+                    pipelines[0].load_voice("af_ccc")
+                    self.assertEqual(len(cache), 3)
+                    self.assertNotIn("af_bb", cache)
+                    self.assertIn("af_a,af_bb", cache)
+                    self.assertIn("af_a", cache)
+
     def test_tokens_to_ps(self):
         """Test tokens_to_ps method."""
         # Import inside the test method
@@ -399,6 +517,116 @@ class TestBarkModel(unittest.TestCase):
         self.assertIn("layers.1.mlp.weight", sanitized)
         self.assertIn("lm_head.weight", sanitized)
 
+    def test_kv_cache_matches_full_context(self):
+        """Cached decoding gives the logits of a causal pass over the prefix."""
+        from mlx_audio.tts.models.bark.bark import GPT, SemanticConfig
+
+        config = SemanticConfig(
+            block_size=32,
+            input_vocab_size=64,
+            output_vocab_size=64,
+            n_layer=2,
+            n_head=2,
+            n_embd=16,
+        )
+        model = GPT(config)
+        x = mx.random.randint(0, 64, (1, 12))
+
+        cache = model.make_cache()
+        logits, _ = model(x[:, :4], cache=cache)
+        cached = [logits]
+        for t in range(4, 12):
+            logits, _ = model(x[:, t : t + 1], cache=cache)
+            cached.append(logits)
+        self.assertEqual(cache[0].offset, 12)
+        self.assertEqual(cache[0].keys.shape[2], 32)
+
+        for t, logits in zip(range(4, 13), cached):
+            expected, _ = model(x[:, :t])
+            self.assertTrue(mx.allclose(logits, expected, atol=1e-5))
+
+        # Several tokens on top of a cache attend causally among themselves
+        cache = model.make_cache()
+        model(x[:, :4], cache=cache)
+        logits, _ = model(x[:, 4:9], cache=cache)
+        expected, _ = model(x[:, :9])
+        self.assertTrue(mx.allclose(logits, expected, atol=1e-5))
+
+        with self.assertRaises(ValueError):
+            model(mx.zeros((1, 40), dtype=mx.int32), cache=model.make_cache())
+
+
+@patch("importlib.resources.open_text", patched_open_text)
+class TestBarkStreaming(unittest.TestCase):
+    def setUp(self):
+        from mlx_audio.tts.models.bark.bark import (
+            GPT,
+            CoarseAcousticsConfig,
+            CodecConfig,
+            FineAcousticsConfig,
+            ModelConfig,
+            SemanticConfig,
+        )
+        from mlx_audio.tts.models.bark.pipeline import Pipeline
+
+        coarse_config = CoarseAcousticsConfig(n_layer=1, n_head=2, n_embd=16)
+        config = ModelConfig(
+            semantic_config=SemanticConfig(),
+            coarse_acoustics_config=coarse_config,
+            fine_acoustics_config=FineAcousticsConfig(),
+            codec_config=CodecConfig(),
+        )
+        self.model = MagicMock()
+        self.model.coarse_acoustics = GPT(coarse_config)
+        self.model.fine_acoustics.return_value = mx.zeros((1, 1024, 1024))
+        with patch("mlx_audio.tts.models.bark.pipeline.Encodec") as encodec:
+            encodec.from_pretrained.return_value = (MagicMock(), None)
+            self.pipeline = Pipeline(
+                model=self.model, tokenizer=MagicMock(), config=config
+            )
+
+    def test_coarse_windows_pull_semantic_lazily(self):
+        """Windows start before the semantic stage ends and match a full pass."""
+        semantic = mx.random.randint(0, 10_000, (400,)).tolist()
+        pulled = []
+
+        def semantic_stream():
+            for token in semantic:
+                pulled.append(token)
+                yield token
+
+        mx.random.seed(0)
+        windows = self.pipeline._coarse_windows(semantic_stream(), voice=None)
+        first = next(windows)
+        # The first window reads 256 semantic tokens, not all 400
+        self.assertEqual(len(pulled), 256)
+        self.assertEqual(first.shape, (60,))
+        streamed = mx.concatenate([first, *windows])
+
+        mx.random.seed(0)
+        expected = self.pipeline.generate_coarse(mx.array(semantic), voice=None)
+        self.assertEqual(expected.shape, (2, streamed.shape[0] // 2))
+        self.assertTrue(mx.array_equal(self.pipeline._coarse_codes(streamed), expected))
+
+    @patch("mlx_audio.tts.models.bark.pipeline.codec_decode")
+    def test_stream_yields_chunks(self, mock_codec_decode):
+        mock_codec_decode.side_effect = lambda codec, fine: mx.zeros(
+            (1, fine.shape[1] * 320)
+        )
+        semantic = mx.random.randint(0, 10_000, (100,)).tolist()
+        self.pipeline._semantic_prompt = MagicMock(return_value=(None, mx.array([1])))
+        self.pipeline._semantic_tokens = MagicMock(return_value=iter(semantic))
+
+        chunks = list(
+            self.pipeline("test", voice=None, stream=True, streaming_interval=1.0)
+        )
+        # 100 semantic tokens give 150 coarse frames: two one-second chunks
+        self.assertEqual([c.audio.shape[1] for c in chunks], [75 * 320, 75 * 320])
+        # The second chunk is decoded with the first as codec context
+        self.assertEqual(mock_codec_decode.call_args_list[1][0][1].shape[1], 150)
+        history = self.model.fine_acoustics.call_args_list[-1][0][1]
+        self.assertEqual(history.shape, (1, 1024, 8))
+
 
 @patch("importlib.resources.open_text", patched_open_text)
 class TestBarkPipeline(unittest.TestCase):
@@ -673,6 +901,59 @@ class TestLlamaModel(unittest.TestCase):
             # lm_head should be kept with tie_word_embeddings=False
             self.assertIn("lm_head.weight", sanitized2)
 
+    def test_stream_generate_matches_generate(self):
+        """Streamed chunks concatenate to the audio of a full decode."""
+        from types import SimpleNamespace
+
+        from mlx_audio.codec.models.snac import SNAC
+        from mlx_audio.tts.models.llama import llama
+        from mlx_audio.tts.models.llama.llama import Model
+
+        snac = SNAC(
+            encoder_dim=48,
+            encoder_rates=[2, 4, 8, 8],
+            decoder_dim=64,
+            decoder_rates=[8, 8, 4, 2],
+            attn_window_size=None,
+            vq_strides=[4, 2, 1],
+            noise=False,
+        )
+        rng = np.random.default_rng(0)
+        codes = [128266 + (i % 7) * 4096 + int(rng.integers(4096)) for i in range(140)]
+        # Start of speech, 20 frames, a partial frame, end of speech
+        tokens = [128257] + codes + [128266, 128258]
+
+        def fake_stream_generate(*args, **kwargs):
+            for token in tokens:
+                yield SimpleNamespace(token=token)
+
+        with patch.object(Model, "__init__", return_value=None):
+            model = Model.__new__(Model)
+            model.config = SimpleNamespace(sample_rate=24000)
+            model.tokenizer = MagicMock()
+            model.prepare_input_ids = MagicMock(return_value=mx.zeros((1, 4)))
+
+            with (
+                patch.object(llama, "snac_model", snac),
+                patch.object(llama, "stream_generate", fake_stream_generate),
+            ):
+                (full,) = list(model.generate("Hello", voice="tara"))
+                chunks = list(
+                    model.generate(
+                        "Hello", voice="tara", stream=True, streaming_interval=0.2
+                    )
+                )
+                # Reference: parse the whole sequence once and decode it
+                code_list = model.parse_output(mx.array([tokens]))[0]
+                expected = llama.decode_audio_from_codes(code_list)[0]
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sum(c.token_count for c in chunks), len(tokens))
+        np.testing.assert_allclose(full.audio, expected, atol=1e-6)
+        np.testing.assert_allclose(
+            mx.concatenate([c.audio for c in chunks]), full.audio, atol=1e-5
+        )
+
 
 class TestQwen3Model(unittest.TestCase):
     @property
@@ -940,6 +1221,68 @@ class TestDiaModel(unittest.TestCase):
         # Check that model was created
         self.assertIsInstance(model, Model)
 
+    def _tiny_model(self):
+        from mlx_audio.tts.models.dia.dia import Model
+
+        config = self._default_config
+        config["model"]["encoder"].update(
+            n_layer=1, n_embd=32, n_hidden=64, n_head=2, head_dim=16
+        )
+        config["model"]["decoder"].update(
+            n_layer=2,
+            n_embd=32,
+            n_hidden=64,
+            gqa_query_heads=4,
+            cross_query_heads=4,
+            kv_heads=2,
+            gqa_head_dim=16,
+            cross_head_dim=16,
+        )
+        config["training"] = {"dtype": "float32"}
+        config["data"].update(text_length=128, audio_length=128)
+        with patch("mlx_audio.tts.models.dia.dia.DAC"):
+            model = Model(config)
+        mx.random.seed(1)
+        model.model.update(
+            tree_map(
+                lambda p: 0.2 * mx.random.normal(p.shape), model.model.parameters()
+            )
+        )
+        return model
+
+    def test_decode_step_batches_prompts(self):
+        """Each prompt decodes as if alone; compiled and eager steps agree."""
+        model = self._tiny_model()
+        texts = ["[S1] Hello there.", "[S1] Something else entirely."]
+
+        codes = model._generate_codes(texts, max_tokens=40, temperature=0.0)
+        self.assertEqual([c.shape for c in codes], [(39, 9), (39, 9)])
+        alone = model._generate_codes(texts[1:], max_tokens=40, temperature=0.0)
+        self.assertTrue(mx.array_equal(codes[1], alone[0]))
+
+        mx.random.seed(0)
+        compiled = model._generate_codes(texts, max_tokens=20)
+        mx.random.seed(0)
+        eager = model._generate_codes(texts, max_tokens=20, compiled=False)
+        for c, e in zip(compiled, eager):
+            self.assertTrue(mx.array_equal(c, e))
+
+    def test_decode_step_eos_countdown(self):
+        """After EOS on channel 0, each channel gets EOS at its delay, then PAD."""
+        model = self._tiny_model()
+        weight = model.model.decoder.logits_dense.weight
+        weight[:, 0, 1024] = 50.0
+        model.model.decoder.logits_dense.weight = weight
+
+        codes = model._generate_codes(["[S1] Hi."], max_tokens=100, temperature=0.0)
+        # EOS at the first step, then 30 extra steps with the last one dropped
+        self.assertEqual(codes[0].shape, (29, 9))
+        delays = model.config.data.delay_pattern
+        # The last two channels reach EOS after the final kept step
+        for channel, delay in enumerate(delays[:-2]):
+            self.assertEqual(codes[0][15 + delay, channel].item(), 1024)
+            self.assertTrue(mx.all(codes[0][16 + delay :, channel] == 1025).item())
+
 
 class TestSparkTTSModel(unittest.TestCase):
     @property
@@ -1314,6 +1657,226 @@ class TestChatterboxModel(unittest.TestCase):
         self.assertIn("t3.tfmr.weight", result)
         self.assertIn("s3gen.flow.weight", result)
 
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.T3")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3Token2Wav")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.VoiceEncoder")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3TokenizerV2")
+    def test_prepare_conditionals_cached(
+        self, mock_s3_tokenizer, mock_ve, mock_s3gen, mock_t3
+    ):
+        """Test conditionals are computed once per reference clip."""
+        from mlx_audio.tts.models.chatterbox.chatterbox import Conditionals, Model
+        from mlx_audio.tts.models.chatterbox.t3.cond_enc import T3Cond
+
+        model = Model()
+        computed = []
+
+        def compute(ref_wav, ref_sr):
+            computed.append(ref_sr)
+            return Conditionals(
+                T3Cond(speaker_emb=mx.ones((1, 256))),
+                {"embedding": mx.zeros((1, 192))},
+            )
+
+        model._compute_conditionals = compute
+        ref = np.random.default_rng(0).standard_normal(24000).astype(np.float32)
+
+        a = model.prepare_conditionals(ref, 24000, exaggeration=0.3)
+        b = model.prepare_conditionals(mx.array(ref), 24000, exaggeration=0.7)
+        self.assertEqual(len(computed), 1)
+        self.assertAlmostEqual(float(a.t3.emotion_adv[0, 0, 0]), 0.3, places=6)
+        self.assertAlmostEqual(float(b.t3.emotion_adv[0, 0, 0]), 0.7, places=6)
+        self.assertIs(a.gen, b.gen)
+
+        # A different clip or sample rate is a different voice
+        model.prepare_conditionals(ref, 16000)
+        model.prepare_conditionals(ref[::-1].copy(), 24000)
+        self.assertEqual(len(computed), 3)
+
+        model.conds_cache = None
+        model.prepare_conditionals(ref, 24000)
+        self.assertEqual(len(computed), 4)
+
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.T3")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3Token2Wav")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.VoiceEncoder")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3TokenizerV2")
+    def test_conds_cache_dir_from_env(
+        self, mock_s3_tokenizer, mock_ve, mock_s3gen, mock_t3
+    ):
+        """Test MLX_AUDIO_CONDS_CACHE_DIR keeps conditionals across models."""
+        import tempfile
+
+        from mlx_audio.tts.models.chatterbox.chatterbox import Conditionals, Model
+        from mlx_audio.tts.models.chatterbox.t3.cond_enc import T3Cond
+
+        computed = []
+
+        def compute(ref_wav, ref_sr):
+            computed.append(ref_sr)
+            return Conditionals(
+                T3Cond(speaker_emb=mx.full((1, 256), 3.0)),
+                {"embedding": mx.zeros((1, 192))},
+            )
+
+        ref = np.random.default_rng(0).standard_normal(24000).astype(np.float32)
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(os.environ, {"MLX_AUDIO_CONDS_CACHE_DIR": tmp}):
+                first = Model()
+                first._compute_conditionals = compute
+                first.prepare_conditionals(ref, 24000)
+
+                # A new model instance (e.g. after a restart) reads it from disk
+                second = Model()
+                second._compute_conditionals = compute
+                conds = second.prepare_conditionals(ref, 24000)
+
+            self.assertEqual(str(second.conds_cache.cache_dir), tmp)
+            self.assertEqual(len(computed), 1)
+            self.assertEqual(second.conds_cache.cache_info()["disk_hits"], 1)
+            self.assertTrue(
+                mx.array_equal(conds.t3.speaker_emb, mx.full((1, 256), 3.0))
+            )
+
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(Model().conds_cache.cache_dir)
+
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.T3")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3Token2Wav")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.VoiceEncoder")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3TokenizerV2")
+    def test_generate_unknown_voice(
+        self, mock_s3_tokenizer, mock_ve, mock_s3gen, mock_t3
+    ):
+        """Test an unregistered voice is an error, not the default voice."""
+        from mlx_audio.tts.models.chatterbox.chatterbox import Conditionals, Model
+        from mlx_audio.tts.models.chatterbox.t3.cond_enc import T3Cond
+
+        model = Model()
+        model._conds = Conditionals(
+            T3Cond(speaker_emb=mx.ones((1, 256))), {"embedding": mx.zeros((1, 192))}
+        )
+        with self.assertRaisesRegex(ValueError, "Unknown voice"):
+            next(model.generate("Hello", voice="nobody.wav"))
+
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.T3")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3Token2Wav")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.VoiceEncoder")
+    @patch("mlx_audio.tts.models.chatterbox.chatterbox.S3TokenizerV2")
+    def test_generate_preloaded_voice(
+        self, mock_s3_tokenizer, mock_ve, mock_s3gen, mock_t3
+    ):
+        """Test generate(voice=...) with a voice from preload_voices."""
+        import tempfile
+
+        import soundfile as sf
+
+        from mlx_audio.tts.models.chatterbox.chatterbox import Model
+
+        model = Model()
+        model._s3_tokenizer = None
+        model.ve.embeds_from_wavs.return_value = mx.ones((1, 256))
+        model.tokenizer = MagicMock()
+        model.tokenizer.text_to_tokens.return_value = mx.array([[5, 6, 7]])
+        model.t3.hp.start_text_token = 255
+        model.t3.hp.stop_text_token = 0
+        model.t3.inference.return_value = mx.array([[1, 2, 3], [1, 2, 3]])
+        model.s3gen.return_value = mx.zeros((1, 2400))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "alice.wav")
+            ref = np.random.default_rng(0).standard_normal(24000) * 0.1
+            sf.write(path, ref.astype(np.float32), 24000)
+            model.preload_voices([path])
+
+        for exaggeration in (0.5, 0.3):
+            result = next(
+                model.generate("Hello", voice=path, exaggeration=exaggeration)
+            )
+            self.assertEqual(result.samples, 2400)
+            t3_cond = model.t3.inference.call_args.kwargs["t3_cond"]
+            self.assertAlmostEqual(
+                float(t3_cond.emotion_adv[0, 0, 0]), exaggeration, places=6
+            )
+
+
+class TestChatterboxConditionalsCache(unittest.TestCase):
+    def _make_cache(self, **kwargs):
+        from mlx_audio.tts.models.chatterbox.chatterbox import Conditionals
+        from mlx_audio.tts.models.chatterbox.conds_cache import ConditionalsCache
+        from mlx_audio.tts.models.chatterbox.t3.cond_enc import T3Cond
+
+        return ConditionalsCache(Conditionals, T3Cond, "chatterbox", **kwargs)
+
+    def _make_conds(self, value: float):
+        from mlx_audio.tts.models.chatterbox.chatterbox import Conditionals
+        from mlx_audio.tts.models.chatterbox.t3.cond_enc import T3Cond
+
+        return Conditionals(
+            T3Cond(
+                speaker_emb=mx.full((1, 256), value),
+                cond_prompt_speech_tokens=mx.array([[1, 2, 3]]),
+            ),
+            {"prompt_feat": mx.full((1, 4, 80), value), "embedding": mx.zeros((1, 8))},
+        )
+
+    def test_key(self):
+        cache = self._make_cache()
+        audio = np.linspace(-1, 1, 1000, dtype=np.float32)
+
+        self.assertEqual(
+            cache.key(audio, ref_sr=24000), cache.key(mx.array(audio), ref_sr=24000)
+        )
+        self.assertNotEqual(
+            cache.key(audio, ref_sr=24000), cache.key(audio, ref_sr=16000)
+        )
+        self.assertNotEqual(cache.key(audio), cache.key(audio[:-1]))
+
+        # Models never share entries
+        cache.namespace = "chatterbox_turbo"
+        self.assertNotEqual(cache.key(audio), self._make_cache().key(audio))
+
+    def test_lru_and_pinned_voices(self):
+        cache = self._make_cache(max_entries=2)
+        cache.put("voice", self._make_conds(9.0), pin=True, name="catalog/alice.wav")
+        for i in range(4):
+            cache.put(f"k{i}", self._make_conds(float(i)))
+
+        info = cache.cache_info()
+        self.assertEqual(info["entries"], 2)
+        self.assertEqual(info["pinned"], 1)
+        self.assertEqual(info["evictions"], 2)
+        self.assertIsNone(cache.get("k0"))
+        self.assertIsNotNone(cache.get("k3"))
+
+        voice = cache.get_voice("catalog/alice.wav")
+        self.assertEqual(float(voice.t3.speaker_emb[0, 0]), 9.0)
+        self.assertIsNone(cache.get_voice("unknown"))
+
+    def test_disk_store(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self._make_cache(cache_dir=tmp).put("abc", self._make_conds(2.0))
+
+            # A fresh cache (e.g. after a restart) loads the entry from disk
+            cache = self._make_cache(cache_dir=tmp)
+            conds = cache.get("abc")
+            self.assertEqual(cache.cache_info()["disk_hits"], 1)
+            self.assertTrue(
+                mx.array_equal(conds.t3.speaker_emb, mx.full((1, 256), 2.0))
+            )
+            self.assertTrue(
+                mx.array_equal(
+                    conds.t3.cond_prompt_speech_tokens, mx.array([[1, 2, 3]])
+                )
+            )
+            self.assertEqual(set(conds.gen), {"prompt_feat", "embedding"})
+
+            self.assertIsNotNone(cache.get("abc"))
+            self.assertEqual(cache.cache_info()["hits"], 1)
+            self.assertIsNone(cache.get("missing"))
+
 
 class TestChatterboxTurboConfig(unittest.TestCase):
     def test_t3_config_defaults(self):
@@ -1504,6 +2067,31 @@ class TestChatterboxTurboModel(unittest.TestCase):
         self.assertIn("ve.lstm.weight", result)
         self.assertIn("unknown.param", result)
 
+    @patch("mlx_audio.tts.models.chatterbox_turbo.chatterbox_turbo.T3")
+    @patch("mlx_audio.tts.models.chatterbox_turbo.chatterbox_turbo.S3Gen")
+    @patch("mlx_audio.tts.models.chatterbox_turbo.chatterbox_turbo.VoiceEncoder")
+    @patch("mlx_audio.tts.models.chatterbox_turbo.chatterbox_turbo.S3TokenizerV2")
+    def test_voice_selection(
+        self, mock_s3_tokenizer, mock_ve_class, mock_s3gen_class, mock_t3_class
+    ):
+        """Test voices resolve through the cache and unknown ones raise."""
+        from mlx_audio.tts.models.chatterbox_turbo import ChatterboxTurboTTS
+        from mlx_audio.tts.models.chatterbox_turbo.chatterbox_turbo import (
+            Conditionals,
+        )
+        from mlx_audio.tts.models.chatterbox_turbo.models.t3 import T3Cond
+
+        model = ChatterboxTurboTTS()
+        conds = Conditionals(T3Cond(speaker_emb=mx.ones((1, 256))), {})
+        model.conds_cache.put("key", conds, pin=True, name="alice.wav")
+
+        self.assertIsNone(model._voice_conditionals(None))
+        self.assertIs(model._voice_conditionals("alice.wav"), conds)
+        # The voice is used per request and never becomes the model default
+        self.assertIsNone(model.get("_conds"))
+        with self.assertRaisesRegex(ValueError, "Unknown voice"):
+            next(model.generate("Hello", voice="nobody.wav"))
+
 
 class TestChatterboxTurboConditionals(unittest.TestCase):
     def test_conditionals_dataclass(self):
@@ -2625,11 +3213,11 @@ class TestQwen3TTSGenerateICL(unittest.TestCase):
             },
             "speaker_encoder_config": None,
             "tokenizer_config": None,
-            "im_start_token_id": 151644,
-            "im_end_token_id": 151645,
-            "tts_pad_token_id": 151671,
-            "tts_bos_token_id": 151672,
-            "tts_eos_token_id": 151673,
+            "im_start_token_id": 90,
+            "im_end_token_id": 91,
+            "tts_pad_token_id": 97,
+            "tts_bos_token_id": 98,
+            "tts_eos_token_id": 99,
             "sample_rate": 24000,
         }
 
@@ -2830,6 +3418,24 @@ class TestQwen3TTSGenerateICL(unittest.TestCase):
             if call_pen != 1.0:  # CB1+ calls don't pass rep_penalty
                 self.assertEqual(call_pen, 1.5)
 
+    def test_sample_token_counts_match_generated_tokens(self):
+        """Test that on-device token counts penalize like a token history."""
+        model = self._make_icl_model()
+        logits = mx.array([[[1.0, 3.0, -2.0, 2.9, 0.5]]])
+        generated = [1, 2, 1]
+        counts = mx.zeros((1, 5), dtype=mx.int32)
+        for token in generated:
+            counts = counts.at[0, token].add(1)
+
+        from_list = model._sample_token(
+            logits, temperature=0, repetition_penalty=1.5, generated_tokens=generated
+        )
+        from_counts = model._sample_token(
+            logits, temperature=0, repetition_penalty=1.5, token_counts=counts
+        )
+        self.assertEqual(from_list.tolist(), [[3]])
+        self.assertEqual(from_counts.tolist(), from_list.tolist())
+
     def test_generate_icl_ref_codes_prepended(self):
         """Test that reference codes are prepended to generated codes for decoding."""
         model = self._make_icl_model()
@@ -3168,5 +3774,140 @@ class TestQwen3TTSStreamingDecode(unittest.TestCase):
         self.assertEqual(max(1, int(0.1 * 12.5)), 1)
 
 
+class TestSesameModel(unittest.TestCase):
+    def _make_model(self):
+        from mlx_audio.tts.models.sesame.sesame import SesameModel
+
+        common = {
+            "attention_bias": False,
+            "attention_dropout": 0.0,
+            "head_dim": 16,
+            "hidden_act": "silu",
+            "initializer_range": 0.02,
+            "intermediate_size": 64,
+            "max_position_embeddings": 512,
+            "mlp_bias": False,
+            "num_attention_heads": 4,
+            "num_key_value_heads": 2,
+            "rms_norm_eps": 1e-5,
+            "rope_scaling": {"factor": 32.0, "rope_type": "llama3"},
+            "rope_theta": 500000,
+            "use_cache": True,
+        }
+        config = {
+            **common,
+            "model_type": "csm",
+            "backbone_flavor": "llama-1B",
+            "decoder_flavor": "llama-100M",
+            "text_vocab_size": 100,
+            "audio_vocab_size": 32,
+            "audio_num_codebooks": 4,
+            "hidden_size": 64,
+            "num_hidden_layers": 2,
+            "depth_decoder_config": {
+                **common,
+                "backbone_hidden_size": 64,
+                "hidden_size": 32,
+                "model_type": "csm_depth",
+                "num_codebooks": 4,
+                "num_hidden_layers": 1,
+                "vocab_size": 32,
+            },
+        }
+        mx.random.seed(0)
+        model = SesameModel(config)
+        model.setup_caches(1)
+        return model
+
+    def test_restore_context_snapshot(self):
+        """Test a restored context prefill matches prefilling everything."""
+        model = self._make_model()
+        tokens = mx.random.randint(0, 32, (1, 10, 5))
+        mask = mx.ones((1, 10, 5), dtype=mx.bool_)
+
+        model.reset_caches()
+        model.prefill(tokens, mask)
+        expected = [c.state for c in model.backbone_cache]
+
+        model.reset_caches()
+        model.prefill(tokens[:, :6], mask[:, :6])
+        snapshot = model.snapshot_caches()
+        saved = [(mx.array(k), mx.array(v)) for k, v in snapshot]
+
+        # The snapshot survives being restored and extended more than once
+        for _ in range(2):
+            model.restore_caches(snapshot)
+            self.assertEqual(model.backbone_cache[0].offset, 6)
+            model.prefill(tokens[:, 6:], mask[:, 6:])
+            for (k, v), c in zip(expected, model.backbone_cache):
+                np.testing.assert_allclose(np.array(c.state[0]), np.array(k), atol=1e-5)
+                np.testing.assert_allclose(np.array(c.state[1]), np.array(v), atol=1e-5)
+
+        for (k, v), (k0, v0) in zip(snapshot, saved):
+            self.assertTrue(mx.array_equal(k, k0))
+            self.assertTrue(mx.array_equal(v, v0))
+
+    def test_generate_frame_matches_reference(self):
+        """Test the compiled depth decoder against a plain per-frame loop."""
+        from mlx_lm.models.cache import make_prompt_cache
+
+        model = self._make_model()
+        model.audio_head = mx.random.normal(model.audio_head.shape)
+        greedy = lambda x: mx.argmax(x, axis=-1)
+
+        def reference_frame(tokens, mask):
+            embeds = model._embed_tokens(tokens)
+            h = mx.sum(embeds * mx.expand_dims(mask, -1), axis=2)
+            last_h = model.backbone(h, cache=model.backbone_cache)[:, -1, :]
+            sample = mx.expand_dims(greedy(model.codebook0_head(last_h)), -1)
+            curr_h = mx.concat(
+                [mx.expand_dims(last_h, 1), model._embed_audio(0, sample)], axis=1
+            )
+            cache = make_prompt_cache(model.decoder)
+            for i in range(1, model.args.audio_num_codebooks):
+                h = model.decoder(model.projection(curr_h), cache=cache)
+                ci = mx.expand_dims(greedy(h[:, -1, :] @ model.audio_head[i - 1]), -1)
+                curr_h = model._embed_audio(i, ci)
+                sample = mx.concat([sample, ci], axis=1)
+            return sample
+
+        def run(frame_fn, tokens, mask):
+            model.reset_caches()
+            frames = []
+            for _ in range(3):
+                frame = frame_fn(tokens, mask)
+                frames.append(frame)
+                tokens = mx.concat(
+                    [frame, mx.zeros((frame.shape[0], 1), dtype=mx.int32)], axis=1
+                )[:, None]
+                mask = mx.ones_like(tokens).astype(mx.bool_)
+            return mx.stack(frames, axis=1)
+
+        tokens = mx.random.randint(0, 32, (2, 6, 5))
+        mask = mx.ones((2, 6, 5), dtype=mx.bool_)
+        frame = lambda t, m: model.generate_frame(t, m, None, greedy)
+
+        # Batched frames share each depth step and match decoding alone
+        batched = run(frame, tokens, mask)
+        self.assertEqual(batched.shape, (2, 3, 4))
+        for b in range(2):
+            expected = run(reference_frame, tokens[b : b + 1], mask[b : b + 1])
+            self.assertTrue(mx.array_equal(batched[b : b + 1], expected))
+            single = run(frame, tokens[b : b + 1], mask[b : b + 1])
+            self.assertTrue(mx.array_equal(single, expected))
+
+    def test_lru_cache(self):
+        from mlx_audio.tts.models.sesame.sesame import LRUCache
+
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -34,6 +34,7 @@ from mlx_audio.dsp import (
     hanning,
     istft,
     mel_filters,
+    resample,
     stft,
 )
 
@@ -527,7 +528,6 @@ def load_audio(
     import os
 
     import numpy as np
-    from scipy.signal import resample
 
     from mlx_audio.audio_io import read as audio_read
 
@@ -546,7 +546,7 @@ def load_audio(
     if sample_rate != orig_sample_rate:
         duration = samples.shape[0] / orig_sample_rate
         num_samples = int(duration * sample_rate)
-        samples = resample(samples, num_samples)
+        samples = resample(samples, orig_sample_rate, sample_rate)[:num_samples]
 
     # Random segment selection
     if segment_duration is not None: